@@ -10,7 +10,7 @@ and performance monitoring throughout the Elite Options Trading System.
 
 Key decorators:
 - validate_data: Ensures data meets specified validation criteria using Pydantic models
-- track_performance: Monitors and logs execution time and resource usage
+- track_performance: Samples execution time (and optionally CPU/memory) into per-function telemetry
 - error_handler: Provides standardized error handling and recovery
 - audit_log: Records function calls and parameters for audit purposes
 - rate_limit: Enforces rate limits on function calls
@@ -32,10 +32,11 @@ from enum import Enum
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Type, Union
 
-import psutil
 from filelock import FileLock
 from pydantic import BaseModel, ValidationError
 
+from utils.decorator_telemetry_v2_5 import get_decorator_telemetry
+
 # Configure logger
 logger = logging.getLogger(__name__)
 
@@ -136,71 +137,34 @@ def track_compliance(component_id: str, component_name: str):
     return track_performance()
 
 # Performance tracking decorator
-def track_performance(metrics_file: Optional[str] = None):
+def track_performance(metrics_file: Optional[str] = None, sample_rate: Optional[float] = None,
+                      capture_memory: bool = False, capture_cpu: bool = False):
     """
-    Tracks and logs performance metrics for the decorated function.
+    Tracks performance metrics for the decorated function via the sampling telemetry
+    backend (utils/decorator_telemetry_v2_5.py).
+    
+    Sampled calls are timed with a monotonic clock and aggregated into per-function
+    counters and latency histograms; a background thread merges them. Read them with
+    ``get_decorator_telemetry().report()``. Exceptions are logged and re-raised.
     
     Args:
-        metrics_file: Optional file path to save metrics (in addition to logging)
+        metrics_file: Optional JSON-lines file receiving periodic aggregated summaries
+        sample_rate: Probability that a call is measured (default: backend default, 1.0)
+        capture_memory: Also record RSS deltas for sampled calls
+        capture_cpu: Also record thread CPU time for sampled calls
         
     Returns:
         Decorated function
     """
     def decorator(func):
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            start_time = time.time()
-            process = psutil.Process()
-            start_memory = process.memory_info().rss / (1024 * 1024)  # MB
-            
-            success = True
-            error_message = None
-            result = None
-            
-            try:
-                result = func(*args, **kwargs)
-                return result
-            except Exception as e:
-                success = False
-                error_message = str(e)
-                logger.error(f"Error in {func.__name__}: {e}")
-                raise
-            finally:
-                end_time = time.time()
-                execution_time_ms = (end_time - start_time) * 1000
-                end_memory = process.memory_info().rss / (1024 * 1024)  # MB
-                memory_usage_mb = end_memory - start_memory
-                cpu_percent = process.cpu_percent()
-                
-                # Log performance metrics
-                metrics = PerformanceMetrics(
-                    function_name=func.__name__,
-                    execution_time_ms=execution_time_ms,
-                    memory_usage_mb=memory_usage_mb,
-                    cpu_percent=cpu_percent,
-                    timestamp=datetime.now(),
-                    success=success,
-                    error_message=error_message
-                )
-                
-                logger.info(f"Performance metrics for {func.__name__}: "
-                           f"time={metrics.execution_time_ms:.2f}ms, "
-                           f"memory={metrics.memory_usage_mb:.2f}MB, "
-                           f"CPU={metrics.cpu_percent:.1f}%")
-                
-                # Save metrics to file if specified
-                if metrics_file:
-                    try:
-                        metrics_path = Path(metrics_file)
-                        metrics_path.parent.mkdir(parents=True, exist_ok=True)
-                        
-                        with FileLock(f"{metrics_file}.lock"):
-                            with open(metrics_file, 'a') as f:
-                                f.write(metrics.json() + '\n')
-                    except Exception as e:
-                        logger.error(f"Failed to save metrics to file: {e}")
-                
-        return wrapper
+        return get_decorator_telemetry().instrument(
+            func,
+            sample_rate=sample_rate,
+            capture_cpu=capture_cpu,
+            capture_memory=capture_memory,
+            metrics_file=metrics_file,
+            error_logger=logger
+        )
     return decorator
 
 # Error handling decorator
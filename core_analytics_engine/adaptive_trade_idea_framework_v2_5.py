@@ -2,8 +2,9 @@
 # EOTS v2.5 - S-GRADE PRODUCTION HARDENED ARTIFACT
 
 import logging
-from typing import Dict, List, Optional, Any, TYPE_CHECKING, Tuple
+from typing import Dict, List, Optional, Any, TYPE_CHECKING, Tuple, Sequence
 from datetime import datetime
+import numpy as np
 from pydantic import ValidationError
 
 from data_models import (
@@ -12,9 +13,10 @@ from data_models import (
     ATIFManagementDirectiveV2_5, ATIFSituationalAssessmentProfileV2_5,
     KeyLevelsDataV2_5
 )
-from data_models import ATIFSettingsModel # Import from new location
+from data_models import AdaptiveTradeIdeaFrameworkSettings
 from utils.config_manager_v2_5 import ConfigManagerV2_5
 from utils.pydantic_utils import normalize_config
+from core_analytics_engine.atif_batch_v2_5 import SpecificityRuleTableV2_5, accumulate_directional_scores
 
 if TYPE_CHECKING:
     pass
@@ -29,7 +31,7 @@ class AdaptiveTradeIdeaFrameworkV2_5:
     version includes comprehensive error handling and data validation to ensure
     resilience and stability.
     All public methods are strictly Pydantic-first: inputs and outputs are validated at the boundary.
-    The ATIF settings config is strictly validated and self-documenting via ATIFSettingsModel.
+    The ATIF settings config is strictly validated and self-documenting via AdaptiveTradeIdeaFrameworkSettings.
     """
 
     def __init__(self, config_manager: ConfigManagerV2_5, performance_tracker: Any):
@@ -37,9 +39,9 @@ class AdaptiveTradeIdeaFrameworkV2_5:
         self.config_manager = config_manager
         self.performance_tracker = performance_tracker
         raw_atif_settings = self.config_manager.get_setting("adaptive_trade_idea_framework_settings", default={})
-        normalized_settings = normalize_config(raw_atif_settings, ATIFSettingsModel)
+        normalized_settings = normalize_config(raw_atif_settings, AdaptiveTradeIdeaFrameworkSettings)
         try:
-            self.atif_settings = ATIFSettingsModel.model_validate(normalized_settings)
+            self.atif_settings = AdaptiveTradeIdeaFrameworkSettings.model_validate(normalized_settings)
         except ValidationError as e:
             self.logger.critical(f"ATIF settings config validation failed: {e.errors()}")
             raise
@@ -97,6 +99,91 @@ class AdaptiveTradeIdeaFrameworkV2_5:
             self.logger.critical(f"Unhandled exception during trade directive generation: {e}", exc_info=True)
             return []
 
+    def generate_trade_directives_batch(
+        self,
+        processed_data: Sequence[ProcessedDataBundleV2_5],
+        scored_signals: Sequence[Dict[str, List[SignalPayloadV2_5]]],
+        key_levels: Sequence[KeyLevelsDataV2_5]
+    ) -> Dict[str, List[ATIFStrategyDirectivePayloadV2_5]]:
+        """
+        Cross-ticker generate_trade_directives. Inputs are aligned per symbol; signal
+        integration, conviction mapping and rule matching run as array operations over
+        all symbols. Returns symbol -> directives, identical to the per-symbol path.
+        """
+        bundles: List[ProcessedDataBundleV2_5] = []
+        signal_maps: List[Dict[str, List[SignalPayloadV2_5]]] = []
+        results: Dict[str, List[ATIFStrategyDirectivePayloadV2_5]] = {}
+        for bundle, signals, levels in zip(processed_data, scored_signals, key_levels):
+            try:
+                if not isinstance(bundle, ProcessedDataBundleV2_5):
+                    bundle = ProcessedDataBundleV2_5.model_validate(bundle)
+                if not isinstance(levels, KeyLevelsDataV2_5):
+                    KeyLevelsDataV2_5.model_validate(levels)
+            except ValidationError as e:
+                self.logger.error(f"Input validation error in generate_trade_directives_batch: {e.errors()}")
+                continue
+            results[bundle.underlying_data_enriched.symbol] = []
+            if not signals:
+                self.logger.error(f"Empty scored_signals for {bundle.underlying_data_enriched.symbol}. Skipping.")
+                continue
+            bundles.append(bundle)
+            signal_maps.append(signals)
+        if not bundles:
+            return results
+
+        try:
+            n = len(bundles)
+            symbols = [b.underlying_data_enriched.symbol for b in bundles]
+            raw_regimes = [b.underlying_data_enriched.current_market_regime_v2_5 for b in bundles]
+            regimes = [r or "UNKNOWN" for r in raw_regimes]
+            weight_regimes = [r or "DEFAULT" for r in raw_regimes]
+
+            # Signal integration: flatten every symbol's signals, sum per symbol in input order
+            weights_by_regime = {
+                r: self.atif_settings.regime_context_weight_multipliers.get(r, {}).get(r, 1.0) for r in set(weight_regimes)
+            }
+            regime_weight = np.array([weights_by_regime[r] for r in weight_regimes], dtype=float)
+            flat = [(i, s.strength_score, s.direction) for i, m in enumerate(signal_maps) for lst in m.values() for s in lst]
+            symbol_index = np.array([f[0] for f in flat], dtype=np.int64)
+            strength = np.array([f[1] for f in flat], dtype=float)
+            bull, bear = accumulate_directional_scores(symbol_index, strength, [f[2] for f in flat], regime_weight, n)
+            assessed = (bull != 0) | (bear != 0)
+
+            # Conviction mapping
+            bullish = bull > bear
+            bias = np.where(bullish, "Bullish", "Bearish").astype(object)
+            dominant = np.where(bullish, bull, bear)
+            win_rate = np.full(n, 0.5)
+            bias_boost = np.zeros(n)
+            for i in np.flatnonzero(assessed):
+                win_rate[i] = self.performance_tracker.get_historical_performance_for_setup(symbols[i], regimes[i], bias[i])['win_rate']
+                conviction_params = self.atif_settings.conviction_mapping_params.get(regimes[i], {})
+                bias_boost[i] = conviction_params.get("bias_boost", {}).get(bias[i], 0.0)
+            conviction = np.maximum(0.0, dominant + (win_rate - 0.5) + bias_boost)
+            tradeable = assessed & (conviction >= self.min_conviction_to_trade)
+
+            # Strategy specificity via the compiled rule table (IV rank placeholder, as per-symbol)
+            rule_table = SpecificityRuleTableV2_5(getattr(self.atif_settings, 'strategy_specificity_rules', []))
+            rule_index = rule_table.match(bias, conviction, regimes, np.full(n, 50.0))
+
+            for i in np.flatnonzero(tradeable & (rule_index >= 0)):
+                try:
+                    assessment = self._assessment_profile(float(bull[i]), float(bear[i]))
+                    results[symbols[i]] = [
+                        self._build_directive(rule_table.rules[rule_index[i]], assessment, float(conviction[i]), bundles[i])
+                    ]
+                except ValidationError as e:
+                    self.logger.error(f"Validation error for {symbols[i]} in generate_trade_directives_batch: {e.errors()}")
+            self.logger.info(
+                f"Batched ATIF evaluated {n} symbols: {int(tradeable.sum())} above conviction threshold, "
+                f"{sum(1 for d in results.values() if d)} directives"
+            )
+        except ValidationError as e:
+            self.logger.error(f"Validation error in generate_trade_directives_batch: {e.errors()}")
+        except Exception as e:
+            self.logger.critical(f"Unhandled exception during batched trade directive generation: {e}", exc_info=True)
+        return results
+
     def get_management_directive(self, active_recommendation: ActiveRecommendationPayloadV2_5, current_und_price: float) -> Optional[ATIFManagementDirectiveV2_5]:
         """
         Evaluates an existing active recommendation and issues a management directive.
@@ -134,7 +221,8 @@ class AdaptiveTradeIdeaFrameworkV2_5:
         self, scored_signals: Dict[str, List[SignalPayloadV2_5]], processed_data: ProcessedDataBundleV2_5
     ) -> Optional[ATIFSituationalAssessmentProfileV2_5]:
         """Dynamically integrates signals to form a holistic situational assessment."""
-        assessment = ATIFSituationalAssessmentProfileV2_5(timestamp=datetime.now())
+        bullish_score = 0.0
+        bearish_score = 0.0
         current_regime = processed_data.underlying_data_enriched.current_market_regime_v2_5 or "DEFAULT"
         # Regime-aware weighting
         weight_multipliers = self.atif_settings.regime_context_weight_multipliers.get(current_regime, {})
@@ -143,12 +231,24 @@ class AdaptiveTradeIdeaFrameworkV2_5:
             for signal in signal_list:
                 weighted_score = signal.strength_score * regime_weight
                 if signal.direction == "Bullish":
-                    assessment.bullish_assessment_score += weighted_score
+                    bullish_score += weighted_score
                 elif signal.direction == "Bearish":
-                    assessment.bearish_assessment_score += abs(weighted_score) # Use absolute for bearish score
-        if assessment.bullish_assessment_score == 0 and assessment.bearish_assessment_score == 0:
+                    bearish_score += abs(weighted_score) # Use absolute for bearish score
+        if bullish_score == 0 and bearish_score == 0:
             return None
-        return assessment
+        return self._assessment_profile(bullish_score, bearish_score)
+
+    @staticmethod
+    def _assessment_profile(bullish_score: float, bearish_score: float) -> ATIFSituationalAssessmentProfileV2_5:
+        """Assessment profile for integrated directional scores (volatility and mean-reversion views are not assessed yet)."""
+        return ATIFSituationalAssessmentProfileV2_5(
+            bullish_assessment_score=bullish_score,
+            bearish_assessment_score=bearish_score,
+            vol_expansion_score=0.0,
+            vol_contraction_score=0.0,
+            mean_reversion_likelihood=0.0,
+            timestamp=datetime.now()
+        )
 
     def _map_assessment_to_conviction(self, assessment: ATIFSituationalAssessmentProfileV2_5, symbol: str, regime: str) -> Tuple[str, float]:
         """Translates a situational assessment score into a final trade conviction."""
@@ -198,18 +298,24 @@ class AdaptiveTradeIdeaFrameworkV2_5:
                 continue
 
             # If all conditions match, we have found our strategy
-            strat_output = rule["strategy_output"]
-            return ATIFStrategyDirectivePayloadV2_5(
-                selected_strategy_type=strat_output["strategy_type"],
-                target_dte_min=strat_output["target_dte"][0],
-                target_dte_max=strat_output["target_dte"][1],
-                target_delta_long_leg_min=strat_output.get("delta_range_long", [None, None])[0],
-                target_delta_long_leg_max=strat_output.get("delta_range_long", [None, None])[1],
-                target_delta_short_leg_min=strat_output.get("delta_range_short", [None, None])[0],
-                target_delta_short_leg_max=strat_output.get("delta_range_short", [None, None])[1],
-                underlying_price_at_decision=processed_data.underlying_data_enriched.price or 0.0,
-                final_conviction_score_from_atif=conviction,
-                supportive_rationale_components={"rule_name": rule.get("name")},
-                assessment_profile=assessment
-            )
-        return None
\ No newline at end of file
+            return self._build_directive(rule, assessment, conviction, processed_data)
+        return None
+
+    def _build_directive(
+        self, rule: Dict[str, Any], assessment: ATIFSituationalAssessmentProfileV2_5, conviction: float, processed_data: ProcessedDataBundleV2_5
+    ) -> ATIFStrategyDirectivePayloadV2_5:
+        """Builds the strategy directive for a matched specificity rule."""
+        strat_output = rule["strategy_output"]
+        return ATIFStrategyDirectivePayloadV2_5(
+            selected_strategy_type=strat_output["strategy_type"],
+            target_dte_min=strat_output["target_dte"][0],
+            target_dte_max=strat_output["target_dte"][1],
+            target_delta_long_leg_min=strat_output.get("delta_range_long", [None, None])[0],
+            target_delta_long_leg_max=strat_output.get("delta_range_long", [None, None])[1],
+            target_delta_short_leg_min=strat_output.get("delta_range_short", [None, None])[0],
+            target_delta_short_leg_max=strat_output.get("delta_range_short", [None, None])[1],
+            underlying_price_at_decision=processed_data.underlying_data_enriched.price or 0.0,
+            final_conviction_score_from_atif=conviction,
+            supportive_rationale_components={"rule_name": rule.get("name")},
+            assessment_profile=assessment
+        )
\ No newline at end of file
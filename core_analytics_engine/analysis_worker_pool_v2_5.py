@@ -0,0 +1,479 @@
+# core_analytics_engine/analysis_worker_pool_v2_5.py
+# EOTS v2.5 - Process-sharded CPU workers for per-symbol analysis
+
+"""
+Process-sharded analysis workers.
+
+Metrics calculation, the elite impact steps and key-level identification are CPU-bound
+pandas work that serializes on one interpreter's GIL. AnalysisWorkerPoolV2_5 runs them in
+N worker processes instead:
+- Symbols are pinned to workers by a stable hash, so each symbol's rolling caches
+  (metrics calculator state, enhanced cache, surfaces) live in exactly one process
+- Requests and results cross a duplex pipe as length-framed pickle (protocol 5),
+  zlib-compressed above a size threshold
+- Each worker admits a bounded number of in-flight requests; further submissions wait
+  (backpressure) rather than queueing unboundedly in the pipe
+- Dead or timed-out workers are restarted in place (same shard, same symbols) up to a
+  restart budget; a worker that exhausts it is retired and its symbols fail over to the
+  next live shard
+"""
+
+import asyncio
+import atexit
+import logging
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict, Field
+
+logger = logging.getLogger(__name__)
+
+_RAW = b"P"
+_ZLIB = b"Z"
+
+# Message kinds on the worker pipe
+TASK, STARTED, RESULT, ERROR, STOP = "task", "started", "result", "error", "stop"
+
+
+class AnalysisWorkerError(RuntimeError):
+    """A worker failed, crashed or timed out while analyzing a symbol."""
+
+
+def encode_message(message: Tuple[Any, ...], compress_threshold: int) -> bytes:
+    """Pickle ``message``; payloads at or above ``compress_threshold`` bytes are zlib-compressed."""
+    raw = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    if len(raw) >= compress_threshold:
+        return _ZLIB + zlib.compress(raw, 1)
+    return _RAW + raw
+
+
+def decode_message(data: bytes) -> Tuple[Any, ...]:
+    body = memoryview(data)[1:]
+    return pickle.loads(zlib.decompress(body) if data[:1] == _ZLIB else body)
+
+
+def shard_for(symbol: str, worker_count: int) -> int:
+    """Stable (cross-process, cross-run) shard for ``symbol``."""
+    return zlib.crc32(symbol.upper().encode("utf-8")) % worker_count
+
+
+@dataclass
+class WorkerAnalysisResultV2_5:
+    """What a worker returns for one symbol."""
+    symbol: str
+    processed_bundle: Any
+    key_levels: Any
+    worker_id: int
+    compute_seconds: float
+    payload_bytes: int = 0
+
+
+class AnalysisWorkerHealthV2_5(BaseModel):
+    """Point-in-time health of one analysis worker."""
+    worker_id: int = Field(..., description="Shard index of the worker.")
+    pid: Optional[int] = Field(None, description="Process id of the current worker process.")
+    alive: bool = Field(..., description="Whether the worker process is running.")
+    retired: bool = Field(False, description="True once the worker exhausted its restart budget.")
+    restarts: int = Field(0, ge=0, description="Restarts within the current restart window.")
+    in_flight: int = Field(0, ge=0, description="Requests sent and not yet answered.")
+    completed: int = Field(0, ge=0, description="Requests answered successfully.")
+    failed: int = Field(0, ge=0, description="Requests that raised, crashed the worker or timed out.")
+    mean_compute_ms: float = Field(0.0, ge=0.0, description="Mean in-worker compute time of completed requests.")
+    symbols: List[str] = Field(default_factory=list, description="Symbols routed to this worker.")
+    last_error: Optional[str] = Field(None, description="Most recent failure reason.")
+
+    model_config = ConfigDict(extra='forbid')
+
+
+# ---------------------------------------------------------------------------
+# Worker process side
+# ---------------------------------------------------------------------------
+
+class MetricsWorkerRuntimeV2_5:
+    """Default per-process runtime: metrics calculator plus key-level identifier."""
+
+    def __init__(self, worker_id: int):
+        from core_analytics_engine.eots_metrics import MetricsCalculatorV2_5
+        from core_analytics_engine.key_level_identifier_v2_5 import KeyLevelIdentifierV2_5
+        from data_management.database_manager_v2_5 import DatabaseManagerV2_5
+        from data_management.enhanced_cache_manager_v2_5 import EnhancedCacheManagerV2_5
+        from data_management.historical_data_manager_v2_5 import HistoricalDataManagerV2_5
+        from utils.config_manager_v2_5 import ConfigManagerV2_5
+
+        config_manager = ConfigManagerV2_5()
+        cache_root = config_manager.get_resolved_path('cache_settings.cache_root') or "cache/enhanced_v2_5"
+        elite_config = config_manager.get_setting("elite_config", None)
+        # Each process opens its own database connection; connections do not survive a spawn
+        self.historical_data_manager = HistoricalDataManagerV2_5(config_manager, DatabaseManagerV2_5(config_manager))
+        self.metrics_calculator = MetricsCalculatorV2_5(
+            config_manager=config_manager,
+            historical_data_manager=self.historical_data_manager,
+            enhanced_cache_manager=EnhancedCacheManagerV2_5(
+                cache_root=os.path.join(cache_root, f"worker_{worker_id}"),
+                memory_limit_mb=100,
+                disk_limit_mb=1000,
+                default_ttl_seconds=3600,
+                ultra_fast_mode=True
+            ),
+            elite_config=elite_config.model_dump() if elite_config else None
+        )
+        self.key_level_identifier = KeyLevelIdentifierV2_5(config_manager)
+
+    def analyze(self, symbol: str, contracts: List[Any], underlying: Any) -> Tuple[Any, Any]:
+        import pandas as pd
+
+        bundle = self.metrics_calculator.process_data_bundle_v2(options_contracts=contracts, underlying_data=underlying)
+        key_levels = None
+        if bundle.strike_level_data_with_metrics:
+            df_strike = pd.DataFrame([s.model_dump() for s in bundle.strike_level_data_with_metrics])
+            key_levels = self.key_level_identifier.identify_and_score_key_levels(df_strike, bundle.underlying_data_enriched)
+        return bundle, key_levels
+
+
+def _worker_main(worker_id: int, conn, runtime_factory: Callable[[int], Any], compress_threshold: int) -> None:
+    """Worker process loop: build the runtime once, then answer tasks until STOP or pipe close."""
+    runtime = None
+    while True:
+        try:
+            data = conn.recv_bytes()
+        except (EOFError, OSError):
+            return
+        kind, task_id, payload = decode_message(data)
+        if kind == STOP:
+            return
+        try:
+            if runtime is None:
+                runtime = runtime_factory(worker_id)
+            conn.send_bytes(encode_message((STARTED, task_id, None), compress_threshold))
+            started = time.perf_counter()
+            symbol, contracts, underlying = payload
+            bundle, key_levels = runtime.analyze(symbol, contracts, underlying)
+            reply = (RESULT, task_id, (bundle, key_levels, time.perf_counter() - started))
+        except (EOFError, OSError):
+            return
+        except Exception as e:
+            reply = (ERROR, task_id, f"{type(e).__name__}: {e}")
+        try:
+            conn.send_bytes(encode_message(reply, compress_threshold))
+        except (EOFError, OSError):
+            return
+
+
+# ---------------------------------------------------------------------------
+# Orchestrator side
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _WorkerHandle:
+    worker_id: int
+    process: Any = None
+    conn: Any = None
+    reader: Optional[threading.Thread] = None
+    loop: Optional[asyncio.AbstractEventLoop] = None
+    slots: Optional[asyncio.Semaphore] = None
+    send_lock: threading.Lock = field(default_factory=threading.Lock)
+    in_flight: Dict[int, Tuple[asyncio.Future, asyncio.Future, str]] = field(default_factory=dict)
+    restart_times: Deque[float] = field(default_factory=deque)
+    retired: bool = False
+    completed: int = 0
+    failed: int = 0
+    compute_seconds: float = 0.0
+    last_error: Optional[str] = None
+    generation: int = 0
+
+
+class AnalysisWorkerPoolV2_5:
+    """
+    Shards per-symbol analysis across worker processes with symbol affinity.
+
+    ``analyze`` is awaited from the orchestrator's event loop; processes are started
+    on first use and stopped by ``close`` (also registered with atexit).
+    """
+
+    def __init__(
+        self,
+        worker_count: int = 0,
+        max_in_flight_per_worker: int = 2,
+        task_timeout_seconds: float = 60.0,
+        startup_timeout_seconds: float = 120.0,
+        max_restarts: int = 5,
+        restart_window_seconds: float = 300.0,
+        start_method: str = "spawn",
+        compress_threshold_bytes: int = 64 * 1024,
+        runtime_factory: Callable[[int], Any] = MetricsWorkerRuntimeV2_5,
+    ):
+        self.logger = logger.getChild(self.__class__.__name__)
+        self.worker_count = worker_count or max(1, (os.cpu_count() or 2) - 1)
+        self.max_in_flight_per_worker = max(1, max_in_flight_per_worker)
+        self.task_timeout_seconds = task_timeout_seconds
+        self.startup_timeout_seconds = startup_timeout_seconds
+        self.max_restarts = max_restarts
+        self.restart_window_seconds = restart_window_seconds
+        self.compress_threshold_bytes = compress_threshold_bytes
+        self.runtime_factory = runtime_factory
+        self._context = multiprocessing.get_context(start_method)
+        self._workers = [_WorkerHandle(worker_id=i) for i in range(self.worker_count)]
+        self._routes: Dict[str, int] = {}
+        self._task_ids = count()
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+
+    @classmethod
+    def from_settings(cls, settings: Any, **kwargs: Any) -> "AnalysisWorkerPoolV2_5":
+        return cls(
+            worker_count=settings.worker_count,
+            max_in_flight_per_worker=settings.max_in_flight_per_worker,
+            task_timeout_seconds=settings.task_timeout_seconds,
+            startup_timeout_seconds=settings.startup_timeout_seconds,
+            max_restarts=settings.max_restarts,
+            restart_window_seconds=settings.restart_window_seconds,
+            start_method=settings.start_method,
+            compress_threshold_bytes=settings.compress_threshold_bytes,
+            **kwargs
+        )
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def start(self) -> None:
+        with self._lock:
+            if self._started or self._closed:
+                return
+            for handle in self._workers:
+                self._spawn(handle)
+            self._started = True
+            atexit.register(self.close)
+        self.logger.info(f"Started {self.worker_count} analysis workers")
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop every worker; in-flight requests fail with AnalysisWorkerError."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        for handle in self._workers:
+            self._stop_process(handle, graceful=True, timeout=timeout)
+            self._fail_in_flight(handle, "analysis worker pool closed")
+
+    def _spawn(self, handle: _WorkerHandle) -> None:
+        parent_conn, child_conn = self._context.Pipe(duplex=True)
+        process = self._context.Process(
+            target=_worker_main,
+            args=(handle.worker_id, child_conn, self.runtime_factory, self.compress_threshold_bytes),
+            name=f"eots-analysis-worker-{handle.worker_id}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        handle.generation += 1
+        handle.process, handle.conn = process, parent_conn
+        handle.reader = threading.Thread(
+            target=self._read_results, args=(handle, parent_conn, handle.generation),
+            name=f"eots-analysis-reader-{handle.worker_id}", daemon=True,
+        )
+        handle.reader.start()
+
+    def _stop_process(self, handle: _WorkerHandle, graceful: bool, timeout: float = 2.0) -> None:
+        process, conn = handle.process, handle.conn
+        if process is None:
+            return
+        if graceful and process.is_alive():
+            try:
+                conn.send_bytes(encode_message((STOP, None, None), self.compress_threshold_bytes))
+            except (EOFError, OSError):
+                pass
+            process.join(timeout)
+        if process.is_alive():
+            process.terminate()
+            process.join(timeout)
+        try:
+            conn.close()
+        except OSError:
+            pass
+
+    def _restart(self, handle: _WorkerHandle, reason: str, generation: Optional[int] = None) -> None:
+        with self._lock:
+            if self._closed or handle.retired or (generation is not None and generation != handle.generation):
+                return  # closed, retired, or this worker process was already replaced
+            self.logger.warning(f"Restarting analysis worker {handle.worker_id}: {reason}")
+            handle.last_error = reason
+            self._stop_process(handle, graceful=False)
+            self._fail_in_flight(handle, reason)
+
+            now = time.monotonic()
+            while handle.restart_times and now - handle.restart_times[0] > self.restart_window_seconds:
+                handle.restart_times.popleft()
+            if len(handle.restart_times) >= self.max_restarts:
+                handle.retired = True
+                handle.process = None
+                self._routes = {s: w for s, w in self._routes.items() if w != handle.worker_id}
+                self.logger.error(f"Analysis worker {handle.worker_id} retired after {self.max_restarts} restarts; its symbols fail over")
+                return
+            handle.restart_times.append(now)
+            self._spawn(handle)
+
+    # -- result channel ----------------------------------------------------
+
+    def _read_results(self, handle: _WorkerHandle, conn, generation: int) -> None:
+        while True:
+            try:
+                data = conn.recv_bytes()
+            except (EOFError, OSError):
+                break
+            kind, task_id, payload = decode_message(data)
+            if handle.loop is not None:
+                handle.loop.call_soon_threadsafe(self._resolve, handle, task_id, kind, payload, len(data))
+        # Pipe closed: an unexpected exit (not a restart or close we initiated) is a crash
+        if handle.generation == generation and not self._closed and handle.loop is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(self._on_worker_exit(handle, generation), handle.loop)
+            except RuntimeError:
+                pass  # event loop already closed
+
+    async def _on_worker_exit(self, handle: _WorkerHandle, generation: int) -> None:
+        # Joining and respawning block for up to seconds; keep them off the event loop
+        process, exitcode = handle.process, None
+        if process is not None:
+            await asyncio.to_thread(process.join, 1.0)
+            exitcode = process.exitcode
+        await asyncio.to_thread(self._restart, handle, f"worker process exited (exitcode={exitcode})", generation)
+
+    def _resolve(self, handle: _WorkerHandle, task_id: int, kind: str, payload: Any, payload_bytes: int) -> None:
+        if kind == STARTED:
+            entry = handle.in_flight.get(task_id)
+            if entry is not None and not entry[1].done():
+                entry[1].set_result(time.monotonic())
+            return
+        entry = handle.in_flight.pop(task_id, None)
+        if entry is None:
+            return
+        future, _, symbol = entry
+        handle.slots.release()
+        if future.done():
+            return
+        if kind == RESULT:
+            bundle, key_levels, compute_seconds = payload
+            handle.completed += 1
+            handle.compute_seconds += compute_seconds
+            future.set_result(WorkerAnalysisResultV2_5(
+                symbol=symbol, processed_bundle=bundle, key_levels=key_levels,
+                worker_id=handle.worker_id, compute_seconds=compute_seconds, payload_bytes=payload_bytes
+            ))
+        else:
+            handle.failed += 1
+            handle.last_error = payload
+            future.set_exception(AnalysisWorkerError(f"{symbol} failed in analysis worker {handle.worker_id}: {payload}"))
+
+    def _fail_in_flight(self, handle: _WorkerHandle, reason: str) -> None:
+        """Fail every in-flight request; safe to call from any thread."""
+        pending, handle.in_flight = handle.in_flight, {}
+        for future, started, symbol in pending.values():
+            handle.failed += 1
+            error = AnalysisWorkerError(f"{symbol} lost on analysis worker {handle.worker_id}: {reason}")
+            try:
+                future.get_loop().call_soon_threadsafe(self._fail_waiters, handle.slots, (started, future), error)
+            except RuntimeError:
+                pass  # event loop already closed (interpreter shutdown)
+
+    @staticmethod
+    def _fail_waiters(slots: Optional[asyncio.Semaphore], waiters: Tuple[asyncio.Future, ...], error: Exception) -> None:
+        if slots is not None:
+            slots.release()
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_exception(error)
+                waiter.exception()  # only one of (started, result) is awaited; mark both retrieved
+
+    # -- routing and submission --------------------------------------------
+
+    def worker_for(self, symbol: str) -> int:
+        """Worker id ``symbol`` is pinned to (first live shard from its hash)."""
+        key = symbol.upper()
+        worker_id = self._routes.get(key)
+        if worker_id is not None and not self._workers[worker_id].retired:
+            return worker_id
+        home = shard_for(key, self.worker_count)
+        for offset in range(self.worker_count):
+            candidate = (home + offset) % self.worker_count
+            if not self._workers[candidate].retired:
+                self._routes[key] = candidate
+                return candidate
+        raise AnalysisWorkerError("all analysis workers are retired")
+
+    async def analyze(self, symbol: str, contracts: List[Any], underlying: Any) -> WorkerAnalysisResultV2_5:
+        """Metrics + key levels for ``symbol`` on its pinned worker."""
+        if self._closed:
+            raise AnalysisWorkerError("analysis worker pool is closed")
+        self.start()
+        handle = self._workers[self.worker_for(symbol)]
+        loop = asyncio.get_running_loop()
+        if handle.loop is not loop:
+            handle.loop, handle.slots = loop, asyncio.Semaphore(self.max_in_flight_per_worker)
+
+        await handle.slots.acquire()  # backpressure: bounded in-flight requests per worker
+        task_id = next(self._task_ids)
+        future, started = loop.create_future(), loop.create_future()
+        handle.in_flight[task_id] = (future, started, symbol)
+        generation = handle.generation
+        message = encode_message((TASK, task_id, (symbol, contracts, underlying)), self.compress_threshold_bytes)
+        try:
+            await loop.run_in_executor(None, self._send, handle, message)
+        except (EOFError, OSError, ValueError) as e:
+            await asyncio.to_thread(self._restart, handle, f"send failed: {e}", generation)
+
+        # The task timeout counts from when the worker starts the task, not from when it
+        # was queued behind the worker's other in-flight requests or its runtime start-up
+        queue_timeout = self.task_timeout_seconds * self.max_in_flight_per_worker + self.startup_timeout_seconds
+        try:
+            await asyncio.wait_for(asyncio.shield(started), queue_timeout)
+            return await asyncio.wait_for(asyncio.shield(future), self.task_timeout_seconds)
+        except asyncio.TimeoutError:
+            if handle.in_flight.pop(task_id, None) is not None:
+                handle.failed += 1
+                handle.slots.release()
+            future.cancel()
+            started.cancel()
+            await asyncio.to_thread(self._restart, handle, f"{symbol} exceeded {self.task_timeout_seconds:.0f}s", generation)
+            raise AnalysisWorkerError(f"{symbol} timed out on analysis worker {handle.worker_id}") from None
+
+    @staticmethod
+    def _send(handle: _WorkerHandle, message: bytes) -> None:
+        with handle.send_lock:  # large payloads are written in chunks; keep them from interleaving
+            handle.conn.send_bytes(message)
+
+    async def analyze_many(self, requests: List[Tuple[str, List[Any], Any]]) -> Dict[str, Any]:
+        """Analyze several symbols concurrently; values are results or the exception raised."""
+        results = await asyncio.gather(*(self.analyze(*request) for request in requests), return_exceptions=True)
+        return {request[0]: result for request, result in zip(requests, results)}
+
+    # -- health ------------------------------------------------------------
+
+    def health(self) -> List[AnalysisWorkerHealthV2_5]:
+        symbols_by_worker: Dict[int, List[str]] = {}
+        for symbol, worker_id in self._routes.items():
+            symbols_by_worker.setdefault(worker_id, []).append(symbol)
+        report = []
+        for handle in self._workers:
+            process = handle.process
+            report.append(AnalysisWorkerHealthV2_5(
+                worker_id=handle.worker_id,
+                pid=process.pid if process is not None else None,
+                alive=bool(process is not None and process.is_alive()),
+                retired=handle.retired,
+                restarts=len(handle.restart_times),
+                in_flight=len(handle.in_flight),
+                completed=handle.completed,
+                failed=handle.failed,
+                mean_compute_ms=(handle.compute_seconds / handle.completed * 1000.0) if handle.completed else 0.0,
+                symbols=sorted(symbols_by_worker.get(handle.worker_id, [])),
+                last_error=handle.last_error,
+            ))
+        return report
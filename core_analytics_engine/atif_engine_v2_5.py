@@ -39,8 +39,9 @@ import logging
 import uuid
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple, cast
+from typing import Dict, List, Any, Optional, Tuple, Mapping, Sequence, cast
 import asyncio
+import numpy as np
 from pydantic import BaseModel, Field
 
 # Core EOTS imports
@@ -57,6 +58,9 @@ from data_models import AIPredictionV2_5, AIPredictionRequestV2_5
 
 # Integrated component imports
 from core_analytics_engine.market_intelligence_engine_v2_5 import MarketIntelligenceEngineV2_5
+from core_analytics_engine.atif_batch_v2_5 import (
+    StrategyMatrixLookupV2_5, adaptive_conviction, fuse_signals, lookup
+)
 
 logger = logging.getLogger(__name__)
 
@@ -187,16 +191,17 @@ class _ConvictionEngine:
         
         return max(0.0, min(1.0, conviction))
     
+    REGIME_MULTIPLIERS = {
+        'extreme_bull': 1.2,
+        'bull': 1.1,
+        'neutral': 1.0,
+        'bear': 0.9,
+        'extreme_bear': 0.8
+    }
+    
     def _get_regime_multiplier(self, regime: str) -> float:
         """Get multiplier based on market regime."""
-        multipliers = {
-            'extreme_bull': 1.2,
-            'bull': 1.1,
-            'neutral': 1.0,
-            'bear': 0.9,
-            'extreme_bear': 0.8
-        }
-        return multipliers.get(regime, 1.0)
+        return self.REGIME_MULTIPLIERS.get(regime, 1.0)
     
     def _adjust_for_volatility(self, conviction: float, volatility: float) -> float:
         """Adjust conviction based on market volatility."""
@@ -376,6 +381,87 @@ class ATIFEngineV2_5:
             self.logger.error(f"Adaptive strategy generation failed: {str(e)}")
             raise
     
+    def generate_adaptive_strategies_batch(
+        self,
+        symbols: Sequence[str],
+        signals: Mapping[str, Sequence[float]],
+        regimes: Sequence[str],
+        volatilities: Optional[Sequence[float]] = None,
+        performance_metrics: Optional[Sequence[Optional[Dict[str, float]]]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Cross-ticker ``generate_adaptive_strategy``: fusion, conviction and strategy
+        selection for many symbols in one vectorized pass.
+        
+        Args:
+            symbols: Symbols, one per row
+            signals: Signal type -> per-row strengths aligned with ``symbols`` (NaN = missing)
+            regimes: Per-row market regime
+            volatilities: Per-row volatility (NaN or omitted = not supplied)
+            performance_metrics: Per-row historical performance metrics, if any
+            
+        Returns:
+            Symbol -> the same result dict ``generate_adaptive_strategy`` returns
+        """
+        n = len(symbols)
+        signal_columns = {name: np.asarray(values, dtype=float) for name, values in signals.items()}
+        volatility = np.full(n, np.nan) if volatilities is None else np.asarray(volatilities, dtype=float)
+        performance = list(performance_metrics) if performance_metrics is not None else [None] * n
+        
+        # 1. Fuse signals
+        fused = fuse_signals(signal_columns, self.signal_engine.signal_weights, n)
+        
+        # 2. Conviction (per-symbol defaults: volatility 1.0 here, 0.5 for strategy selection)
+        has_performance = np.array([bool(metrics) for metrics in performance], dtype=bool)
+        conviction = adaptive_conviction(
+            signal_strength=fused,
+            regime_multiplier=lookup(regimes, self.conviction_engine.REGIME_MULTIPLIERS, 1.0),
+            volatility=np.where(np.isnan(volatility), 1.0, volatility),
+            win_rate=np.array([(metrics or {}).get('win_rate', 0.5) for metrics in performance], dtype=float),
+            profit_factor=np.array([(metrics or {}).get('profit_factor', 1.0) for metrics in performance], dtype=float),
+            has_performance=has_performance
+        )
+        
+        # 3. Strategy lookup
+        selection_volatility = np.where(np.isnan(volatility), 0.5, volatility)
+        strategy_lookup = StrategyMatrixLookupV2_5(
+            self.strategy_selector.STRATEGY_MATRIX, self.strategy_selector.volatility_thresholds
+        )
+        strategies, vol_regimes = strategy_lookup.select(regimes, selection_volatility)
+        position_size = np.maximum(0.1, np.minimum(1.0, conviction * 1.2))
+        width_pct = 0.05 + (conviction * 0.15)
+        leg_delta = 0.1 + (0.2 * (1 - conviction))
+        
+        results: Dict[str, Dict[str, Any]] = {}
+        for i, symbol in enumerate(symbols):
+            strategy = strategies[i]
+            params: Dict[str, Any] = {'position_size': float(position_size[i])}
+            if 'Iron Condor' in strategy or 'Strangle' in strategy:
+                params['width_pct'] = float(width_pct[i])
+                params['delta'] = round(float(leg_delta[i]), 2)
+            market_context: Dict[str, Any] = {'regime': regimes[i]}
+            if not np.isnan(volatility[i]):
+                market_context['volatility'] = float(volatility[i])
+            results[symbol] = {
+                'strategy': {
+                    'strategy': strategy,
+                    'parameters': params,
+                    'volatility_regime': vol_regimes[i],
+                    'market_regime': regimes[i],
+                    'conviction': float(conviction[i])
+                },
+                'signal_assessment': {
+                    'fused_score': float(fused[i]),
+                    'weights': self.signal_engine.signal_weights,
+                    'component_scores': {
+                        name: float(values[i]) for name, values in signal_columns.items() if not np.isnan(values[i])
+                    }
+                },
+                'conviction': float(conviction[i]),
+                'market_context': market_context
+            }
+        return results
+    
     # ===== SUPERIOR CONSOLIDATED INTELLIGENCE PIPELINE =====
     
     async def generate_superior_trade_intelligence(
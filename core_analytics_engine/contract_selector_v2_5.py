@@ -0,0 +1,258 @@
+# core_analytics_engine/contract_selector_v2_5.py
+# EOTS v2.5 - Pre-indexed option contract selection for the Trade Parameter Optimizer
+
+"""
+Contract selector built once per options chain snapshot.
+
+Contracts are split by option type and sorted by (DTE, |delta|), so every expiry is a
+contiguous block ordered by delta. Batched queries then resolve with searchsorted
+instead of re-filtering the chain:
+- ``nearest_delta``: contract closest to a target |delta| within a DTE window
+- ``most_liquid``: most liquid contract within a DTE window and |delta| band, answered
+  with a sparse-table range-max over the liquidity score
+
+Liquidity scores combine open interest and volume (OI + 5 x volume, as the optimizer
+has always ranked them) discounted by the relative bid/ask spread.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Canonical field -> chain columns accepted for it, in order of preference
+COLUMN_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "dte": ("dte_calc", "dte"),
+    "delta": ("delta", "delta_contract"),
+    "open_interest": ("oi", "open_interest"),
+    "volume": ("volm",),
+    "bid": ("bid_price", "bid"),
+    "ask": ("ask_price", "ask"),
+}
+
+OPTION_TYPES = ("call", "put")
+VOLUME_WEIGHT = 5.0
+
+ArrayLike = Union[float, int, str, None, np.ndarray, List[Any]]
+
+
+class _TypeBook:
+    """
+    Contracts of one option type sorted by (DTE, |delta|) with a liquidity range-max table.
+
+    The sort key is exact integer arithmetic: expiry rank * stride + rank of |delta| among
+    the book's distinct |delta| values, with contracts lacking a delta ranked after all of
+    them. Float offsets would merge |delta| values a few ulps apart and blur band edges.
+    """
+
+    def __init__(self, rows: np.ndarray, dte: np.ndarray, abs_delta: np.ndarray, liquidity: np.ndarray):
+        has_delta = np.isfinite(abs_delta)
+        self.delta_values = np.unique(abs_delta[has_delta])
+        self.missing_rank = len(self.delta_values)
+        self.stride = self.missing_rank + 1
+        delta_rank = np.where(has_delta, np.searchsorted(self.delta_values, abs_delta), self.missing_rank)
+
+        order = np.lexsort((rows, delta_rank, dte))
+        self.rows = rows[order]
+        self.abs_delta = abs_delta[order]
+        self.liquidity = liquidity[order]
+        self.dtes, seg_start = np.unique(dte[order], return_index=True)
+        self.seg_start = seg_start
+        self.seg_end = np.append(seg_start[1:], len(order))
+        seg_rank = np.repeat(np.arange(len(self.dtes), dtype=np.int64), self.seg_end - seg_start)
+        self.key = seg_rank * self.stride + delta_rank[order]
+        # First sorted position of each run of equal keys (its lowest chain row)
+        run_head = np.r_[True, self.key[1:] != self.key[:-1]]
+        self.run_start = np.flatnonzero(run_head)[np.cumsum(run_head) - 1]
+        self.table = self._build_range_max(self.liquidity, self.rows)
+
+    def delta_rank(self, abs_delta: np.ndarray, side: str = "left") -> np.ndarray:
+        """Rank key of |delta| values inside an expiry block (NaN ranks after every delta)."""
+        return np.searchsorted(self.delta_values, abs_delta, side=side)
+
+    @staticmethod
+    def _better(liquidity: np.ndarray, rows: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        # Higher score wins; ties go to the earlier chain row, like DataFrame.idxmax
+        return (liquidity[a] > liquidity[b]) | ((liquidity[a] == liquidity[b]) & (rows[a] < rows[b]))
+
+    @classmethod
+    def _build_range_max(cls, liquidity: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        n = len(liquidity)
+        levels = max(1, int(n).bit_length())
+        table = np.zeros((levels, n), dtype=np.int64)
+        table[0] = np.arange(n)
+        for k in range(1, levels):
+            span = 1 << k
+            width = n - span + 1
+            left = table[k - 1, :width]
+            right = table[k - 1, span // 2:span // 2 + width]
+            table[k, :width] = np.where(cls._better(liquidity, rows, left, right), left, right)
+        return table
+
+    def range_max(self, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+        """Sorted position of the most liquid contract in each non-empty [lo, hi)."""
+        level = np.floor(np.log2(hi - lo)).astype(np.int64)
+        left = self.table[level, lo]
+        right = self.table[level, hi - (1 << level)]
+        return np.where(self._better(self.liquidity, self.rows, left, right), left, right)
+
+    def expiry_pairs(self, dte_lo: np.ndarray, dte_hi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Expand each query into one (query, expiry block) pair per expiry inside its DTE window."""
+        first = np.searchsorted(self.dtes, dte_lo, side="left")
+        counts = np.maximum(np.searchsorted(self.dtes, dte_hi, side="right") - first, 0)
+        query = np.repeat(np.arange(len(dte_lo)), counts)
+        offsets = np.arange(len(query)) - np.repeat(np.cumsum(counts) - counts, counts)
+        return query, first[query] + offsets
+
+
+class ContractSelectorV2_5:
+    """
+    Pre-indexed contract selection over a single options chain snapshot.
+
+    Build once per chain and reuse for every directive in the cycle; all query methods
+    accept scalars or arrays (broadcast together) and return chain row positions, with
+    -1 where no contract qualifies.
+    """
+
+    def __init__(self, chain: pd.DataFrame, volume_weight: float = VOLUME_WEIGHT):
+        self.logger = logger.getChild(self.__class__.__name__)
+        self.chain = chain.reset_index(drop=True)
+        n = len(self.chain)
+
+        dte = self._numeric("dte", n)
+        abs_delta = np.abs(self._numeric("delta", n))
+        open_interest = np.nan_to_num(self._numeric("open_interest", n))
+        volume = np.nan_to_num(self._numeric("volume", n))
+        bid = self._numeric("bid", n)
+        ask = self._numeric("ask", n)
+
+        mid = (bid + ask) / 2.0
+        quoted = (bid > 0) & (ask >= bid)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.relative_spread = np.where(quoted, (ask - bid) / np.where(quoted, mid, 1.0), np.nan)
+        spread_discount = 1.0 - np.clip(np.nan_to_num(self.relative_spread), 0.0, 1.0)
+        self.liquidity_score = (open_interest + volume_weight * volume) * spread_discount
+
+        kind = (
+            self.chain["opt_kind"].astype(str).str.lower().to_numpy()
+            if "opt_kind" in self.chain.columns else np.full(n, "", dtype=object)
+        )
+        rows = np.arange(n)
+        self._books: Dict[str, _TypeBook] = {}
+        for option_type in OPTION_TYPES:
+            mask = (kind == option_type) & np.isfinite(dte)
+            if mask.any():
+                self._books[option_type] = _TypeBook(rows[mask], dte[mask], abs_delta[mask], self.liquidity_score[mask])
+
+    def __len__(self) -> int:
+        return len(self.chain)
+
+    @property
+    def empty(self) -> bool:
+        return not self._books
+
+    def _numeric(self, field: str, n: int) -> np.ndarray:
+        column = next((c for c in COLUMN_ALIASES[field] if c in self.chain.columns), None)
+        if column is None:
+            return np.full(n, np.nan)
+        return pd.to_numeric(self.chain[column], errors="coerce").to_numpy(dtype=float)
+
+    @staticmethod
+    def _broadcast(*values: ArrayLike) -> List[np.ndarray]:
+        arrays = [np.asarray(v, dtype=object if isinstance(v, (str, type(None))) else None) for v in values]
+        return [np.atleast_1d(a) for a in np.broadcast_arrays(*arrays)]
+
+    @staticmethod
+    def _as_float(values: np.ndarray) -> np.ndarray:
+        return np.array([np.nan if v is None else float(v) for v in values.tolist()], dtype=float)
+
+    def nearest_delta(
+        self, option_type: ArrayLike, target_delta: ArrayLike, target_dte: ArrayLike,
+        dte_tolerance: float = 2.0, min_dte: float = 1.0
+    ) -> np.ndarray:
+        """
+        Contract whose |delta| is closest to |target_delta| with DTE inside
+        [max(min_dte, target_dte - dte_tolerance), target_dte + dte_tolerance].
+        """
+        types, deltas, dtes = self._broadcast(option_type, target_delta, target_dte)
+        dtes = dtes.astype(float)
+        result = np.full(len(types), -1, dtype=np.int64)
+        for name, book in self._books.items():
+            selected = np.flatnonzero(np.char.lower(types.astype(str)) == name)
+            if not len(selected):
+                continue
+            target = np.abs(deltas[selected].astype(float))
+            query, seg = book.expiry_pairs(np.maximum(min_dte, dtes[selected] - dte_tolerance), dtes[selected] + dte_tolerance)
+            if not len(query):
+                continue
+
+            # Neighbours of the insertion point inside each expiry block; among equal |delta|
+            # the lowest chain row wins, so the lower neighbour steps back to its run start
+            pos = np.searchsorted(book.key, seg * book.stride + book.delta_rank(target[query]))
+            below = book.run_start[np.clip(pos - 1, book.seg_start[seg], book.seg_end[seg] - 1)]
+            above = np.clip(pos, book.seg_start[seg], book.seg_end[seg] - 1)
+            # A neighbour without a delta (or a NaN target) never wins against one with a delta
+            diff_below = np.nan_to_num(np.abs(book.abs_delta[below] - target[query]), nan=np.inf)
+            diff_above = np.nan_to_num(np.abs(book.abs_delta[above] - target[query]), nan=np.inf)
+            pick_above = (diff_above < diff_below) | ((diff_above == diff_below) & (book.rows[above] < book.rows[below]))
+            best = np.where(pick_above, above, below)
+            diff = np.where(pick_above, diff_above, diff_below)
+
+            order = np.lexsort((book.rows[best], diff, query))
+            first = order[np.r_[True, query[order][1:] != query[order][:-1]]]
+            found = np.isfinite(diff[first])
+            result[selected[query[first][found]]] = book.rows[best[first][found]]
+        return result
+
+    def most_liquid(
+        self, option_type: ArrayLike, dte_min: ArrayLike, dte_max: ArrayLike,
+        delta_min: ArrayLike = None, delta_max: ArrayLike = None
+    ) -> np.ndarray:
+        """Most liquid contract with dte_min <= DTE <= dte_max and delta_min <= |delta| <= delta_max."""
+        types, lo_dte, hi_dte, lo_delta, hi_delta = self._broadcast(option_type, dte_min, dte_max, delta_min, delta_max)
+        lo_delta, hi_delta = self._as_float(lo_delta), self._as_float(hi_delta)
+
+        result = np.full(len(types), -1, dtype=np.int64)
+        for name, book in self._books.items():
+            selected = np.flatnonzero(np.char.lower(types.astype(str)) == name)
+            if not len(selected):
+                continue
+            query, seg = book.expiry_pairs(lo_dte[selected].astype(float), hi_dte[selected].astype(float))
+            lo_band, hi_band = lo_delta[selected][query], hi_delta[selected][query]
+            # Key range [lo_rank, hi_rank) of the band; contracts without a delta only
+            # qualify when no delta band is requested
+            lo_rank = np.where(np.isnan(lo_band), 0, book.delta_rank(lo_band, side="left"))
+            hi_rank = np.where(
+                np.isnan(hi_band),
+                np.where(np.isnan(lo_band), book.stride, book.missing_rank),
+                book.delta_rank(hi_band, side="right"),
+            )
+            base = seg * book.stride
+            lo = np.searchsorted(book.key, base + lo_rank, side="left")
+            hi = np.searchsorted(book.key, base + hi_rank, side="left")
+            hit = hi > lo
+            if not hit.any():
+                continue
+            query, best = query[hit], book.range_max(lo[hit], hi[hit])
+
+            order = np.lexsort((book.rows[best], -book.liquidity[best], query))
+            first = order[np.r_[True, query[order][1:] != query[order][:-1]]]
+            result[selected[query[first]]] = book.rows[best[first]]
+        return result
+
+    def records(self, positions: ArrayLike) -> List[Optional[Dict[str, Any]]]:
+        """Chain rows for ``positions`` as dicts with their liquidity score and relative spread."""
+        records: List[Optional[Dict[str, Any]]] = []
+        for position in np.atleast_1d(np.asarray(positions, dtype=np.int64)).tolist():
+            if position < 0:
+                records.append(None)
+                continue
+            record = self.chain.iloc[position].to_dict()
+            record["liquidity_score"] = float(self.liquidity_score[position])
+            spread = self.relative_spread[position]
+            record["relative_spread"] = None if np.isnan(spread) else float(spread)
+            records.append(record)
+        return records
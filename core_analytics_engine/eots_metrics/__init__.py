@@ -19,10 +19,14 @@ from .core_calculator import CoreCalculator, MetricCalculationState, MetricCache
 from .flow_analytics import FlowAnalytics, FlowType
 from .adaptive_calculator import AdaptiveCalculator, MarketRegime
 from .visualization_metrics import VisualizationMetrics
+from .elite_classifiers import EliteClassifierRuntimeV2_5
 from .elite_intelligence import (
     EliteImpactCalculator, EliteConfig, ConvexValueColumns, EliteImpactColumns, EliteImpactResultsV2_5
 )
 from .supplementary_metrics import SupplementaryMetrics, AdvancedOptionsMetrics
+from .greek_engine import BlackScholesGreekEngine, GreekEnrichmentReport
+from .exposure_surface import ExposureSurfaceEngine, SURFACE_METRICS
+from .elite_volatility_surface import EliteVolatilitySurface, VolatilitySurfaceGrid, VolatilitySurfaceFeatures
 
 # CONSOLIDATED IMPORTS - STRICT PYDANTIC V2-ONLY (Eliminates duplicate imports)
 from data_models import (
@@ -46,6 +50,9 @@ import pandas as pd
 # Import Pydantic validation
 from pydantic import ValidationError
 
+# Per-stage tracing (no-op unless stage_tracing_settings.enabled)
+from utils.stage_tracer_v2_5 import trace_span, traced
+
 # For backward compatibility, create a composite calculator that combines all consolidated modules
 class MetricsCalculatorV2_5:
     """
@@ -73,9 +80,26 @@ class MetricsCalculatorV2_5:
         self.flow_analytics = FlowAnalytics(config_manager, historical_data_manager, enhanced_cache_manager, elite_config)
         self.adaptive = AdaptiveCalculator(config_manager, historical_data_manager, enhanced_cache_manager, elite_config)
         self.visualization = VisualizationMetrics(config_manager, historical_data_manager, enhanced_cache_manager, elite_config)
-        self.elite_intelligence = EliteImpactCalculator(elite_config)
+        # Trained regime/flow classifiers, served when a promoted model exists (rules otherwise)
+        classifier_settings = config_manager.get_setting("elite_classifier_settings", None)
+        classifier_runtime = (
+            EliteClassifierRuntimeV2_5.from_settings(classifier_settings)
+            if classifier_settings is not None and classifier_settings.enabled else None
+        )
+        # IV surface fitted once per chain snapshot (refits only when the chain changes) and shared
+        # with the elite impact calculator, which reads its regime instead of fitting its own
+        self.volatility_surface = EliteVolatilitySurface(elite_config)
+        self.elite_intelligence = EliteImpactCalculator(
+            elite_config, classifier_runtime=classifier_runtime, volatility_surface=self.volatility_surface
+        )
         self.supplementary = SupplementaryMetrics(config_manager, historical_data_manager, enhanced_cache_manager)
 
+        # Optional gap-filling of vendor IV/greeks before any metric reads them
+        greek_settings = config_manager.get_setting("greek_enrichment_settings", None)
+        self.greek_engine = BlackScholesGreekEngine(greek_settings) if greek_settings is not None and greek_settings.enabled else None
+        # Strike x expiry exposure grids, kept per symbol so unchanged expiries are reused across cycles
+        self.exposure_surfaces = ExposureSurfaceEngine()
+
         # Store references for common access
         self.config_manager = config_manager
         self.historical_data_manager = historical_data_manager
@@ -123,6 +147,12 @@ class MetricsCalculatorV2_5:
 
         return float(column_sum)
 
+    def _require_surface_profile(self, surface, metric: str, metric_description: str) -> pd.Series:
+        """FAIL-FAST: Require an exposure grid on the surface and collapse it to per-strike totals"""
+        if metric not in surface.grids:
+            raise ValueError(f"CRITICAL: Required {metric_description} grid '{metric}' is missing from the exposure surface!")
+        return surface.strike_profile(metric)
+
     def _require_pydantic_field(self, pydantic_model, field_name: str, field_description: str):
         """FAIL-FAST: Require field from Pydantic model - NO DICTIONARY CONVERSION ALLOWED"""
         if not hasattr(pydantic_model, field_name):
@@ -176,6 +206,7 @@ class MetricsCalculatorV2_5:
             "for complete metrics calculation with all required fields properly calculated."
         )
 
+    @traced("metrics.process_data_bundle", symbol_arg="underlying_data.symbol")
     def process_data_bundle_v2(self, options_contracts, underlying_data):
         """
         CRITICAL FIX: Process data bundle using strict Pydantic v2 models with ZERO TOLERANCE FAKE DATA.
@@ -206,7 +237,8 @@ class MetricsCalculatorV2_5:
 
             # STEP 2: Convert Pydantic models to DataFrame for calculate_all_metrics compatibility
             # NOTE: This is the ONLY acceptable dictionary usage - for pandas DataFrame creation from Pydantic models
-            options_df_raw = pd.DataFrame([contract.model_dump() for contract in options_contracts])
+            with trace_span("metrics.build_chain_frame", contracts=len(options_contracts)):
+                options_df_raw = pd.DataFrame([contract.model_dump() for contract in options_contracts])
 
             # STEP 3: Call our new calculate_all_metrics method with proper delegation
             strike_level_data, contract_metrics, underlying_enriched = self.calculate_all_metrics(
@@ -217,58 +249,59 @@ class MetricsCalculatorV2_5:
 
             # STEP 4: Convert results to ProcessedDataBundleV2_5 format
             # CRITICAL FIX: Create proper ProcessedStrikeLevelMetricsV2_5 models to satisfy validation
-            strike_level_metrics = []
-            if strike_level_data is not None and not strike_level_data.empty:
-                print(f"🔄 Converting {len(strike_level_data)} strike-level records to Pydantic models...")
-
-                for _, row in strike_level_data.iterrows():
-                    try:
-                        # Create ProcessedStrikeLevelMetricsV2_5 with only the strike field (required)
-                        # All other fields are Optional[float] and will default to None
-                        strike_metric = ProcessedStrikeLevelMetricsV2_5(
-                            strike=float(row['strike'])
-                        )
-                        strike_level_metrics.append(strike_metric)
-                    except Exception as e:
-                        print(f"⚠️ Warning: Failed to convert strike {row.get('strike', 'unknown')}: {e}")
-                        continue
-
-                print(f"✅ Successfully converted {len(strike_level_metrics)} strike-level metrics")
-            else:
-                # FAIL-FAST: If no strike data, create at least one minimal record to satisfy validation
-                print("⚠️ WARNING: No strike-level data available - creating minimal record to satisfy validation")
-                strike_level_metrics = [ProcessedStrikeLevelMetricsV2_5(strike=0.0)]
-
-            # Convert contract-level DataFrame to Pydantic models (if needed)
-            contract_level_metrics = []
-            if options_df_raw is not None and not options_df_raw.empty:
-                print(f"🔄 Converting {len(options_df_raw)} contract-level records to Pydantic models...")
-
-                for _, row in options_df_raw.iterrows():
-                    try:
-                        # Create ProcessedContractMetricsV2_5 with minimal required fields
-                        # Most fields are Optional and will default to None
-                        contract_metric = ProcessedContractMetricsV2_5(
-                            contract_symbol=str(row.get('contract_symbol', 'UNKNOWN')),
-                            strike=float(row.get('strike', 0.0)),
-                            opt_kind=str(row.get('opt_kind', 'unknown')),
-                            dte_calc=float(row.get('dte_calc', 0.0))
-                        )
-                        contract_level_metrics.append(contract_metric)
-                    except Exception as e:
-                        print(f"⚠️ Warning: Failed to convert contract {row.get('contract_symbol', 'unknown')}: {e}")
-                        continue
-
-                print(f"✅ Successfully converted {len(contract_level_metrics)} contract-level metrics")
-            else:
-                # FAIL-FAST: If no contract data, create at least one minimal record to satisfy validation
-                print("⚠️ WARNING: No contract-level data available - creating minimal record to satisfy validation")
-                contract_level_metrics = [ProcessedContractMetricsV2_5(
-                    contract_symbol="MINIMAL_RECORD",
-                    strike=0.0,
-                    opt_kind="unknown",
-                    dte_calc=0.0
-                )]
+            with trace_span("metrics.model_conversion"):
+                strike_level_metrics = []
+                if strike_level_data is not None and not strike_level_data.empty:
+                    print(f"🔄 Converting {len(strike_level_data)} strike-level records to Pydantic models...")
+
+                    for _, row in strike_level_data.iterrows():
+                        try:
+                            # Create ProcessedStrikeLevelMetricsV2_5 with only the strike field (required)
+                            # All other fields are Optional[float] and will default to None
+                            strike_metric = ProcessedStrikeLevelMetricsV2_5(
+                                strike=float(row['strike'])
+                            )
+                            strike_level_metrics.append(strike_metric)
+                        except Exception as e:
+                            print(f"⚠️ Warning: Failed to convert strike {row.get('strike', 'unknown')}: {e}")
+                            continue
+
+                    print(f"✅ Successfully converted {len(strike_level_metrics)} strike-level metrics")
+                else:
+                    # FAIL-FAST: If no strike data, create at least one minimal record to satisfy validation
+                    print("⚠️ WARNING: No strike-level data available - creating minimal record to satisfy validation")
+                    strike_level_metrics = [ProcessedStrikeLevelMetricsV2_5(strike=0.0)]
+
+                # Convert contract-level DataFrame to Pydantic models (if needed)
+                contract_level_metrics = []
+                if options_df_raw is not None and not options_df_raw.empty:
+                    print(f"🔄 Converting {len(options_df_raw)} contract-level records to Pydantic models...")
+
+                    for _, row in options_df_raw.iterrows():
+                        try:
+                            # Create ProcessedContractMetricsV2_5 with minimal required fields
+                            # Most fields are Optional and will default to None
+                            contract_metric = ProcessedContractMetricsV2_5(
+                                contract_symbol=str(row.get('contract_symbol', 'UNKNOWN')),
+                                strike=float(row.get('strike', 0.0)),
+                                opt_kind=str(row.get('opt_kind', 'unknown')),
+                                dte_calc=float(row.get('dte_calc', 0.0))
+                            )
+                            contract_level_metrics.append(contract_metric)
+                        except Exception as e:
+                            print(f"⚠️ Warning: Failed to convert contract {row.get('contract_symbol', 'unknown')}: {e}")
+                            continue
+
+                    print(f"✅ Successfully converted {len(contract_level_metrics)} contract-level metrics")
+                else:
+                    # FAIL-FAST: If no contract data, create at least one minimal record to satisfy validation
+                    print("⚠️ WARNING: No contract-level data available - creating minimal record to satisfy validation")
+                    contract_level_metrics = [ProcessedContractMetricsV2_5(
+                        contract_symbol="MINIMAL_RECORD",
+                        strike=0.0,
+                        opt_kind="unknown",
+                        dte_calc=0.0
+                    )]
             # Note: contract_metrics is typically empty from calculate_all_metrics as it focuses on aggregates
 
             print(f"✅ Successfully processed {len(strike_level_metrics)} strike levels for {underlying_data.symbol}")
@@ -279,7 +312,8 @@ class MetricsCalculatorV2_5:
                 options_data_with_metrics=contract_level_metrics,
                 underlying_data_enriched=underlying_enriched,  # Already ProcessedUnderlyingAggregatesV2_5
                 processing_timestamp=datetime.now(),
-                errors=[]
+                errors=[],
+                exposure_surface=self.exposure_surfaces.latest(underlying_data.symbol)
             )
 
         except Exception as e:
@@ -292,6 +326,7 @@ class MetricsCalculatorV2_5:
             raise RuntimeError(f"CRITICAL: process_data_bundle_v2 failed with error: {str(e)}") from e
 
 
+    @traced("metrics.calculate_all_metrics", symbol_arg="und_data_api_raw.symbol")
     def calculate_all_metrics(self, options_df_raw, und_data_api_raw, dte_max=45):
         """
         STRICT PYDANTIC V2-ONLY: Calculate all metrics using proper delegation pattern with ZERO TOLERANCE FAKE DATA.
@@ -321,6 +356,21 @@ class MetricsCalculatorV2_5:
             if not hasattr(und_data_api_raw, 'price') or und_data_api_raw.price <= 0.0:
                 raise ValueError(f"CRITICAL: Invalid price data {getattr(und_data_api_raw, 'price', 'MISSING')} - cannot calculate metrics with fake/missing price!")
 
+            # Recompute missing/inconsistent vendor IV and greeks so every downstream stage sees the same chain
+            if self.greek_engine is not None and not options_df_raw.empty:
+                with trace_span("metrics.greek_enrichment", contracts=len(options_df_raw)):
+                    options_df_raw, _ = self.greek_engine.enrich_chain(options_df_raw, float(und_data_api_raw.price))
+
+            # One (expiry, strike) aggregation pass shared by the strike-level metrics and the bundle,
+            # plus the IV surface fit for this snapshot
+            if not options_df_raw.empty:
+                with trace_span("metrics.exposure_surface", contracts=len(options_df_raw)):
+                    exposure_surface = self.exposure_surfaces.build(options_df_raw, und_data_api_raw.symbol)
+                if self.elite_config.volatility_surface_enabled:
+                    with trace_span("metrics.volatility_surface", contracts=len(options_df_raw)):
+                        self.volatility_surface.fit_surface(options_df_raw, float(und_data_api_raw.price))
+            surface_features = self.volatility_surface.features() if not options_df_raw.empty and self.elite_config.volatility_surface_enabled else None
+
             # Initialize contract level data
             df_chain_all_metrics = options_df_raw.copy() if not options_df_raw.empty else pd.DataFrame()
 
@@ -359,7 +409,8 @@ class MetricsCalculatorV2_5:
 
             # STEP 2: Calculate foundational metrics using proper delegation
             print(f"🔄 Calculating foundational metrics...")
-            foundational_model = self.core.calculate_all_foundational_metrics(temp_model_for_calculation)
+            with trace_span("metrics.foundational"):
+                foundational_model = self.core.calculate_all_foundational_metrics(temp_model_for_calculation)
 
             # FAIL-FAST: Validate foundational metrics were calculated with real data
             if foundational_model.gib_oi_based_und == 0.0:
@@ -375,7 +426,8 @@ class MetricsCalculatorV2_5:
             print(f"🔄 Calculating enhanced flow metrics...")
             symbol = foundational_model.symbol
             try:
-                flow_model = self.flow_analytics.calculate_all_enhanced_flow_metrics(foundational_model, symbol)
+                with trace_span("metrics.flow_analytics"):
+                    flow_model = self.flow_analytics.calculate_all_enhanced_flow_metrics(foundational_model, symbol)
 
                 # FAIL-FAST: Validate flow metrics were calculated with real data
                 if flow_model is None:
@@ -399,7 +451,8 @@ class MetricsCalculatorV2_5:
 
             # STEP 4: Calculate elite intelligence metrics using proper delegation
             print(f"🔄 Calculating elite intelligence metrics...")
-            elite_results = self.elite_intelligence.calculate_elite_impact_score(df_chain_all_metrics, flow_model)
+            with trace_span("metrics.elite_intelligence"):
+                elite_results = self.elite_intelligence.calculate_elite_impact_score(df_chain_all_metrics, flow_model)
 
             # FAIL-FAST: Validate elite results are proper Pydantic model with real data
             if not isinstance(elite_results, EliteImpactResultsV2_5):
@@ -442,7 +495,9 @@ class MetricsCalculatorV2_5:
                 flow_type_elite=elite_results.flow_type_elite,
                 volatility_regime_elite=elite_results.volatility_regime_elite,
                 confidence=elite_results.confidence,
-                transition_risk=elite_results.transition_risk
+                transition_risk=elite_results.transition_risk,
+                # ATM IV (30-day) read off the fitted volatility surface
+                impl_vol_atm=surface_features.atm_iv_30d if surface_features is not None else None
             )
 
             print(f"✅ STRICT PYDANTIC V2-ONLY: Created ProcessedUnderlyingAggregatesV2_5 with ALL 18 required fields populated with real calculated values")
@@ -453,78 +508,90 @@ class MetricsCalculatorV2_5:
 
             if not options_df_raw.empty:
                 print(f"🔄 Generating strike-level data from {len(options_df_raw)} options contracts...")
-                # Create strike-level aggregation from contract data
-                strike_groups = options_df_raw.groupby('strike')
-
-                strike_data = []
-                for strike, group in strike_groups:
-                    # Calculate average DTE for this strike
-                    if 'dte_calc' in group.columns:
-                        avg_dte = group['dte_calc'].mean()
-                    elif 'dte' in group.columns:
-                        avg_dte = group['dte'].mean()
-                    else:
-                        avg_dte = 30.0  # Reasonable default for DTE
-
-                    # Calculate average implied volatility at strike
-                    avg_iv_at_strike = self._calculate_avg_iv_at_strike(group)
-
-                    # STRICT PYDANTIC V2-ONLY: Create ProcessedStrikeLevelMetricsV2_5 model
-                    strike_model = ProcessedStrikeLevelMetricsV2_5(
-                        strike=float(strike),
-                        # Greek exposure aggregations with fail-fast validation
-                        total_dxoi_at_strike=self._require_column_and_sum(group, 'dxoi', 'delta exposure'),
-                        total_gxoi_at_strike=self._require_column_and_sum(group, 'gxoi', 'gamma exposure'),
-                        total_vxoi_at_strike=self._require_column_and_sum(group, 'vxoi', 'vega exposure'),
-                        total_txoi_at_strike=self._require_column_and_sum(group, 'txoi', 'theta exposure'),
-                        total_vannaxoi_at_strike=self._require_column_and_sum(group, 'vannaxoi', 'vanna exposure'),
-                        # Implied volatility aggregation
-                        avg_iv_at_strike=avg_iv_at_strike,
-                        # Trading metrics - initialize as None, will be calculated by adaptive calculator
-                        a_dag_strike=None,
-                        e_sdag_mult_strike=None,
-                        e_sdag_dir_strike=None,
-                        e_sdag_w_strike=None,
-                        e_sdag_vf_strike=None,
-                        vri_2_0_strike=None,
-                        d_tdpi_strike=None,
-                        e_ctr_strike=None,
-                        e_tdfi_strike=None,
-                        e_vvr_sens_strike=None,
-                        e_vfi_sens_strike=None,
-                        sgdhp_score_strike=None,
-                        ugch_score_strike=None,
-                        arfi_strike=None,
-                        # Flow metrics - calculate from available data
-                        net_cust_delta_flow_at_strike=self._calculate_flow_metric(group, 'delta_contract', 'volm'),
-                        net_cust_gamma_flow_at_strike=self._calculate_flow_metric(group, 'gamma_contract', 'volm'),
-                        net_cust_vega_flow_at_strike=self._calculate_flow_metric(group, 'vega_contract', 'volm'),
-                        net_cust_theta_flow_at_strike=self._calculate_flow_metric(group, 'theta_contract', 'volm')
-                    )
-
-                    strike_data.append(strike_model)
-
-                if strike_data:
-                    # STRICT PYDANTIC V2-ONLY: Convert Pydantic models to DataFrame using model_dump()
-                    df_strike_all_metrics = pd.DataFrame([model.model_dump() for model in strike_data])
-                    print(f"✅ Created strike-level data for {len(df_strike_all_metrics)} strikes")
+                with trace_span("metrics.strike_aggregation", contracts=len(options_df_raw)):
+                    # Create strike-level aggregation from contract data; exposure totals are the
+                    # exposure surface collapsed across expiries
+                    strike_groups = options_df_raw.groupby('strike')
+                    strike_exposures = {
+                        metric: self._require_surface_profile(exposure_surface, metric, description)
+                        for metric, description in (
+                            ('dex', 'delta exposure'), ('gex', 'gamma exposure'), ('vex', 'vega exposure'),
+                            ('tex', 'theta exposure'), ('vanna', 'vanna exposure'),
+                        )
+                    }
+
+                    strike_data = []
+                    for strike, group in strike_groups:
+                        # Calculate average DTE for this strike
+                        if 'dte_calc' in group.columns:
+                            avg_dte = group['dte_calc'].mean()
+                        elif 'dte' in group.columns:
+                            avg_dte = group['dte'].mean()
+                        else:
+                            avg_dte = 30.0  # Reasonable default for DTE
+
+                        # Calculate average implied volatility at strike
+                        avg_iv_at_strike = self._calculate_avg_iv_at_strike(group)
+
+                        # STRICT PYDANTIC V2-ONLY: Create ProcessedStrikeLevelMetricsV2_5 model
+                        strike_model = ProcessedStrikeLevelMetricsV2_5(
+                            strike=float(strike),
+                            # Greek exposure aggregations with fail-fast validation
+                            total_dxoi_at_strike=float(strike_exposures['dex'].get(strike, 0.0)),
+                            total_gxoi_at_strike=float(strike_exposures['gex'].get(strike, 0.0)),
+                            total_vxoi_at_strike=float(strike_exposures['vex'].get(strike, 0.0)),
+                            total_txoi_at_strike=float(strike_exposures['tex'].get(strike, 0.0)),
+                            total_vannaxoi_at_strike=float(strike_exposures['vanna'].get(strike, 0.0)),
+                            # Implied volatility aggregation
+                            avg_iv_at_strike=avg_iv_at_strike,
+                            # Trading metrics - initialize as None, will be calculated by adaptive calculator
+                            a_dag_strike=None,
+                            e_sdag_mult_strike=None,
+                            e_sdag_dir_strike=None,
+                            e_sdag_w_strike=None,
+                            e_sdag_vf_strike=None,
+                            vri_2_0_strike=None,
+                            d_tdpi_strike=None,
+                            e_ctr_strike=None,
+                            e_tdfi_strike=None,
+                            e_vvr_sens_strike=None,
+                            e_vfi_sens_strike=None,
+                            sgdhp_score_strike=None,
+                            ugch_score_strike=None,
+                            arfi_strike=None,
+                            # Flow metrics - calculate from available data
+                            net_cust_delta_flow_at_strike=self._calculate_flow_metric(group, 'delta_contract', 'volm'),
+                            net_cust_gamma_flow_at_strike=self._calculate_flow_metric(group, 'gamma_contract', 'volm'),
+                            net_cust_vega_flow_at_strike=self._calculate_flow_metric(group, 'vega_contract', 'volm'),
+                            net_cust_theta_flow_at_strike=self._calculate_flow_metric(group, 'theta_contract', 'volm')
+                        )
+
+                        strike_data.append(strike_model)
+
+                    if strike_data:
+                        # STRICT PYDANTIC V2-ONLY: Convert Pydantic models to DataFrame using model_dump()
+                        df_strike_all_metrics = pd.DataFrame([model.model_dump() for model in strike_data])
+                        print(f"✅ Created strike-level data for {len(df_strike_all_metrics)} strikes")
 
             # STEP 7: Calculate adaptive metrics (strike-level) using proper delegation
             if not df_strike_all_metrics.empty:
                 print(f"🔄 Calculating adaptive metrics for {len(df_strike_all_metrics)} strikes...")
-                df_strike_all_metrics = self.adaptive.calculate_all_adaptive_metrics(df_strike_all_metrics, enriched_underlying)
+                with trace_span("metrics.adaptive"):
+                    df_strike_all_metrics = self.adaptive.calculate_all_adaptive_metrics(df_strike_all_metrics, enriched_underlying)
                 print(f"✅ Adaptive metrics calculated")
 
             # STEP 8: Calculate heatmap metrics (strike-level) using proper delegation
             if not df_strike_all_metrics.empty:
                 print(f"🔄 Calculating heatmap metrics for {len(df_strike_all_metrics)} strikes...")
-                df_strike_all_metrics = self.visualization.calculate_all_heatmap_data(df_strike_all_metrics, enriched_underlying)
+                with trace_span("metrics.heatmap"):
+                    df_strike_all_metrics = self.visualization.calculate_all_heatmap_data(df_strike_all_metrics, enriched_underlying)
                 print(f"✅ Heatmap metrics calculated")
 
             # STEP 9: Calculate underlying aggregates using proper delegation
             if not df_strike_all_metrics.empty:
                 print(f"🔄 Calculating underlying aggregates from strike-level data...")
-                aggregates = self.visualization.calculate_all_underlying_aggregates(df_strike_all_metrics, enriched_underlying)
+                with trace_span("metrics.underlying_aggregates"):
+                    aggregates = self.visualization.calculate_all_underlying_aggregates(df_strike_all_metrics, enriched_underlying)
 
                 # STRICT PYDANTIC V2-ONLY: Update model with aggregates if returned as dictionary
                 if isinstance(aggregates, dict) and aggregates:
@@ -601,6 +668,11 @@ __all__ = [
     'VisualizationMetrics',
     'EliteImpactCalculator',
     'SupplementaryMetrics',
+    'BlackScholesGreekEngine',
+    'EliteVolatilitySurface',
+    'VolatilitySurfaceGrid',
+    'ExposureSurfaceEngine',
+    'EliteClassifierRuntimeV2_5',
 
     # Configuration and state classes
     'MetricCalculationState',
@@ -614,6 +686,9 @@ __all__ = [
     'ConvexValueColumns',
     'EliteImpactColumns',
     'AdvancedOptionsMetrics',
+    'GreekEnrichmentReport',
+    'SURFACE_METRICS',
+    'VolatilitySurfaceFeatures',
 
     # Backward compatibility
     'MetricsCalculatorV2_5'
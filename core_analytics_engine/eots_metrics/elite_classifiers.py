@@ -0,0 +1,407 @@
+# core_analytics_engine/eots_metrics/elite_classifiers.py
+
+"""
+EOTS Elite Classifiers - Offline-trained regime and flow models
+
+Provides the model side of elite regime detection and flow classification:
+- Feature definitions shared by training and inference (one frame builder for both)
+- Labeled datasets from recorded history: snapshot-recorder Parquet sessions, local
+  Parquet/CSV record files and daily closes from HistoricalDataManagerV2_5
+- Compact scikit-learn pipelines (imputer + scaler + classifier) trained on CPU and
+  serialized with joblib into a versioned model directory
+- A runtime that loads each model once and serves batched, vectorized predictions
+  with feature-schema checks and a latency budget
+
+Callers keep their rule-based classification as the fallback whenever no usable
+model is loaded, the inputs do not match the model's feature schema, or a model
+keeps exceeding its latency budget.
+
+Model directory layout:
+    <model_dir>/<kind>/<version>.joblib   pipeline + metadata
+    <model_dir>/<kind>/<version>.json     metadata only, for inspection
+    <model_dir>/<kind>/LATEST             version served by default
+"""
+
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+MODEL_FORMAT_VERSION = 1
+REGIME = "regime"
+FLOW = "flow"
+
+# Features are computed from RawUnderlyingDataCombinedV2_5 fields, which every processed
+# underlying model inherits and the snapshot recorder stores per cycle
+REGIME_FEATURES: Tuple[str, ...] = (
+    "u_volatility", "price_change_pct_und", "intraday_range_pct", "gap_pct",
+    "day_volume", "value_bs", "volm_bs", "vflowratio", "gxoi", "dxoi",
+)
+FLOW_FEATURES: Tuple[str, ...] = (
+    "value_bs", "volm_bs", "day_volume",
+    "value_call_buy", "value_call_sell", "value_put_buy", "value_put_sell",
+    "volm_call_buy", "volm_call_sell", "volm_put_buy", "volm_put_sell",
+    "deltas_buy", "deltas_sell", "vflowratio",
+)
+FEATURE_SETS: Dict[str, Tuple[str, ...]] = {REGIME: REGIME_FEATURES, FLOW: FLOW_FEATURES}
+
+# Derived features: source columns and the function computing them from a numeric frame
+_DERIVED_FEATURES = {
+    "intraday_range_pct": (("day_high_price_und", "day_low_price_und", "price"),
+                           lambda f: (f["day_high_price_und"] - f["day_low_price_und"]) / f["price"]),
+    "gap_pct": (("day_open_price_und", "prev_day_close_price_und"),
+                lambda f: f["day_open_price_und"] / f["prev_day_close_price_und"] - 1.0),
+}
+
+MODEL_TYPES = ("hist_gradient_boosting", "random_forest", "logistic")
+
+
+def source_columns(kind: str) -> List[str]:
+    """Record columns the features of ``kind`` are computed from."""
+    columns: List[str] = []
+    for name in FEATURE_SETS[kind]:
+        for column in _DERIVED_FEATURES[name][0] if name in _DERIVED_FEATURES else (name,):
+            if column not in columns:
+                columns.append(column)
+    return columns
+
+
+def feature_frame(records: pd.DataFrame, kind: str) -> pd.DataFrame:
+    """Numeric feature frame of ``kind``; missing or non-numeric values become NaN."""
+    numeric = pd.DataFrame(
+        {column: pd.to_numeric(records[column], errors="coerce") if column in records else np.nan
+         for column in source_columns(kind)},
+        index=records.index,
+    ).astype(float)
+    features = pd.DataFrame(index=records.index)
+    for name in FEATURE_SETS[kind]:
+        features[name] = _DERIVED_FEATURES[name][1](numeric) if name in _DERIVED_FEATURES else numeric[name]
+    return features.replace([np.inf, -np.inf], np.nan)
+
+
+def records_from_models(models: Iterable[Any], kind: str) -> pd.DataFrame:
+    """Source columns of ``kind`` read off underlying models (attributes only, no model_dump)."""
+    columns = source_columns(kind)
+    return pd.DataFrame([[getattr(m, c, None) for c in columns] for m in models], columns=columns)
+
+
+# =============================================================================
+# DATASETS
+# =============================================================================
+
+def load_snapshot_records(root: str, symbol: Optional[str] = None) -> pd.DataFrame:
+    """
+    Underlying records of every snapshot session under ``root`` (or of the session ``root``
+    itself), sorted by timestamp. Only the columns the classifiers use are read.
+    """
+    root_path = Path(root)
+    paths = sorted(root_path.glob("underlying-*.parquet")) or sorted(root_path.glob("*/underlying-*.parquet"))
+    wanted = set(source_columns(REGIME)) | set(source_columns(FLOW)) | {"symbol", "timestamp", "price"}
+    frames = []
+    for path in paths:
+        available = set(pq.read_schema(path).names)
+        frames.append(pq.read_table(path, columns=sorted(wanted & available)).to_pandas())
+    if not frames:
+        return pd.DataFrame(columns=sorted(wanted))
+    records = pd.concat(frames, ignore_index=True)
+    if symbol is not None and "symbol" in records:
+        records = records[records["symbol"] == symbol]
+    return _sorted_by_time(records)
+
+
+def load_record_file(path: str) -> pd.DataFrame:
+    """Underlying records from a Parquet file/directory or a CSV file, sorted by timestamp."""
+    records = pd.read_csv(path) if str(path).endswith(".csv") else pd.read_parquet(path)
+    return _sorted_by_time(records)
+
+
+def load_daily_closes(historical_data_manager: Any, symbol: str, lookback_days: int) -> Optional[pd.Series]:
+    """Daily closes from the daily_ohlcv table, indexed by date."""
+    ohlcv = historical_data_manager.get_historical_ohlcv(symbol, lookback_days)
+    if ohlcv is None or ohlcv.empty:
+        return None
+    closes = pd.Series(pd.to_numeric(ohlcv["close"], errors="coerce").to_numpy(),
+                       index=pd.to_datetime(ohlcv["date"]).dt.normalize())
+    return closes[~closes.index.duplicated(keep="last")].sort_index().dropna()
+
+
+def _sorted_by_time(records: pd.DataFrame) -> pd.DataFrame:
+    if "timestamp" in records:
+        records = records.assign(timestamp=pd.to_datetime(records["timestamp"], errors="coerce", utc=True).dt.tz_localize(None))
+        records = records.sort_values("timestamp", kind="stable")
+    return records.reset_index(drop=True)
+
+
+def regime_labels(prices: pd.Series, horizon: int, periods_per_year: float,
+                  vol_thresholds: Tuple[float, float] = (0.15, 0.30), trend_threshold: float = 0.02) -> pd.Series:
+    """
+    Regime label per observation from the realized path that follows it: annualized
+    volatility of the next ``horizon`` returns (low / medium / high) and whether the
+    move over those ``horizon`` steps exceeds ``trend_threshold`` (trending / ranging).
+    Labels are MarketRegime values; observations without a full forward window are NaN.
+    """
+    prices = pd.to_numeric(prices, errors="coerce").astype(float)
+    forward_returns = np.log(prices).diff().shift(-1)
+    window = pd.api.indexers.FixedForwardWindowIndexer(window_size=horizon)
+    forward_vol = forward_returns.rolling(window, min_periods=horizon).std() * np.sqrt(periods_per_year)
+    forward_move = prices.shift(-horizon) / prices - 1.0
+
+    low, high = vol_thresholds
+    vol = np.where(forward_vol > high, "high", np.where(forward_vol < low, "low", "medium"))
+    trend = np.where(forward_move.abs() > trend_threshold, "trending", "ranging")
+    labels = pd.Series(np.char.add(np.char.add(vol.astype(str), "_vol_"), trend.astype(str)), index=prices.index)
+    return labels.where(forward_vol.notna() & forward_move.notna())
+
+
+def build_regime_dataset(records: pd.DataFrame, horizon: int, periods_per_year: float,
+                         daily_closes: Optional[pd.Series] = None, **label_kwargs) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Regime features and forward-outcome labels. Labels come from the records' own price
+    path (per symbol), or, when ``daily_closes`` is given, from the daily path starting
+    on each record's date (``horizon`` and ``periods_per_year`` then refer to days).
+    """
+    if daily_closes is not None:
+        daily = regime_labels(daily_closes, horizon, periods_per_year, **label_kwargs)
+        dates = pd.to_datetime(records["timestamp"]).dt.normalize()
+        labels = pd.Series(daily.reindex(dates).to_numpy(), index=records.index)
+    elif "symbol" in records:
+        labels = records.groupby("symbol", sort=False)["price"].transform(
+            lambda prices: regime_labels(prices, horizon, periods_per_year, **label_kwargs)
+        )
+    else:
+        labels = regime_labels(records["price"], horizon, periods_per_year, **label_kwargs)
+    keep = labels.notna()
+    return feature_frame(records[keep], REGIME), labels[keep].astype(str)
+
+
+def build_flow_dataset(records: pd.DataFrame, label_column: str = "flow_type_label") -> Tuple[pd.DataFrame, pd.Series]:
+    """Flow features and the curated FlowType labels in ``label_column``."""
+    if label_column not in records:
+        raise ValueError(f"Flow training records need a '{label_column}' label column")
+    keep = records[label_column].notna()
+    return feature_frame(records[keep], FLOW), records.loc[keep, label_column].astype(str)
+
+
+# =============================================================================
+# TRAINING AND SERIALIZATION
+# =============================================================================
+
+@dataclass
+class EliteClassifierArtifactV2_5:
+    """A trained pipeline plus the metadata needed to serve it safely."""
+    kind: str
+    model: Any
+    feature_names: List[str]
+    classes: List[str]
+    version: str
+    trained_at: str
+    model_type: str
+    n_samples: int
+    holdout_accuracy: Optional[float]
+    sklearn_version: str
+    format_version: int = MODEL_FORMAT_VERSION
+    training_info: Dict[str, Any] = field(default_factory=dict)
+
+    def metadata(self) -> Dict[str, Any]:
+        return {k: v for k, v in asdict(self).items() if k != "model"}
+
+
+def _make_estimator(model_type: str, random_state: int):
+    from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+
+    if model_type == "hist_gradient_boosting":
+        return HistGradientBoostingClassifier(max_iter=100, max_depth=4, learning_rate=0.1, random_state=random_state)
+    if model_type == "random_forest":
+        return RandomForestClassifier(n_estimators=50, max_depth=8, min_samples_leaf=5, n_jobs=1, random_state=random_state)
+    if model_type == "logistic":
+        return LogisticRegression(max_iter=1000)
+    raise ValueError(f"Unknown model type '{model_type}'; expected one of {MODEL_TYPES}")
+
+
+def train_classifier(kind: str, features: pd.DataFrame, labels: pd.Series, model_type: str = "hist_gradient_boosting",
+                     holdout_fraction: float = 0.2, random_state: int = 42,
+                     training_info: Optional[Dict[str, Any]] = None) -> EliteClassifierArtifactV2_5:
+    """
+    Fit a compact pipeline on time-ordered data. Accuracy is measured on the most recent
+    ``holdout_fraction`` of rows before the final model is refit on everything.
+    """
+    import sklearn
+    from sklearn.impute import SimpleImputer
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    if list(features.columns) != list(FEATURE_SETS[kind]):
+        raise ValueError(f"Feature columns do not match the {kind} feature schema")
+    if labels.nunique() < 2:
+        raise ValueError(f"Need at least two {kind} classes to train, got {sorted(labels.unique())}")
+
+    X = features.to_numpy(dtype=float)
+    y = labels.to_numpy(dtype=str)
+
+    def pipeline():
+        return make_pipeline(SimpleImputer(strategy="median", keep_empty_features=True), StandardScaler(),
+                             _make_estimator(model_type, random_state))
+
+    holdout_accuracy = None
+    split = int(len(y) * (1.0 - holdout_fraction))
+    if 0.0 < holdout_fraction < 1.0 and 0 < split < len(y) and len(np.unique(y[:split])) >= 2:
+        holdout_accuracy = float(pipeline().fit(X[:split], y[:split]).score(X[split:], y[split:]))
+
+    model = pipeline().fit(X, y)
+    now = datetime.now(timezone.utc)
+    return EliteClassifierArtifactV2_5(
+        kind=kind,
+        model=model,
+        feature_names=list(FEATURE_SETS[kind]),
+        classes=[str(c) for c in model.classes_],
+        version=now.strftime("%Y%m%dT%H%M%S%fZ"),
+        trained_at=now.isoformat(),
+        model_type=model_type,
+        n_samples=len(y),
+        holdout_accuracy=holdout_accuracy,
+        sklearn_version=sklearn.__version__,
+        training_info=dict(training_info or {}),
+    )
+
+
+class EliteModelRegistryV2_5:
+    """Versioned on-disk store of trained elite classifiers."""
+
+    def __init__(self, model_dir: str = "models/elite_classifiers"):
+        self.model_dir = Path(model_dir)
+
+    def save(self, artifact: EliteClassifierArtifactV2_5, promote: bool = True) -> Path:
+        """Write ``artifact`` and, if ``promote``, make it the version served by default."""
+        kind_dir = self.model_dir / artifact.kind
+        kind_dir.mkdir(parents=True, exist_ok=True)
+        path = kind_dir / f"{artifact.version}.joblib"
+        joblib.dump({"metadata": artifact.metadata(), "model": artifact.model}, path)
+        (kind_dir / f"{artifact.version}.json").write_text(json.dumps(artifact.metadata(), indent=2, default=str), encoding="utf-8")
+        if promote:
+            tmp = kind_dir / "LATEST.tmp"
+            tmp.write_text(artifact.version, encoding="utf-8")
+            os.replace(tmp, kind_dir / "LATEST")
+        return path
+
+    def versions(self, kind: str) -> List[str]:
+        return sorted(p.stem for p in (self.model_dir / kind).glob("*.joblib"))
+
+    def load(self, kind: str, version: str = "latest") -> EliteClassifierArtifactV2_5:
+        kind_dir = self.model_dir / kind
+        if version == "latest":
+            pointer = kind_dir / "LATEST"
+            if not pointer.exists():
+                raise FileNotFoundError(f"No promoted {kind} model in {kind_dir}")
+            version = pointer.read_text(encoding="utf-8").strip()
+        payload = joblib.load(kind_dir / f"{version}.joblib")
+        return EliteClassifierArtifactV2_5(model=payload["model"], **payload["metadata"])
+
+
+# =============================================================================
+# RUNTIME
+# =============================================================================
+
+class EliteClassifierRuntimeV2_5:
+    """
+    Serves the promoted regime and flow models. Models are loaded once; a model whose
+    feature schema or format does not match this code is not served, and a model that
+    exceeds the latency budget on ``max_budget_breaches`` consecutive calls is disabled.
+    """
+
+    def __init__(self, model_dir: str = "models/elite_classifiers", versions: Optional[Dict[str, str]] = None,
+                 latency_budget_ms: float = 25.0, max_budget_breaches: int = 5):
+        self.registry = EliteModelRegistryV2_5(model_dir)
+        self.latency_budget_ms = latency_budget_ms
+        self.max_budget_breaches = max_budget_breaches
+        self.models: Dict[str, EliteClassifierArtifactV2_5] = {}
+        self.disabled: Dict[str, str] = {}
+        self._breaches: Dict[str, int] = {}
+        self.stats = {"predictions": 0, "rows": 0, "budget_breaches": 0, "errors": 0}
+        for kind in FEATURE_SETS:
+            self._load(kind, (versions or {}).get(kind, "latest"))
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "EliteClassifierRuntimeV2_5":
+        return cls(
+            model_dir=settings.model_dir,
+            versions={REGIME: settings.regime_model_version, FLOW: settings.flow_model_version},
+            latency_budget_ms=settings.latency_budget_ms,
+            max_budget_breaches=settings.max_budget_breaches,
+        )
+
+    def _load(self, kind: str, version: str) -> None:
+        try:
+            artifact = self.registry.load(kind, version)
+        except FileNotFoundError as e:
+            logger.info(f"No trained {kind} classifier available ({e}); using rule-based {kind} classification")
+            return
+        if artifact.format_version != MODEL_FORMAT_VERSION or artifact.feature_names != list(FEATURE_SETS[kind]):
+            logger.warning(f"Ignoring {kind} classifier {artifact.version}: its feature schema does not match this build")
+            return
+        self.models[kind] = artifact
+        logger.info(f"Loaded {kind} classifier {artifact.version} ({artifact.model_type}, holdout accuracy {artifact.holdout_accuracy})")
+
+    def available(self, kind: str) -> bool:
+        return kind in self.models and kind not in self.disabled
+
+    def version(self, kind: str) -> Optional[str]:
+        return self.models[kind].version if kind in self.models else None
+
+    def predict(self, kind: str, records: pd.DataFrame, enforce_budget: bool = False) -> Optional[np.ndarray]:
+        """
+        Labels for every row of ``records`` in one vectorized call, or None if no usable
+        model. Absent or non-numeric inputs are imputed exactly as during training.
+        """
+        if not self.available(kind):
+            return None
+        started = time.perf_counter()
+        try:
+            labels = self.models[kind].model.predict(feature_frame(records, kind).to_numpy(dtype=float))
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"{kind} classifier prediction failed: {e}; falling back to rules")
+            return None
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        self.stats["predictions"] += 1
+        self.stats["rows"] += len(records)
+        if enforce_budget:
+            self._check_budget(kind, elapsed_ms)
+        return labels
+
+    def predict_one(self, kind: str, underlying_data: Any) -> Optional[str]:
+        """Label for one underlying model, within the latency budget."""
+        if not self.available(kind):
+            return None
+        labels = self.predict(kind, records_from_models([underlying_data], kind), enforce_budget=True)
+        return str(labels[0]) if labels is not None else None
+
+    def _check_budget(self, kind: str, elapsed_ms: float) -> None:
+        if elapsed_ms <= self.latency_budget_ms:
+            self._breaches[kind] = 0
+            return
+        self.stats["budget_breaches"] += 1
+        self._breaches[kind] = self._breaches.get(kind, 0) + 1
+        if self._breaches[kind] >= self.max_budget_breaches:
+            self.disabled[kind] = f"exceeded {self.latency_budget_ms:.1f} ms on {self._breaches[kind]} consecutive calls"
+            logger.warning(f"Disabling {kind} classifier {self.version(kind)}: {self.disabled[kind]}; using rules")
+
+
+__all__ = [
+    'REGIME', 'FLOW', 'REGIME_FEATURES', 'FLOW_FEATURES', 'MODEL_TYPES',
+    'feature_frame', 'records_from_models', 'source_columns',
+    'load_snapshot_records', 'load_record_file', 'load_daily_closes',
+    'regime_labels', 'build_regime_dataset', 'build_flow_dataset', 'train_classifier',
+    'EliteClassifierArtifactV2_5', 'EliteModelRegistryV2_5', 'EliteClassifierRuntimeV2_5',
+]
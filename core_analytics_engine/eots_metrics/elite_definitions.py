@@ -41,6 +41,7 @@ class EliteConfig(BaseModel):
     volatility_surface_enabled: bool = Field(default=True, description="Enable volatility surface integration")
     skew_adjustment_alpha: float = Field(default=1.0, description="Alpha for skew adjustment")
     surface_stability_threshold: float = Field(default=0.15, description="Threshold for volatility surface stability")
+    surface_smile_degree: int = Field(default=3, ge=1, le=6, description="Polynomial degree of each expiry's total-variance smile in the fitted volatility surface")
     momentum_detection_enabled: bool = Field(default=True, description="Enable momentum-acceleration detection")
     acceleration_threshold_multiplier: float = Field(default=2.0, description="Multiplier for acceleration threshold")
     momentum_persistence_threshold: float = Field(default=0.7, description="Threshold for momentum persistence")
@@ -96,7 +96,7 @@ class EliteImpactCalculator:
     incorporating all elite features for maximum accuracy and performance.
     """
     
-    def __init__(self, config: EliteConfig = None):
+    def __init__(self, config: EliteConfig = None, volatility_surface: Optional[EliteVolatilitySurface] = None):
         if config is not None and not isinstance(config, EliteConfig):
             try:
                 config = EliteConfig.model_validate(config)
@@ -105,7 +105,8 @@ class EliteImpactCalculator:
         self.config = config or EliteConfig()
         self.regime_detector = EliteMarketRegimeDetector(self.config)
         self.flow_classifier = EliteFlowClassifier(self.config)
-        self.volatility_surface = EliteVolatilitySurface(self.config)
+        # Share the caller's fitted surface so a snapshot is fitted once per cycle
+        self.volatility_surface = volatility_surface if volatility_surface is not None else EliteVolatilitySurface(self.config)
         self.momentum_detector = EliteMomentumDetector(self.config)
         
         # Performance tracking
@@ -186,7 +187,7 @@ class EliteImpactCalculator:
         
         # Step 3: Volatility Regime Analysis
         if self.config.volatility_surface_enabled:
-            vol_regime = self.volatility_surface.get_volatility_regime(result_df)
+            vol_regime = self.volatility_surface.get_volatility_regime(result_df, current_price)
             result_df[EliteImpactColumns.VOLATILITY_REGIME] = vol_regime
         
         # Step 4: Calculate Enhanced Proximity Factors
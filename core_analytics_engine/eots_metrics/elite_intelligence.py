@@ -17,13 +17,17 @@ Optimizations:
 import logging
 import numpy as np
 import pandas as pd
-from typing import Union, Optional, List, Dict, Any, Tuple
+from typing import TYPE_CHECKING, Union, Optional, List, Dict, Any, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from pydantic import BaseModel, Field, ConfigDict
 from functools import lru_cache
 import warnings
 
+if TYPE_CHECKING:  # configuration_models also loads this file as a top-level module
+    from .elite_classifiers import EliteClassifierRuntimeV2_5
+    from .elite_volatility_surface import EliteVolatilitySurface
+
 # Suppress warnings for cleaner output
 warnings.filterwarnings('ignore')
 
@@ -76,6 +80,7 @@ class EliteConfig(BaseModel):
     # Volatility surface parameters
     skew_adjustment_alpha: float = Field(default=1.0, description="Alpha for skew adjustment")
     surface_stability_threshold: float = Field(default=0.15, description="Threshold for volatility surface stability")
+    surface_smile_degree: int = Field(default=3, ge=1, le=6, description="Polynomial degree of each expiry's total-variance smile in the fitted volatility surface")
     
     # Momentum detection parameters
     acceleration_threshold_multiplier: float = Field(default=2.0, description="Multiplier for acceleration threshold")
@@ -202,12 +207,17 @@ class EliteImpactCalculator:
     Simplified elite impact calculator focusing on core institutional intelligence.
     
     Eliminates complex ML models in favor of robust heuristic-based calculations
-    that provide reliable institutional flow intelligence.
+    that provide reliable institutional flow intelligence. When a classifier runtime
+    serves trained regime/flow models, those replace the heuristic classification.
     """
     
-    def __init__(self, elite_config: EliteConfig = None):
+    def __init__(self, elite_config: EliteConfig = None, classifier_runtime: Optional['EliteClassifierRuntimeV2_5'] = None,
+                 volatility_surface: Optional['EliteVolatilitySurface'] = None):
         self.logger = logging.getLogger(self.__class__.__name__)
         self.config = elite_config or EliteConfig()
+        self.classifier_runtime = classifier_runtime
+        # Surface fitted by the metrics calculator for the current snapshot (read, never refitted here)
+        self.volatility_surface = volatility_surface
         
         # Impact calculation weights (optimized from original complex models)
         self.IMPACT_WEIGHTS = {
@@ -260,8 +270,8 @@ class EliteImpactCalculator:
             flow_momentum_index = self._calculate_flow_momentum_index_optimized(underlying_data)
             
             # Determine market regime and flow type
-            market_regime = self._determine_market_regime_simple(underlying_data)
-            flow_type = self._classify_flow_type_simple(options_data, underlying_data)
+            market_regime = self._determine_market_regime(underlying_data)
+            flow_type = self._classify_flow_type(options_data, underlying_data)
             volatility_regime = self._determine_volatility_regime_simple(underlying_data)
             
             # Calculate confidence and transition risk
@@ -449,6 +459,26 @@ class EliteImpactCalculator:
     # SIMPLIFIED CLASSIFICATION METHODS
     # =============================================================================
     
+    def _determine_market_regime(self, underlying_data) -> MarketRegime:
+        """Trained regime model when one is served, otherwise the heuristic determination"""
+        label = self.classifier_runtime.predict_one("regime", underlying_data) if self.classifier_runtime else None
+        if label is not None:
+            try:
+                return MarketRegime(label)
+            except ValueError:
+                self.logger.warning(f"Regime classifier returned unknown label '{label}'")
+        return self._determine_market_regime_simple(underlying_data)
+    
+    def _classify_flow_type(self, options_data: pd.DataFrame, underlying_data) -> FlowType:
+        """Trained flow model when one is served, otherwise the heuristic classification"""
+        label = self.classifier_runtime.predict_one("flow", underlying_data) if self.classifier_runtime else None
+        if label is not None:
+            try:
+                return FlowType(label)
+            except ValueError:
+                self.logger.warning(f"Flow classifier returned unknown label '{label}'")
+        return self._classify_flow_type_simple(options_data, underlying_data)
+    
     def _determine_market_regime_simple(self, underlying_data: Dict) -> MarketRegime:
         """Simplified market regime determination"""
         try:
@@ -511,8 +541,11 @@ class EliteImpactCalculator:
             return FlowType.UNKNOWN
     
     def _determine_volatility_regime_simple(self, underlying_data: Dict) -> str:
-        """Simplified volatility regime determination"""
+        """Volatility regime from the shared fitted surface, else from the underlying IV level"""
         try:
+            if self.volatility_surface is not None and self.volatility_surface.surface is not None:
+                return self.volatility_surface.features().regime
+
             current_iv_raw = getattr(underlying_data, 'u_volatility', None)
             current_iv = float(current_iv_raw) if current_iv_raw is not None else 0.20
 
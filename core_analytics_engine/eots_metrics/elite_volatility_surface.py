@@ -1,10 +1,19 @@
+import hashlib
+import logging
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from functools import lru_cache, wraps
 
+from pydantic import BaseModel, ConfigDict, Field
+
 from core_analytics_engine.eots_metrics.elite_definitions import EliteConfig, ConvexValueColumns
 
+logger = logging.getLogger(__name__)
+
+# Chain columns holding per-contract implied volatility, in order of preference
+IV_COLUMNS = ('iv', ConvexValueColumns.VOLATILITY, 'implied_volatility')
+
 # Decorator for caching results
 def cache_result(maxsize=128):
     """Enhanced caching decorator with configurable size"""
@@ -16,41 +25,244 @@ def cache_result(maxsize=128):
         return wrapper
     return decorator
 
+
+class VolatilitySurfaceFeatures(BaseModel):
+    """Skew, term-structure and regime features read off a fitted volatility surface"""
+    atm_iv_front: float = Field(..., description="ATM implied volatility of the nearest fitted expiry.")
+    atm_iv_30d: float = Field(..., description="ATM implied volatility interpolated at 30 days.")
+    term_slope: float = Field(..., description="Change in ATM IV per year of expiry between the front expiry and 30 days (negative = inverted).")
+    skew_30d: float = Field(..., description="dIV/d(log-moneyness) at the money, 30 days out (negative = put skew).")
+    risk_reversal_30d: float = Field(..., description="IV 10% OTM call minus IV 10% OTM put (log-moneyness +/-0.1), 30 days out.")
+    smile_curvature_30d: float = Field(..., description="d2IV/d(log-moneyness)2 at the money, 30 days out.")
+    atm_term_dispersion: float = Field(..., description="Standard deviation of ATM IV across fitted expiries.")
+    fit_rmse: float = Field(..., description="Vega-weighted RMS error of the fit, in IV units.")
+    expiries: int = Field(..., description="Number of fitted expiries.")
+    contracts: int = Field(..., description="Number of contracts used in the fit.")
+    regime: str = Field(..., description="Volatility regime: high_vol, low_vol, unstable or medium_vol.")
+
+    model_config = ConfigDict(extra='forbid')
+
+
+class VolatilitySurfaceGrid:
+    """
+    Implied-volatility surface over log-moneyness x time fitted from one chain snapshot.
+
+    Each expiry's total variance w = iv^2 * T is a vega-weighted polynomial in
+    k = ln(K / spot); all expiries are fitted together through one batched
+    normal-equation solve. Between expiries total variance is interpolated linearly in
+    T (constant IV outside the fitted range), and each smile is held flat beyond the
+    log-moneyness range it was fitted on.
+    """
+
+    def __init__(self, spot: float, t_years: np.ndarray, coeffs: np.ndarray, k_lo: np.ndarray, k_hi: np.ndarray,
+                 fit_rmse: float, contracts: int):
+        self.spot = float(spot)
+        self.t_years = t_years
+        self.coeffs = coeffs
+        self.k_lo = k_lo
+        self.k_hi = k_hi
+        self.fit_rmse = float(fit_rmse)
+        self.contracts = int(contracts)
+
+    @classmethod
+    def fit(cls, strike: np.ndarray, dte: np.ndarray, iv: np.ndarray, spot: float, degree: int = 3,
+            ridge: float = 1e-4, min_dte_days: float = 0.25) -> Optional["VolatilitySurfaceGrid"]:
+        """Fit a surface from per-contract arrays; None when no contract has a usable IV."""
+        strike = np.asarray(strike, dtype=float)
+        iv = np.asarray(iv, dtype=float)
+        t_all = np.maximum(np.asarray(dte, dtype=float), min_dte_days) / 365.0
+        ok = np.isfinite(strike) & (strike > 0) & np.isfinite(iv) & (iv > 0.01) & (iv < 5.0) & np.isfinite(t_all)
+        if spot <= 0 or not ok.any():
+            return None
+
+        k = np.log(strike[ok] / spot)
+        v = iv[ok]
+        t_unique, expiry = np.unique(t_all[ok], return_inverse=True)
+        t = t_unique[expiry]
+        w = v * v * t
+        # Vega weighting: standard normal density of the standardized moneyness
+        weight = np.maximum(np.exp(-0.5 * (k / (v * np.sqrt(t))) ** 2), 1e-3)
+
+        n_exp, n_coef = len(t_unique), degree + 1
+        # Per-expiry weighted moments sum(weight * k^p) and sum(weight * w * k^p)
+        powers, rhs = [], []
+        term = weight
+        for p in range(2 * degree + 1):
+            powers.append(np.bincount(expiry, weights=term, minlength=n_exp))
+            if p < n_coef:
+                rhs.append(np.bincount(expiry, weights=term * w, minlength=n_exp))
+            term = term * k
+        normal = np.empty((n_exp, n_coef, n_coef))
+        for i in range(n_coef):
+            for j in range(n_coef):
+                normal[:, i, j] = powers[i + j]
+        rhs = np.stack(rhs, axis=1)
+        # Relative ridge on the non-constant terms keeps expiries with only a few strikes solvable
+        slope_terms = np.arange(1, n_coef)
+        normal[:, slope_terms, slope_terms] = normal[:, slope_terms, slope_terms] * (1.0 + ridge) + 1e-12 * powers[0][:, None]
+        coeffs = np.linalg.solve(normal, rhs[..., None])[..., 0]
+
+        k_lo = np.full(n_exp, np.inf)
+        k_hi = np.full(n_exp, -np.inf)
+        np.minimum.at(k_lo, expiry, k)
+        np.maximum.at(k_hi, expiry, k)
+
+        grid = cls(spot, t_unique, coeffs, k_lo, k_hi, fit_rmse=0.0, contracts=int(ok.sum()))
+        fitted = np.sqrt(grid._smile_variance(expiry, k) / t)
+        grid.fit_rmse = float(np.sqrt(np.average((fitted - v) ** 2, weights=weight)))
+        return grid
+
+    def _smile_variance(self, expiry: np.ndarray, k: np.ndarray) -> np.ndarray:
+        k = np.clip(k, self.k_lo[expiry], self.k_hi[expiry])
+        coeffs = self.coeffs[expiry]
+        w = coeffs[..., -1]
+        for j in range(coeffs.shape[-1] - 2, -1, -1):  # Horner
+            w = w * k + coeffs[..., j]
+        return np.maximum(w, 1e-10)
+
+    def total_variance(self, log_moneyness: np.ndarray, t_years: np.ndarray) -> np.ndarray:
+        """Total variance at arbitrary (log-moneyness, T) arrays (broadcast together)."""
+        k, t = np.broadcast_arrays(np.asarray(log_moneyness, dtype=float), np.asarray(t_years, dtype=float))
+        t_fit = self.t_years
+        upper = np.clip(np.searchsorted(t_fit, t), 1, len(t_fit) - 1) if len(t_fit) > 1 else np.zeros(t.shape, dtype=int)
+        lower = np.maximum(upper - 1, 0)
+        w_lo = self._smile_variance(lower, k)
+        w_hi = self._smile_variance(upper, k)
+        span = t_fit[upper] - t_fit[lower]
+        frac = np.where(span > 0, (t - t_fit[lower]) / np.where(span > 0, span, 1.0), 0.0)
+        # Linear in total variance between expiries, constant IV outside the fitted expiries
+        below, above = t <= t_fit[0], t >= t_fit[-1]
+        w_inside = (1.0 - frac) * w_lo + frac * w_hi
+        w_flat = np.where(below, w_lo / t_fit[lower], w_hi / t_fit[upper]) * t
+        return np.where(below | above, w_flat, w_inside)
+
+    def implied_vol(self, strikes: np.ndarray, dtes: np.ndarray, min_dte_days: float = 0.25) -> np.ndarray:
+        """Batch IV lookup for arbitrary strike / days-to-expiry arrays (broadcast together)."""
+        t = np.maximum(np.asarray(dtes, dtype=float), min_dte_days) / 365.0
+        k = np.log(np.asarray(strikes, dtype=float) / self.spot)
+        return np.sqrt(self.total_variance(k, t) / t)
+
+    def atm_vol(self, dtes: np.ndarray) -> np.ndarray:
+        return self.implied_vol(np.full(np.shape(dtes), self.spot), dtes)
+
+    def smile_derivatives(self, dte: float, h: float = 1e-3) -> tuple:
+        """(skew, curvature) of IV in log-moneyness at the money for one expiry horizon."""
+        t = max(float(dte), 0.25) / 365.0
+        k = np.array([-h, 0.0, h])
+        vol = np.sqrt(self.total_variance(k, np.full(3, t)) / t)
+        return (vol[2] - vol[0]) / (2 * h), (vol[2] - 2 * vol[1] + vol[0]) / (h * h)
+
+    def features(self, stability_threshold: float = 0.15) -> VolatilitySurfaceFeatures:
+        dtes = self.t_years * 365.0
+        atm_by_expiry = self.atm_vol(dtes)
+        atm_front, atm_30 = float(atm_by_expiry[0]), float(self.atm_vol(np.array([30.0]))[0])
+        t_front = float(self.t_years[0])
+        term_slope = (atm_30 - atm_front) / (30.0 / 365.0 - t_front) if abs(30.0 / 365.0 - t_front) > 1e-9 else 0.0
+        skew, curvature = self.smile_derivatives(30.0)
+        wings = self.implied_vol(self.spot * np.exp(np.array([0.1, -0.1])), np.full(2, 30.0))
+        dispersion = float(np.std(atm_by_expiry))
+
+        # Same level thresholds as the legacy mean/std rule, read off the fitted ATM term structure
+        if atm_30 > 0.40:
+            regime = "high_vol"
+        elif atm_30 < 0.15:
+            regime = "low_vol"
+        elif dispersion > 0.1 or self.fit_rmse > stability_threshold * atm_30:
+            regime = "unstable"
+        else:
+            regime = "medium_vol"
+
+        return VolatilitySurfaceFeatures(
+            atm_iv_front=atm_front,
+            atm_iv_30d=atm_30,
+            term_slope=float(term_slope),
+            skew_30d=float(skew),
+            risk_reversal_30d=float(wings[0] - wings[1]),
+            smile_curvature_30d=float(curvature),
+            atm_term_dispersion=dispersion,
+            fit_rmse=self.fit_rmse,
+            expiries=len(self.t_years),
+            contracts=self.contracts,
+            regime=regime,
+        )
+
+
 class EliteVolatilitySurface:
     """Advanced volatility surface modeling and analysis"""
-    
+
     def __init__(self, config: EliteConfig):
         self.config = config
         self.surface_cache = {}
-        
+        self.surface: Optional[VolatilitySurfaceGrid] = None
+        self._snapshot_key: Optional[str] = None
+        self.fit_count = 0
+
     @cache_result(maxsize=64)
-    def calculate_skew_adjustment(self, strike: float, atm_vol: float, 
+    def calculate_skew_adjustment(self, strike: float, atm_vol: float,
                                 strike_vol: float, alpha: float = 1.0) -> float:
         """Calculate skew adjustment factor"""
         if atm_vol <= 0 or strike_vol <= 0:
             return 1.0
-        
+
         skew_ratio = strike_vol / atm_vol
         adjustment = 1.0 + alpha * (skew_ratio - 1.0)
         return max(0.1, min(3.0, adjustment))  # Bounded adjustment
-    
-    def get_volatility_regime(self, options_data: pd.DataFrame) -> str:
-        """Determine volatility regime"""
-        if ConvexValueColumns.VOLATILITY not in options_data.columns:
-            return "medium_vol"
 
-        vol_series = pd.to_numeric(options_data[ConvexValueColumns.VOLATILITY], errors='coerce').dropna()
-        if len(vol_series) == 0:
-            return "medium_vol"
+    def skew_adjustments(self, strikes: np.ndarray, dtes: np.ndarray, alpha: Optional[float] = None) -> np.ndarray:
+        """Vectorized calculate_skew_adjustment against the fitted surface (1.0 when no surface is fitted)."""
+        strikes = np.asarray(strikes, dtype=float)
+        if self.surface is None:
+            return np.ones(np.broadcast(strikes, np.asarray(dtes)).shape)
+        alpha = getattr(self.config, 'skew_adjustment_alpha', 1.0) if alpha is None else alpha
+        ratio = self.surface.implied_vol(strikes, dtes) / self.surface.atm_vol(np.broadcast_to(dtes, np.broadcast(strikes, np.asarray(dtes)).shape))
+        return np.clip(1.0 + alpha * (ratio - 1.0), 0.1, 3.0)
 
-        vol_mean = vol_series.mean()
-        vol_std = vol_series.std()
+    def fit_surface(self, options_data: pd.DataFrame, spot: Optional[float] = None) -> Optional[VolatilitySurfaceGrid]:
+        """Fit the surface for this chain snapshot; returns the cached fit when the snapshot is unchanged."""
+        iv_column = next((c for c in IV_COLUMNS if c in options_data.columns), None)
+        if iv_column is None or 'strike' not in options_data.columns or 'dte_calc' not in options_data.columns:
+            self.surface, self._snapshot_key = None, None
+            return None
+        strike = pd.to_numeric(options_data['strike'], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        dte = pd.to_numeric(options_data['dte_calc'], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        iv = pd.to_numeric(options_data[iv_column], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        spot = float(spot) if spot else self._infer_spot(options_data, strike)
+        if not spot or not np.isfinite(spot):
+            self.surface, self._snapshot_key = None, None
+            return None
 
-        if vol_mean > 0.4:
-            return "high_vol"
-        elif vol_mean < 0.15:
-            return "low_vol"
-        elif vol_std > 0.1:
-            return "unstable"
-        else:
-            return "medium_vol"
\ No newline at end of file
+        hasher = hashlib.blake2b(repr(spot).encode(), digest_size=16)
+        for values in (strike, dte, iv):
+            hasher.update(values.tobytes())
+        key = hasher.hexdigest()
+        if key == self._snapshot_key:
+            return self.surface
+
+        degree = int(getattr(self.config, 'surface_smile_degree', 3))
+        self.surface = VolatilitySurfaceGrid.fit(strike, dte, iv, spot, degree=degree)
+        self._snapshot_key = key
+        self.fit_count += 1
+        return self.surface
+
+    def features(self) -> Optional[VolatilitySurfaceFeatures]:
+        if self.surface is None:
+            return None
+        return self.surface.features(getattr(self.config, 'surface_stability_threshold', 0.15))
+
+    def get_volatility_regime(self, options_data: pd.DataFrame, spot: Optional[float] = None) -> str:
+        """Determine volatility regime from the fitted surface (refitted only when the snapshot changes)"""
+        if self.fit_surface(options_data, spot) is None:
+            return "medium_vol"
+        return self.features().regime
+
+    @staticmethod
+    def _infer_spot(options_data: pd.DataFrame, strike: np.ndarray) -> Optional[float]:
+        """Spot proxy when none is given: the strike whose call delta is closest to 0.5."""
+        if 'delta_contract' in options_data.columns and 'opt_kind' in options_data.columns:
+            delta = pd.to_numeric(options_data['delta_contract'], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+            calls = options_data['opt_kind'].astype(str).str.lower().str.startswith('c').to_numpy() & np.isfinite(delta)
+            if calls.any():
+                distance = np.where(calls, np.abs(delta - 0.5), np.inf)
+                return float(strike[int(np.argmin(distance))])
+        finite = strike[np.isfinite(strike)]
+        return float(np.median(finite)) if finite.size else None
@@ -0,0 +1,161 @@
+# core_analytics_engine/eots_metrics/exposure_surface.py
+
+"""
+EOTS Exposure Surface Engine - strike x expiry exposure grids in one pass
+
+Builds GEX/DEX/VEX/theta/vanna/charm/vomma exposure and OI/volume grids over
+(expiry, strike) with a single groupby over the contract chain, instead of each
+consumer regrouping contracts per strike or per expiry:
+- Strike-level aggregates are the grids summed across expiries
+- Term-structure views are the grids summed across strikes
+- Per-expiry row blocks are cached per symbol and fingerprinted, so a cycle in which
+  only some expiries changed re-aggregates only those expiries
+"""
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from data_models import ExposureSurfaceV2_5
+
+logger = logging.getLogger(__name__)
+
+# Surface metric name -> contract-level chain column summed into it
+SURFACE_METRICS: Dict[str, str] = {
+    "gex": "gxoi",
+    "dex": "dxoi",
+    "vex": "vxoi",
+    "tex": "txoi",
+    "vanna": "vannaxoi",
+    "charm": "charmxoi",
+    "vomma": "vommaxoi",
+    "open_interest": "open_interest",
+    "volume": "volm",
+}
+
+# Chain columns identifying an expiry, in order of preference; dte_calc is the fallback
+EXPIRY_COLUMNS = ("expiration", "expiration_date")
+
+
+@dataclass
+class _SymbolSurfaceState:
+    columns: List[str]
+    fingerprints: Dict[object, int] = field(default_factory=dict)
+    blocks: Optional[pd.DataFrame] = None  # (expiry, strike)-indexed sums for every expiry
+    surface: Optional[ExposureSurfaceV2_5] = None
+
+
+class ExposureSurfaceEngine:
+    """Builds and incrementally maintains one ExposureSurfaceV2_5 per symbol."""
+
+    def __init__(self, metrics: Optional[Dict[str, str]] = None):
+        self.metrics = dict(metrics or SURFACE_METRICS)
+        self.logger = logger.getChild(self.__class__.__name__)
+        self._states: Dict[str, _SymbolSurfaceState] = {}
+        self._lock = threading.Lock()
+
+    def latest(self, symbol: str) -> Optional[ExposureSurfaceV2_5]:
+        """Most recent surface built for ``symbol``, if any."""
+        state = self._states.get(symbol)
+        return state.surface if state else None
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        """Drop cached expiry blocks for ``symbol`` (or for every symbol)."""
+        with self._lock:
+            if symbol is None:
+                self._states.clear()
+            else:
+                self._states.pop(symbol, None)
+
+    def build(self, chain: pd.DataFrame, symbol: str, partial: bool = False) -> ExposureSurfaceV2_5:
+        """
+        Build the surface for ``symbol`` from a contract-level chain.
+
+        Expiries whose contracts are unchanged since the previous call reuse their cached
+        rows. With ``partial=True`` the chain holds only the expiries that were re-fetched,
+        and every other cached expiry is carried over unchanged.
+        """
+        if chain.empty or "strike" not in chain.columns or "dte_calc" not in chain.columns:
+            previous = self.latest(symbol) if partial else None
+            return previous if previous is not None else ExposureSurfaceV2_5(symbol=symbol)
+
+        columns = [column for column in self.metrics.values() if column in chain.columns]
+        expiry_column = next((c for c in EXPIRY_COLUMNS if c in chain.columns), "dte_calc")
+        frame = chain[["strike"] + columns + ["dte_calc"]].rename(columns={"dte_calc": "dte"})
+        if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in frame.dtypes):
+            frame = frame.apply(pd.to_numeric, errors="coerce")
+        expiry = chain[expiry_column].rename("expiry")
+
+        # Per-expiry fingerprint: order-independent sum of row hashes (wraps on overflow)
+        row_hash = pd.util.hash_pandas_object(frame, index=False)
+        fingerprints = row_hash.groupby(expiry.to_numpy(), sort=False).sum().to_dict()
+
+        with self._lock:
+            state = self._states.get(symbol)
+            if state is None or state.columns != columns:
+                state = _SymbolSurfaceState(columns=columns)
+            changed = [key for key, value in fingerprints.items() if state.fingerprints.get(key) != value]
+
+            unchanged = not changed and state.surface is not None and (partial or len(fingerprints) == len(state.fingerprints))
+            if unchanged:
+                surface = state.surface.model_copy(update={"updated_dtes": [], "built_at": datetime.now()})
+                state.surface = surface
+                self._states[symbol] = state
+                return surface
+
+            kept = state.blocks
+            if kept is not None:
+                keep = ~kept.index.get_level_values("expiry").isin(changed)
+                if not partial:
+                    keep &= kept.index.get_level_values("expiry").isin(list(fingerprints))
+                kept = kept[keep]
+
+            if changed:
+                mask = expiry.isin(changed).to_numpy()
+                subset = frame[mask]
+                fresh = subset.groupby([expiry.to_numpy()[mask], subset["strike"].to_numpy()], sort=False).agg(
+                    {**{column: "sum" for column in columns}, "dte": "min"}
+                )
+                fresh.index.names = ["expiry", "strike"]
+                blocks = fresh if kept is None or kept.empty else pd.concat([kept, fresh])
+            else:
+                blocks = kept
+
+            if partial:
+                state.fingerprints.update(fingerprints)
+            else:
+                state.fingerprints = dict(fingerprints)
+            state.blocks = blocks
+            surface = self._to_surface(symbol, blocks, columns, changed)
+            state.surface = surface
+            self._states[symbol] = state
+
+        self.logger.debug(
+            f"Exposure surface for {symbol}: {len(surface.dtes)} expiries x {len(surface.strikes)} strikes, "
+            f"{len(changed)} expiries recomputed"
+        )
+        return surface
+
+    def _to_surface(self, symbol: str, blocks: pd.DataFrame, columns: List[str], changed: List[object]) -> ExposureSurfaceV2_5:
+        # One DTE per expiry (the minimum across its strikes) labels the rows
+        dte_by_expiry = blocks["dte"].groupby(level="expiry").min().sort_values(kind="stable")
+        expiry_row = pd.Index(dte_by_expiry.index).get_indexer(blocks.index.get_level_values("expiry"))
+        strikes, strike_col = np.unique(blocks.index.get_level_values("strike").to_numpy(dtype=float), return_inverse=True)
+
+        # Scatter the (expiry, strike) sums into dense grids; absent cells stay 0.0
+        dense = np.zeros((len(columns), len(dte_by_expiry), len(strikes)))
+        dense[:, expiry_row, strike_col] = np.nan_to_num(blocks[columns].to_numpy(dtype=float).T)
+        grids = {name: dense[columns.index(column)].tolist() for name, column in self.metrics.items() if column in columns}
+        return ExposureSurfaceV2_5(
+            symbol=symbol,
+            strikes=strikes.tolist(),
+            dtes=dte_by_expiry.to_numpy(dtype=float).tolist(),
+            grids=grids,
+            updated_dtes=dte_by_expiry.reindex(changed).dropna().sort_values().tolist(),
+            built_at=datetime.now(),
+        )
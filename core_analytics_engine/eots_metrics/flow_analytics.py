@@ -24,6 +24,11 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.ensemble import GradientBoostingClassifier
 
 from core_analytics_engine.eots_metrics.core_calculator import CoreCalculator
+from core_analytics_engine.eots_metrics.momentum_features import (
+    UNDERLYING_FLOW_SERIES,
+    FlowMomentumFeatureEngine,
+    FlowMomentumFeatures,
+)
 from data_management.enhanced_cache_manager_v2_5 import EnhancedCacheManagerV2_5
 
 logger = logging.getLogger(__name__)
@@ -59,8 +64,9 @@ class FlowAnalytics(CoreCalculator):
         self.flow_model = None  # Would be loaded from pre-trained model in production
         self.is_flow_model_trained = False
         
-        # Momentum detection cache
+        # Momentum detection cache: latest FlowMomentumFeatures per symbol
         self.momentum_cache = {}
+        self.flow_momentum = FlowMomentumFeatureEngine()
         
         # Flow classification thresholds (optimized from original modules)
         self.INSTITUTIONAL_THRESHOLD_PERCENTILE = 95.0
@@ -106,6 +112,12 @@ class FlowAnalytics(CoreCalculator):
             dwfd_raw, dwfd_z_score, dwfd_fvd = self._calculate_dwfd_optimized(und_data, symbol)
             tw_laf_raw, tw_laf_z_score, tw_laf_liquidity_factor_5m, tw_laf_time_weighted_sum = self._calculate_tw_laf_optimized(und_data, symbol)
 
+            # One O(1) ring-buffer update per cycle covers every tracked flow series; the raw
+            # Tier 3 metrics come from the values just computed, not from the model
+            observations = {name: getattr(und_data, name, None) for name in UNDERLYING_FLOW_SERIES}
+            observations.update(vapi_fa_raw=vapi_fa_raw, dwfd_raw=dwfd_raw, tw_laf_raw=tw_laf_raw)
+            self.momentum_cache[symbol] = self.flow_momentum.update(symbol, observations)
+
             self.logger.debug(f"Enhanced flow metrics calculation complete for {symbol}.")
 
             # STRICT PYDANTIC V2-ONLY: Update model fields directly, no dictionaries
@@ -328,6 +340,10 @@ class FlowAnalytics(CoreCalculator):
     # MOMENTUM DETECTION - Consolidated from elite_momentum_detector.py
     # =============================================================================
     
+    def get_flow_momentum(self, symbol: str) -> Optional[FlowMomentumFeatures]:
+        """Latest velocity/acceleration/persistence of the tracked flow series for a symbol"""
+        return self.momentum_cache.get(symbol)
+
     def _calculate_momentum_acceleration_index_optimized(self, und_data) -> float:
         """Optimized momentum acceleration calculation with proper Pydantic access"""
         try:
@@ -0,0 +1,285 @@
+# core_analytics_engine/eots_metrics/greek_engine.py
+
+"""
+EOTS Greek Engine - Vectorized Black-Scholes greeks and implied volatility
+
+Fills vendor gaps in options chains before MetricsCalculatorV2_5 runs:
+- Prices and greeks (delta, gamma, vega, theta, vanna, charm, vomma) for whole chains
+  with NumPy, in the same units as the ConvexValue feed (vega and vanna per vol point,
+  theta and charm per day)
+- Implied volatility solved for all rows at once by a bracketed Newton iteration
+  (bisection fallback whenever a Newton step leaves the bracket)
+- Only rows whose IV is missing, or whose greeks are missing or inconsistent with the
+  vendor IV, are recomputed; OI/volume-weighted exposures (gxoi, dxvolm, ...) are
+  rebuilt for the recomputed greeks so GEX/DEX/VEX aggregates stay consistent
+"""
+
+import logging
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, ConfigDict, Field
+from scipy.special import ndtr
+
+from data_models import GreekEnrichmentSettings
+
+logger = logging.getLogger(__name__)
+
+_INV_SQRT_2PI = 1.0 / np.sqrt(2.0 * np.pi)
+
+# Chain column for each greek, and the prefix of its OI/volume-weighted exposure columns
+GREEK_COLUMNS: Dict[str, str] = {
+    "delta": "delta_contract",
+    "gamma": "gamma_contract",
+    "vega": "vega_contract",
+    "theta": "theta_contract",
+    "vanna": "vanna_contract",
+    "vomma": "vomma_contract",
+    "charm": "charm_contract",
+}
+EXPOSURE_PREFIXES: Dict[str, str] = {
+    "delta": "dx", "gamma": "gx", "vega": "vx", "theta": "tx",
+    "vanna": "vannax", "vomma": "vommax", "charm": "charmx",
+}
+
+
+class GreekEnrichmentReport(BaseModel):
+    """What a single enrichment pass changed."""
+    contracts: int = Field(default=0, description="Contracts in the chain.", ge=0)
+    iv_solved: int = Field(default=0, description="Contracts whose IV was solved from price.", ge=0)
+    iv_unsolvable: int = Field(default=0, description="Contracts whose IV could not be solved from price; their greeks use the expiry median IV.", ge=0)
+    rows_recomputed: int = Field(default=0, description="Contracts whose full greek set was recomputed (missing IV or inconsistent greeks).", ge=0)
+    inconsistent_rows: int = Field(default=0, description="Contracts whose vendor greeks disagreed with the vendor IV.", ge=0)
+    cells_filled: int = Field(default=0, description="Greek cells written by the engine.", ge=0)
+    elapsed_ms: float = Field(default=0.0, description="Wall-clock time of the pass in milliseconds.", ge=0.0)
+
+    model_config = ConfigDict(extra='forbid')
+
+
+def black_scholes_greeks(spot: np.ndarray, strike: np.ndarray, t_years: np.ndarray, iv: np.ndarray,
+                         is_call: np.ndarray, r: float = 0.0, q: float = 0.0) -> Dict[str, np.ndarray]:
+    """Vectorized Black-Scholes-Merton price and greeks (vega/vanna per vol point, theta/charm per day)."""
+    sqrt_t = np.sqrt(t_years)
+    sig_sqrt_t = iv * sqrt_t
+    d1 = (np.log(spot / strike) + (r - q + 0.5 * iv * iv) * t_years) / sig_sqrt_t
+    d2 = d1 - sig_sqrt_t
+    pdf_d1 = _INV_SQRT_2PI * np.exp(-0.5 * d1 * d1)
+    disc_r = np.exp(-r * t_years)
+    disc_q = np.exp(-q * t_years)
+    cdf_d1, cdf_d2 = ndtr(d1), ndtr(d2)
+
+    call_price = spot * disc_q * cdf_d1 - strike * disc_r * cdf_d2
+    price = np.where(is_call, call_price, call_price - spot * disc_q + strike * disc_r)
+    delta = np.where(is_call, disc_q * cdf_d1, disc_q * (cdf_d1 - 1.0))
+    gamma = disc_q * pdf_d1 / (spot * sig_sqrt_t)
+    vega = spot * disc_q * pdf_d1 * sqrt_t / 100.0
+    theta_common = -spot * disc_q * pdf_d1 * iv / (2.0 * sqrt_t)
+    theta = np.where(
+        is_call,
+        theta_common - r * strike * disc_r * cdf_d2 + q * spot * disc_q * cdf_d1,
+        theta_common + r * strike * disc_r * ndtr(-d2) - q * spot * disc_q * ndtr(-d1),
+    ) / 365.0
+    vanna = -disc_q * pdf_d1 * d2 / iv / 100.0
+    vomma = vega * d1 * d2 / iv
+    charm_common = -disc_q * pdf_d1 * (2.0 * (r - q) * t_years - d2 * sig_sqrt_t) / (2.0 * t_years * sig_sqrt_t)
+    charm = np.where(is_call, charm_common + q * disc_q * cdf_d1, charm_common - q * disc_q * ndtr(-d1)) / 365.0
+    return {
+        "price": price, "delta": delta, "gamma": gamma, "vega": vega, "theta": theta,
+        "vanna": vanna, "vomma": vomma, "charm": charm,
+    }
+
+
+def implied_volatility(price: np.ndarray, spot: np.ndarray, strike: np.ndarray, t_years: np.ndarray,
+                       is_call: np.ndarray, r: float = 0.0, q: float = 0.0, lower: float = 0.005,
+                       upper: float = 5.0, tol: float = 1e-8, max_iter: int = 50) -> np.ndarray:
+    """
+    Solve Black-Scholes implied volatility for every element at once.
+
+    Each element keeps a [lo, hi] bracket that is narrowed after every evaluation;
+    a Newton step is taken when it stays inside the bracket, otherwise the element
+    bisects. An element converges when its model price is within ``tol`` (relative)
+    of the target. Prices outside the no-arbitrage bounds (or outside the bracket's price
+    range) return NaN.
+    """
+    price, spot, strike, t_years, is_call = np.broadcast_arrays(
+        np.asarray(price, float), np.asarray(spot, float), np.asarray(strike, float),
+        np.asarray(t_years, float), np.asarray(is_call, bool))
+    n = price.size
+    result = np.full(n, np.nan)
+    disc_r, disc_q = np.exp(-r * t_years), np.exp(-q * t_years)
+    intrinsic = np.where(is_call, np.maximum(spot * disc_q - strike * disc_r, 0.0), np.maximum(strike * disc_r - spot * disc_q, 0.0))
+    ceiling = np.where(is_call, spot * disc_q, strike * disc_r)
+    valid = np.isfinite(price) & (price > intrinsic) & (price < ceiling) & (t_years > 0) & (spot > 0) & (strike > 0)
+
+    idx = np.flatnonzero(valid)
+    if idx.size == 0:
+        return result
+    S, K, T, C, P = spot[idx], strike[idx], t_years[idx], is_call[idx], price[idx]
+    lo = np.full(idx.size, lower)
+    hi = np.full(idx.size, upper)
+    # Brenner-Subrahmanyam starting point
+    sigma = np.clip(np.sqrt(2.0 * np.pi / T) * P / S, lower * 2.0, upper / 2.0)
+
+    active = np.arange(idx.size)
+    for _ in range(max_iter):
+        s, k, t, c, p, sig = S[active], K[active], T[active], C[active], P[active], sigma[active]
+        with np.errstate(all="ignore"):
+            greeks = black_scholes_greeks(s, k, t, sig, c, r, q)
+            diff = greeks["price"] - p
+            newton = sig - diff / (greeks["vega"] * 100.0)
+        done = np.abs(diff) <= tol * p
+        result[idx[active[done]]] = sig[done]
+
+        above = diff > 0
+        hi[active] = np.where(above, sig, hi[active])
+        lo[active] = np.where(above, lo[active], sig)
+        lo_a, hi_a = lo[active], hi[active]
+        inside = np.isfinite(newton) & (newton > lo_a) & (newton < hi_a)
+        sigma[active] = np.where(inside, newton, 0.5 * (lo_a + hi_a))
+
+        collapsed = ~done & (hi_a - lo_a <= 1e-12)
+        _accept_interior(result, idx[active[collapsed]], sigma[active[collapsed]], lower, upper)
+        active = active[~done & ~collapsed]
+        if active.size == 0:
+            break
+
+    # Elements still open after max_iter are accepted unless they ran into a bound
+    _accept_interior(result, idx[active], sigma[active], lower, upper)
+    return result
+
+
+def _accept_interior(result: np.ndarray, positions: np.ndarray, sigma: np.ndarray, lower: float, upper: float) -> None:
+    ok = (sigma > lower * (1 + 1e-9)) & (sigma < upper * (1 - 1e-9))
+    result[positions[ok]] = sigma[ok]
+
+
+class BlackScholesGreekEngine:
+    """
+    Optional enrichment stage that repairs vendor IV/greek gaps in a chain DataFrame.
+
+    Columns follow RawOptionsContractV2_5 (strike, opt_kind, dte_calc, iv, bid_price,
+    ask_price, raw_price, *_contract greeks, open_interest, volm). Missing
+    columns are treated as all-missing.
+    """
+
+    def __init__(self, config: Optional[GreekEnrichmentSettings] = None):
+        self.config = config or GreekEnrichmentSettings()
+        self.logger = logger.getChild(self.__class__.__name__)
+        self.last_report: Optional[GreekEnrichmentReport] = None
+
+    def enrich_chain(self, chain: pd.DataFrame, spot: float) -> Tuple[pd.DataFrame, GreekEnrichmentReport]:
+        """Return a copy of ``chain`` with missing/inconsistent IV and greeks recomputed."""
+        start = time.perf_counter()
+        cfg = self.config
+        report = GreekEnrichmentReport(contracts=len(chain))
+        if chain.empty or not spot or spot <= 0 or "strike" not in chain.columns:
+            self.last_report = report
+            return chain, report
+
+        n = len(chain)
+        strike = self._column(chain, "strike")
+        is_call = chain["opt_kind"].astype(str).str.lower().str.startswith("c").to_numpy() if "opt_kind" in chain.columns else np.ones(n, bool)
+        dte = np.nan_to_num(self._column(chain, "dte_calc"), nan=0.0)
+        t_years = np.maximum(dte, cfg.min_time_to_expiry_days) / 365.0
+        spot_arr = np.full(n, float(spot))
+        r, q = cfg.risk_free_rate, cfg.dividend_yield
+
+        vendor_iv = self._column(chain, "iv")
+        iv_ok = np.isfinite(vendor_iv) & (vendor_iv >= cfg.iv_lower_bound) & (vendor_iv <= cfg.iv_upper_bound) & (strike > 0)
+
+        # Model greeks at the vendor IV flag stale/inconsistent vendor greeks
+        vendor = {g: self._column(chain, col) for g, col in GREEK_COLUMNS.items()}
+        with np.errstate(all="ignore"):
+            at_vendor_iv = black_scholes_greeks(spot_arr, strike, t_years, np.where(iv_ok, vendor_iv, 0.2), is_call, r, q)
+        delta_v = vendor["delta"]
+        bad_delta = np.isfinite(delta_v) & (
+            np.where(is_call, (delta_v < 0.0) | (delta_v > 1.0), (delta_v > 0.0) | (delta_v < -1.0))
+            | (np.abs(delta_v - at_vendor_iv["delta"]) > cfg.delta_tolerance)
+        )
+        inconsistent = iv_ok & (bad_delta | (vendor["gamma"] < 0.0) | (vendor["vega"] < 0.0))
+
+        # Solve IV from price where the vendor IV is unusable
+        iv = np.where(iv_ok, vendor_iv, np.nan)
+        need_iv = ~iv_ok & (strike > 0)
+        if need_iv.any():
+            price = self._option_price(chain)[need_iv]
+            solved = implied_volatility(price, spot_arr[need_iv], strike[need_iv], t_years[need_iv], is_call[need_iv], r, q,
+                                        cfg.iv_lower_bound, cfg.iv_upper_bound, cfg.iv_price_tolerance, cfg.iv_max_iterations)
+            iv[need_iv] = solved
+            report.iv_solved = int(np.isfinite(solved).sum())
+            report.iv_unsolvable = int(need_iv.sum() - report.iv_solved)
+
+        # Quotes at/below intrinsic (or with no time value left) have no identifiable IV; price
+        # them at the expiry's median IV so delta/gamma still take their limiting values.
+        greek_iv = iv
+        unsolved = need_iv & ~np.isfinite(iv)
+        if unsolved.any() and np.isfinite(iv).any():
+            expiry_iv = pd.Series(iv).groupby(dte).transform("median").to_numpy()
+            greek_iv = iv.copy()
+            greek_iv[unsolved] = np.where(np.isfinite(expiry_iv[unsolved]), expiry_iv[unsolved], np.nanmedian(iv))
+
+        priceable = np.isfinite(greek_iv)
+        recompute_row = priceable & (need_iv | inconsistent)
+        # Only null/NaN cells (or absent columns) are gaps; a vendor greek of exactly 0.0 is a value
+        missing_cell = {g: ~np.isfinite(v) for g, v in vendor.items()}
+        replace = {g: priceable & (recompute_row | missing_cell[g]) for g in GREEK_COLUMNS}
+        if not any(mask.any() for mask in replace.values()) and not report.iv_solved:
+            report.elapsed_ms = (time.perf_counter() - start) * 1000.0
+            self.last_report = report
+            return chain, report
+
+        rows = np.flatnonzero(np.logical_or.reduce(list(replace.values())))
+        with np.errstate(all="ignore"):
+            model = black_scholes_greeks(spot_arr[rows], strike[rows], t_years[rows], greek_iv[rows], is_call[rows], r, q)
+
+        out = chain.copy()
+        if report.iv_solved:
+            out["iv"] = np.where(need_iv & np.isfinite(iv), iv, vendor_iv)
+        oi = np.nan_to_num(self._column(chain, "open_interest"), nan=0.0)
+        volm = np.nan_to_num(self._column(chain, "volm"), nan=0.0)
+        cells = 0
+        for greek, column in GREEK_COLUMNS.items():
+            mask = replace[greek][rows]
+            if not mask.any():
+                continue
+            values = vendor[greek].copy()
+            target = rows[mask]
+            values[target] = model[greek][mask]
+            out[column] = values
+            cells += int(mask.sum())
+            if cfg.recompute_exposures:
+                prefix = EXPOSURE_PREFIXES[greek]
+                for suffix, weight in (("oi", oi), ("volm", volm)):
+                    exposure_column = f"{prefix}{suffix}"
+                    exposure = self._column(chain, exposure_column)
+                    # Per-share greek x contracts, like the feed; calculators apply the multiplier
+                    exposure[target] = values[target] * weight[target]
+                    out[exposure_column] = exposure
+
+        report.rows_recomputed = int(recompute_row.sum())
+        report.inconsistent_rows = int(inconsistent.sum())
+        report.cells_filled = cells
+        report.elapsed_ms = (time.perf_counter() - start) * 1000.0
+        self.last_report = report
+        self.logger.debug(
+            f"Greek enrichment: {report.cells_filled} cells over {rows.size}/{n} contracts "
+            f"({report.iv_solved} IVs solved, {report.inconsistent_rows} inconsistent) in {report.elapsed_ms:.1f} ms"
+        )
+        return out, report
+
+    @staticmethod
+    def _column(frame: pd.DataFrame, name: str) -> np.ndarray:
+        if name not in frame.columns:
+            return np.full(len(frame), np.nan)
+        return pd.to_numeric(frame[name], errors="coerce").to_numpy(dtype=float, na_value=np.nan, copy=True)
+
+    def _option_price(self, chain: pd.DataFrame) -> np.ndarray:
+        """Mid of a sane bid/ask quote, else the vendor's last price."""
+        bid = self._column(chain, "bid_price")
+        ask = self._column(chain, "ask_price")
+        last = self._column(chain, "raw_price")
+        quote_ok = np.isfinite(bid) & np.isfinite(ask) & (bid > 0) & (ask >= bid)
+        price = np.where(quote_ok, 0.5 * (bid + ask), last)
+        return np.where(np.isfinite(price) & (price > 0), price, np.nan)
@@ -0,0 +1,280 @@
+"""
+Incremental flow-momentum features.
+
+EliteMomentumDetector.calculate_flow_velocity / calculate_flow_acceleration /
+calculate_momentum_persistence take one pd.Series and recompute diffs and window
+statistics on every call. FlowMomentumFeatureEngine keeps a ring buffer of the
+last `window` observations of every tracked flow series per symbol, together with
+the running aggregates those three features need (positive-change count,
+absolute-change sum, Welford mean/M2). Each new observation updates them in O(1)
+per series, and the features of all series (and, with update_batch, all symbols)
+come out of one NumPy array expression.
+
+Semantics match the per-series functions applied to the last `window`
+observations, with one difference: non-finite observations are stored as 0.0,
+which is how the callers fill missing flow.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Rolling flows read off ProcessedUnderlyingAggregatesV2_5
+UNDERLYING_FLOW_SERIES: Tuple[str, ...] = (
+    "net_vol_flow_5m_und",
+    "net_vol_flow_15m_und",
+    "net_vol_flow_30m_und",
+    "net_value_flow_5m_und",
+    "net_value_flow_15m_und",
+)
+# Raw Tier 3 flow metrics, computed by FlowAnalytics each cycle (the model has no fields for them)
+DERIVED_FLOW_SERIES: Tuple[str, ...] = ("vapi_fa_raw", "dwfd_raw", "tw_laf_raw")
+TRACKED_FLOW_SERIES: Tuple[str, ...] = UNDERLYING_FLOW_SERIES + DERIVED_FLOW_SERIES
+MIN_PERSISTENCE_OBSERVATIONS = 10
+
+Observations = Union[Mapping[str, Any], Sequence[float], np.ndarray]
+
+
+def _persistence(positive: np.ndarray, abs_sum: np.ndarray, count: np.ndarray, std: np.ndarray) -> np.ndarray:
+    """Share of rising steps, scaled down when the average step is small relative to the level std."""
+    n_changes = np.maximum(count - 1, 1)
+    magnitude = np.maximum(abs_sum, 0.0) / n_changes
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # A flat series has std 0; the per-series function then takes min(1.0, inf/nan) == 1.0
+        factor = np.where(std > 0, np.minimum(1.0, magnitude / std), 1.0)
+    score = positive / n_changes * factor
+    return np.where(count >= MIN_PERSISTENCE_OBSERVATIONS, score, 0.0)
+
+
+def flow_momentum_matrix(history: Any, period: int = 5) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Velocity, acceleration and persistence at the last row of a (time x series) matrix.
+
+    Stateless counterpart of FlowMomentumFeatureEngine, used to seed it and as the
+    vectorized form of the per-series EliteMomentumDetector functions.
+    """
+    values = np.asarray(history, dtype=float)
+    if values.ndim == 1:
+        values = values.reshape(-1, 1)
+    values = np.where(np.isfinite(values), values, 0.0)
+    n, k = values.shape
+    zeros = np.zeros(k)
+    velocity = values[-1] - values[-1 - period] if n > period else zeros
+    acceleration = values[-1] - 2.0 * values[-1 - period] + values[-1 - 2 * period] if n > 2 * period else zeros
+    if n < MIN_PERSISTENCE_OBSERVATIONS:
+        return velocity, acceleration, zeros
+    changes = np.diff(values, axis=0)
+    persistence = _persistence((changes > 0).sum(axis=0), np.abs(changes).sum(axis=0),
+                               np.full(k, n), values.std(axis=0, ddof=1))
+    return velocity, acceleration, persistence
+
+
+@dataclass(frozen=True)
+class FlowMomentumFeatures:
+    """Latest momentum features of every tracked series for one symbol."""
+    symbol: str
+    series_names: Tuple[str, ...]
+    observations: int
+    velocity: np.ndarray
+    acceleration: np.ndarray
+    persistence: np.ndarray
+
+    def get(self, series_name: str) -> Dict[str, float]:
+        i = self.series_names.index(series_name)
+        return {
+            "velocity": float(self.velocity[i]),
+            "acceleration": float(self.acceleration[i]),
+            "persistence": float(self.persistence[i]),
+        }
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        return {name: self.get(name) for name in self.series_names}
+
+
+class FlowMomentumFeatureEngine:
+    """Per-symbol ring buffers of tracked flow series with O(1) momentum feature updates."""
+
+    def __init__(self, series_names: Iterable[str] = TRACKED_FLOW_SERIES, period: int = 5,
+                 window: int = 60, initial_symbols: int = 8):
+        self.series_names = tuple(series_names)
+        if not self.series_names:
+            raise ValueError("FlowMomentumFeatureEngine needs at least one series")
+        if period < 1:
+            raise ValueError(f"period must be positive, got {period}")
+        self.period = int(period)
+        # Acceleration needs 2 * period + 1 points and persistence 10
+        self.window = max(int(window), 2 * self.period + 1, MIN_PERSISTENCE_OBSERVATIONS)
+        self._index: Dict[str, int] = {}
+        self._allocate(max(int(initial_symbols), 1))
+
+    # ------------------------------------------------------------------ state
+
+    def _allocate(self, capacity: int) -> None:
+        k, w = len(self.series_names), self.window
+        self._values = np.zeros((capacity, w, k))
+        self._head = np.zeros(capacity, dtype=np.int64)  # slot receiving the next observation
+        self._count = np.zeros(capacity, dtype=np.int64)
+        self._since_refresh = np.zeros(capacity, dtype=np.int64)
+        self._positive = np.zeros((capacity, k))
+        self._abs_sum = np.zeros((capacity, k))
+        self._mean = np.zeros((capacity, k))
+        self._m2 = np.zeros((capacity, k))
+
+    def _grow(self) -> None:
+        old = (self._values, self._head, self._count, self._since_refresh,
+               self._positive, self._abs_sum, self._mean, self._m2)
+        self._allocate(2 * len(self._head))
+        new = (self._values, self._head, self._count, self._since_refresh,
+               self._positive, self._abs_sum, self._mean, self._m2)
+        for target, source in zip(new, old):
+            target[:len(source)] = source
+
+    def _row(self, symbol: str) -> int:
+        row = self._index.get(symbol)
+        if row is None:
+            if len(self._index) == len(self._head):
+                self._grow()
+            row = self._index[symbol] = len(self._index)
+        return row
+
+    def _observation_vector(self, observations: Observations) -> np.ndarray:
+        if isinstance(observations, Mapping):
+            raw = [observations.get(name) for name in self.series_names]
+            values = np.array([np.nan if v is None else v for v in raw], dtype=float)
+        else:
+            values = np.asarray(observations, dtype=float).reshape(-1)
+            if values.shape[0] != len(self.series_names):
+                raise ValueError(f"Expected {len(self.series_names)} observations, got {values.shape[0]}")
+        return np.where(np.isfinite(values), values, 0.0)
+
+    @property
+    def symbols(self) -> Tuple[str, ...]:
+        return tuple(self._index)
+
+    def reset(self, symbol: Optional[str] = None) -> None:
+        """Forget one symbol's history, or every symbol's."""
+        if symbol is None:
+            self._index.clear()
+            self._allocate(len(self._head))
+            return
+        row = self._index.get(symbol)
+        if row is None:
+            return
+        for array in (self._values, self._head, self._count, self._since_refresh,
+                      self._positive, self._abs_sum, self._mean, self._m2):
+            array[row] = 0
+
+    # ---------------------------------------------------------------- updates
+
+    def update(self, symbol: str, observations: Observations) -> FlowMomentumFeatures:
+        """Append one observation of every tracked series and return the updated features."""
+        return self.update_batch({symbol: observations})[symbol]
+
+    def update_from_model(self, symbol: str, source: Any) -> FlowMomentumFeatures:
+        """Append the tracked series read as attributes of a data model (missing values count as 0)."""
+        return self.update(symbol, {name: getattr(source, name, None) for name in self.series_names})
+
+    def update_batch(self, observations_by_symbol: Mapping[str, Observations]) -> Dict[str, FlowMomentumFeatures]:
+        """Append one observation per symbol and compute all their features in one pass."""
+        symbols = list(observations_by_symbol)
+        if not symbols:
+            return {}
+        rows = np.array([self._row(s) for s in symbols], dtype=np.int64)
+        x = np.vstack([self._observation_vector(observations_by_symbol[s]) for s in symbols])
+        self._append(rows, x)
+        return self._features(symbols, rows)
+
+    def seed(self, symbol: str, history: Any) -> FlowMomentumFeatures:
+        """Replace a symbol's buffer with the tail of a (time x series) history matrix."""
+        values = np.asarray(history, dtype=float)
+        if values.ndim == 1:
+            values = values.reshape(-1, 1)
+        self.reset(symbol)
+        row = self._row(symbol)
+        rows = np.array([row], dtype=np.int64)
+        for observation in values[-self.window:]:
+            self._append(rows, self._observation_vector(observation)[None, :])
+        return self._features([symbol], rows)[symbol]
+
+    def features(self, symbol: str) -> Optional[FlowMomentumFeatures]:
+        """Current features of a symbol without appending anything."""
+        row = self._index.get(symbol)
+        if row is None:
+            return None
+        return self._features([symbol], np.array([row], dtype=np.int64))[symbol]
+
+    def _append(self, rows: np.ndarray, x: np.ndarray) -> None:
+        w = self.window
+        head = self._head[rows]
+        count = self._count[rows].copy()
+
+        full = count == w
+        if full.any():
+            # The oldest observation sits in the slot about to be overwritten; the
+            # change leading out of it leaves the window together with it.
+            fr, fh = rows[full], head[full]
+            oldest = self._values[fr, fh]
+            dropped = self._values[fr, (fh + 1) % w] - oldest
+            self._positive[fr] -= dropped > 0
+            self._abs_sum[fr] -= np.abs(dropped)
+            mean = self._mean[fr]
+            reduced_mean = mean - (oldest - mean) / (w - 1)
+            self._m2[fr] -= (oldest - mean) * (oldest - reduced_mean)
+            self._mean[fr] = reduced_mean
+            count[full] -= 1
+
+        previous = self._values[rows, (head - 1) % w]
+        change = np.where((count > 0)[:, None], x - previous, 0.0)
+        self._positive[rows] += change > 0
+        self._abs_sum[rows] += np.abs(change)
+        count += 1
+        delta = x - self._mean[rows]
+        mean = self._mean[rows] + delta / count[:, None]
+        self._m2[rows] += delta * (x - mean)
+        self._mean[rows] = mean
+
+        self._values[rows, head] = x
+        self._head[rows] = (head + 1) % w
+        self._count[rows] = count
+        self._since_refresh[rows] += 1
+        stale = self._since_refresh[rows] >= w
+        if stale.any():
+            self._refresh(rows[stale])
+
+    def _refresh(self, rows: np.ndarray) -> None:
+        """Recompute the running aggregates exactly once per window so rounding cannot drift."""
+        # Only called on full buffers, whose oldest observation is at the head slot
+        order = (self._head[rows][:, None] + np.arange(self.window)) % self.window
+        ordered = self._values[rows[:, None], order]
+        changes = np.diff(ordered, axis=1)
+        self._positive[rows] = (changes > 0).sum(axis=1)
+        self._abs_sum[rows] = np.abs(changes).sum(axis=1)
+        mean = ordered.mean(axis=1)
+        self._mean[rows] = mean
+        self._m2[rows] = ((ordered - mean[:, None, :]) ** 2).sum(axis=1)
+        self._since_refresh[rows] = 0
+
+    def _features(self, symbols: Sequence[str], rows: np.ndarray) -> Dict[str, FlowMomentumFeatures]:
+        w, p = self.window, self.period
+        count = self._count[rows]
+        last = (self._head[rows] - 1) % w
+        x = self._values[rows, last]
+        lag = self._values[rows, (last - p) % w]
+        lag2 = self._values[rows, (last - 2 * p) % w]
+        velocity = np.where((count > p)[:, None], x - lag, 0.0)
+        acceleration = np.where((count > 2 * p)[:, None], x - 2.0 * lag + lag2, 0.0)
+        counts = count[:, None]
+        std = np.sqrt(np.maximum(self._m2[rows], 0.0) / np.maximum(counts - 1, 1))
+        persistence = _persistence(self._positive[rows], self._abs_sum[rows], counts, std)
+        return {
+            symbol: FlowMomentumFeatures(
+                symbol=symbol,
+                series_names=self.series_names,
+                observations=int(count[i]),
+                velocity=velocity[i],
+                acceleration=acceleration[i],
+                persistence=persistence[i],
+            )
+            for i, symbol in enumerate(symbols)
+        }
@@ -58,7 +58,7 @@ from utils.config_manager_v2_5 import ConfigManagerV2_5
 from core_analytics_engine.eots_metrics import MetricsCalculatorV2_5
 from core_analytics_engine.market_regime_engine_v2_5 import MarketRegimeEngineV2_5
 from core_analytics_engine.market_intelligence_engine_v2_5 import MarketIntelligenceEngineV2_5
-from core_analytics_engine.atif_engine_v2_5 import ATIFEngineV2_5
+from core_analytics_engine.atif_engine_v2_5 import ATIFEngineV2_5, ConsolidatedAnalysisRequest
 from core_analytics_engine.news_intelligence_engine_v2_5 import NewsIntelligenceEngineV2_5
 from core_analytics_engine.adaptive_learning_integration_v2_5 import AdaptiveLearningIntegrationV2_5
 from data_management.enhanced_cache_manager_v2_5 import EnhancedCacheManagerV2_5
@@ -67,6 +67,10 @@ from data_management.historical_data_manager_v2_5 import HistoricalDataManagerV2
 from data_management.performance_tracker_v2_5 import PerformanceTrackerV2_5
 from data_management.convexvalue_data_fetcher_v2_5 import ConvexValueDataFetcherV2_5
 from data_management.tradier_data_fetcher_v2_5 import TradierDataFetcherV2_5
+from data_management.snapshot_recorder_v2_5 import SnapshotRecorderV2_5
+from utils.stage_tracer_v2_5 import configure_stage_tracer, trace_span, traced
+from core_analytics_engine.analysis_worker_pool_v2_5 import AnalysisWorkerPoolV2_5, AnalysisWorkerError
+from core_analytics_engine.key_level_tracker_v2_5 import KeyLevelTrackerV2_5
 
 # Import Elite components - Updated to use consolidated elite_intelligence
 from core_analytics_engine.eots_metrics.elite_intelligence import EliteConfig, ConvexValueColumns, EliteImpactColumns, MarketRegime, FlowType
@@ -165,6 +169,13 @@ class ITSOrchestratorV2_5:
             self.convex_fetcher = None
             self.tradier_fetcher = None
 
+        # Optionally record every raw fetch for offline replay (data_management/snapshot_replay_v2_5.py)
+        self.snapshot_recorder = None
+        recording_settings = config_manager.get_setting("snapshot_recording_settings", None)
+        if recording_settings is not None and recording_settings.enabled and self.convex_fetcher is not None:
+            self.snapshot_recorder = SnapshotRecorderV2_5.from_settings(recording_settings)
+            self.convex_fetcher, self.tradier_fetcher = self.snapshot_recorder.wrap_fetchers(self.convex_fetcher, self.tradier_fetcher)
+
         # Initialize metrics calculator
         # Get elite_config - now properly returns EliteConfig Pydantic model
         elite_config_obj = config_manager.get_setting("elite_config", None)
@@ -218,6 +229,22 @@ class ITSOrchestratorV2_5:
         # CRITICAL FIX: Initialize KeyLevelIdentifierV2_5 for real-time key level generation
         self.key_level_identifier = KeyLevelIdentifierV2_5(config_manager)
 
+        # Optionally track real-time key levels incrementally (hysteresis + per-cycle level diffs)
+        self.key_level_tracker = None
+        tracking_settings = config_manager.get_setting("key_level_tracking_settings", None)
+        if tracking_settings is not None and tracking_settings.enabled:
+            self.key_level_tracker = KeyLevelTrackerV2_5.from_settings(self.key_level_identifier, tracking_settings)
+
+        # Per-stage tracing (Prometheus stage histograms + slowest-cycle span trees)
+        self.stage_tracer = configure_stage_tracer(config_manager.get_setting("stage_tracing_settings", None))
+
+        # Optionally shard metric calculation + key-level scoring across worker processes by symbol
+        self.worker_pool = None
+        worker_pool_settings = config_manager.get_setting("analysis_worker_pool_settings", None)
+        if worker_pool_settings is not None and worker_pool_settings.enabled:
+            self.worker_pool = AnalysisWorkerPoolV2_5.from_settings(worker_pool_settings)
+            self.worker_pool.start()
+
         # Initialize system state with all required fields
         self.system_state = SystemStateV2_5(
             is_running=True,
@@ -495,85 +522,91 @@ class ITSOrchestratorV2_5:
         Focus on high-probability setups with clear risk/reward profiles.
         """
     
+    @traced("analysis_cycle", symbol_arg="ticker")
     async def run_full_analysis_cycle(self, ticker: str, dte_min: int, dte_max: int, price_range_percent: int, **kwargs) -> FinalAnalysisBundleV2_5:
         """
         Run a complete analysis cycle with all experts, using only live data.
         """
+        if self.snapshot_recorder is not None:
+            self.snapshot_recorder.begin_cycle(
+                ticker, {"dte_min": dte_min, "dte_max": dte_max, "price_range_percent": price_range_percent})
         try:
             self.logger.debug(f"🚀 Starting full analysis cycle for {ticker}...")
             start_time = datetime.now()
 
             # Step 1: Fetch live data (ConvexValue primary, Tradier fallback)
             self.logger.debug(f"🔄 Fetching live data for {ticker}...")
-            chain_data, underlying_data = await self.convex_fetcher.fetch_chain_and_underlying(
-                session=None,
-                symbol=ticker,
-                dte_min=dte_min,
-                dte_max=dte_max,
-                price_range_percent=price_range_percent
-            )
-            if not underlying_data or not chain_data:
-                self.logger.warning(f"ConvexValue fetch failed, trying Tradier fallback for {ticker}")
-                async with self.tradier_fetcher as tradier:
-                    chain_data, underlying_data = await tradier.fetch_chain_and_underlying(ticker)
-            if not underlying_data or not chain_data:
-                raise RuntimeError(f"Failed to fetch live data from both ConvexValue and Tradier for {ticker}.")
+            with trace_span("fetch"):
+                chain_data, underlying_data = await self.convex_fetcher.fetch_chain_and_underlying(
+                    session=None,
+                    symbol=ticker,
+                    dte_min=dte_min,
+                    dte_max=dte_max,
+                    price_range_percent=price_range_percent
+                )
+                if not underlying_data or not chain_data:
+                    self.logger.warning(f"ConvexValue fetch failed, trying Tradier fallback for {ticker}")
+                    async with self.tradier_fetcher as tradier:
+                        chain_data, underlying_data = await tradier.fetch_chain_and_underlying(ticker)
+                if not underlying_data or not chain_data:
+                    raise RuntimeError(f"Failed to fetch live data from both ConvexValue and Tradier for {ticker}.")
 
             # CRITICAL FIX: Enrich ConvexValue data with Tradier OHLC data for price change calculations
-            if underlying_data and (
-                underlying_data.price_change_pct_und is None or
-                underlying_data.day_open_price_und is None or
-                underlying_data.prev_day_close_price_und is None
-            ):
-                self.logger.info(f"🔄 Enriching {ticker} data with Tradier OHLC for price change calculations...")
-                try:
-                    async with self.tradier_fetcher as tradier:
-                        # Fetch historical data to get previous close and today's open
-                        historical_data = await tradier.fetch_historical_data(ticker, days=2)
-                        if historical_data and 'data' in historical_data and len(historical_data['data']) >= 1:
-                            # Get the most recent day's data
-                            latest_day = historical_data['data'][-1]
-                            prev_day = historical_data['data'][-2] if len(historical_data['data']) >= 2 else latest_day
+            with trace_span("ohlc_enrichment"):
+                if underlying_data and (
+                    underlying_data.price_change_pct_und is None or
+                    underlying_data.day_open_price_und is None or
+                    underlying_data.prev_day_close_price_und is None
+                ):
+                    self.logger.info(f"🔄 Enriching {ticker} data with Tradier OHLC for price change calculations...")
+                    try:
+                        async with self.tradier_fetcher as tradier:
+                            # Fetch historical data to get previous close and today's open
+                            historical_data = await tradier.fetch_historical_data(ticker, days=2)
+                            if historical_data and 'data' in historical_data and len(historical_data['data']) >= 1:
+                                # Get the most recent day's data
+                                latest_day = historical_data['data'][-1]
+                                prev_day = historical_data['data'][-2] if len(historical_data['data']) >= 2 else latest_day
 
-                            # Calculate price changes using real OHLC data
-                            current_price = float(underlying_data.price)
-                            day_open = float(latest_day.get('open', current_price))
-                            prev_close = float(prev_day.get('close', current_price))
-                            day_high = float(latest_day.get('high', current_price))
-                            day_low = float(latest_day.get('low', current_price))
+                                # Calculate price changes using real OHLC data
+                                current_price = float(underlying_data.price)
+                                day_open = float(latest_day.get('open', current_price))
+                                prev_close = float(prev_day.get('close', current_price))
+                                day_high = float(latest_day.get('high', current_price))
+                                day_low = float(latest_day.get('low', current_price))
 
-                            # Calculate price changes
-                            price_change_abs = current_price - prev_close if prev_close > 0 else 0.0
-                            price_change_pct = (price_change_abs / prev_close) if prev_close > 0 else 0.0
+                                # Calculate price changes
+                                price_change_abs = current_price - prev_close if prev_close > 0 else 0.0
+                                price_change_pct = (price_change_abs / prev_close) if prev_close > 0 else 0.0
 
-                            # Create enriched underlying data with OHLC fields populated
-                            enrichment_data = {
-                                'price_change_abs_und': price_change_abs,
-                                'price_change_pct_und': price_change_pct,
-                                'day_open_price_und': day_open,
-                                'day_high_price_und': day_high,
-                                'day_low_price_und': day_low,
-                                'prev_day_close_price_und': prev_close
-                            }
+                                # Create enriched underlying data with OHLC fields populated
+                                enrichment_data = {
+                                    'price_change_abs_und': price_change_abs,
+                                    'price_change_pct_und': price_change_pct,
+                                    'day_open_price_und': day_open,
+                                    'day_high_price_und': day_high,
+                                    'day_low_price_und': day_low,
+                                    'prev_day_close_price_und': prev_close
+                                }
 
-                            # CRITICAL FIX: Add missing flow fields using ConvexValue data
-                            # Map ConvexValue flow fields to expected field names for elite intelligence
-                            if hasattr(underlying_data, 'value_bs') and underlying_data.value_bs is not None:
-                                enrichment_data['net_value_flow_5m_und'] = underlying_data.value_bs
-                                self.logger.info(f"✅ Mapped value_bs ({underlying_data.value_bs}) to net_value_flow_5m_und")
+                                # CRITICAL FIX: Add missing flow fields using ConvexValue data
+                                # Map ConvexValue flow fields to expected field names for elite intelligence
+                                if hasattr(underlying_data, 'value_bs') and underlying_data.value_bs is not None:
+                                    enrichment_data['net_value_flow_5m_und'] = underlying_data.value_bs
+                                    self.logger.info(f"✅ Mapped value_bs ({underlying_data.value_bs}) to net_value_flow_5m_und")
 
-                            if hasattr(underlying_data, 'volm_bs') and underlying_data.volm_bs is not None:
-                                enrichment_data['net_vol_flow_5m_und'] = underlying_data.volm_bs
-                                self.logger.info(f"✅ Mapped volm_bs ({underlying_data.volm_bs}) to net_vol_flow_5m_und")
+                                if hasattr(underlying_data, 'volm_bs') and underlying_data.volm_bs is not None:
+                                    enrichment_data['net_vol_flow_5m_und'] = underlying_data.volm_bs
+                                    self.logger.info(f"✅ Mapped volm_bs ({underlying_data.volm_bs}) to net_vol_flow_5m_und")
 
-                            underlying_data = underlying_data.model_copy(update=enrichment_data)
+                                underlying_data = underlying_data.model_copy(update=enrichment_data)
 
-                            self.logger.info(f"✅ Enriched {ticker} with OHLC: price_change_pct={price_change_pct:.4f}, open={day_open}, prev_close={prev_close}")
-                        else:
-                            self.logger.warning(f"⚠️ No historical data available for {ticker} OHLC enrichment")
-                except Exception as e:
-                    self.logger.warning(f"⚠️ Failed to enrich {ticker} with Tradier OHLC data: {e}")
-                    # Continue with ConvexValue data only - the system will handle missing OHLC gracefully
+                                self.logger.info(f"✅ Enriched {ticker} with OHLC: price_change_pct={price_change_pct:.4f}, open={day_open}, prev_close={prev_close}")
+                            else:
+                                self.logger.warning(f"⚠️ No historical data available for {ticker} OHLC enrichment")
+                    except Exception as e:
+                        self.logger.warning(f"⚠️ Failed to enrich {ticker} with Tradier OHLC data: {e}")
+                        # Continue with ConvexValue data only - the system will handle missing OHLC gracefully
 
             # Keep data as Pydantic v2 models for as long as possible
             # Only convert to DataFrame/dict at the metrics calculator boundary if absolutely necessary
@@ -586,53 +619,83 @@ class ITSOrchestratorV2_5:
             if not isinstance(chain_data, list) or not all(isinstance(c, RawOptionsContractV2_5) for c in chain_data):
                 raise TypeError(f"chain_data must be List[RawOptionsContractV2_5], got {type(chain_data)}")
 
-            # Call metrics calculator with strict Pydantic v2 models
-            processed_bundle = self.metrics_calculator.process_data_bundle_v2(
-                options_contracts=chain_data,  # List[RawOptionsContractV2_5]
-                underlying_data=underlying_data  # RawUnderlyingDataCombinedV2_5
-            )
+            # Call metrics calculator with strict Pydantic v2 models, on the symbol's worker process when the pool is enabled
+            processed_bundle, worker_key_levels = None, None
+            if self.worker_pool is not None:
+                try:
+                    with trace_span("worker_pool"):
+                        worker_result = await self.worker_pool.analyze(ticker, chain_data, underlying_data)
+                    processed_bundle, worker_key_levels = worker_result.processed_bundle, worker_result.key_levels
+                except AnalysisWorkerError as e:
+                    self.logger.warning(f"⚠️ Analysis worker failed for {ticker}, calculating metrics in-process: {e}")
+            if processed_bundle is None:
+                processed_bundle = self.metrics_calculator.process_data_bundle_v2(
+                    options_contracts=chain_data,  # List[RawOptionsContractV2_5]
+                    underlying_data=underlying_data  # RawUnderlyingDataCombinedV2_5
+                )
             self.logger.info(f"✅ All metrics calculated for {ticker}")
 
             # Step 3: Market Regime Analysis (using the enriched data from metrics_calculator)
             self.logger.info(f"🏛️ STEP: Market regime analysis for {ticker}")
-            market_regime_analysis_result = await self.market_regime_engine.determine_market_regime(processed_bundle)
+            with trace_span("market_regime"):
+                market_regime_analysis_result = await self.market_regime_engine.determine_market_regime(processed_bundle)
             processed_bundle.underlying_data_enriched.current_market_regime_v2_5 = market_regime_analysis_result
             self.logger.info(f"🏛️ Market regime determined: {market_regime_analysis_result} for {ticker}")
 
             # Step 4: Generate Key Levels (using the enriched data)
             self.logger.info(f"🔑 STEP: Generating key levels for {ticker}")
-            key_levels_data = await self._generate_key_levels(
-                processed_bundle,
-                ticker,
-                datetime.now()
-            )
+            with trace_span("key_levels"):
+                key_levels_data = await self._generate_key_levels(
+                    processed_bundle,
+                    ticker,
+                    datetime.now(),
+                    precomputed_levels=worker_key_levels
+                )
+                key_level_diff = None
+                if self.key_level_tracker is not None:
+                    tracked_diff = self.key_level_tracker.last_diff(ticker)
+                    if tracked_diff is not None and tracked_diff.timestamp == processed_bundle.underlying_data_enriched.timestamp:
+                        key_level_diff = tracked_diff
             self.logger.info(f"✅ Key levels generated for {ticker}")
 
-            # Step 5: ATIF Recommendations (placeholder for now, will use processed_bundle)
+            # Step 5: ATIF Recommendations (only real directives; the engine's fallback directive is not passed on)
             self.logger.info(f"💡 STEP: Generating ATIF recommendations for {ticker}")
-            atif_recommendations = [] # Placeholder
-            self.logger.info(f"✅ ATIF recommendations generated for {ticker}")
+            atif_recommendations = []
+            with trace_span("atif"):
+                try:
+                    trade_intelligence = await self.atif_engine.generate_superior_trade_intelligence(
+                        ConsolidatedAnalysisRequest(ticker=ticker),
+                        processed_bundle,
+                        key_levels_data
+                    )
+                    if not trade_intelligence.metadata.get('fallback'):
+                        atif_recommendations.append(trade_intelligence.strategy_directive)
+                except Exception as e:
+                    self.logger.warning(f"⚠️ ATIF recommendation generation failed for {ticker}: {e}")
+            self.logger.info(f"✅ {len(atif_recommendations)} ATIF recommendations generated for {ticker}")
 
             # Step 6: Assemble the final analysis bundle
             # Create minimal valid scored signals (required by model validation)
-            scored_signals = {
-                "system_status": [
-                    f"Analysis completed for {ticker} at {datetime.now().strftime('%H:%M:%S')}",
-                    f"Processed {len(processed_bundle.options_data_with_metrics)} contracts",
-                    f"Elite impact score: {processed_bundle.underlying_data_enriched.elite_impact_score_und:.1f}"
-                ]
-            }
+            with trace_span("bundle_assembly"):
+                scored_signals = {
+                    "system_status": [
+                        f"Analysis completed for {ticker} at {datetime.now().strftime('%H:%M:%S')}",
+                        f"Processed {len(processed_bundle.options_data_with_metrics)} contracts",
+                        f"Elite impact score: {processed_bundle.underlying_data_enriched.elite_impact_score_und:.1f}"
+                    ]
+                }
 
-            bundle = FinalAnalysisBundleV2_5(
-                processed_data_bundle=processed_bundle,
-                scored_signals_v2_5=scored_signals,
-                key_levels_data_v2_5=key_levels_data,
-                bundle_timestamp=datetime.now(),
-                target_symbol=ticker,
-                system_status_messages=[],
-                active_recommendations_v2_5=[],
-                atif_recommendations_v2_5=atif_recommendations
-            )
+                bundle = FinalAnalysisBundleV2_5(
+                    processed_data_bundle=processed_bundle,
+                    scored_signals_v2_5=scored_signals,
+                    key_levels_data_v2_5=key_levels_data,
+                    key_level_diff_v2_5=key_level_diff,
+                    bundle_timestamp=datetime.now(),
+                    target_symbol=ticker,
+                    system_status_messages=[],
+                    active_recommendations_v2_5=[],
+                    atif_recommendations_v2_5=atif_recommendations
+                )
             self.logger.info(f"✅ Final analysis bundle created for {ticker}")
             return bundle
         except Exception as e:
@@ -799,6 +862,14 @@ class ITSOrchestratorV2_5:
         else:
             self.performance_metrics["failed_analyses"] = self.performance_metrics.get("failed_analyses", 0) + 1
     
+    def get_stage_trace_report(self, limit: Optional[int] = None, symbol: Optional[str] = None) -> Dict[str, Any]:
+        """Slowest recorded analysis cycles (full span trees) plus a per-stage summary."""
+        return {
+            "enabled": self.stage_tracer.enabled,
+            "slowest_cycles": self.stage_tracer.get_slowest_cycles(limit=limit, symbol=symbol),
+            "stage_summary": self.stage_tracer.get_stage_summary(symbol=symbol),
+        }
+
     def get_legendary_performance_metrics(self) -> Dict[str, Any]:
         """Get current performance metrics for the legendary system"""
         try:
@@ -841,7 +912,8 @@ class ITSOrchestratorV2_5:
                 "status": "failed"
             }
     
-    async def _generate_key_levels(self, data_bundle: ProcessedDataBundleV2_5, ticker: str, timestamp: datetime) -> KeyLevelsDataV2_5:
+    async def _generate_key_levels(self, data_bundle: ProcessedDataBundleV2_5, ticker: str, timestamp: datetime,
+                                   precomputed_levels: Optional[KeyLevelsDataV2_5] = None) -> KeyLevelsDataV2_5:
         """
         Generate key levels from database first, then from real-time analysis if database is empty.
         CRITICAL FIX: Generate key levels from current strike data when database is empty.
@@ -850,6 +922,7 @@ class ITSOrchestratorV2_5:
             data_bundle: Processed data bundle containing price and options data
             ticker: Trading symbol
             timestamp: Analysis timestamp
+            precomputed_levels: Key levels already scored by the symbol's analysis worker, if any
 
         Returns:
             KeyLevelsDataV2_5: Key levels from database or real-time analysis
@@ -866,6 +939,9 @@ class ITSOrchestratorV2_5:
                 return database_levels
 
             # Step 2: CRITICAL FIX - Generate key levels from current strike data when database is empty
+            if precomputed_levels is not None:
+                self.logger.info(f"✅ Using {len(precomputed_levels.supports)} supports, {len(precomputed_levels.resistances)} resistances scored by the analysis worker")
+                return precomputed_levels
             self.logger.info(f"🔑 Database empty, generating key levels from current strike data for {ticker}")
 
             # Convert strike data to DataFrame for key level identification
@@ -885,10 +961,13 @@ class ITSOrchestratorV2_5:
             df_strike = pd.DataFrame([s.model_dump() for s in strike_data])
 
             # Use KeyLevelIdentifierV2_5 to generate key levels from current data
-            generated_levels = self.key_level_identifier.identify_and_score_key_levels(
-                df_strike,
-                data_bundle.underlying_data_enriched
-            )
+            if self.key_level_tracker is not None:
+                generated_levels, _ = self.key_level_tracker.update(ticker, df_strike, data_bundle.underlying_data_enriched)
+            else:
+                generated_levels = self.key_level_identifier.identify_and_score_key_levels(
+                    df_strike,
+                    data_bundle.underlying_data_enriched
+                )
 
             self.logger.info(f"✅ Generated {len(generated_levels.supports)} supports, {len(generated_levels.resistances)} resistances from current data")
             return generated_levels
@@ -11,6 +11,22 @@ from data_models import ProcessedUnderlyingAggregatesV2_5
 logger = logging.getLogger(__name__)
 EPSILON = 1e-9
 
+# Strike-level input column per key-level source
+SOURCE_COLUMNS = {
+    'a_mspi': 'a_mspi_strike',
+    'nvp': 'nvp_at_strike',
+    'sgdhp': 'sgdhp_score_strike',
+    'ugch': 'ugch_score_strike',
+}
+
+# (support type, resistance type) emitted per source
+SOURCE_LEVEL_TYPES = {
+    'a_mspi': ('AMSPI_Support', 'AMSPI_Resistance'),
+    'nvp': ('NVP_Support', 'NVP_Resistance'),
+    'sgdhp': ('SGDHP_Support_Wall', 'SGDHP_Resistance_Wall'),
+    'ugch': ('UGCH_Major_Support_Zone', 'UGCH_Major_Resistance_Zone'),
+}
+
 class KeyLevelIdentifierV2_5:
     """
     Identifies and scores critical price zones (Key Levels) based on a confluence of metrics.
@@ -64,7 +80,7 @@ class KeyLevelIdentifierV2_5:
             )
 
         # Ensure necessary columns exist
-        required_cols = ['strike', 'a_mspi_strike', 'nvp_at_strike', 'sgdhp_score_strike', 'ugch_score_strike']
+        required_cols = ['strike', *SOURCE_COLUMNS.values()]
         for col in required_cols:
             if col not in df_strike.columns:
                 self.logger.warning(f"Missing required column for key level identification: {col}. Skipping.")
@@ -78,81 +94,97 @@ class KeyLevelIdentifierV2_5:
                 )
 
         # --- Individual Source Level Identification ---
+        strikes = df_strike['strike'].to_numpy(dtype=float)
+        series = {source: df_strike[column].fillna(0).to_numpy(dtype=float) for source, column in SOURCE_COLUMNS.items()}
+
+        # Identify peaks (resistance) and troughs (support) in A-MSPI
+        # Using a simple peak detection for now, can be enhanced
+        a_mspi_series = series['a_mspi']
+        peaks, _ = signal.find_peaks(a_mspi_series, height=np.quantile(a_mspi_series, 0.75))
+        troughs, _ = signal.find_peaks(-a_mspi_series, height=np.quantile(-a_mspi_series, 0.75))
+
+        potential_levels = self.potential_levels(strikes, series, peaks, troughs, current_price, self.source_thresholds())
+        scored_levels = self.score_levels(potential_levels, current_price)
+
+        # Filter by conviction and classify
+        supports_list: List[KeyLevelV2_5] = []
+        resistances_list: List[KeyLevelV2_5] = []
+        for lvl_data in scored_levels:
+            if lvl_data['conviction'] >= self.min_conviction_for_level_reporting:
+                key_level = self.build_key_level(lvl_data, current_price)
+                if key_level.level_type == 'Support':
+                    supports_list.append(key_level)
+                else:
+                    resistances_list.append(key_level)
+
+        # Sort by proximity to current price or by level price
+        supports_list.sort(key=lambda x: abs(x.level_price - current_price))
+        resistances_list.sort(key=lambda x: abs(x.level_price - current_price))
+
+        self.logger.debug(f"Identified {len(supports_list)} support levels and {len(resistances_list)} resistance levels.")
+        return KeyLevelsDataV2_5(
+            supports=supports_list,
+            resistances=resistances_list,
+            pin_zones=[],
+            vol_triggers=[],
+            major_walls=[],
+            timestamp=und_data.timestamp
+        )
+
+    # --- Level pipeline stages (shared with KeyLevelTrackerV2_5) ---
+    def source_thresholds(self) -> Dict[str, float]:
+        """Absolute score thresholds for the threshold-based sources (NVP, SGDHP, UGCH)."""
+        return {
+            'nvp': self.config_manager.get_setting("key_level_settings.nvp_threshold", 1000000), # Example threshold
+            'sgdhp': self.config_manager.get_setting("key_level_settings.sgdhp_threshold", 0.5), # Example threshold
+            'ugch': self.config_manager.get_setting("key_level_settings.ugch_threshold", 0.7), # Example threshold
+        }
+
+    def potential_levels(self,
+                         strikes: np.ndarray,
+                         series: Dict[str, np.ndarray],
+                         a_mspi_peaks: np.ndarray,
+                         a_mspi_troughs: np.ndarray,
+                         current_price: float,
+                         thresholds: Dict[str, float]) -> List[Dict[str, Any]]:
+        """
+        Per-source level candidates: A-MSPI peaks above / troughs below price, and strikes
+        where NVP, SGDHP or UGCH exceed their threshold on the matching side of price.
+        """
         potential_levels: List[Dict[str, Any]] = []
+        a_mspi_series = series['a_mspi']
+        support_type, resistance_type = SOURCE_LEVEL_TYPES['a_mspi']
+        for peak_idx in a_mspi_peaks:
+            strike = float(strikes[peak_idx])
+            if strike > current_price: # Only consider as resistance if above current price
+                potential_levels.append({'level': strike, 'type': resistance_type, 'score': float(a_mspi_series[peak_idx]), 'source': 'a_mspi'})
+        for trough_idx in a_mspi_troughs:
+            strike = float(strikes[trough_idx])
+            if strike < current_price: # Only consider as support if below current price
+                potential_levels.append({'level': strike, 'type': support_type, 'score': float(-a_mspi_series[trough_idx]), 'source': 'a_mspi'})
 
-        # A-MSPI based levels
-        if 'a_mspi_strike' in df_strike.columns:
-            # Identify peaks (resistance) and troughs (support) in A-MSPI
-            # Using a simple peak detection for now, can be enhanced
-            a_mspi_series = df_strike['a_mspi_strike'].fillna(0)
-            
-            # Peaks for resistance (positive A-MSPI)
-            peaks, _ = signal.find_peaks(a_mspi_series, height=a_mspi_series.quantile(0.75))
-            for peak_idx in peaks:
-                strike = float(df_strike.iloc[peak_idx]['strike'])
-                if strike > current_price: # Only consider as resistance if above current price
-                    potential_levels.append({'level': strike, 'type': 'AMSPI_Resistance', 'score': float(a_mspi_series.iloc[peak_idx]), 'source': 'a_mspi'})
-
-            # Troughs for support (negative A-MSPI, so find peaks in -A-MSPI)
-            troughs, _ = signal.find_peaks(-a_mspi_series, height=(-a_mspi_series).quantile(0.75))
-            for trough_idx in troughs:
-                strike = float(df_strike.iloc[trough_idx]['strike'])
-                if strike < current_price: # Only consider as support if below current price
-                    potential_levels.append({'level': strike, 'type': 'AMSPI_Support', 'score': float(-a_mspi_series.iloc[trough_idx]), 'source': 'a_mspi'})
-
-        # NVP based levels (simplified: look for significant positive/negative NVP)
-        if 'nvp_at_strike' in df_strike.columns:
-            nvp_series = df_strike['nvp_at_strike'].fillna(0)
-            nvp_threshold = self.config_manager.get_setting("key_level_settings.nvp_threshold", 1000000) # Example threshold
-            
-            # Positive NVP (potential support)
-            positive_nvp_strikes = df_strike[nvp_series > nvp_threshold]['strike']
-            for strike in positive_nvp_strikes:
-                if strike < current_price: # Only consider as support if below current price
-                    potential_levels.append({'level': strike, 'type': 'NVP_Support', 'score': nvp_series.loc[strike], 'source': 'nvp'})
-            
-            # Negative NVP (potential resistance)
-            negative_nvp_strikes = df_strike[nvp_series < -nvp_threshold]['strike']
-            for strike in negative_nvp_strikes:
-                if strike > current_price: # Only consider as resistance if above current price
-                    potential_levels.append({'level': strike, 'type': 'NVP_Resistance', 'score': abs(nvp_series.loc[strike]), 'source': 'nvp'})
-
-        # SGDHP based levels
-        if 'sgdhp_score_strike' in df_strike.columns:
-            sgdhp_series = df_strike['sgdhp_score_strike'].fillna(0)
-            sgdhp_threshold = self.config_manager.get_setting("key_level_settings.sgdhp_threshold", 0.5) # Example threshold
-
-            # Positive SGDHP (potential support)
-            positive_sgdhp_strikes = df_strike[sgdhp_series > sgdhp_threshold]['strike']
-            for strike in positive_sgdhp_strikes:
-                if strike < current_price: # Only consider as support if below current price
-                    potential_levels.append({'level': strike, 'type': 'SGDHP_Support_Wall', 'score': sgdhp_series.loc[strike], 'source': 'sgdhp'})
-            
-            # Negative SGDHP (potential resistance)
-            negative_sgdhp_strikes = df_strike[sgdhp_series < -sgdhp_threshold]['strike']
-            for strike in negative_sgdhp_strikes:
-                if strike > current_price: # Only consider as resistance if above current price
-                    potential_levels.append({'level': strike, 'type': 'SGDHP_Resistance_Wall', 'score': abs(sgdhp_series.loc[strike]), 'source': 'sgdhp'})
-
-        # UGCH based levels
-        if 'ugch_score_strike' in df_strike.columns:
-            ugch_series = df_strike['ugch_score_strike'].fillna(0)
-            ugch_threshold = self.config_manager.get_setting("key_level_settings.ugch_threshold", 0.7) # Example threshold
-
-            # Positive UGCH (potential support)
-            positive_ugch_strikes = df_strike[ugch_series > ugch_threshold]['strike']
-            for strike in positive_ugch_strikes:
-                if strike < current_price: # Only consider as support if below current price
-                    potential_levels.append({'level': strike, 'type': 'UGCH_Major_Support_Zone', 'score': ugch_series.loc[strike], 'source': 'ugch'})
-            
-            # Negative UGCH (potential resistance)
-            negative_ugch_strikes = df_strike[ugch_series < -ugch_threshold]['strike']
-            for strike in negative_ugch_strikes:
-                if strike > current_price: # Only consider as resistance if above current price
-                    potential_levels.append({'level': strike, 'type': 'UGCH_Major_Resistance_Zone', 'score': abs(ugch_series.loc[strike]), 'source': 'ugch'})
+        # Positive scores below price are supports, negative scores above price are resistances
+        for source in ('nvp', 'sgdhp', 'ugch'):
+            values = series[source]
+            threshold = thresholds[source]
+            support_type, resistance_type = SOURCE_LEVEL_TYPES[source]
+            for idx in np.flatnonzero((values > threshold) & (strikes < current_price)):
+                potential_levels.append({'level': float(strikes[idx]), 'type': support_type, 'score': float(values[idx]), 'source': source})
+            for idx in np.flatnonzero((values < -threshold) & (strikes > current_price)):
+                potential_levels.append({'level': float(strikes[idx]), 'type': resistance_type, 'score': abs(float(values[idx])), 'source': source})
+        return potential_levels
+
+    def score_levels(self, potential_levels: List[Dict[str, Any]], current_price: float) -> List[Dict[str, Any]]:
+        """
+        Cluster nearby candidates, accumulate source-weighted scores and normalize them to a 0-1 conviction.
 
-        # --- Consolidate and Score Levels ---
+        Each candidate joins the earliest-added level within the proximity threshold. Levels
+        are bucketed by price so only neighbouring buckets are searched.
+        """
         final_levels: Dict[float, Dict[str, Any]] = {}
+        order: Dict[float, int] = {}
+        buckets: Dict[int, List[float]] = {}
+        width = self.proximity_cluster_threshold_pct * current_price
 
         for level_info in potential_levels:
             level_price = level_info['level']
@@ -161,64 +193,56 @@ class KeyLevelIdentifierV2_5:
             source = level_info['source']
 
             # Check for existing level within proximity
-            found_existing = False
-            for existing_price in list(final_levels.keys()): # Iterate over a copy of keys
-                if abs(existing_price - level_price) / current_price < self.proximity_cluster_threshold_pct:
-                    # Found a nearby existing level, consolidate
-                    existing_level = final_levels[existing_price]
-                    
-                    # Update type if more specific/stronger
-                    if existing_level['type'] == 'AMSPI_Support' and 'NVP_Support' in level_type: existing_level['type'] = 'NVP_Support'
-                    # Add more type consolidation logic as needed
-
-                    # Accumulate scores based on source weights
-                    weight = self.conviction_weights_by_source.get(source, 0.0)
-                    existing_level['raw_score'] = existing_level.get('raw_score', 0.0) + (score * weight)
-                    existing_level['sources'].add(source)
-                    found_existing = True
-                    break
-            
-            if not found_existing:
+            nearby = []
+            if width > 0:
+                bucket = int(np.floor(level_price / width))
+                nearby = [
+                    existing_price
+                    for key in range(bucket - 2, bucket + 3)
+                    for existing_price in buckets.get(key, ())
+                    if abs(existing_price - level_price) / current_price < self.proximity_cluster_threshold_pct
+                ]
+
+            if nearby:
+                # Found a nearby existing level, consolidate
+                existing_level = final_levels[min(nearby, key=order.__getitem__)]
+
+                # Update type if more specific/stronger
+                if existing_level['type'] == 'AMSPI_Support' and 'NVP_Support' in level_type: existing_level['type'] = 'NVP_Support'
+                # Add more type consolidation logic as needed
+
+                # Accumulate scores based on source weights
+                weight = self.conviction_weights_by_source.get(source, 0.0)
+                existing_level['raw_score'] = existing_level.get('raw_score', 0.0) + (score * weight)
+                existing_level['sources'].add(source)
+            else:
                 # Add new level
                 new_level = {'level': level_price, 'type': level_type, 'raw_score': score * self.conviction_weights_by_source.get(source, 0.0), 'sources': {source}}
                 final_levels[level_price] = new_level
-
-        # Finalize conviction scores and filter
-        supports_list: List[KeyLevelV2_5] = []
-        resistances_list: List[KeyLevelV2_5] = []
+                order.setdefault(level_price, len(order))
+                if width > 0:
+                    buckets.setdefault(int(np.floor(level_price / width)), []).append(level_price)
 
         max_raw_score = max([lvl['raw_score'] for lvl in final_levels.values()]) if final_levels else 1.0
 
         for lvl_data in final_levels.values():
             # Normalize raw_score to 0-1 conviction
             conviction = lvl_data['raw_score'] / (max_raw_score + EPSILON)
-            conviction = min(1.0, max(0.0, conviction)) # Ensure bounds
-
-            if conviction >= self.min_conviction_for_level_reporting:
-                key_level = KeyLevelV2_5(
-                    level_price=lvl_data['level'],
-                    level_type=lvl_data['type'],
-                    conviction_score=conviction,
-                    contributing_metrics=list(lvl_data['sources']),
-                    source_identifier="key_level_identifier_v2_5"
-                )
-                if key_level.level_price < current_price: # Simple classification for now
-                    supports_list.append(key_level)
-                else:
-                    resistances_list.append(key_level)
-
-        # Sort by proximity to current price or by level price
-        supports_list.sort(key=lambda x: abs(x.level_price - current_price))
-        resistances_list.sort(key=lambda x: abs(x.level_price - current_price))
+            lvl_data['conviction'] = min(1.0, max(0.0, conviction)) # Ensure bounds
+        return list(final_levels.values())
 
-        self.logger.debug(f"Identified {len(supports_list)} support levels and {len(resistances_list)} resistance levels.")
-        return KeyLevelsDataV2_5(
-            supports=supports_list,
-            resistances=resistances_list,
-            pin_zones=[],
-            vol_triggers=[],
-            major_walls=[],
-            timestamp=und_data.timestamp
+    def build_key_level(self, lvl_data: Dict[str, Any], current_price: float) -> KeyLevelV2_5:
+        """
+        KeyLevelV2_5 for a scored level. The level type is Support/Resistance by side of
+        price (the categories KeyLevelV2_5 accepts); the source-specific type (e.g.
+        'UGCH_Major_Support_Zone') is kept as the source identifier.
+        """
+        return KeyLevelV2_5(
+            level_price=lvl_data['level'],
+            level_type='Support' if lvl_data['level'] < current_price else 'Resistance', # Simple classification for now
+            conviction_score=lvl_data['conviction'],
+            contributing_metrics=sorted(lvl_data['sources']),
+            source_identifier=lvl_data['type']
         )
 
     # --- Vectorized Helper Functions (Moved from MarketIntelligenceEngine) ---
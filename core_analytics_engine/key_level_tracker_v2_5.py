@@ -0,0 +1,274 @@
+# core_analytics_engine/key_level_tracker_v2_5.py
+# EOTS v2.5 - Incremental key-level tracking with hysteresis
+
+"""
+Incremental key levels across analysis cycles.
+
+KeyLevelIdentifierV2_5 rescans every strike and rebuilds every KeyLevelV2_5 each cycle.
+KeyLevelTrackerV2_5 keeps, per symbol, the reference strike inputs and the A-MSPI local
+extrema from the previous cycle:
+- Only strikes whose inputs moved by more than ``input_tolerance_pct`` of their source's
+  scale are updated, and A-MSPI peaks/troughs are re-detected only in windows around
+  them (widened across plateaus, so the result equals a full ``find_peaks`` rescan of
+  the reference inputs). A changed strike grid triggers a full rescan.
+- Reported levels follow hysteresis: a level enters at the identifier's minimum
+  conviction, leaves only below that minus ``hysteresis_band`` or after
+  ``absent_cycles_to_remove`` cycles without a candidate, and keeps its KeyLevelV2_5
+  model until its conviction moves by ``strength_delta``.
+- Each update returns a KeyLevelDiffV2_5 (added / removed / strengthened / weakened).
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import signal
+
+from core_analytics_engine.key_level_identifier_v2_5 import SOURCE_COLUMNS, KeyLevelIdentifierV2_5
+from data_models import KeyLevelDiffV2_5, KeyLevelsDataV2_5, KeyLevelV2_5, ProcessedUnderlyingAggregatesV2_5
+
+logger = logging.getLogger(__name__)
+
+# A strike's local-extremum status depends on its neighbours (and on plateau edges),
+# so a change at strike i is rescanned over [i - RESCAN_RADIUS, i + RESCAN_RADIUS].
+RESCAN_RADIUS = 2
+
+
+def _local_extrema(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Boolean masks of find_peaks maxima and minima (no height filter)."""
+    is_peak = np.zeros(len(values), dtype=bool)
+    is_trough = np.zeros(len(values), dtype=bool)
+    is_peak[signal.find_peaks(values)[0]] = True
+    is_trough[signal.find_peaks(-values)[0]] = True
+    return is_peak, is_trough
+
+
+@dataclass
+class _ActiveLevel:
+    model: KeyLevelV2_5
+    absent_cycles: int = 0
+
+
+@dataclass
+class _SymbolLevelState:
+    strikes: np.ndarray
+    reference: Dict[str, np.ndarray]
+    is_peak: np.ndarray
+    is_trough: np.ndarray
+    active: Dict[float, _ActiveLevel] = field(default_factory=dict)
+    scored: Optional[List[Dict[str, Any]]] = None
+    below_price: Optional[np.ndarray] = None
+
+
+class KeyLevelTrackerV2_5:
+    """Per-symbol incremental key levels with hysteresis, built on a KeyLevelIdentifierV2_5."""
+
+    def __init__(self,
+                 identifier: KeyLevelIdentifierV2_5,
+                 input_tolerance_pct: float = 0.01,
+                 hysteresis_band: float = 0.1,
+                 strength_delta: float = 0.05,
+                 absent_cycles_to_remove: int = 2):
+        self.logger = logger.getChild(self.__class__.__name__)
+        self.identifier = identifier
+        self.input_tolerance_pct = input_tolerance_pct
+        self.hysteresis_band = hysteresis_band
+        self.strength_delta = strength_delta
+        self.absent_cycles_to_remove = max(1, absent_cycles_to_remove)
+        self.thresholds = identifier.source_thresholds()
+        self._states: Dict[str, _SymbolLevelState] = {}
+        self._last_diffs: Dict[str, KeyLevelDiffV2_5] = {}
+
+    @classmethod
+    def from_settings(cls, identifier: KeyLevelIdentifierV2_5, settings: Any) -> "KeyLevelTrackerV2_5":
+        return cls(
+            identifier,
+            input_tolerance_pct=settings.input_tolerance_pct,
+            hysteresis_band=settings.hysteresis_band,
+            strength_delta=settings.strength_delta,
+            absent_cycles_to_remove=settings.absent_cycles_to_remove,
+        )
+
+    @property
+    def enter_conviction(self) -> float:
+        return self.identifier.min_conviction_for_level_reporting
+
+    @property
+    def exit_conviction(self) -> float:
+        return max(0.0, self.enter_conviction - self.hysteresis_band)
+
+    def last_diff(self, symbol: str) -> Optional[KeyLevelDiffV2_5]:
+        return self._last_diffs.get(symbol)
+
+    def reset(self, symbol: Optional[str] = None) -> None:
+        """Forget tracked state for ``symbol`` (or every symbol)."""
+        if symbol is None:
+            self._states.clear()
+            self._last_diffs.clear()
+        else:
+            self._states.pop(symbol, None)
+            self._last_diffs.pop(symbol, None)
+
+    # -- update ------------------------------------------------------------
+
+    def update(self, symbol: str, df_strike: pd.DataFrame,
+               und_data: ProcessedUnderlyingAggregatesV2_5) -> Tuple[KeyLevelsDataV2_5, KeyLevelDiffV2_5]:
+        """Key levels for this cycle and their diff against the previous cycle's levels."""
+        current_price = und_data.price
+        usable = (
+            not df_strike.empty and current_price is not None and current_price > 0
+            and all(column in df_strike.columns for column in ('strike', *SOURCE_COLUMNS.values()))
+        )
+        if not usable:
+            # The identifier logs why and returns an empty level set; drop everything tracked
+            previous = self._states.pop(symbol, None)
+            levels = self.identifier.identify_and_score_key_levels(df_strike, und_data)
+            removed = [level.model for level in previous.active.values()] if previous else []
+            diff = KeyLevelDiffV2_5(removed=removed, full_rescan=True, timestamp=und_data.timestamp)
+            self._last_diffs[symbol] = diff
+            return levels, diff
+
+        strikes = df_strike['strike'].to_numpy(dtype=float)
+        inputs = {source: df_strike[column].fillna(0).to_numpy(dtype=float, copy=True) for source, column in SOURCE_COLUMNS.items()}
+
+        state = self._states.get(symbol)
+        full_rescan = state is None or not np.array_equal(state.strikes, strikes)
+        if full_rescan:
+            is_peak, is_trough = _local_extrema(inputs['a_mspi'])
+            state = _SymbolLevelState(strikes, inputs, is_peak, is_trough, active=state.active if state else {})
+            self._states[symbol] = state
+            rescanned = len(strikes)
+        else:
+            rescanned = self._refresh_reference(state, inputs)
+
+        # Candidates depend on price through which side of it each strike lies (and, marginally,
+        # the clustering width), so they are reused while no strike was updated and price has
+        # not crossed a strike
+        below_price = strikes < current_price
+        if rescanned or state.scored is None or not np.array_equal(below_price, state.below_price):
+            a_mspi = state.reference['a_mspi']
+            peaks = np.flatnonzero(state.is_peak & (a_mspi >= np.quantile(a_mspi, 0.75)))
+            troughs = np.flatnonzero(state.is_trough & (-a_mspi >= np.quantile(-a_mspi, 0.75)))
+            potential = self.identifier.potential_levels(strikes, state.reference, peaks, troughs, current_price, self.thresholds)
+            state.scored = self.identifier.score_levels(potential, current_price)
+            state.below_price = below_price
+
+        diff = self._apply_hysteresis(state, state.scored, current_price, und_data.timestamp)
+        diff.rescanned_strikes = rescanned
+        diff.full_rescan = full_rescan
+        self._last_diffs[symbol] = diff
+
+        supports = [level.model for level in state.active.values() if level.model.level_type == 'Support']
+        resistances = [level.model for level in state.active.values() if level.model.level_type != 'Support']
+        supports.sort(key=lambda x: abs(x.level_price - current_price))
+        resistances.sort(key=lambda x: abs(x.level_price - current_price))
+        levels = KeyLevelsDataV2_5(
+            supports=supports,
+            resistances=resistances,
+            pin_zones=[],
+            vol_triggers=[],
+            major_walls=[],
+            timestamp=und_data.timestamp
+        )
+        return levels, diff
+
+    def _refresh_reference(self, state: _SymbolLevelState, inputs: Dict[str, np.ndarray]) -> int:
+        """Fold inputs that moved beyond tolerance into the reference; returns the number of strikes updated."""
+        changed = np.zeros(len(state.strikes), dtype=bool)
+        for source, values in inputs.items():
+            reference = state.reference[source]
+            scale = float(np.max(np.abs(reference))) if len(reference) else 0.0
+            changed |= np.abs(values - reference) > self.input_tolerance_pct * scale
+        positions = np.flatnonzero(changed)
+        if not len(positions):
+            return 0
+
+        previous_a_mspi = state.reference['a_mspi'].copy()
+        for source, values in inputs.items():
+            state.reference[source][positions] = values[positions]
+        self._rescan_extrema(state, previous_a_mspi, positions)
+        return len(positions)
+
+    @staticmethod
+    def _rescan_extrema(state: _SymbolLevelState, previous: np.ndarray, positions: np.ndarray) -> None:
+        """Re-detect A-MSPI local extrema in merged windows around ``positions``."""
+        values = state.reference['a_mspi']
+        n = len(values)
+        windows: List[List[int]] = []
+        for position in positions.tolist():
+            lo, hi = max(0, position - RESCAN_RADIUS), min(n - 1, position + RESCAN_RADIUS)
+            if windows and lo <= windows[-1][1]:
+                windows[-1][1] = hi
+            else:
+                windows.append([lo, hi])
+
+        for lo, hi in windows:
+            # Widen until no plateau (old or new) crosses a window edge, so every interior
+            # strike sees the same neighbourhood find_peaks would on the full series
+            while lo > 0 and (values[lo] == values[lo + 1] or previous[lo] == previous[lo + 1]):
+                lo -= 1
+            while hi < n - 1 and (values[hi] == values[hi - 1] or previous[hi] == previous[hi - 1]):
+                hi += 1
+            segment = values[lo:hi + 1]
+            state.is_peak[lo + 1:hi] = False
+            state.is_trough[lo + 1:hi] = False
+            state.is_peak[lo + signal.find_peaks(segment)[0]] = True
+            state.is_trough[lo + signal.find_peaks(-segment)[0]] = True
+
+    def _apply_hysteresis(self, state: _SymbolLevelState, scored: List[Dict[str, Any]],
+                          current_price: float, timestamp: Any) -> KeyLevelDiffV2_5:
+        added: List[KeyLevelV2_5] = []
+        removed: List[KeyLevelV2_5] = []
+        strengthened: List[KeyLevelV2_5] = []
+        weakened: List[KeyLevelV2_5] = []
+        unchanged = 0
+
+        candidates = {float(level['level']): level for level in scored}
+        for price, level in candidates.items():
+            conviction = level['conviction']
+            tracked = state.active.get(price)
+            if tracked is None:
+                if conviction >= self.enter_conviction:
+                    model = self.identifier.build_key_level(level, current_price)
+                    state.active[price] = _ActiveLevel(model)
+                    added.append(model)
+                continue
+            if conviction < self.exit_conviction:
+                removed.append(state.active.pop(price).model)
+                continue
+
+            tracked.absent_cycles = 0
+            previous = tracked.model
+            side = 'Support' if price < current_price else 'Resistance'
+            delta = conviction - previous.conviction_score
+            if side != previous.level_type:
+                # Price crossed the level: it is reported again on the other side
+                tracked.model = self.identifier.build_key_level(level, current_price)
+                removed.append(previous)
+                added.append(tracked.model)
+            elif (abs(delta) >= self.strength_delta
+                  or sorted(level['sources']) != previous.contributing_metrics
+                  or level['type'] != previous.source_identifier):
+                tracked.model = self.identifier.build_key_level(level, current_price)
+                (strengthened if delta >= 0 else weakened).append(tracked.model)
+            else:
+                unchanged += 1
+
+        for price in [price for price in state.active if price not in candidates]:
+            tracked = state.active[price]
+            tracked.absent_cycles += 1
+            if tracked.absent_cycles >= self.absent_cycles_to_remove:
+                removed.append(state.active.pop(price).model)
+            else:
+                unchanged += 1
+
+        return KeyLevelDiffV2_5(
+            added=added,
+            removed=removed,
+            strengthened=strengthened,
+            weakened=weakened,
+            unchanged_count=unchanged,
+            timestamp=timestamp
+        )
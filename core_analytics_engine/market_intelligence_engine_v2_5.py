@@ -46,6 +46,7 @@ from core_analytics_engine.news_intelligence_engine_v2_5 import NewsIntelligence
 # Local imports
 from data_management.enhanced_cache_manager_v2_5 import EnhancedCacheManagerV2_5, CacheLevel
 from data_management.database_manager_v2_5 import DatabaseManagerV2_5
+from data_management.market_pattern_store_v2_5 import MarketPatternStoreV2_5
 from utils.config_manager_v2_5 import ConfigManagerV2_5
 from core_analytics_engine.eots_metrics import MetricsCalculatorV2_5
 
@@ -290,6 +291,14 @@ class MarketIntelligenceEngineV2_5:
         # Initialize storage managers
         self.cache_manager = EnhancedCacheManagerV2_5()
         self.db_manager = DatabaseManagerV2_5()
+        self.pattern_store = MarketPatternStoreV2_5(
+            connection_provider=self.db_manager.get_connection,
+            model_cls=MarketPattern,
+            batch_size=self.config.get("pattern_store_batch_size", 50),
+            flush_interval_seconds=self.config.get("pattern_store_flush_interval_seconds", 5.0),
+            ring_window_minutes=self.config.get("pattern_ring_window_minutes", 60.0),
+            ring_capacity=self.config.get("pattern_ring_capacity", 512)
+        )
         
         # Initialize news intelligence engine
         self.news_intelligence = NewsIntelligenceEngineV2_5(config_manager)
@@ -336,60 +345,21 @@ class MarketIntelligenceEngineV2_5:
             return False
 
     def _store_pattern_longterm(self, symbol: str, pattern: MarketPattern) -> bool:
-        """Store pattern in Supabase for long-term analysis."""
+        """Queue pattern for the batched, indexed long-term pattern store."""
         try:
-            # Convert to database format
-            pattern_data = pattern.model_dump()
-            pattern_data["symbol"] = symbol
-            
-            # Store in Supabase using execute_query
-            query = """
-            INSERT INTO market_patterns (data)
-            VALUES (%s)
-            RETURNING id
-            """
-            result = self.db_manager.execute_query(query, (pattern_data,))
-            return bool(result)
+            self.pattern_store.add(symbol, pattern)
+            return True
         except Exception as e:
             self.logger.error(f"Failed to store pattern in database: {e}")
             return False
 
     def _get_recent_patterns(self, symbol: str, lookback_minutes: int = 30) -> List[MarketPattern]:
-        """Get recent patterns from cache and database."""
-        patterns = []
-        
+        """Get recent patterns, newest first (in-memory ring, indexed query beyond its window)."""
         try:
-            # Check cache first
-            for pattern_type in self.pattern_types:
-                cached_pattern = self.cache_manager.get(
-                    symbol=symbol,
-                    metric_name=f"pattern_{pattern_type}"
-                )
-                if cached_pattern:
-                    patterns.append(MarketPattern(**cached_pattern))
-            
-            # If not enough patterns in cache, check database
-            if len(patterns) < 5:  # Arbitrary threshold
-                lookback_time = datetime.now() - timedelta(minutes=lookback_minutes)
-                query = """
-                SELECT data FROM market_patterns 
-                WHERE data->>'symbol' = %s 
-                AND (data->>'timestamp')::timestamp > %s
-                ORDER BY (data->>'timestamp')::timestamp DESC
-                LIMIT 10
-                """
-                results = self.db_manager.execute_query(
-                    query,
-                    (symbol, lookback_time.isoformat())
-                )
-                
-                for row in results:
-                    patterns.append(MarketPattern(**row['data']))
-        
+            return self.pattern_store.recent(symbol, lookback_minutes)
         except Exception as e:
             self.logger.error(f"Error retrieving patterns: {e}")
-        
-        return patterns
+            return []
 
     def _detect_market_patterns(
         self, 
@@ -475,8 +445,8 @@ class MarketIntelligenceEngineV2_5:
                     ttl_seconds=3600  # Cache for 1 hour
                 )
                 
-                # Store in database for long-term analysis
-                self._store_pattern_longterm(symbol, pattern)
+            # Store in database for long-term analysis (written in batches)
+            self.pattern_store.add_many(symbol, patterns)
 
         except Exception as e:
             self.logger.error(f"Error in pattern detection: {e}")
@@ -0,0 +1,276 @@
+# core_analytics_engine/mcp_fanout_executor_v2_5.py
+# EOTS v2.5 - Deadline-bounded fan-out for MCP intelligence sources and warm MCP servers
+
+"""
+Deadline-bounded fan-out for the unified MCP intelligence request.
+
+DeadlineFanOutExecutorV2_5 starts every source at once. Each source runs under its own
+budget, and all of them share one global deadline. A source that has not finished by
+then is cancelled, and the caller gets what did finish: an outcome with per-source
+results, the failed and timed-out sources, and a weighted completeness score in [0, 1].
+
+MCPServerPoolV2_5 keeps the MCP server subprocesses alive across requests. A server is
+spawned once, reused while it runs, and respawned (at most once per backoff interval)
+only after it exits. ``stop`` shuts them down from the event loop; ``terminate_sync``
+does it without one, for interpreter exit.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FanOutTask:
+    """One intelligence source: a coroutine factory with an optional budget and completeness weight."""
+    name: str
+    factory: Callable[[], Awaitable[Any]]
+    budget_seconds: Optional[float] = None
+    weight: float = 1.0
+
+
+@dataclass
+class FanOutOutcome:
+    """Results of one fan-out; sources missing from ``results`` failed, timed out or were skipped."""
+    results: Dict[str, Any] = field(default_factory=dict)
+    failed: Dict[str, str] = field(default_factory=dict)
+    timed_out: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+    total_weight: float = 0.0
+    completed_weight: float = 0.0
+
+    @property
+    def completeness(self) -> float:
+        return self.completed_weight / self.total_weight if self.total_weight > 0 else 1.0
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.failed or self.timed_out or self.skipped)
+
+    def ordered(self, names: Iterable[str]) -> List[Any]:
+        """Results of ``names`` that completed, in that order."""
+        return [self.results[name] for name in names if name in self.results]
+
+    @classmethod
+    def combine(cls, *outcomes: "FanOutOutcome") -> "FanOutOutcome":
+        combined = cls()
+        for outcome in outcomes:
+            combined.results.update(outcome.results)
+            combined.failed.update(outcome.failed)
+            combined.timed_out.extend(outcome.timed_out)
+            combined.skipped.extend(outcome.skipped)
+            combined.elapsed_seconds += outcome.elapsed_seconds
+            combined.total_weight += outcome.total_weight
+            combined.completed_weight += outcome.completed_weight
+        return combined
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "completeness": self.completeness,
+            "partial": self.partial,
+            "completed_sources": sorted(self.results),
+            "timed_out_sources": list(self.timed_out),
+            "failed_sources": dict(self.failed),
+            "skipped_sources": list(self.skipped),
+            "elapsed_seconds": self.elapsed_seconds,
+        }
+
+
+class DeadlineFanOutExecutorV2_5:
+    """Runs intelligence sources concurrently under per-source budgets and a global deadline."""
+
+    def __init__(self, default_budget_seconds: float = 8.0, task_budgets: Optional[Dict[str, float]] = None,
+                 cancel_grace_seconds: float = 0.5):
+        self.default_budget_seconds = default_budget_seconds
+        self.task_budgets = dict(task_budgets or {})
+        self.cancel_grace_seconds = cancel_grace_seconds
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "DeadlineFanOutExecutorV2_5":
+        return cls(
+            default_budget_seconds=settings.default_task_budget_seconds,
+            task_budgets=settings.task_budgets,
+            cancel_grace_seconds=settings.cancel_grace_seconds,
+        )
+
+    def budget_for(self, task: FanOutTask) -> float:
+        if task.name in self.task_budgets:
+            return self.task_budgets[task.name]
+        return task.budget_seconds if task.budget_seconds is not None else self.default_budget_seconds
+
+    async def run(self, tasks: List[FanOutTask], deadline_seconds: float) -> FanOutOutcome:
+        """Run ``tasks`` concurrently and return whatever finished within ``deadline_seconds``."""
+        outcome = FanOutOutcome(total_weight=sum(task.weight for task in tasks))
+        started = time.monotonic()
+        if deadline_seconds <= 0:
+            outcome.skipped = [task.name for task in tasks]
+            return outcome
+
+        running: Dict[asyncio.Task, FanOutTask] = {}
+        for task in tasks:
+            budget = min(self.budget_for(task), deadline_seconds)
+            running[asyncio.ensure_future(asyncio.wait_for(task.factory(), budget))] = task
+
+        done, pending = await asyncio.wait(running, timeout=deadline_seconds) if running else (set(), set())
+
+        for future in pending:
+            future.cancel()
+        if pending and self.cancel_grace_seconds > 0:
+            # Stragglers get a short grace to unwind; the result does not wait on them beyond that
+            await asyncio.wait(pending, timeout=self.cancel_grace_seconds)
+
+        for future, task in running.items():
+            if future in pending:
+                outcome.timed_out.append(task.name)
+                logger.warning(f"⏱️ Intelligence source '{task.name}' missed the {deadline_seconds:.1f}s deadline and was cancelled")
+                continue
+            if future.cancelled():
+                # Cancelled from inside the source (not by the deadline); exception() would re-raise
+                outcome.failed[task.name] = "CancelledError"
+                logger.warning(f"⚠️ Intelligence source '{task.name}' was cancelled")
+                continue
+            error = future.exception()
+            if isinstance(error, asyncio.TimeoutError):
+                outcome.timed_out.append(task.name)
+                logger.warning(f"⏱️ Intelligence source '{task.name}' exceeded its {self.budget_for(task):.1f}s budget")
+            elif error is not None:
+                outcome.failed[task.name] = f"{type(error).__name__}: {error}"
+                logger.warning(f"⚠️ Intelligence source '{task.name}' failed: {error}")
+            else:
+                outcome.results[task.name] = future.result()
+                outcome.completed_weight += task.weight
+
+        outcome.elapsed_seconds = time.monotonic() - started
+        return outcome
+
+
+class MCPServerPoolV2_5:
+    """
+    Long-lived MCP server subprocesses, spawned once and reused across requests.
+
+    Nothing reads the servers' output pipes, so stdout is discarded and stderr goes to
+    ``<log_dir>/<server>.log`` (discarded too without a log directory); an unread pipe
+    would fill up and block a chatty server.
+    """
+
+    def __init__(self, configs: Dict[Any, Dict[str, Any]], restart_backoff_seconds: float = 30.0,
+                 log_dir: Optional[str] = None):
+        self.configs = configs
+        self.restart_backoff_seconds = restart_backoff_seconds
+        self.log_dir = Path(log_dir) if log_dir is not None else None
+        self.processes: Dict[Any, asyncio.subprocess.Process] = {}
+        self._last_spawn: Dict[Any, float] = {}
+        self._restarts: Dict[Any, asyncio.Task] = {}
+
+    def is_alive(self, server_type: Any) -> bool:
+        process = self.processes.get(server_type)
+        return process is not None and process.returncode is None
+
+    def live_servers(self) -> List[Any]:
+        """Servers that are running now; exited ones are respawned in the background."""
+        live = []
+        for server_type in list(self.processes):
+            if self.is_alive(server_type):
+                live.append(server_type)
+            else:
+                self._schedule_restart(server_type)
+        return live
+
+    async def start(self, server_types: Iterable[Any]) -> Dict[Any, bool]:
+        """Ensure each server is running, reusing live processes."""
+        return {server_type: await self.ensure(server_type) for server_type in server_types}
+
+    async def ensure(self, server_type: Any) -> bool:
+        if self.is_alive(server_type):
+            return True
+        config = self.configs[server_type]
+        self._last_spawn[server_type] = time.monotonic()
+        name = getattr(server_type, "value", server_type)
+        stderr_log = None
+        try:
+            logger.info(f"🚀 Starting MCP server: {name}")
+            if self.log_dir is not None:
+                self.log_dir.mkdir(parents=True, exist_ok=True)
+                stderr_log = open(self.log_dir / f"{name}.log", "ab")
+            self.processes[server_type] = await asyncio.create_subprocess_exec(
+                config["command"],
+                *config["args"],
+                env={**config["env"]},
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=stderr_log if stderr_log is not None else asyncio.subprocess.DEVNULL
+            )
+            logger.info(f"✅ MCP server {name} running (pid {self.processes[server_type].pid})")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Failed to start MCP server {name}: {str(e)}")
+            return False
+        finally:
+            if stderr_log is not None:
+                stderr_log.close()  # the child keeps its own descriptor
+
+    def _schedule_restart(self, server_type: Any) -> None:
+        restart = self._restarts.get(server_type)
+        if restart is not None and not restart.done():
+            return
+        since_spawn = time.monotonic() - self._last_spawn.get(server_type, float("-inf"))
+        if since_spawn < self.restart_backoff_seconds:
+            return
+        self._restarts[server_type] = asyncio.ensure_future(self.ensure(server_type))
+
+    async def stop(self, timeout_seconds: float = 5.0) -> None:
+        """Terminate every server, killing those that do not exit within ``timeout_seconds``."""
+        for restart in self._restarts.values():
+            restart.cancel()
+        self._restarts.clear()
+        for server_type, process in list(self.processes.items()):
+            if process.returncode is not None:
+                continue
+            process.terminate()
+            try:
+                await asyncio.wait_for(process.wait(), timeout_seconds)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+        self.processes.clear()
+
+    def terminate_sync(self, timeout_seconds: float = 5.0) -> None:
+        """
+        Terminate every server without an event loop (the loop that spawned them may
+        already be closed at interpreter exit), killing those that do not exit within
+        ``timeout_seconds``.
+        """
+        for restart in self._restarts.values():
+            try:
+                restart.cancel()
+            except RuntimeError:
+                pass  # its event loop is closed
+        self._restarts.clear()
+        servers = []
+        for process in self.processes.values():
+            if process.returncode is not None:
+                continue
+            try:
+                server = psutil.Process(process.pid)
+                server.terminate()
+                servers.append(server)
+            except psutil.Error:
+                pass  # already gone
+        _, alive = psutil.wait_procs(servers, timeout=timeout_seconds)
+        for server in alive:
+            try:
+                server.kill()
+            except psutil.Error:
+                pass
+        psutil.wait_procs(alive, timeout=timeout_seconds)
+        if servers:
+            logger.info(f"🛑 Terminated {len(servers)} MCP servers")
+        self.processes.clear()
@@ -26,6 +26,7 @@ Author: EOTS v2.5 Development Team - "Apex Predator Consciousness Division"
 Version: 2.5.0 - "UNIFIED SENTIENT MARKET DOMINATION"
 """
 
+import atexit
 import logging
 import asyncio
 from datetime import datetime
@@ -45,7 +46,10 @@ except ImportError:
     PYDANTIC_AI_AVAILABLE = False
 
 # EOTS v2.5 imports
-from data_models import FinalAnalysisBundleV2_5
+from data_models import FinalAnalysisBundleV2_5, MCPFanOutSettings
+from core_analytics_engine.mcp_fanout_executor_v2_5 import (
+    DeadlineFanOutExecutorV2_5, FanOutOutcome, FanOutTask, MCPServerPoolV2_5
+)
 
 logger = logging.getLogger(__name__)
 
@@ -136,8 +140,19 @@ class MCPUnifiedManagerV2_5:
         # MCP server configurations (consolidated from both orchestrators)
         self.mcp_configs = self._get_unified_mcp_configs()
         
-        # Active MCP processes and tools
-        self.active_servers = {}
+        # Deadline-bounded fan-out of intelligence sources
+        fanout_settings = config_manager.get_setting("mcp_fanout_settings", None) if config_manager is not None else None
+        self.fanout_settings = fanout_settings if fanout_settings is not None else MCPFanOutSettings()
+        self.fanout_executor = DeadlineFanOutExecutorV2_5.from_settings(self.fanout_settings)
+        
+        # Long-lived MCP server processes (reused across requests) and tools
+        self.server_pool = MCPServerPoolV2_5(
+            self.mcp_configs, restart_backoff_seconds=self.fanout_settings.server_restart_backoff_seconds,
+            log_dir="logs/mcp"
+        )
+        self.active_servers = self.server_pool.processes
+        # Servers still running when the interpreter exits are terminated, not orphaned
+        atexit.register(self.server_pool.terminate_sync)
         self.tool_cache = {}
         self.execution_history = []
         
@@ -287,6 +302,9 @@ class MCPUnifiedManagerV2_5:
         """
         Initialize specified MCP servers with enhanced error handling.
 
+        Servers that are already running are reused; only missing or exited
+        servers are spawned.
+
         Args:
             servers: List of server types to initialize (None = all)
 
@@ -296,33 +314,14 @@ class MCPUnifiedManagerV2_5:
         if servers is None:
             servers = list(MCPServerType)
 
-        results = {}
-
-        for server_type in servers:
-            try:
-                logger.info(f"🚀 Initializing MCP server: {server_type.value}")
-
-                config = self.mcp_configs[server_type]
-
-                # Start the MCP server process
-                process = await asyncio.create_subprocess_exec(
-                    config["command"],
-                    *config["args"],
-                    env={**config["env"]},
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-
-                self.active_servers[server_type] = process
-                results[server_type] = True
-
-                logger.info(f"✅ MCP server {server_type.value} initialized successfully")
+        return await self.server_pool.start(servers)
 
-            except Exception as e:
-                logger.error(f"❌ Failed to initialize MCP server {server_type.value}: {str(e)}")
-                results[server_type] = False
-
-        return results
+    async def shutdown_mcp_servers(self, timeout_seconds: float = 5.0) -> None:
+        """
+        Terminate the long-lived MCP server processes from the running event loop
+        (servers left at interpreter exit are terminated by an atexit hook).
+        """
+        await self.server_pool.stop(timeout_seconds)
 
     async def generate_unified_intelligence(self,
                                           final_bundle: FinalAnalysisBundleV2_5,
@@ -339,73 +338,59 @@ class MCPUnifiedManagerV2_5:
         """
         try:
             logger.info(f"🧠 Generating unified intelligence for {symbol}...")
+            deadline = asyncio.get_running_loop().time() + self.fanout_settings.global_deadline_seconds
+
+            # PHASE 1: Intelligence sources of the running MCP servers (from orchestrator)
+            live_servers = set(self.server_pool.live_servers())
+            server_sources = [
+                (MCPServerType.MEMORY, self._generate_enhanced_memory_intelligence),
+                (MCPServerType.KNOWLEDGE_GRAPH, self._generate_knowledge_graph_intelligence),
+                (MCPServerType.SEQUENTIAL_THINKING, self._generate_sequential_thinking_intelligence),
+                (MCPServerType.HOT_NEWS, self._generate_news_intelligence),
+            ]
+            intelligence_tasks = [
+                FanOutTask(server_type.value, lambda method=method: method(final_bundle, symbol))
+                for server_type, method in server_sources if server_type in live_servers
+            ]
 
-            # PHASE 1: Parallel Intelligence Gathering (from orchestrator)
-            intelligence_tasks = []
-
-            # Memory Intelligence with Pydantic AI enhancement
-            if MCPServerType.MEMORY in self.active_servers:
-                intelligence_tasks.append(
-                    self._generate_enhanced_memory_intelligence(final_bundle, symbol)
-                )
-
-            # Knowledge Graph Intelligence
-            if MCPServerType.KNOWLEDGE_GRAPH in self.active_servers:
-                intelligence_tasks.append(
-                    self._generate_knowledge_graph_intelligence(final_bundle, symbol)
-                )
-
-            # Sequential Thinking Intelligence
-            if MCPServerType.SEQUENTIAL_THINKING in self.active_servers:
-                intelligence_tasks.append(
-                    self._generate_sequential_thinking_intelligence(final_bundle, symbol)
-                )
-
-            # News Intelligence
-            if MCPServerType.HOT_NEWS in self.active_servers:
-                intelligence_tasks.append(
-                    self._generate_news_intelligence(final_bundle, symbol)
-                )
-
-            # PHASE 2: Tool-based Intelligence Gathering (from tool orchestrator)
-            tool_tasks = []
-
-            # Database Intelligence
-            tool_tasks.append(self._gather_database_intelligence(symbol, final_bundle))
-
-            # Research Intelligence
-            tool_tasks.append(self._gather_research_intelligence(symbol, final_bundle))
-
-            # Pattern Intelligence
-            tool_tasks.append(self._gather_pattern_intelligence(symbol, final_bundle))
+            # PHASE 2: Tool-based intelligence sources (from tool orchestrator)
+            tool_tasks = [
+                FanOutTask("database", lambda: self._gather_database_intelligence(symbol, final_bundle)),
+                FanOutTask("research", lambda: self._gather_research_intelligence(symbol, final_bundle)),
+                FanOutTask("pattern", lambda: self._gather_pattern_intelligence(symbol, final_bundle)),
+            ]
 
-            # Execute all intelligence gathering in parallel
-            intelligence_results = await asyncio.gather(*intelligence_tasks, return_exceptions=True)
-            tool_results = await asyncio.gather(*tool_tasks, return_exceptions=True)
+            # Run every source concurrently under its budget and the global deadline
+            gather_outcome = await self.fanout_executor.run(
+                intelligence_tasks + tool_tasks, deadline - asyncio.get_running_loop().time()
+            )
+            intelligence_results = gather_outcome.ordered(task.name for task in intelligence_tasks)
+            tool_results = gather_outcome.ordered(task.name for task in tool_tasks)
 
-            # PHASE 3: Pydantic AI Recursive Learning (if enabled)
+            # PHASE 3: Pydantic AI Recursive Learning (if enabled), both agents concurrently
             recursive_analysis = None
             adaptive_learning = None
+            learning_outcome = FanOutOutcome()
 
             if self.pydantic_ai_enabled:
-                try:
-                    # Perform recursive intelligence analysis
-                    recursive_analysis = await self._perform_recursive_analysis(
+                learning_budget = self.fanout_settings.learning_budget_seconds
+                learning_outcome = await self.fanout_executor.run([
+                    FanOutTask("recursive_analysis", lambda: self._perform_recursive_analysis(
                         final_bundle, symbol, intelligence_results, tool_results
-                    )
-
-                    # Execute adaptive learning
-                    adaptive_learning = await self._execute_adaptive_learning(
+                    ), budget_seconds=learning_budget),
+                    FanOutTask("adaptive_learning", lambda: self._execute_adaptive_learning(
                         final_bundle, symbol, intelligence_results, tool_results
-                    )
-
-                except Exception as e:
-                    logger.error(f"❌ Pydantic AI analysis error: {str(e)}")
+                    ), budget_seconds=learning_budget),
+                ], deadline - asyncio.get_running_loop().time())
+                recursive_analysis = learning_outcome.results.get("recursive_analysis")
+                adaptive_learning = learning_outcome.results.get("adaptive_learning")
 
             # PHASE 4: Aggregate and synthesize all intelligence
             unified_intelligence = self._synthesize_unified_intelligence(
                 symbol, intelligence_results, tool_results, recursive_analysis, adaptive_learning
             )
+            unified_intelligence["fanout"] = FanOutOutcome.combine(gather_outcome, learning_outcome).summary()
+            unified_intelligence["completeness"] = unified_intelligence["fanout"]["completeness"]
 
             # PHASE 5: Store learning patterns for future improvement
             await self._store_learning_patterns(symbol, final_bundle, unified_intelligence)
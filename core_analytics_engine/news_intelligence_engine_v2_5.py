@@ -29,6 +29,7 @@ import uuid
 
 # Import EOTS components
 from data_management.alpha_vantage_fetcher_v2_5 import AlphaVantageDataFetcherV2_5, SentimentDataV2_5
+from data_management.sentiment_store_v2_5 import SentimentStoreV2_5
 from data_models import (
     ProcessedDataBundleV2_5,
     ProcessedUnderlyingAggregatesV2_5,
@@ -124,6 +125,15 @@ class NewsIntelligenceEngineV2_5:
         self.config_manager = config_manager
         self.alpha_vantage_fetcher = alpha_vantage_fetcher
         
+        # Cached sentiment per symbol, refreshed within the Alpha Vantage daily quota
+        self.sentiment_store: Optional[SentimentStoreV2_5] = None
+        if alpha_vantage_fetcher is not None:
+            cache_settings = config_manager.get_setting("news_sentiment_cache_settings", None) if config_manager is not None else None
+            self.sentiment_store = (
+                SentimentStoreV2_5.from_settings(alpha_vantage_fetcher, cache_settings)
+                if cache_settings is not None else SentimentStoreV2_5(alpha_vantage_fetcher)
+            )
+        
         # Intelligence thresholds
         self.sentiment_thresholds = {
             'extreme_bullish': 0.4,
@@ -167,8 +177,11 @@ class NewsIntelligenceEngineV2_5:
             # Extract EOTS metrics
             eots_metrics = self._extract_eots_metrics(processed_data)
             
-            # Classify sentiment regime
-            sentiment_regime = self._classify_sentiment_regime(sentiment_intelligence)
+            # Classify sentiment regime (once per fresh sentiment payload)
+            if self.sentiment_store is not None:
+                sentiment_regime = self.sentiment_store.derive(symbol, "sentiment_regime", self._classify_sentiment_regime)
+            else:
+                sentiment_regime = self._classify_sentiment_regime(sentiment_intelligence)
             
             # Detect market signals
             intelligence_signals = self._detect_intelligence_signals(
@@ -212,18 +225,13 @@ class NewsIntelligenceEngineV2_5:
             return self._get_fallback_intelligence(symbol)
     
     def _fetch_sentiment_intelligence(self, symbol: str) -> Dict[str, Any]:
-        """Fetch and process sentiment intelligence from Alpha Vantage."""
+        """Sentiment intelligence from the store: fresh, refreshed within the request budget, or stale."""
         try:
-            if not self.alpha_vantage_fetcher:
+            if self.sentiment_store is None:
                 return {}
             
-            # Get comprehensive sentiment data
-            comprehensive_intel = self.alpha_vantage_fetcher.get_comprehensive_intelligence_summary(symbol)
-            
-            if comprehensive_intel and comprehensive_intel.get('alpha_intelligence_active'):
-                return comprehensive_intel.get('sentiment', {})
-            
-            return {}
+            # Only the news-sentiment request is spent here; the payload carries its freshness
+            return self.sentiment_store.get(symbol)
             
         except Exception as e:
             logger.error(f"Error fetching sentiment intelligence: {str(e)}")
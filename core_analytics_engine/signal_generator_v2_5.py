@@ -10,6 +10,7 @@ import numpy as np
 
 from data_models import ProcessedDataBundleV2_5, SignalPayloadV2_5, ProcessedUnderlyingAggregatesV2_5 # Updated import
 from utils.config_manager_v2_5 import ConfigManagerV2_5
+from core_analytics_engine.vectorized_signal_engine_v2_5 import VectorizedSignalEngineV2_5
 
 
 logger = logging.getLogger(__name__)
@@ -50,6 +51,12 @@ class SignalGeneratorV2_5:
                              if hasattr(self.settings, 'get') 
                              else getattr(self.settings, 'signal_activation', {"EnableAllSignals": True}))
         
+        # Declarative signal rules, evaluated together over the underlying and strike arrays
+        vectorized_settings = self.config_manager.get_setting("vectorized_signal_settings", None)
+        self.signal_engine: Optional[VectorizedSignalEngineV2_5] = None
+        if vectorized_settings is None or vectorized_settings.enabled:
+            self.signal_engine = VectorizedSignalEngineV2_5.from_settings(vectorized_settings)
+
         self.logger.info("SignalGeneratorV2_5 initialized with activation settings.")
 
     def generate_all_signals(self, bundle: ProcessedDataBundleV2_5) -> Dict[str, List[SignalPayloadV2_5]]:
@@ -74,15 +81,18 @@ class SignalGeneratorV2_5:
         
         enable_all = self.activation.get("EnableAllSignals", False)
 
-        # Create DataFrames once for performance
-        # Ensure strike_level_data_with_metrics is not None before list comprehension
-        strike_metrics_list = bundle.strike_level_data_with_metrics or []
-        df_strike = pd.DataFrame([s.model_dump() for s in strike_metrics_list])
-        if not df_strike.empty:
-            df_strike.set_index('strike', inplace=True, drop=False)
-        else:
-            self.logger.debug("Strike level metrics data is empty or None. df_strike will be empty.")
+        if self.signal_engine is not None:
+            # One pass over all configured rules; the strike frame is built only if a rule reads it
+            df_strike = self._build_strike_frame(bundle) if self.signal_engine.needs_strike_frame else None
+            fired = self.signal_engine.evaluate(bundle.underlying_data_enriched, df_strike, regime)
+            for category in signals:
+                if enable_all or self.activation.get(f"{category}_signals", False):
+                    signals[category] = fired.get(category, [])
+            total_signals_generated = sum(len(v) for v in signals.values())
+            self.logger.info(f"Signal generation complete for {bundle.underlying_data_enriched.symbol}. Found {total_signals_generated} total signals.")
+            return signals
 
+        df_strike = self._build_strike_frame(bundle)
 
         if enable_all or self.activation.get("v2_5_enhanced_flow_signals", False):
             signals['v2_5_enhanced_flow'] = self._generate_v2_5_enhanced_flow_signals(bundle.underlying_data_enriched, regime)
@@ -104,6 +114,17 @@ class SignalGeneratorV2_5:
         self.logger.info(f"Signal generation complete for {bundle.underlying_data_enriched.symbol}. Found {total_signals_generated} total signals.")
         return signals
 
+    def _build_strike_frame(self, bundle: ProcessedDataBundleV2_5) -> pd.DataFrame:
+        """Strike-level metrics as a DataFrame indexed by strike."""
+        # Ensure strike_level_data_with_metrics is not None before list comprehension
+        strike_metrics_list = bundle.strike_level_data_with_metrics or []
+        df_strike = pd.DataFrame([s.model_dump() for s in strike_metrics_list])
+        if not df_strike.empty:
+            df_strike.set_index('strike', inplace=True, drop=False)
+        else:
+            self.logger.debug("Strike level metrics data is empty or None. df_strike will be empty.")
+        return df_strike
+
     # --- Stub Methods for Future Signal Categories ---
     def _generate_directional_signals(self, bundle: ProcessedDataBundleV2_5, regime: str, df_strike: pd.DataFrame) -> List[SignalPayloadV2_5]:
         self.logger.warning(f"Signal generation for 'directional' category for {bundle.underlying_data_enriched.symbol} is not yet implemented. Returning empty list.")
@@ -15,8 +15,6 @@ import pandas as pd
 from typing import Dict, List, Optional, Any, Union
 from pydantic import BaseModel, Field
 from datetime import datetime
-import time
-import random
 import warnings
 
 # Conditional import for Yahoo Finance
@@ -29,6 +27,7 @@ except ImportError:
 
 # Import Pydantic model for type hints
 from data_models import TickerContextAnalyzerSettings
+from data_management.market_context_cache_v2_5 import MarketContextCacheV2_5
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -92,7 +91,8 @@ class TickerContextAnalyzerV2_5:
     analysis including fundamental, technical, and market environment factors.
     """
     
-    def __init__(self, config: Union[TickerContextAnalyzerSettings, Dict[str, Any]]):
+    def __init__(self, config: Union[TickerContextAnalyzerSettings, Dict[str, Any]],
+                 market_data: Optional[MarketContextCacheV2_5] = None):
         self.logger = logger.getChild(self.__class__.__name__)
         
         # PYDANTIC COMPLIANCE: Handle both Pydantic models and dictionaries
@@ -115,11 +115,8 @@ class TickerContextAnalyzerV2_5:
         
         self.logger.info(f"TickerContextAnalyzer initialized. Yahoo Finance: {'Enabled' if self.use_yahoo_finance else 'Disabled'}")
         
-        # Cache for ticker info to avoid repeated API calls
-        self._ticker_info_cache = {}
-        
-        # Rate limiting for Yahoo Finance
-        self._last_yahoo_call = None
+        # Persistent, TTL-aware cache of daily bars and ticker info (shared across processes)
+        self.market_data = market_data if market_data is not None else MarketContextCacheV2_5.from_settings(config)
         
         # Market benchmarks
         self.benchmarks = ['SPY', 'QQQ', 'IWM', 'VIX']
@@ -138,9 +135,6 @@ class TickerContextAnalyzerV2_5:
             'Real Estate': 'XLRE',
             'Communication Services': 'XLC'
         }
-        
-        # Cache for market data
-        self.market_data_cache: Dict[str, pd.DataFrame] = {}
     
     def analyze_ticker_context(self, 
                              symbol: str,
@@ -239,30 +233,16 @@ class TickerContextAnalyzerV2_5:
             return TickerProfile(symbol=symbol)
     
     def _get_ticker_info(self, symbol: str) -> Dict:
-        """Get ticker fundamental information with rate limiting and error handling."""
-        if symbol in self._ticker_info_cache:
-            return self._ticker_info_cache[symbol]
-        
-        if not self.use_yahoo_finance:
-            raise ValueError(f"CRITICAL: Yahoo Finance disabled and no fallback data allowed for {symbol} - cannot proceed without real ticker data!")
-        
+        """Get ticker fundamental information from the market context cache."""
         try:
-            # Rate limiting: use configured delay
-            time.sleep(random.uniform(1.0, self.yahoo_finance_rate_limit))
-            
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
-            
-            # Validate that we got useful data
-            if not info or len(info) < 5:
-                raise ValueError(f"CRITICAL: Yahoo Finance returned minimal data for {symbol} - cannot proceed without real ticker data!")
-            
-            self._ticker_info_cache[symbol] = info
-            self.logger.debug(f"Successfully fetched Yahoo Finance data for {symbol}")
-            return info
-            
+            info = self.market_data.get_info(symbol)
         except Exception as e:
-            raise ValueError(f"CRITICAL: Yahoo Finance failed for {symbol}: {str(e)} - cannot proceed without real ticker data!")
+            raise ValueError(f"CRITICAL: Ticker info unavailable for {symbol}: {str(e)} - cannot proceed without real ticker data!")
+        
+        # Validate that we got useful data
+        if len(info) < 5:
+            raise ValueError(f"CRITICAL: Provider returned minimal data for {symbol} - cannot proceed without real ticker data!")
+        return info
     
     # ZERO TOLERANCE FAKE DATA: _get_fallback_ticker_info method removed
     
@@ -308,27 +288,13 @@ class TickerContextAnalyzerV2_5:
             )
     
     def _get_market_data(self, symbol: str) -> pd.DataFrame:
-        """Get market data with caching and error handling."""
-        if symbol in self.market_data_cache:
-            return self.market_data_cache[symbol]
-        
-        if not self.use_yahoo_finance:
-            self.logger.warning(f"Yahoo Finance disabled or unavailable - returning empty DataFrame for {symbol}")
-            return pd.DataFrame()
-        
+        """Get the last three months of daily bars from the market context cache."""
         try:
-            # Rate limiting: use configured delay
-            time.sleep(random.uniform(1.0, self.yahoo_finance_rate_limit))
-            
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period='3mo')
+            data = self.market_data.get_history(symbol, period_days=92)
             
             if data.empty:
-                self.logger.warning(f"Yahoo Finance returned empty data for {symbol}")
+                self.logger.warning(f"Market data provider returned empty data for {symbol}")
                 return pd.DataFrame()
-            
-            self.market_data_cache[symbol] = data
-            self.logger.debug(f"Successfully fetched market data for {symbol}: {len(data)} rows")
             return data
             
         except Exception as e:
@@ -3,11 +3,12 @@
 
 import logging
 import uuid
-from typing import Optional, Tuple, List, Dict, Any
+from typing import Optional, Tuple, List, Dict, Any, Sequence
 from datetime import datetime
 import pandas as pd
 
 from utils.config_manager_v2_5 import ConfigManagerV2_5
+from core_analytics_engine.contract_selector_v2_5 import ContractSelectorV2_5
 from data_models import ATIFStrategyDirectivePayloadV2_5
 from data_models import ActiveRecommendationPayloadV2_5
 from data_models import KeyLevelsDataV2_5
@@ -32,24 +33,59 @@ class TradeParameterOptimizerV2_5:
             # Fallback to a default Pydantic model instance if settings are not found
             self.settings = TradeParameterOptimizerSettings()
         
+        # One pre-indexed selector per symbol, rebuilt only when a new chain snapshot arrives
+        self._selectors: Dict[str, Tuple[Tuple[Any, ...], ContractSelectorV2_5]] = {}
+
         self.logger.info("TradeParameterOptimizerV2_5 Initialized with settings:")
         self.logger.debug(f"Settings: {self.settings}")
 
+    def contract_selector_for(self, processed_data: ProcessedDataBundleV2_5) -> ContractSelectorV2_5:
+        """Returns the contract selector for this bundle's chain, building it once per snapshot."""
+        contracts = processed_data.options_data_with_metrics
+        symbol = processed_data.underlying_data_enriched.symbol
+        snapshot_key = (processed_data.processing_timestamp, id(contracts), len(contracts))
+        cached = self._selectors.get(symbol)
+        if cached is not None and cached[0] == snapshot_key:
+            return cached[1]
+
+        chain_df = pd.DataFrame([c.model_dump() if hasattr(c, "model_dump") else c for c in contracts])
+        selector = ContractSelectorV2_5(chain_df)
+        self._selectors[symbol] = (snapshot_key, selector)
+        return selector
+
+    def optimize_parameters_for_directives(
+        self, directives: Sequence[ATIFStrategyDirectivePayloadV2_5],
+        processed_data: ProcessedDataBundleV2_5, key_levels: KeyLevelsDataV2_5
+    ) -> List[Optional[ActiveRecommendationPayloadV2_5]]:
+        """Parameterizes every directive for one symbol, selecting all contracts in a single batched query."""
+        try:
+            selector = self.contract_selector_for(processed_data)
+            contracts = self._select_optimal_contracts_batch(list(directives), selector)
+        except Exception as e:
+            self.logger.critical(f"Unhandled exception during batched contract selection: {e}", exc_info=True)
+            return [None] * len(directives)
+        return [
+            self.optimize_parameters_for_directive(directive, processed_data, key_levels, selected_contracts=selected)
+            for directive, selected in zip(directives, contracts)
+        ]
+
     def optimize_parameters_for_directive(
         self, directive: ATIFStrategyDirectivePayloadV2_5,
-        processed_data: ProcessedDataBundleV2_5, key_levels: KeyLevelsDataV2_5
+        processed_data: ProcessedDataBundleV2_5, key_levels: KeyLevelsDataV2_5,
+        selected_contracts: Optional[List[Dict]] = None
     ) -> Optional[ActiveRecommendationPayloadV2_5]:
         """Main method to generate a fully parameterized trade recommendation."""
         if not all(isinstance(arg, (ATIFStrategyDirectivePayloadV2_5, ProcessedDataBundleV2_5, KeyLevelsDataV2_5)) for arg in [directive, processed_data, key_levels]):
             self.logger.error("Invalid input types to TPO. Aborting.")
             return None
         try:
-            options_chain_df = pd.DataFrame(processed_data.options_data_with_metrics)
-            if options_chain_df.empty:
-                self.logger.warning("Options chain is empty. Cannot select contract.")
-                return None
+            if selected_contracts is None:
+                selector = self.contract_selector_for(processed_data)
+                if selector.empty:
+                    self.logger.warning("Options chain is empty. Cannot select contract.")
+                    return None
+                selected_contracts = self._select_optimal_contracts(directive, selector)
 
-            selected_contracts = self._select_optimal_contracts(directive, options_chain_df)
             if not selected_contracts:
                 self.logger.warning(f"Could not find a suitable contract for directive: {directive.selected_strategy_type}")
                 return None
@@ -68,33 +104,34 @@ class TradeParameterOptimizerV2_5:
             self.logger.critical(f"Unhandled exception during parameter optimization: {e}", exc_info=True)
             return None
 
-    def _select_optimal_contracts(self, directive: ATIFStrategyDirectivePayloadV2_5, chain_df: pd.DataFrame) -> Optional[List[Dict]]:
+    def _select_optimal_contracts(self, directive: ATIFStrategyDirectivePayloadV2_5, chain: Any) -> Optional[List[Dict]]:
         """Selects the best option contracts from the chain based on ATIF directives."""
-        if directive.selected_strategy_type in ["LongCall", "LongPut"]:
-            is_call = directive.selected_strategy_type == "LongCall"
-            
-            # Filter by DTE and option type
-            candidates = chain_df[
-                (chain_df['opt_kind'] == ('call' if is_call else 'put')) &
-                (chain_df['dte_calc'] >= directive.target_dte_min) &
-                (chain_df['dte_calc'] <= directive.target_dte_max)
-            ].copy()
+        selector = chain if isinstance(chain, ContractSelectorV2_5) else ContractSelectorV2_5(chain)
+        return self._select_optimal_contracts_batch([directive], selector)[0]
 
-            # Filter by delta
-            if directive.target_delta_long_leg_min is not None:
-                candidates = candidates[candidates['delta'].abs().between(
-                    directive.target_delta_long_leg_min, directive.target_delta_long_leg_max
-                )]
+    def _select_optimal_contracts_batch(
+        self, directives: List[ATIFStrategyDirectivePayloadV2_5], selector: ContractSelectorV2_5
+    ) -> List[Optional[List[Dict]]]:
+        """Selects the most liquid contract inside each directive's DTE window and delta band in one query."""
+        results: List[Optional[List[Dict]]] = [None] * len(directives)
+        single_leg = [i for i, d in enumerate(directives) if d.selected_strategy_type in ["LongCall", "LongPut"]]
+        for i, directive in enumerate(directives):
+            if directive.selected_strategy_type not in ["LongCall", "LongPut"]:
+                self.logger.warning(f"Contract selection for '{directive.selected_strategy_type}' is not yet implemented.")
+        if not single_leg:
+            return results
 
-            if candidates.empty: return None
-
-            # Score and select best contract
-            candidates['liquidity_score'] = candidates['oi'].fillna(0) + candidates['volm'].fillna(0) * 5
-            best_contract = candidates.loc[candidates['liquidity_score'].idxmax()]
-            return [best_contract.to_dict()]
-        
-        self.logger.warning(f"Contract selection for '{directive.selected_strategy_type}' is not yet implemented.")
-        return None
+        legs = [directives[i] for i in single_leg]
+        positions = selector.most_liquid(
+            option_type=["call" if d.selected_strategy_type == "LongCall" else "put" for d in legs],
+            dte_min=[d.target_dte_min for d in legs],
+            dte_max=[d.target_dte_max for d in legs],
+            delta_min=[d.target_delta_long_leg_min for d in legs],
+            delta_max=[d.target_delta_long_leg_max if d.target_delta_long_leg_min is not None else None for d in legs],
+        )
+        for i, record in zip(single_leg, selector.records(positions)):
+            results[i] = [record] if record is not None else None
+        return results
 
     def _calculate_sl_and_targets(self, trade_bias: str, entry_price_und: float, key_levels: KeyLevelsDataV2_5, atr: float) -> Tuple[float, float, Optional[float]]:
         """Calculates SL and multiple TP levels for the underlying."""
@@ -194,36 +231,28 @@ class TradeParameterOptimizerV2_5:
             "target_2": target_2
         }
 
-    def _select_best_contract(self, options_df: pd.DataFrame, target_delta: float, target_dte: int, 
+    def _select_best_contract(self, options_df: Any, target_delta: float, target_dte: int, 
                             option_type: str) -> Optional[Dict[str, Any]]:
         """Select the best contract based on delta and DTE targets."""
         try:
-            # Filter by option type and DTE
-            filtered_df = options_df[
-                (options_df['opt_kind'] == option_type) & 
-                (options_df['dte'] <= target_dte + 2) &  # Allow some flexibility
-                (options_df['dte'] >= max(1, target_dte - 2))
-            ].copy()
-            
-            if filtered_df.empty:
+            selector = options_df if isinstance(options_df, ContractSelectorV2_5) else ContractSelectorV2_5(options_df)
+            # Closest |delta| within +/- 2 DTE of the target (never below 1 DTE)
+            contract_dict = selector.records(selector.nearest_delta(option_type, target_delta, target_dte))[0]
+            if contract_dict is None:
                 return None
             
-            # Find contract closest to target delta
-            filtered_df['delta_diff'] = abs(filtered_df['delta'] - abs(target_delta))
-            best_contract = filtered_df.loc[filtered_df['delta_diff'].idxmin()]
-            
             # PYDANTIC COMPLIANCE FIX: Handle contract data properly
-            contract_dict = best_contract.to_dict()
             opt_entry = contract_dict.get('price') or ((contract_dict.get('bid_price', 0) + contract_dict.get('ask_price', 0)) / 2)
-            opt_delta = contract_dict.get('delta', 0.5)
+            opt_delta = contract_dict.get('delta', contract_dict.get('delta_contract', 0.5))
             
             return {
-                'strike': best_contract['strike'],
-                'expiration': best_contract['expiration'],
+                'strike': contract_dict['strike'],
+                'expiration': contract_dict.get('expiration'),
                 'option_type': option_type,
                 'delta': opt_delta,
                 'entry_price': opt_entry,
-                'dte': best_contract['dte']
+                'dte': contract_dict.get('dte', contract_dict.get('dte_calc')),
+                'liquidity_score': contract_dict['liquidity_score']
             }
             
         except Exception as e:
@@ -234,7 +263,7 @@ class TradeParameterOptimizerV2_5:
         """Constructs the final recommendation payload."""
         contract = contracts[0]
         opt_entry = contract.get('price') or ((contract.get('bid_price', 0) + contract.get('ask_price', 0)) / 2)
-        opt_delta = contract.get('delta', 0.5)
+        opt_delta = contract.get('delta', contract.get('delta_contract', 0.5))
 
         opt_sl = opt_entry - abs(und_sl - processed_data.underlying_data_enriched.price) * abs(opt_delta)
         opt_t1 = opt_entry + abs(und_t1 - processed_data.underlying_data_enriched.price) * abs(opt_delta)
@@ -0,0 +1,217 @@
+# core_analytics_engine/vectorized_signal_engine_v2_5.py
+# EOTS v2.5 - Columnar evaluation of declarative signal rules
+
+"""
+Columnar signal rule engine for SignalGeneratorV2_5.
+
+Signal rules are declared in configuration (VectorizedSignalSettings.rules). A rule is
+a list of conditions over underlying or strike metrics plus a strength metric. At
+construction the rules of each scope are compiled into flat arrays (metric index,
+operator and threshold per condition, and the offset of each rule's first condition).
+One call to ``evaluate`` then:
+
+1. gathers every referenced metric into a matrix (1 row for the underlying, one row
+   per strike),
+2. evaluates all conditions of all rules as one broadcast comparison,
+3. reduces conditions to per-rule masks with ``np.logical_and.reduceat``,
+4. builds SignalPayloadV2_5 models only for the rule/row pairs that fired (for strike
+   rules, the ``max_signals`` strongest strikes).
+
+Adding rules or strikes therefore grows array widths, not Python loops.
+"""
+
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from data_models import SignalPayloadV2_5, VectorizedSignalSettings
+
+logger = logging.getLogger(__name__)
+EPSILON = 1e-9
+
+SIGNAL_CATEGORIES = ('directional', 'volatility', 'time_decay', 'complex', 'v2_5_enhanced_flow')
+
+# SignalPayloadV2_5.signal_type and the SupportingMetrics group used for each category
+CATEGORY_SIGNAL_TYPES = {
+    'directional': 'Directional',
+    'volatility': 'Volatility',
+    'time_decay': 'Structural',
+    'complex': 'Structural',
+    'v2_5_enhanced_flow': 'Momentum',
+}
+CATEGORY_METRIC_GROUPS = {
+    'directional': 'momentum_indicators',
+    'volatility': 'volatility_indicators',
+    'time_decay': 'market_microstructure',
+    'complex': 'market_microstructure',
+    'v2_5_enhanced_flow': 'momentum_indicators',
+}
+
+_OP_SIGN = {'gt': 1.0, 'ge': 1.0, 'abs_gt': 1.0, 'lt': -1.0, 'le': -1.0, 'abs_lt': -1.0}
+
+
+@dataclass
+class _CompiledRules:
+    """Rules of one scope flattened into condition and rule arrays."""
+    rules: List[Any]
+    metrics: List[str]
+    cond_metric_idx: np.ndarray
+    cond_abs: np.ndarray
+    cond_sign: np.ndarray
+    cond_inclusive: np.ndarray
+    cond_threshold: np.ndarray
+    cond_regime_thresholds: List[Dict[str, float]]
+    rule_offsets: np.ndarray
+    strength_idx: np.ndarray
+    strength_scale: np.ndarray
+
+    @classmethod
+    def compile(cls, rules: List[Any]) -> "_CompiledRules":
+        metrics: List[str] = []
+        index: Dict[str, int] = {}
+
+        def metric_idx(name: str) -> int:
+            if name not in index:
+                index[name] = len(metrics)
+                metrics.append(name)
+            return index[name]
+
+        conditions = [c for rule in rules for c in rule.conditions]
+        offsets = np.cumsum([0] + [len(rule.conditions) for rule in rules[:-1]]).astype(np.intp)
+        return cls(
+            rules=rules,
+            metrics=metrics,
+            cond_metric_idx=np.array([metric_idx(c.metric) for c in conditions], dtype=np.intp),
+            cond_abs=np.array([c.op.startswith('abs_') for c in conditions], dtype=bool),
+            cond_sign=np.array([_OP_SIGN[c.op] for c in conditions], dtype=float),
+            cond_inclusive=np.array([c.op in ('ge', 'le') for c in conditions], dtype=bool),
+            cond_threshold=np.array([c.threshold for c in conditions], dtype=float),
+            cond_regime_thresholds=[c.regime_thresholds for c in conditions],
+            rule_offsets=offsets,
+            strength_idx=np.array([metric_idx(r.strength_metric or r.conditions[0].metric) for r in rules], dtype=np.intp),
+            strength_scale=np.array([r.strength_scale for r in rules], dtype=float),
+        )
+
+    def thresholds(self, regime: str) -> np.ndarray:
+        overrides = [(i, t[regime]) for i, t in enumerate(self.cond_regime_thresholds) if regime in t]
+        if not overrides:
+            return self.cond_threshold
+        thresholds = self.cond_threshold.copy()
+        for i, value in overrides:
+            thresholds[i] = value
+        return thresholds
+
+    def evaluate(self, values: np.ndarray, regime: str):
+        """Per-rule fired mask and strength, each shaped (rows, rules), plus the condition thresholds used."""
+        thresholds = self.thresholds(regime)
+        cond_values = values[:, self.cond_metric_idx]
+        cond_values = np.where(self.cond_abs, np.abs(cond_values), cond_values)
+        with np.errstate(invalid='ignore'):
+            margin = self.cond_sign * (cond_values - thresholds)
+            holds = (margin > 0) | (self.cond_inclusive & (margin == 0))
+        fired = np.logical_and.reduceat(holds, self.rule_offsets, axis=1)
+        strength = values[:, self.strength_idx] * self.strength_scale
+        return fired & np.isfinite(strength), strength, thresholds
+
+
+class VectorizedSignalEngineV2_5:
+    """Evaluates configured signal rules over underlying aggregates and the strike frame in one pass."""
+
+    def __init__(self, rules: List[Any]):
+        self.underlying = _CompiledRules.compile([r for r in rules if r.scope == 'underlying'])
+        self.strike = _CompiledRules.compile([r for r in rules if r.scope == 'strike'])
+
+    @classmethod
+    def from_settings(cls, settings: Optional[VectorizedSignalSettings]) -> "VectorizedSignalEngineV2_5":
+        return cls((settings or VectorizedSignalSettings()).rules)
+
+    @property
+    def needs_strike_frame(self) -> bool:
+        return bool(self.strike.rules)
+
+    def evaluate(self, und_data: Any, df_strike: Optional[pd.DataFrame], regime: str) -> Dict[str, List[SignalPayloadV2_5]]:
+        """Signals that fired, grouped by category."""
+        signals: Dict[str, List[SignalPayloadV2_5]] = {category: [] for category in SIGNAL_CATEGORIES}
+        regime = str(regime) if regime is not None else "UNKNOWN"
+        symbol = getattr(und_data, 'symbol', None) or "UNKNOWN"
+        timestamp = datetime.now()
+
+        if self.underlying.rules:
+            values = np.array([[self._as_float(getattr(und_data, m, None)) for m in self.underlying.metrics]], dtype=float)
+            fired, strength, thresholds = self.underlying.evaluate(values, regime)
+            for r in np.flatnonzero(fired[0]):
+                rule = self.underlying.rules[r]
+                signals[rule.category].append(self._payload(
+                    rule, self.underlying, symbol, timestamp, regime, strength[0, r], values[0], thresholds, r, None
+                ))
+
+        if self.strike.rules and df_strike is not None and not df_strike.empty:
+            values = self._strike_matrix(df_strike, self.strike.metrics)
+            strikes = pd.to_numeric(df_strike['strike'], errors='coerce').to_numpy(dtype=float) if 'strike' in df_strike else None
+            fired, strength, thresholds = self.strike.evaluate(values, regime)
+            for r in np.flatnonzero(fired.any(axis=0)):
+                rule = self.strike.rules[r]
+                rows = np.flatnonzero(fired[:, r])
+                if len(rows) > rule.max_signals:
+                    rows = rows[np.argpartition(-np.abs(strength[rows, r]), rule.max_signals - 1)[:rule.max_signals]]
+                rows = rows[np.lexsort((rows, -np.abs(strength[rows, r])))]  # strongest first, ties by strike order
+                for row in rows:
+                    strike = strikes[row] if strikes is not None else None
+                    signals[rule.category].append(self._payload(
+                        rule, self.strike, symbol, timestamp, regime, strength[row, r], values[row], thresholds, r, strike
+                    ))
+
+        return signals
+
+    @staticmethod
+    def _as_float(value: Any) -> float:
+        try:
+            return float(value) if value is not None else np.nan
+        except (TypeError, ValueError):
+            return np.nan
+
+    @staticmethod
+    def _strike_matrix(df_strike: pd.DataFrame, metrics: List[str]) -> np.ndarray:
+        frame = df_strike.reindex(columns=metrics)
+        non_numeric = [c for c in frame.columns if not pd.api.types.is_numeric_dtype(frame[c])]
+        if non_numeric:
+            frame = frame.copy()
+            frame[non_numeric] = frame[non_numeric].apply(pd.to_numeric, errors='coerce')
+        return frame.to_numpy(dtype=float, na_value=np.nan)
+
+    @staticmethod
+    def _payload(rule: Any, compiled: _CompiledRules, symbol: str, timestamp: datetime, regime: str,
+                 strength: float, row_values: np.ndarray, thresholds: np.ndarray, rule_idx: int,
+                 strike: Optional[float]) -> SignalPayloadV2_5:
+        if rule.direction != 'sign':
+            direction = rule.direction
+        elif strength > EPSILON:
+            direction = "Bullish"
+        elif strength < -EPSILON:
+            direction = "Bearish"
+        else:
+            direction = "Neutral"
+
+        start = compiled.rule_offsets[rule_idx]
+        evidence: Dict[str, float] = {}
+        for i, condition in enumerate(rule.conditions, start=start):
+            evidence[condition.metric] = float(row_values[compiled.cond_metric_idx[i]])
+            evidence[f"{condition.metric}_threshold"] = float(thresholds[i])
+
+        return SignalPayloadV2_5(
+            signal_id=f"sig_{uuid.uuid4().hex[:8]}",
+            signal_name=rule.name,
+            symbol=symbol,
+            timestamp=timestamp,
+            signal_type=rule.signal_type or CATEGORY_SIGNAL_TYPES[rule.category],
+            direction=direction,
+            strength_score=float(np.clip(strength, -5.0, 5.0)),
+            strike_impacted=float(strike) if strike is not None and np.isfinite(strike) and strike > 0 else None,
+            regime_at_signal_generation=regime,
+            supporting_metrics={CATEGORY_METRIC_GROUPS[rule.category]: evidence},
+        )
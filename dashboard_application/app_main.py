@@ -1,6 +1,7 @@
 # dashboard_application/app_main.py
 # EOTS v2.5 - S-GRADE, AUTHORITATIVE APPLICATION ENTRY POINT (REFACTORED)
 
+import json
 import logging
 import sys
 import os
@@ -12,6 +13,7 @@ if project_root not in sys.path:
 
 from dash.dash import Dash
 import dash_bootstrap_components as dbc
+from flask import Response, request
 
 # --- [START] EOTS V2.5 CORE IMPORTS (CORRECTED) ---
 # All imports are now absolute from the project root, which is added to sys.path
@@ -68,9 +70,25 @@ def create_dash_app(config_manager: ConfigManagerV2_5, orchestrator) -> Dash:
     
     # Register callbacks with hardwired filtering
     callback_manager_v2_5.register_v2_5_callbacks(app, orchestrator, config_manager)
+
+    register_status_routes(app, orchestrator)
     
     return app
 
+def register_status_routes(app: Dash, orchestrator) -> None:
+    """
+    Expose orchestrator diagnostics as JSON on the dashboard's Flask server.
+
+    GET /status/stage-traces?limit=N&symbol=SPY returns the slowest recorded analysis
+    cycles (full span trees) and the per-stage summary from the stage tracer.
+    """
+    @app.server.route("/status/stage-traces")
+    def stage_trace_status():
+        limit = request.args.get("limit", type=int)
+        symbol = request.args.get("symbol") or None
+        report = orchestrator.get_stage_trace_report(limit=limit, symbol=symbol)
+        return Response(json.dumps(report, default=str), mimetype="application/json")
+
 def run_dashboard(config_manager: ConfigManagerV2_5, orchestrator) -> None:
     """
     🚀 PYDANTIC-FIRST: Run the Dash application with hardwired universal filtering.
@@ -10,7 +10,7 @@ import time
 import json
 
 import dash
-from dash import Input, Output, State, ctx, no_update, html
+from dash import Input, Output, State, ALL, ctx, no_update, html
 import dash_bootstrap_components as dbc
 
 # EOTS V2.5 Imports
@@ -29,6 +29,8 @@ from data_models import KeyLevelsDataV2_5, KeyLevelV2_5, SignalPayloadV2_5
 from data_models import ATIFStrategyDirectivePayloadV2_5, ATIFSituationalAssessmentProfileV2_5
 from data_models import ActiveRecommendationPayloadV2_5, TradeParametersV2_5
 from data_models import ProcessedContractMetricsV2_5, ProcessedStrikeLevelMetricsV2_5
+from dashboard_application.utils.figure_cache_v2_5 import FIGURE_GRAPH_TYPE, FigureUpdatePlannerV2_5
+from data_management.shared_bundle_channel_v2_5 import SharedBundleReaderV2_5
 
 # --- Module-Specific Logger & Global References ---
 callback_logger = logging.getLogger(__name__)
@@ -39,11 +41,20 @@ CONFIG_REF: Optional[ConfigManagerV2_5] = None
 _last_request_cache = {}
 _cache_timeout = 2  # seconds
 
+# Sends dash.Patch / per-figure updates when only chart data changed between renders (state kept per rendered page)
+FIGURE_UPDATE_PLANNER = FigureUpdatePlannerV2_5()
+
+# Reads bundles the intraday collector published to shared memory (None when the channel is disabled)
+SHARED_BUNDLE_READER: Optional[SharedBundleReaderV2_5] = None
+
 def register_v2_5_callbacks(app: dash.Dash, orchestrator: ITSOrchestratorV2_5, config: ConfigManagerV2_5):
     """Registers all v2.5 callbacks with the Dash app instance."""
-    global ORCHESTRATOR_REF, CONFIG_REF
+    global ORCHESTRATOR_REF, CONFIG_REF, SHARED_BUNDLE_READER
     ORCHESTRATOR_REF = orchestrator
     CONFIG_REF = config
+    shared_bundle_settings = config.get_setting("shared_bundle_channel_settings", None)
+    if shared_bundle_settings is not None and shared_bundle_settings.enabled:
+        SHARED_BUNDLE_READER = SharedBundleReaderV2_5.from_settings(shared_bundle_settings)
     callback_logger.info("Registering EOTS v2.5 authoritative callbacks...")
 
     # --- Primary Data Fetching and Storage Callback ---
@@ -77,6 +88,16 @@ def register_v2_5_callbacks(app: dash.Dash, orchestrator: ITSOrchestratorV2_5, c
             # Update cache with current request time
             _last_request_cache[cache_key] = current_time
 
+            # Use the collector's latest bundle from shared memory when it is fresh and matches the request
+            if SHARED_BUNDLE_READER is not None:
+                bundle_json = SHARED_BUNDLE_READER.read_bundle_json(
+                    symbol or "SPY", dte_min or 0, dte_max or 5, price_range_percent or 5
+                )
+                if bundle_json is not None:
+                    callback_logger.debug(f"📡 Using shared-memory bundle for {symbol or 'SPY'}")
+                    status_message = f"🟢 LIVE (collector) - {symbol or 'SPY'} at {datetime.datetime.now().strftime('%H:%M:%S EST')}"
+                    return bundle_json, dbc.Alert(status_message, color="success", duration=6000)
+
             # Call the orchestrator's async method using asyncio.run with strict Pydantic v2 validation
             callback_logger.debug(f"🔄 Fetching live data for {symbol or 'SPY'}...")
             bundle = asyncio.run(ORCHESTRATOR_REF.run_full_analysis_cycle(
@@ -119,14 +140,24 @@ def register_v2_5_callbacks(app: dash.Dash, orchestrator: ITSOrchestratorV2_5, c
     # --- Dynamic Mode and Chart Rendering Callback ---
     @app.callback(
         Output(ids.ID_PAGE_CONTENT, 'children'),
+        Output({"type": FIGURE_GRAPH_TYPE, "chart": ALL}, 'figure'),
+        Output(ids.ID_FIGURE_PAGE_STORE, 'data'),
         Input(ids.ID_MAIN_DATA_STORE, 'data'),
-        State(ids.ID_URL_LOCATION, 'pathname') # Use URL to determine the mode
+        State(ids.ID_URL_LOCATION, 'pathname'), # Use URL to determine the mode
+        State(ids.ID_FIGURE_PAGE_STORE, 'data')
     )
-    def render_mode_content(bundle_json: Optional[str], pathname: str) -> Any:
+    def render_mode_content(bundle_json: Optional[str], pathname: str, page_token: Optional[str]) -> tuple:
         """
-        Renders the entire layout for the currently selected mode.
-        This is the central UI update callback.
+        Renders the layout for the currently selected mode.
+        This is the central UI update callback: when only chart data changed since this
+        browser page's last render, the page is left in place and the figures are patched
+        individually against what this page was sent.
         """
+        mode_layout = _build_mode_layout(bundle_json, pathname)
+        return FIGURE_UPDATE_PLANNER.plan(pathname or '/', mode_layout, ctx.outputs_list[1], page_token)
+
+    def _build_mode_layout(bundle_json: Optional[str], pathname: str) -> Any:
+        """Builds the entire layout for the currently selected mode."""
         callback_logger.info(f"RENDER CALLBACK: bundle_json={'has data' if bundle_json else 'None'}, pathname='{pathname}'")
         
         if not bundle_json:
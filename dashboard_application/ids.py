@@ -9,6 +9,7 @@ Centralizing IDs here prevents typos and simplifies component management across
 # --- Core Application & State Management ---
 ID_URL_LOCATION = "url-location-id"
 ID_MAIN_DATA_STORE = "main-data-store-id"
+ID_FIGURE_PAGE_STORE = "figure-page-store-id"
 ID_INTERVAL_LIVE_UPDATE = "interval-live-update-id"
 ID_MANUAL_REFRESH_BUTTON = "manual-refresh-button-id"
 
@@ -486,6 +486,7 @@ def create_master_layout(config: ConfigManagerV2_5) -> html.Div:
         children=[
             dcc.Location(id=ids.ID_URL_LOCATION, refresh=False),
             dcc.Store(id=ids.ID_MAIN_DATA_STORE, storage_type='memory'), # Stores the main analysis bundle
+            dcc.Store(id=ids.ID_FIGURE_PAGE_STORE, storage_type='memory'), # Token of the rendered page, for per-page figure patches
             dcc.Interval(
                 id=ids.ID_INTERVAL_LIVE_UPDATE,
                 interval=initial_refresh_ms,
@@ -18,9 +18,17 @@ from data_models import FinalAnalysisBundleV2_5 # ProcessedUnderlyingAggregatesV
 from utils.config_manager_v2_5 import ConfigManagerV2_5
 from dashboard_application.utils_dashboard_v2_5 import create_empty_figure, add_bottom_right_timestamp_annotation, PLOTLY_TEMPLATE, apply_dark_theme_template
 from dashboard_application import ids
+from dashboard_application.utils.figure_cache_v2_5 import cached_chart
 
 logger = logging.getLogger(__name__)
 
+# --- Figure cache selectors for the underlying-history charts ---
+def _history_chart_inputs(und_data, symbol, config, timestamp):
+    return (symbol, und_data, config)
+
+def _history_chart_timestamp(und_data, symbol, config, timestamp):
+    return timestamp
+
 # --- Helper Functions ---
 
 def _wrap_chart_in_card(chart_component, about_text: Component | str, title: str = "") -> Component:
@@ -180,6 +188,7 @@ def _create_z_score_gauge(
         about_text = about_blurb_map.get(metric_name, "See About for details.")
         return _wrap_chart_in_card(chart, about_text)
 
+@cached_chart("advanced_flow.vapifa_history", _history_chart_inputs, timestamp=_history_chart_timestamp)
 def _create_vapifa_historical_chart(und_data, symbol, config, timestamp) -> Component:
     """Create a Plotly time series chart for VAPI-FA Z-score history as a Div with about section."""
     # Defensive: ensure und_data is a Pydantic model
@@ -235,6 +244,7 @@ def _create_vapifa_historical_chart(und_data, symbol, config, timestamp) -> Comp
     about_text = ABOUT_VAPI_FA
     return _wrap_chart_in_card(chart, about_text)
 
+@cached_chart("advanced_flow.dwfd_history", _history_chart_inputs, timestamp=_history_chart_timestamp)
 def _create_dwfd_historical_chart(und_data, symbol, config, timestamp) -> Component:
     """DWFD Z-score history chart, robust to missing data."""
     if not hasattr(und_data, 'model_dump'):
@@ -288,6 +298,7 @@ def _create_dwfd_historical_chart(und_data, symbol, config, timestamp) -> Compon
     about_text = ABOUT_DWFD
     return _wrap_chart_in_card(chart, about_text)
 
+@cached_chart("advanced_flow.twlaf_history", _history_chart_inputs, timestamp=_history_chart_timestamp)
 def _create_twlaf_historical_chart(und_data, symbol, config, timestamp) -> Component:
     """TW-LAF Z-score history chart, robust to missing data."""
     if not hasattr(und_data, 'model_dump'):
@@ -341,6 +352,7 @@ def _create_twlaf_historical_chart(und_data, symbol, config, timestamp) -> Compo
     about_text = ABOUT_TW_LAF
     return _wrap_chart_in_card(chart, about_text)
 
+@cached_chart("advanced_flow.rolling_flows", _history_chart_inputs, timestamp=_history_chart_timestamp)
 def _create_rolling_flows_chart(und_data, symbol, config, timestamp) -> Component:
     """Rolling net signed flows chart, robust to missing data."""
     if not hasattr(und_data, 'model_dump'):
@@ -395,6 +407,7 @@ def _create_rolling_flows_chart(und_data, symbol, config, timestamp) -> Componen
     about_text = ABOUT_ROLLING_FLOWS
     return _wrap_chart_in_card(chart, about_text)
 
+@cached_chart("advanced_flow.nvp", _history_chart_inputs, timestamp=_history_chart_timestamp)
 def _create_nvp_charts(und_data, symbol, config, timestamp) -> Component:
     """NVP and NVP_Vol by strike chart, robust to missing data."""
     if not hasattr(und_data, 'model_dump'):
@@ -454,6 +467,7 @@ def _create_nvp_charts(und_data, symbol, config, timestamp) -> Component:
     about_text = ABOUT_NVP
     return _wrap_chart_in_card(chart, about_text)
 
+@cached_chart("advanced_flow.greek_flows", _history_chart_inputs, timestamp=_history_chart_timestamp)
 def _create_greek_flows_charts(und_data, symbol, config, timestamp) -> Component:
     """Net customer Greek flows chart, robust to missing data."""
     if not hasattr(und_data, 'model_dump'):
@@ -505,6 +519,7 @@ def _create_greek_flows_charts(und_data, symbol, config, timestamp) -> Component
     about_text = ABOUT_GREEK_FLOWS
     return _wrap_chart_in_card(chart, about_text)
 
+@cached_chart("advanced_flow.flow_ratios", _history_chart_inputs, timestamp=_history_chart_timestamp)
 def _create_flow_ratios_charts(und_data, symbol, config, timestamp) -> Component:
     """Specialized flow ratios chart, robust to missing data."""
     if not hasattr(und_data, 'model_dump'):
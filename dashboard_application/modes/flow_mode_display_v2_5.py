@@ -16,6 +16,9 @@ from dashboard_application.utils_dashboard_v2_5 import (
     create_empty_figure, apply_dark_theme_template, 
     add_price_line, add_timestamp_annotation, PLOTLY_TEMPLATE
 )
+from dashboard_application.utils.figure_cache_v2_5 import (
+    cached_chart, strike_chart_inputs, contract_chart_inputs, bundle_timestamp
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -60,6 +63,7 @@ def _wrap_chart_in_card(chart_component, about_text, component_id):
         ])
     ], className="mb-4", id=f"card-{component_id}")
 
+@cached_chart("flow.net_value_heatmap", contract_chart_inputs, timestamp=bundle_timestamp)
 def _generate_net_value_heatmap(bundle: FinalAnalysisBundleV2_5, config: ConfigManagerV2_5) -> Component:
     """Generates a heatmap of net value pressure by strike and option type."""
     chart_name = "Net Value by Strike"
@@ -195,6 +199,7 @@ def _generate_net_value_heatmap(bundle: FinalAnalysisBundleV2_5, config: ConfigM
     )
     return _wrap_chart_in_card(success_graph, about_text, "net-value-heatmap")
 
+@cached_chart(lambda bundle, metric, *args, **kwargs: f"flow.greek_flow.{metric}", strike_chart_inputs, timestamp=bundle_timestamp)
 def _generate_greek_flow_chart(bundle: FinalAnalysisBundleV2_5, metric: str, title: str, color: str) -> Component:
     """Generic helper to create a bar chart for a net customer Greek flow metric."""
     chart_name = f"{title} by Strike"
@@ -276,6 +281,7 @@ def _generate_greek_flow_chart(bundle: FinalAnalysisBundleV2_5, metric: str, tit
         style={'height': '400px', 'width': '100%'}
     ), about_text, f"{title.lower()}-flow-chart")
 
+@cached_chart("flow.sgdhp_heatmap", contract_chart_inputs, timestamp=bundle_timestamp)
 def _generate_sgdhp_heatmap(bundle: FinalAnalysisBundleV2_5, config: ConfigManagerV2_5) -> Component:
     """Generates SGDHP (Strike-level Gamma Delta Hedging Pressure) heatmap."""
     chart_name = "SGDHP - Strike Gamma Delta Hedging Pressure"
@@ -365,6 +371,7 @@ def _generate_sgdhp_heatmap(bundle: FinalAnalysisBundleV2_5, config: ConfigManag
         style={'height': f'{fig_height}px', 'width': '100%'}
     ), about_text, "sgdhp-heatmap")
 
+@cached_chart("flow.ivsdh_heatmap", contract_chart_inputs, timestamp=bundle_timestamp)
 def _generate_ivsdh_heatmap(bundle: FinalAnalysisBundleV2_5, config: ConfigManagerV2_5) -> Component:
     """Generates IVSDH (Implied Volatility Surface Delta Hedging) heatmap."""
     chart_name = "IVSDH - IV Surface Delta Hedging"
@@ -465,6 +472,7 @@ def _generate_ivsdh_heatmap(bundle: FinalAnalysisBundleV2_5, config: ConfigManag
         style={'height': f'{fig_height}px', 'width': '100%'}
     ), about_text, "ivsdh-heatmap")
 
+@cached_chart("flow.ugch_heatmap", contract_chart_inputs, timestamp=bundle_timestamp)
 def _generate_ugch_heatmap(bundle: FinalAnalysisBundleV2_5, config: ConfigManagerV2_5) -> Component:
     """Generates UGCH (Unified Gamma Charm Hedging) heatmap."""
     chart_name = "UGCH - Unified Gamma Charm Hedging"
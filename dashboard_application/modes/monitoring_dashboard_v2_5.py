@@ -51,7 +51,14 @@ class MonitoringDashboard:
             "fiscalYearStartMonth": 0,
             "graphTooltip": 0,
             "id": 1,
-            "links": [],
+            "links": [
+                {
+                    "title": "Slowest Analysis Cycles (span trees)",
+                    "type": "link",
+                    "url": "http://localhost:8050/status/stage-traces?limit=10",
+                    "targetBlank": True
+                }
+            ],
             "liveNow": True,
             "panels": [
                 {
@@ -110,6 +117,51 @@ class MonitoringDashboard:
                     ],
                     "title": "HTTP Request Rate",
                     "type": "timeseries"
+                },
+                {
+                    "datasource": {
+                        "type": "prometheus",
+                        "uid": "${DS_PROMETHEUS}"
+                    },
+                    "fieldConfig": {
+                        "defaults": {
+                            "color": {
+                                "mode": "palette-classic"
+                            },
+                            "unit": "s"
+                        }
+                    },
+                    "gridPos": {
+                        "h": 8,
+                        "w": 12,
+                        "x": 12,
+                        "y": 0
+                    },
+                    "id": 2,
+                    "options": {
+                        "legend": {
+                            "displayMode": "table",
+                            "placement": "bottom",
+                            "showLegend": True
+                        },
+                        "tooltip": {
+                            "mode": "multi",
+                            "sort": "desc"
+                        }
+                    },
+                    "targets": [
+                        {
+                            "datasource": {
+                                "type": "prometheus",
+                                "uid": "${DS_PROMETHEUS}"
+                            },
+                            "expr": "histogram_quantile(0.95, sum(rate(eots_stage_duration_seconds_bucket[5m])) by (le, stage))",
+                            "legendFormat": "p95 {{stage}}",
+                            "refId": "A"
+                        }
+                    ],
+                    "title": "Analysis Cycle Stage Latency (p95)",
+                    "type": "timeseries"
                 }
             ],
             "refresh": "5s",
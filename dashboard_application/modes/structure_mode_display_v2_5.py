@@ -15,9 +15,13 @@ from data_models import (
     FinalAnalysisBundleV2_5,
     ProcessedStrikeLevelMetricsV2_5,
     ProcessedUnderlyingAggregatesV2_5,
-    KeyLevelsDataV2_5
+    KeyLevelsDataV2_5,
+    KeyLevelDiffV2_5
 )
 from utils.config_manager_v2_5 import ConfigManagerV2_5
+from dashboard_application.utils.figure_cache_v2_5 import (
+    cached_chart, strike_chart_inputs, underlying_chart_inputs, bundle_timestamp
+)
 
 logger = logging.getLogger(__name__)
 
@@ -173,6 +177,7 @@ def _wrap_chart_in_card(chart_component, about_text, component_id):
     )
 
 # --- Chart Stubs ---
+@cached_chart("structure.amspi_heatmap", strike_chart_inputs, timestamp=bundle_timestamp)
 def _generate_amspi_heatmap(bundle, config):
     chart_name = "A-MSPI Heatmap (SGDHP Score)"
     struct_settings = getattr(config, 'structure_mode_settings', None)
@@ -275,6 +280,7 @@ def _generate_amspi_heatmap(bundle, config):
         ])
         return _wrap_chart_in_card(chart_component, about_text, "amspi-heatmap")
 
+@cached_chart("structure.esdag", strike_chart_inputs, timestamp=bundle_timestamp)
 def _generate_esdag_charts(bundle, config):
     chart_name = "E-SDAG Methodology Components"
     struct_settings = getattr(config, 'structure_mode_settings', None)
@@ -373,6 +379,7 @@ def _generate_esdag_charts(bundle, config):
         ])
         return _wrap_chart_in_card(chart_component, about_text, "esdag-charts")
 
+@cached_chart("structure.adag_strike", strike_chart_inputs, timestamp=bundle_timestamp)
 def _generate_adag_strike_chart(bundle, config):
     chart_name = "A-DAG by Strike"
     struct_settings = getattr(config, 'structure_mode_settings', None)
@@ -578,6 +585,7 @@ def _generate_adag_strike_chart(bundle, config):
         )
         return _wrap_chart_in_card(chart_component, about_text, "adag-strike-chart")
 
+@cached_chart("structure.asai_assi", underlying_chart_inputs, timestamp=bundle_timestamp)
 def _generate_asai_assi_charts(bundle, config):
     chart_name = "A-SAI & A-SSI (Aggregate Structural Indexes)"
     fig_height = getattr(config, 'asai_assi_chart_height', 350)
@@ -677,6 +685,22 @@ def _generate_asai_assi_charts(bundle, config):
         )
         return _wrap_chart_in_card(chart_component, about_text, "asai-assi-charts")
 
+def _key_level_changes(bundle):
+    """
+    Change tags keyed by (level_price, level_type) and the dropped levels, from the bundle's
+    KeyLevelDiffV2_5 (present when key-level tracking is enabled; a dict after a JSON round trip).
+    """
+    diff = getattr(bundle, 'key_level_diff_v2_5', None)
+    if diff is None:
+        return {}, []
+    if isinstance(diff, dict):
+        diff = KeyLevelDiffV2_5.model_validate(diff)
+    tags = {}
+    for tag, levels in (("New", diff.added), ("Stronger", diff.strengthened), ("Weaker", diff.weakened)):
+        for lvl in levels:
+            tags[(lvl.level_price, lvl.level_type)] = tag
+    return tags, diff.removed
+
 def _generate_key_level_table(bundle, config):
     """
     Generates the Key Level Identifier Table using only the canonical Pydantic model (KeyLevelsDataV2_5).
@@ -717,6 +741,11 @@ def _generate_key_level_table(bundle, config):
                 dbc.Alert("No key levels identified.", color="warning", className="mb-2")
             ])
 
+        # Mark what changed since the previous cycle
+        change_tags, dropped_levels = _key_level_changes(bundle)
+        for d in all_levels:
+            d['change'] = change_tags.get((d.get('level_price'), d.get('level_type')), '')
+
         df = pd.DataFrame(all_levels)
         # Optional: sort by conviction_score descending
         if 'conviction_score' in df.columns:
@@ -728,7 +757,8 @@ def _generate_key_level_table(bundle, config):
             {"name": "Type", "id": "level_type"},
             {"name": "Conviction Score", "id": "conviction_score"},
             {"name": "Contributing Metrics", "id": "contributing_metrics"},
-            {"name": "Source", "id": "source_identifier"}
+            {"name": "Source", "id": "source_identifier"},
+            {"name": "Change", "id": "change"}
         ]
         # Ensure all columns exist in DataFrame
         for col in [c["id"] for c in columns]:
@@ -744,6 +774,11 @@ def _generate_key_level_table(bundle, config):
             style_cell={'textAlign': 'left', 'padding': '5px', 'minWidth': '80px', 'width': 'auto', 'maxWidth': '200px'},
             style_header={'backgroundColor': 'rgb(30, 30, 30)', 'fontWeight': 'bold', 'color': 'white'},
             style_data={'backgroundColor': 'rgb(50, 50, 50)', 'color': 'white'},
+            style_data_conditional=[
+                {'if': {'filter_query': '{change} = "New"'}, 'color': '#4dabf7'},
+                {'if': {'filter_query': '{change} = "Stronger"'}, 'color': '#51cf66'},
+                {'if': {'filter_query': '{change} = "Weaker"'}, 'color': '#ff922b'},
+            ],
             style_as_list_view=True,
             page_size=10,
             sort_action="native",
@@ -754,6 +789,7 @@ def _generate_key_level_table(bundle, config):
             "TYPES: Support (price floor), Resistance (price ceiling), Pin Zone (magnetic price), Vol Trigger (volatility expansion), Major Wall (massive OI). "
             "CONVICTION SCORE (0-1): Higher = stronger level. Above 0.7 = VERY HIGH conviction. "
             "METRICS: Shows which calculations identified this level (technical, options-based, flow-based). "
+            "CHANGE: New, Stronger or Weaker since the previous analysis cycle (with key-level tracking enabled). "
             "💡 TRADING INSIGHT: These are your BATTLE LINES for the day. "
             "SUPPORT levels = Where to buy/cover shorts, place stops below. "
             "RESISTANCE levels = Where to sell/short, place stops above. "
@@ -763,7 +799,12 @@ def _generate_key_level_table(bundle, config):
             "Sort by CONVICTION to focus on the strongest levels. Filter by TYPE for specific strategies. "
             "These levels are DYNAMIC and update as market structure evolves!",
             "key-level-table"
-        ) + [table])
+        ) + [table] + ([
+            html.Small(
+                "Dropped since last cycle: " + ", ".join(f"{lvl.level_price:g} ({lvl.level_type})" for lvl in dropped_levels),
+                className="text-elite-secondary d-block mt-2"
+            )
+        ] if dropped_levels else []))
     except Exception as e:
         logger.error(f"[Key Level Table] Error: {e}", exc_info=True)
         return dbc.Alert("Key level data unavailable.", color="danger")
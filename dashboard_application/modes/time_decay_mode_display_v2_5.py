@@ -10,11 +10,13 @@ from dash.development.base_component import Component
 
 from data_models import FinalAnalysisBundleV2_5 # Updated import
 from utils.config_manager_v2_5 import ConfigManagerV2_5
+from dashboard_application.utils.figure_cache_v2_5 import cached_chart, strike_chart_inputs
 
 logger = logging.getLogger(__name__)
 
 # --- Helper Functions for Chart Generation ---
 
+@cached_chart("time_decay.tdpi_ectr_etdfi", strike_chart_inputs)
 def _generate_tdpi_ectr_etdfi_charts(bundle: FinalAnalysisBundleV2_5, config: ConfigManagerV2_5) -> Component:
     """
     Generates D-TDPI, E-CTR, and E-TDFI by strike as a multi-metric chart.
@@ -97,6 +99,7 @@ def _generate_tdpi_ectr_etdfi_charts(bundle: FinalAnalysisBundleV2_5, config: Co
         ])
         return _wrap_chart_in_card(chart_component, about_text, component_id)
 
+@cached_chart("time_decay.vci_gci_dci_gauges", strike_chart_inputs)
 def _generate_vci_gci_dci_gauges(bundle: FinalAnalysisBundleV2_5, config: ConfigManagerV2_5) -> Component:
     """
     Generates VCI, GCI, DCI gauges for 0DTE.
@@ -359,6 +362,7 @@ def _behavioral_patterns_panel(bundle: FinalAnalysisBundleV2_5) -> html.Div:
     ])
 
 # --- Mini Heatmap ---
+@cached_chart("time_decay.mini_heatmap", strike_chart_inputs)
 def _mini_heatmap(bundle: FinalAnalysisBundleV2_5, config: ConfigManagerV2_5) -> Component:
     """
     Generates Pin Risk/Net Value Flow Mini Heatmap.
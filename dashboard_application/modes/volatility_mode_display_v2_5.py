@@ -10,6 +10,9 @@ from dash.development.base_component import Component
 from dashboard_application.utils_dashboard_v2_5 import PLOTLY_TEMPLATE, add_bottom_right_timestamp_annotation, apply_dark_theme_template
 from data_models import FinalAnalysisBundleV2_5 # Updated import
 from utils.config_manager_v2_5 import ConfigManagerV2_5
+from dashboard_application.utils.figure_cache_v2_5 import (
+    cached_chart, strike_chart_inputs, surface_chart_inputs, underlying_chart_inputs, bundle_timestamp
+)
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +41,7 @@ def _wrap_chart_in_card(chart_component, about_text, component_id):
         className="elite-card fade-in-up"
     )
 
+@cached_chart("volatility.vri_2_0_strike_profile", strike_chart_inputs, timestamp=bundle_timestamp)
 def _generate_vri_2_0_strike_profile(bundle, config):
     chart_name = "VRI 2.0 Volatility Regime Profile"
     vol_settings = getattr(config, 'volatility_mode_settings', None)
@@ -121,6 +125,7 @@ def _generate_vri_2_0_strike_profile(bundle, config):
         ])
         return _wrap_chart_in_card(chart_component, about_text, component_id)
 
+@cached_chart("volatility.gauges", underlying_chart_inputs, timestamp=bundle_timestamp)
 def _generate_volatility_gauges(bundle, config):
     chart_name = "0DTE Volatility Metrics (VRI, VFI, VVR, VCI)"
     vol_settings = getattr(config, 'volatility_mode_settings', None)
@@ -206,6 +211,7 @@ def _generate_volatility_gauges(bundle, config):
         ])
         return _wrap_chart_in_card(chart_component, about_text, component_id)
 
+@cached_chart("volatility.surface_heatmap", strike_chart_inputs, timestamp=bundle_timestamp)
 def _generate_volatility_surface_heatmap(bundle, config):
     chart_name = "Volatility Surface Heatmap"
     vol_settings = getattr(config, 'volatility_mode_settings', None)
@@ -274,6 +280,59 @@ def _generate_volatility_surface_heatmap(bundle, config):
         ])
         return _wrap_chart_in_card(chart_component, about_text, component_id)
 
+@cached_chart("volatility.vex_surface_heatmap", surface_chart_inputs, timestamp=bundle_timestamp)
+def _generate_vex_surface_heatmap(bundle, config):
+    chart_name = "Vega Exposure Surface"
+    vol_settings = getattr(config, 'volatility_mode_settings', None)
+    fig_height = getattr(vol_settings, 'surface_chart_height', 400) if vol_settings else 400
+    about_text = (
+        "🧊 Vega Exposure Surface: Dealer vega exposure (VEX) for every strike and expiration, read from the exposure surface built each cycle. "
+        "BLUE CELLS = POSITIVE vega exposure, RED CELLS = NEGATIVE vega exposure; color intensity shows size. "
+        "VERTICAL AXIS = Days to expiration. "
+        "HORIZONTAL AXIS = Strike price. "
+        "💡 TRADING INSIGHT: Large NEGATIVE pockets mean dealers are short vega there - a volatility spike forces them to buy options, which can accelerate the move. "
+        "Large POSITIVE pockets tend to DAMPEN volatility around those strikes and expirations. "
+        "Compare the front expiries with the back to see where vega risk is concentrated on the term structure!"
+    )
+    component_id = "vex-surface-heatmap"
+    try:
+        surface = getattr(bundle.processed_data_bundle, 'exposure_surface', None)
+        if surface is None or 'vex' not in surface.grids or not surface.strikes:
+            chart_component = html.Div([
+                dbc.Alert(f"No exposure surface available for {chart_name}.", color="warning")
+            ])
+            return _wrap_chart_in_card(chart_component, about_text, component_id)
+        fig = go.Figure(data=go.Heatmap(
+            z=surface.grid('vex'),
+            x=surface.strikes,
+            y=[f"{dte:g} DTE" for dte in surface.dtes],
+            colorscale="RdBu",
+            zmid=0,
+            colorbar=dict(title="VEX")
+        ))
+        fig.update_layout(
+            height=fig_height,
+            title=f"<b>{bundle.target_symbol}</b> - {chart_name} (Strike x Expiry)",
+            margin=dict(l=40, r=40, t=60, b=40),
+            template=PLOTLY_TEMPLATE
+        )
+        apply_dark_theme_template(fig)
+        add_bottom_right_timestamp_annotation(fig, getattr(bundle, 'bundle_timestamp', None))
+        chart_component = dcc.Graph(
+            figure=fig,
+            config={
+                'displayModeBar': False,
+                'displaylogo': False
+            }
+        )
+        return _wrap_chart_in_card(chart_component, about_text, component_id)
+    except Exception as e:
+        logging.exception("Error rendering vega exposure surface")
+        chart_component = html.Div([
+            dbc.Alert(f"Error rendering {chart_name}: {e}", color="danger")
+        ])
+        return _wrap_chart_in_card(chart_component, about_text, component_id)
+
 # --- Contextual Panels ---
 
 def _volatility_context_panel(bundle):
@@ -449,9 +508,10 @@ def create_layout(bundle, config):
         "vri_2_0_strike_profile": (_generate_vri_2_0_strike_profile, (bundle, config)),
         "volatility_gauges": (_generate_volatility_gauges, (bundle, config)),
         "volatility_surface_heatmap": (_generate_volatility_surface_heatmap, (bundle, config)),
+        "vex_surface_heatmap": (_generate_vex_surface_heatmap, (bundle, config)),
     }
     
-    charts_to_display = getattr(config.modes_detail_config.volatility, 'charts', ["vri_2_0_strike_profile", "volatility_gauges", "volatility_surface_heatmap"])
+    charts_to_display = getattr(config.modes_detail_config.volatility, 'charts', ["vri_2_0_strike_profile", "volatility_gauges", "volatility_surface_heatmap", "vex_surface_heatmap"])
     chart_divs = []
     for chart_id in charts_to_display:
         gen = chart_generators.get(chart_id)
@@ -0,0 +1,477 @@
+# dashboard_application/utils/figure_cache_v2_5.py
+# EOTS v2.5 - Figure cache and partial (dash.Patch) figure updates for mode displays
+
+"""
+Figure-building layer for the dashboard mode displays.
+
+Two cooperating pieces:
+
+- ``cached_chart(chart_id, inputs, timestamp=None)`` decorates a mode's chart builder. The
+  ``inputs`` selector returns the slice of the bundle/config the chart actually reads; it is
+  fingerprinted and, if unchanged, a copy of the previously built component is returned
+  instead of rebuilding the Plotly figure, with its "Updated: ..." annotation refreshed.
+  Callers always get their own copy; the cached component is never handed out or mutated.
+  Every ``dcc.Graph`` inside a built component without an id is given a pattern-matching id
+  ``{"type": FIGURE_GRAPH_TYPE, "chart": "<chart_id>#<n>"}``.
+
+- ``FigureUpdatePlannerV2_5.plan(...)`` runs in ``render_mode_content``. Every full render
+  gets a page token, which the browser stores and sends back with the next render. If the
+  page behind that token is still showing the same non-figure content, the page is left
+  alone and per-figure updates are sent instead: ``no_update`` for identical figures, a
+  ``dash.Patch`` when only trace values (y/z/text/customdata/hovertext/marker colour) or
+  annotation texts changed, and the full figure otherwise. Patches are always worked out
+  against the figures that page was last sent, never another tab's or session's.
+
+Per-chart build time, cache hits and payload bytes are available from
+``get_figure_cache().get_chart_report()``.
+"""
+
+import copy
+import functools
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from dash import Patch, dcc, no_update
+from dash.development.base_component import Component
+from plotly.utils import PlotlyJSONEncoder
+from pydantic import BaseModel
+
+from dashboard_application.utils_dashboard_v2_5 import refresh_timestamp_annotations
+
+logger = logging.getLogger(__name__)
+
+FIGURE_GRAPH_TYPE = "eots-figure"
+
+# Fields that change on every fetch without changing what a chart draws
+VOLATILE_FIELDS = frozenset({"timestamp", "bundle_timestamp", "processing_timestamp"})
+
+# Trace attributes that may change between ticks and still be sent as a Patch
+PATCHABLE_TRACE_PATHS: Tuple[Tuple[str, ...], ...] = (
+    ("y",), ("z",), ("text",), ("customdata",), ("hovertext",), ("marker", "color"),
+)
+
+ChartId = Union[str, Callable[..., str]]
+
+
+# =============================================================================
+# FINGERPRINTING
+# =============================================================================
+
+_model_digests: Dict[int, Tuple[weakref.ref, str]] = {}
+
+
+def _model_digest(model: BaseModel) -> str:
+    """Digest of a Pydantic model (volatile fields excluded), memoized per live instance."""
+    key = id(model)
+    entry = _model_digests.get(key)
+    if entry is not None and entry[0]() is model:
+        return entry[1]
+    payload = model.model_dump_json(exclude=set(VOLATILE_FIELDS))
+    digest = hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+    try:
+        _model_digests[key] = (weakref.ref(model, lambda _ref, k=key: _model_digests.pop(k, None)), digest)
+    except TypeError:
+        pass
+    return digest
+
+
+def _update_hash(hasher, part: Any) -> None:
+    if part is None or isinstance(part, (str, int, float, bool)):
+        hasher.update(repr(part).encode())
+    elif isinstance(part, BaseModel):
+        hasher.update(_model_digest(part).encode())
+    elif isinstance(part, (pd.DataFrame, pd.Series)):
+        hasher.update(repr(getattr(part, "columns", part.name)).encode())
+        hasher.update(pd.util.hash_pandas_object(part, index=True).values.tobytes())
+    elif isinstance(part, np.ndarray):
+        hasher.update(f"{part.dtype}{part.shape}".encode())
+        hasher.update(np.ascontiguousarray(part).tobytes())
+    elif isinstance(part, (list, tuple)):
+        hasher.update(b"[")
+        for item in part:
+            _update_hash(hasher, item)
+        hasher.update(b"]")
+    elif isinstance(part, dict):
+        hasher.update(b"{")
+        for key in sorted(part, key=repr):
+            _update_hash(hasher, key)
+            _update_hash(hasher, part[key])
+        hasher.update(b"}")
+    elif isinstance(part, (datetime, date)):
+        hasher.update(part.isoformat().encode())
+    else:
+        hasher.update(repr(part).encode())
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable digest of chart inputs (Pydantic models, DataFrames, arrays, containers, scalars)."""
+    hasher = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        _update_hash(hasher, part)
+    return hasher.hexdigest()
+
+
+# =============================================================================
+# COMPONENT TREE HELPERS
+# =============================================================================
+
+def _iter_graphs(component: Any) -> Iterator[dcc.Graph]:
+    """Depth-first iteration over the dcc.Graph components of a layout tree."""
+    stack = [component]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (list, tuple)):
+            stack.extend(reversed(node))
+        elif isinstance(node, dcc.Graph):
+            yield node
+        elif isinstance(node, Component):
+            children = getattr(node, "children", None)
+            if children is not None:
+                stack.append(children)
+
+
+def _is_managed(graph: dcc.Graph) -> bool:
+    graph_id = getattr(graph, "id", None)
+    return isinstance(graph_id, dict) and graph_id.get("type") == FIGURE_GRAPH_TYPE
+
+
+def _assign_graph_ids(component: Any, chart_id: str) -> None:
+    for n, graph in enumerate(g for g in _iter_graphs(component) if getattr(g, "id", None) is None):
+        graph.id = {"type": FIGURE_GRAPH_TYPE, "chart": f"{chart_id}#{n}"}
+
+
+def _figure_json(figure: Any) -> str:
+    return json.dumps(figure, cls=PlotlyJSONEncoder)
+
+
+def _get_path(node: Any, path: Sequence[str]) -> Any:
+    for key in path:
+        if not isinstance(node, dict):
+            return None
+        node = node.get(key)
+    return node
+
+
+def _without_paths(trace: Dict[str, Any], paths: Sequence[Tuple[str, ...]]) -> Dict[str, Any]:
+    """Shallow copy of a trace dict with the given (at most two-level) paths removed."""
+    stripped = dict(trace)
+    for path in paths:
+        if len(path) == 1:
+            stripped.pop(path[0], None)
+        elif isinstance(stripped.get(path[0]), dict):
+            stripped[path[0]] = {k: v for k, v in stripped[path[0]].items() if k != path[1]}
+    return stripped
+
+
+def build_figure_patch(old: Dict[str, Any], new: Dict[str, Any]) -> Optional[Patch]:
+    """
+    Return a ``dash.Patch`` turning figure ``old`` into ``new`` if they differ only in
+    patchable trace values and annotation texts, else ``None`` (a full figure is needed).
+    """
+    old_data, new_data = old.get("data") or [], new.get("data") or []
+    if len(old_data) != len(new_data):
+        return None
+    operations: List[Tuple[Tuple[Any, ...], Any]] = []
+    for index, (old_trace, new_trace) in enumerate(zip(old_data, new_data)):
+        if _without_paths(old_trace, PATCHABLE_TRACE_PATHS) != _without_paths(new_trace, PATCHABLE_TRACE_PATHS):
+            return None
+        for path in PATCHABLE_TRACE_PATHS:
+            new_value = _get_path(new_trace, path)
+            if _get_path(old_trace, path) != new_value:
+                operations.append((("data", index) + path, new_value))
+
+    old_layout, new_layout = dict(old.get("layout") or {}), dict(new.get("layout") or {})
+    old_annotations, new_annotations = old_layout.pop("annotations", []), new_layout.pop("annotations", [])
+    if old_layout != new_layout or len(old_annotations) != len(new_annotations):
+        return None
+    for index, (old_note, new_note) in enumerate(zip(old_annotations, new_annotations)):
+        if _without_paths(old_note, (("text",),)) != _without_paths(new_note, (("text",),)):
+            return None
+        if old_note.get("text") != new_note.get("text"):
+            operations.append((("layout", "annotations", index, "text"), new_note.get("text")))
+
+    if not operations:
+        return None
+    patch = Patch()
+    for path, value in operations:
+        target = patch
+        for key in path[:-1]:
+            target = target[key]
+        target[path[-1]] = value
+    return patch
+
+
+# =============================================================================
+# FIGURE CACHE
+# =============================================================================
+
+class FigureCacheV2_5:
+    """LRU of built chart components keyed by (chart_id, input fingerprint), with per-chart stats."""
+
+    def __init__(self, max_entries: int = 128, enabled: bool = True):
+        self.max_entries = max(1, max_entries)
+        self.enabled = enabled
+        self._entries: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _chart_stats(self, chart_id: str) -> Dict[str, float]:
+        return self._stats.setdefault(chart_id, {
+            "builds": 0, "cache_hits": 0, "total_build_ms": 0.0, "last_build_ms": 0.0, "max_build_ms": 0.0,
+            "full_updates": 0, "patch_updates": 0, "unchanged_updates": 0, "total_payload_bytes": 0, "last_payload_bytes": 0,
+        })
+
+    def get_or_build(self, chart_id: str, inputs: Sequence[Any], build: Callable[[], Any], timestamp: Any = None) -> Any:
+        """
+        Return a copy of the cached component for these inputs, or build, time and cache a
+        new one. The cached component itself is never returned, so callers may mutate theirs.
+        """
+        key = (chart_id, fingerprint(*inputs))
+        with self._lock:
+            component = self._entries.get(key)
+            if component is not None:
+                self._entries.move_to_end(key)
+                self._chart_stats(chart_id)["cache_hits"] += 1
+        if component is not None:
+            component = copy.deepcopy(component)
+            if timestamp is not None:
+                for graph in _iter_graphs(component):
+                    if isinstance(graph.figure, go.Figure):
+                        refresh_timestamp_annotations(graph.figure, timestamp)
+            return component
+
+        start = time.perf_counter()
+        component = build()
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        _assign_graph_ids(component, chart_id)
+        with self._lock:
+            stats = self._chart_stats(chart_id)
+            stats["builds"] += 1
+            stats["total_build_ms"] += elapsed_ms
+            stats["last_build_ms"] = elapsed_ms
+            stats["max_build_ms"] = max(stats["max_build_ms"], elapsed_ms)
+            self._entries[key] = component
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return copy.deepcopy(component)
+
+    def record_update(self, graph_chart_id: str, kind: str, payload_bytes: int) -> None:
+        """Record what was sent for one graph ('full', 'patch' or 'unchanged')."""
+        chart_id = graph_chart_id.split("#", 1)[0]
+        with self._lock:
+            stats = self._chart_stats(chart_id)
+            stats[f"{kind}_updates"] += 1
+            stats["total_payload_bytes"] += payload_bytes
+            stats["last_payload_bytes"] = payload_bytes
+
+    def get_chart_report(self) -> List[Dict[str, Any]]:
+        """Per-chart stats, most expensive (build time + payload) first."""
+        with self._lock:
+            report = [{"chart_id": chart_id, **stats} for chart_id, stats in self._stats.items()]
+        for entry in report:
+            entry["mean_build_ms"] = entry["total_build_ms"] / entry["builds"] if entry["builds"] else 0.0
+        return sorted(report, key=lambda e: (e["total_build_ms"], e["total_payload_bytes"]), reverse=True)
+
+    def log_chart_report(self, level: int = logging.INFO, limit: int = 10) -> None:
+        for entry in self.get_chart_report()[:limit]:
+            logger.log(level, (
+                f"[FigureCache] {entry['chart_id']}: builds={entry['builds']} hits={entry['cache_hits']} "
+                f"mean_build={entry['mean_build_ms']:.1f}ms full={entry['full_updates']} patch={entry['patch_updates']} "
+                f"unchanged={entry['unchanged_updates']} payload={entry['total_payload_bytes'] / 1024:.1f}KB"
+            ))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats.clear()
+
+
+_figure_cache = FigureCacheV2_5()
+
+
+def get_figure_cache() -> FigureCacheV2_5:
+    return _figure_cache
+
+
+def cached_chart(chart_id: ChartId, inputs: Callable[..., Sequence[Any]], timestamp: Optional[Callable[..., Any]] = None):
+    """
+    Cache a chart builder's component on the fingerprint of its input slice.
+
+    Args:
+        chart_id: Stable chart name, or a callable of the builder's arguments for builders
+            rendered several times per page (e.g. one chart per greek).
+        inputs: Callable of the builder's arguments returning the values the chart reads.
+        timestamp: Optional callable of the builder's arguments returning the bundle timestamp
+            used to refresh "Updated: ..." annotations on cache hits.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = get_figure_cache()
+            if not cache.enabled:
+                return func(*args, **kwargs)
+            try:
+                resolved_id = chart_id(*args, **kwargs) if callable(chart_id) else chart_id
+                input_parts = inputs(*args, **kwargs)
+                stamp = timestamp(*args, **kwargs) if timestamp is not None else None
+            except Exception as e:
+                logger.debug(f"[FigureCache] Could not select inputs for {func.__qualname__}: {e}")
+                return func(*args, **kwargs)
+            return cache.get_or_build(resolved_id, input_parts, lambda: func(*args, **kwargs), stamp)
+        return wrapper
+    return decorator
+
+
+# --- Input selectors shared by the mode displays ---
+
+def strike_chart_inputs(bundle, *args, **kwargs) -> Tuple[Any, ...]:
+    """Strike-level charts: strikes, spot price, symbol and the builder's remaining arguments."""
+    processed = bundle.processed_data_bundle
+    return (bundle.target_symbol, processed.strike_level_data_with_metrics,
+            processed.underlying_data_enriched.price, args, kwargs)
+
+
+def surface_chart_inputs(bundle, *args, **kwargs) -> Tuple[Any, ...]:
+    """Strike x expiry charts: the bundle's exposure surface grids, or the strike-level inputs without one."""
+    processed = bundle.processed_data_bundle
+    surface = getattr(processed, "exposure_surface", None)
+    if surface is None or not surface.grids:
+        return strike_chart_inputs(bundle, *args, **kwargs)
+    return (bundle.target_symbol, surface.strikes, surface.dtes, {name: surface.grid(name) for name in surface.grids},
+            processed.underlying_data_enriched.price, args, kwargs)
+
+
+def contract_chart_inputs(bundle, *args, **kwargs) -> Tuple[Any, ...]:
+    """Contract-level charts: contracts, strikes, underlying aggregates and the remaining arguments."""
+    processed = bundle.processed_data_bundle
+    return (bundle.target_symbol, processed.options_data_with_metrics, processed.strike_level_data_with_metrics,
+            processed.underlying_data_enriched, args, kwargs)
+
+
+def underlying_chart_inputs(bundle, *args, **kwargs) -> Tuple[Any, ...]:
+    """Charts drawn from the enriched underlying aggregates only."""
+    return (bundle.target_symbol, bundle.processed_data_bundle.underlying_data_enriched, args, kwargs)
+
+
+def bundle_timestamp(bundle, *args, **kwargs) -> Any:
+    return getattr(bundle, "bundle_timestamp", None)
+
+
+# =============================================================================
+# PARTIAL FIGURE UPDATES
+# =============================================================================
+
+class _PageState:
+    """What one rendered page (browser tab) was last sent."""
+
+    __slots__ = ("page_key", "skeleton", "sent")
+
+    def __init__(self, page_key: str, skeleton: str, sent: Dict[str, str]):
+        self.page_key = page_key
+        self.skeleton = skeleton
+        self.sent = sent  # graph chart id -> figure JSON last sent to this page
+
+
+class FigureUpdatePlannerV2_5:
+    """
+    Decides between re-sending the page layout and sending per-figure updates.
+
+    State is kept per rendered page, keyed by the page token handed out with each full
+    render and echoed back by the browser (``ids.ID_FIGURE_PAGE_STORE``). A token this
+    planner does not know (new tab, reload, another worker process, evicted page) gets a
+    full render, so patches are only ever computed against what that page actually shows.
+    """
+
+    def __init__(self, cache: Optional[FigureCacheV2_5] = None, max_pages: int = 64):
+        self.cache = cache or get_figure_cache()
+        self.max_pages = max(1, max_pages)
+        self._lock = threading.Lock()
+        self._pages: "OrderedDict[str, _PageState]" = OrderedDict()
+
+    def plan(self, page_key: str, layout: Any, figure_outputs: Sequence[Dict[str, Any]],
+             page_token: Optional[str] = None) -> Tuple[Any, List[Any], Any]:
+        """
+        Args:
+            page_key: Identifies the page (e.g. URL pathname).
+            layout: Freshly built page layout.
+            figure_outputs: ``ctx.outputs_list`` entries of the ALL-matching figure output.
+            page_token: Token of the page currently shown by the requesting browser, if any.
+
+        Returns:
+            (page content or ``no_update``, list of per-figure updates aligned with
+            ``figure_outputs``, new page token or ``no_update``)
+        """
+        current_ids = [output["id"]["chart"] for output in figure_outputs]
+        graphs = list(_iter_graphs(layout))
+        for n, graph in enumerate(g for g in graphs if getattr(g, "id", None) is None):
+            graph.id = {"type": FIGURE_GRAPH_TYPE, "chart": f"{page_key}/graph#{n}"}
+        managed = [g for g in graphs if _is_managed(g)]
+        figures = {g.id["chart"]: _figure_json(g.figure) for g in managed}
+        skeleton = self._skeleton_digest(layout, managed)
+
+        with self._lock:
+            page = self._pages.get(page_token) if page_token else None
+            same_page = (
+                page is not None and page_key == page.page_key and skeleton == page.skeleton
+                and len(current_ids) == len(figures) and set(current_ids) == set(figures)
+            )
+            if same_page:
+                self._pages.move_to_end(page_token)
+                updates = [self._figure_update(page, chart, figures[chart]) for chart in current_ids]
+                return no_update, updates, no_update
+
+            if page is not None:
+                del self._pages[page_token]
+            new_token = uuid.uuid4().hex
+            self._pages[new_token] = _PageState(page_key, skeleton, figures)
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+        for chart, figure_json in figures.items():
+            self.cache.record_update(chart, "full", len(figure_json))
+        return layout, [no_update] * len(current_ids), new_token
+
+    def _figure_update(self, page: _PageState, chart: str, figure_json: str) -> Any:
+        previous = page.sent.get(chart)
+        if previous == figure_json:
+            self.cache.record_update(chart, "unchanged", 0)
+            return no_update
+        page.sent[chart] = figure_json
+        new_figure = json.loads(figure_json)
+        patch = build_figure_patch(json.loads(previous), new_figure) if previous is not None else None
+        if patch is None:
+            self.cache.record_update(chart, "full", len(figure_json))
+            return new_figure
+        self.cache.record_update(chart, "patch", len(json.dumps(patch.to_plotly_json(), cls=PlotlyJSONEncoder)))
+        return patch
+
+    @staticmethod
+    def _skeleton_digest(layout: Any, managed: Sequence[dcc.Graph]) -> str:
+        """Digest of the layout with managed figures blanked out."""
+        saved = [graph.figure for graph in managed]
+        try:
+            for graph in managed:
+                graph.figure = None
+            payload = json.dumps(layout, cls=PlotlyJSONEncoder)
+        finally:
+            for graph, figure in zip(managed, saved):
+                graph.figure = figure
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    @property
+    def page_count(self) -> int:
+        return len(self._pages)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._pages.clear()
@@ -308,6 +308,16 @@ class DashboardUtils:
         )
         return fig
 
+    def refresh_timestamp_annotations(self, fig: go.Figure, timestamp: Union[datetime, str, float, None]) -> go.Figure:
+        """Rewrite the text of existing "Updated: ..." annotations in place (used for cached figures)."""
+        ts_str = self._format_timestamp(timestamp) if timestamp is not None else ""
+        if not ts_str:
+            return fig
+        for annotation in fig.layout.annotations or ():
+            if isinstance(annotation.text, str) and annotation.text.startswith("Updated: "):
+                annotation.text = f"Updated: {ts_str}"
+        return fig
+
 # --- Global Instance ---
 _dashboard_utils: Optional[DashboardUtils] = None
 
@@ -346,6 +356,11 @@ def add_bottom_right_timestamp_annotation(fig: go.Figure, timestamp: Union[datet
     utils = get_dashboard_utils()
     return utils.add_bottom_right_timestamp_annotation(fig, timestamp)
 
+def refresh_timestamp_annotations(fig: go.Figure, timestamp: Union[datetime, str, float, None]) -> go.Figure:
+    """Rewrite existing "Updated: ..." annotations to the given timestamp."""
+    utils = get_dashboard_utils()
+    return utils.refresh_timestamp_annotations(fig, timestamp)
+
 def apply_dark_theme_template(fig: go.Figure) -> go.Figure:
     """Apply the custom dark theme template to match the dark theme dashboard."""
     utils = get_dashboard_utils()
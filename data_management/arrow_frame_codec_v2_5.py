@@ -0,0 +1,54 @@
+# data_management/arrow_frame_codec_v2_5.py
+# EOTS v2.5 - Arrow encoding of per-row model dumps
+#
+# Shared by the snapshot recorder (Parquet segments) and the shared-memory bundle
+# channel (Arrow IPC sections). Rows are the dicts produced by ``model_dump()`` of
+# RawOptionsContractV2_5, ProcessedContractMetricsV2_5 and friends, whose many
+# ``Optional[Any]`` fields do not map onto a single Arrow type; such columns are
+# stored as JSON strings and restored on decode.
+
+import json
+from typing import Any, Dict, List
+
+import pandas as pd
+import pyarrow as pa
+
+JSON_COLUMNS_KEY = b"eots_json_columns"
+
+
+def encode_frame(rows: List[Dict[str, Any]]) -> pa.Table:
+    """
+    Build an Arrow table from row dicts. Object columns holding anything other than
+    strings are JSON-encoded and listed in the schema metadata so ``decode_table``
+    can restore them.
+    """
+    frame = pd.DataFrame(rows)
+    json_columns = []
+    for column in frame.columns:
+        if frame[column].dtype != object:
+            continue
+        values = frame[column].dropna()
+        if values.empty or all(isinstance(v, str) for v in values):
+            continue
+        frame[column] = frame[column].map(lambda v: None if v is None else json.dumps(v, default=str))
+        json_columns.append(column)
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[JSON_COLUMNS_KEY] = json.dumps(json_columns).encode()
+    return table.replace_schema_metadata(metadata)
+
+
+def json_columns(table: pa.Table) -> List[str]:
+    """Columns of ``table`` that ``encode_frame`` stored as JSON strings."""
+    return json.loads((table.schema.metadata or {}).get(JSON_COLUMNS_KEY, b"[]"))
+
+
+def decode_table(table: pa.Table) -> pd.DataFrame:
+    """Inverse of ``encode_frame``: JSON columns are decoded and nulls come back as None."""
+    frame = table.to_pandas()
+    for column in json_columns(table):
+        frame[column] = frame[column].map(lambda v: json.loads(v) if isinstance(v, str) else None)
+    for column in frame.columns:
+        if pd.api.types.is_datetime64_any_dtype(frame[column]):
+            frame[column] = pd.Series(frame[column].dt.to_pydatetime(), index=frame.index, dtype=object)
+    return frame.astype(object).where(frame.notna(), None)
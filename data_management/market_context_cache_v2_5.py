@@ -0,0 +1,319 @@
+# data_management/market_context_cache_v2_5.py
+# EOTS v2.5 - Persistent, TTL-aware cache for daily OHLCV bars and ticker reference data
+#
+# Layout under <cache_dir>:
+#   history/<SYMBOL>.parquet   daily bars (lowercase OHLCV columns, date index)
+#   info/<SYMBOL>.json         ticker reference data (sector, marketCap, beta, ...)
+#
+# A file's modification time is when its dataset was last refreshed, so every process
+# sharing the directory sees the same freshness. Stale history is topped up with the
+# bars after the last cached date instead of being refetched. Concurrent callers for
+# the same dataset wait for a single fetch (threads via a per-key lock, processes via
+# an advisory lock file where the platform supports it). Data comes from a pluggable
+# provider: Yahoo Finance in production, local fixtures in tests and offline runs.
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+try:
+    import fcntl
+except ImportError:  # Windows: cross-process coalescing is skipped, writes stay atomic
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+HISTORY = "history"
+INFO = "info"
+# Parquet schema metadata key: first date the cached bars are complete from
+_COVERED_FROM = b"eots_covered_from"
+
+
+def _normalize_bars(frame: pd.DataFrame) -> pd.DataFrame:
+    """Lowercase OHLCV columns on a tz-naive, sorted, de-duplicated daily index."""
+    if frame is None or frame.empty:
+        return pd.DataFrame(columns=OHLCV_COLUMNS, index=pd.DatetimeIndex([], name="date"))
+    frame = frame.rename(columns=str.lower)
+    index = pd.DatetimeIndex(frame.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    frame = frame.set_axis(pd.DatetimeIndex(index.normalize().to_numpy(), name="date"), axis=0)
+    frame = frame[~frame.index.duplicated(keep="last")].sort_index()
+    return frame[[c for c in OHLCV_COLUMNS if c in frame.columns]]
+
+
+def _covered_from(frame: pd.DataFrame) -> pd.Timestamp:
+    """First date from which ``frame`` holds every available bar."""
+    if "covered_from" in frame.attrs:
+        return frame.attrs["covered_from"]
+    return frame.index[0] if not frame.empty else pd.Timestamp.max
+
+
+# --- Providers -------------------------------------------------------------
+
+class MarketDataProviderV2_5(ABC):
+    """Source of daily bars and ticker reference data for the market context cache."""
+
+    name = "provider"
+
+    @abstractmethod
+    def fetch_history(self, symbol: str, start: datetime) -> pd.DataFrame:
+        """Daily bars for ``symbol`` from ``start`` (inclusive) to the latest available bar."""
+
+    @abstractmethod
+    def fetch_info(self, symbol: str) -> Dict[str, Any]:
+        """Reference data for ``symbol`` (sector, industry, marketCap, beta, ...)."""
+
+
+class YahooFinanceProviderV2_5(MarketDataProviderV2_5):
+    """Yahoo Finance provider with the analyzer's randomized rate-limit delay."""
+
+    name = "yahoo"
+    # Index symbols that Yahoo Finance lists under a different ticker
+    SYMBOL_ALIASES = {"VIX": "^VIX"}
+
+    def __init__(self, rate_limit_seconds: float = 2.0):
+        import yfinance  # optional dependency, only needed when this provider is used
+        self._yf = yfinance
+        self.rate_limit_seconds = rate_limit_seconds
+
+    def _ticker(self, symbol: str) -> Any:
+        time.sleep(random.uniform(1.0, max(1.0, self.rate_limit_seconds)))
+        return self._yf.Ticker(self.SYMBOL_ALIASES.get(symbol, symbol))
+
+    def fetch_history(self, symbol: str, start: datetime) -> pd.DataFrame:
+        return _normalize_bars(self._ticker(symbol).history(start=start.strftime("%Y-%m-%d"), interval="1d"))
+
+    def fetch_info(self, symbol: str) -> Dict[str, Any]:
+        return dict(self._ticker(symbol).info or {})
+
+
+class FixtureMarketDataProviderV2_5(MarketDataProviderV2_5):
+    """Serves bars and reference data from in-memory frames or a fixture directory."""
+
+    name = "fixture"
+
+    def __init__(self, histories: Optional[Dict[str, pd.DataFrame]] = None,
+                 infos: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.histories = {symbol: _normalize_bars(frame) for symbol, frame in (histories or {}).items()}
+        self.infos = dict(infos or {})
+
+    @classmethod
+    def from_directory(cls, fixture_dir: str) -> "FixtureMarketDataProviderV2_5":
+        """Load ``<SYMBOL>.csv`` (date column plus OHLCV) and ``<SYMBOL>.info.json`` files."""
+        root = Path(fixture_dir)
+        histories = {
+            path.stem: pd.read_csv(path, index_col=0, parse_dates=True)
+            for path in root.glob("*.csv")
+        }
+        infos = {
+            path.name[:-len(".info.json")]: json.loads(path.read_text(encoding="utf-8"))
+            for path in root.glob("*.info.json")
+        }
+        return cls(histories, infos)
+
+    def fetch_history(self, symbol: str, start: datetime) -> pd.DataFrame:
+        frame = self.histories.get(symbol)
+        if frame is None:
+            return _normalize_bars(None)
+        return frame[frame.index >= pd.Timestamp(start).normalize()].copy()
+
+    def fetch_info(self, symbol: str) -> Dict[str, Any]:
+        return dict(self.infos.get(symbol, {}))
+
+
+# --- Cache -----------------------------------------------------------------
+
+class MarketContextCacheV2_5:
+    """On-disk, TTL-aware cache of daily bars and reference data shared across processes."""
+
+    def __init__(self, provider: Optional[MarketDataProviderV2_5],
+                 cache_dir: str = "cache/market_context",
+                 history_ttl_seconds: float = 900.0,
+                 info_ttl_seconds: float = 86400.0,
+                 retention_days: int = 400):
+        self.provider = provider
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = {HISTORY: history_ttl_seconds, INFO: info_ttl_seconds}
+        self.retention = timedelta(days=retention_days)
+        # (dataset, symbol) -> (file mtime, value) for what this process last read or wrote
+        self._memory: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        self._key_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "full_fetches": 0, "top_ups": 0, "stale_served": 0}
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "MarketContextCacheV2_5":
+        """Build the cache and its provider from TickerContextAnalyzerSettings (or a dict of them)."""
+        def setting(name: str, default: Any) -> Any:
+            return settings.get(name, default) if isinstance(settings, dict) else getattr(settings, name, default)
+
+        provider_name = setting("market_data_provider", "yahoo")
+        provider: Optional[MarketDataProviderV2_5] = None
+        if provider_name == "fixture":
+            fixture_dir = setting("market_data_fixture_dir", None)
+            if fixture_dir and Path(fixture_dir).is_dir():
+                provider = FixtureMarketDataProviderV2_5.from_directory(fixture_dir)
+            else:
+                logger.warning(f"Market data fixture directory {fixture_dir!r} not found - market context cache serves cached data only")
+        elif setting("use_yahoo_finance", False):
+            try:
+                provider = YahooFinanceProviderV2_5(setting("yahoo_finance_rate_limit_seconds", 2.0) or 2.0)
+            except ImportError:
+                logger.warning("yfinance not available - market context cache serves cached data only")
+        return cls(
+            provider,
+            cache_dir=setting("market_data_cache_dir", "cache/market_context"),
+            history_ttl_seconds=setting("history_cache_ttl_seconds", 900.0),
+            info_ttl_seconds=setting("info_cache_ttl_seconds", 86400.0),
+        )
+
+    # -- public API --------------------------------------------------------
+
+    def get_history(self, symbol: str, period_days: int = 92) -> pd.DataFrame:
+        """Daily bars for the last ``period_days``; refreshed (topped up) once older than the TTL."""
+        start = pd.Timestamp.now().normalize() - pd.Timedelta(days=period_days)
+        frame = self._get(HISTORY, symbol, lambda cached: self._refresh_history(symbol, cached, start),
+                          covers=lambda cached: _covered_from(cached) <= start)
+        return frame[frame.index >= start]
+
+    def get_info(self, symbol: str) -> Dict[str, Any]:
+        """Reference data for ``symbol``; refetched once older than the TTL."""
+        return dict(self._get(INFO, symbol, lambda cached: self._fetch_info(symbol)))
+
+    def invalidate(self, symbol: str) -> None:
+        """Drop every cached dataset for ``symbol`` (memory and disk)."""
+        for dataset in (HISTORY, INFO):
+            self._memory.pop((dataset, symbol), None)
+            self._path(dataset, symbol).unlink(missing_ok=True)
+
+    # -- freshness and coalescing ------------------------------------------
+
+    def _path(self, dataset: str, symbol: str) -> Path:
+        suffix = ".parquet" if dataset == HISTORY else ".json"
+        return self.cache_dir / dataset / f"{symbol.upper().replace('^', '_')}{suffix}"
+
+    def _get(self, dataset: str, symbol: str, refresh, covers=lambda cached: True) -> Any:
+        key = (dataset, symbol)
+        cached, fresh = self._read(dataset, symbol)
+        if cached is not None and fresh and covers(cached):
+            return cached
+        if self.provider is None:
+            # Nothing to refresh from, so nothing to wait for
+            if cached is None:
+                raise LookupError(f"No cached {dataset} for {symbol} and no market data provider configured")
+            self.stats["stale_served"] += 1
+            return cached
+
+        with self._key_lock(key), self._file_lock(dataset, symbol):
+            # Another thread or process may have refreshed it while this caller waited
+            cached, fresh = self._read(dataset, symbol)
+            if cached is not None and fresh and covers(cached):
+                return cached
+            try:
+                value = refresh(cached)
+            except Exception as e:
+                if cached is None:
+                    raise
+                logger.warning(f"Refreshing {dataset} for {symbol} failed, serving stale cache: {e}")
+                self.stats["stale_served"] += 1
+                return cached
+            self._write(dataset, symbol, value)
+            return value
+
+    def _read(self, dataset: str, symbol: str) -> Tuple[Optional[Any], bool]:
+        """Cached value (memory if the file is unchanged, else disk) and whether it is within its TTL."""
+        path = self._path(dataset, symbol)
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return None, False
+        fresh = time.time() - mtime < self.ttl_seconds[dataset]
+        memo = self._memory.get((dataset, symbol))
+        if memo is not None and memo[0] == mtime:
+            self.stats["memory_hits"] += 1
+            return memo[1], fresh
+        try:
+            if dataset == HISTORY:
+                table = pq.read_table(path)
+                value = table.to_pandas()
+                covered_from = (table.schema.metadata or {}).get(_COVERED_FROM)
+                if covered_from is not None:
+                    value.attrs["covered_from"] = pd.Timestamp(covered_from.decode())
+            else:
+                value = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache file {path}: {e}")
+            return None, False
+        self._memory[(dataset, symbol)] = (mtime, value)
+        self.stats["disk_hits"] += 1
+        return value, fresh
+
+    def _write(self, dataset: str, symbol: str, value: Any) -> None:
+        path = self._path(dataset, symbol)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        if dataset == HISTORY:
+            table = pa.Table.from_pandas(value)
+            metadata = {**(table.schema.metadata or {}), _COVERED_FROM: _covered_from(value).isoformat().encode()}
+            pq.write_table(table.replace_schema_metadata(metadata), tmp)
+        else:
+            tmp.write_text(json.dumps(value, default=str), encoding="utf-8")
+        os.replace(tmp, path)  # readers see the old or the new file, never a partial one
+        self._memory[(dataset, symbol)] = (path.stat().st_mtime, value)
+
+    def _key_lock(self, key: Tuple[str, str]) -> threading.Lock:
+        with self._locks_guard:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    @contextmanager
+    def _file_lock(self, dataset: str, symbol: str) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        lock_path = self._path(dataset, symbol).with_suffix(".lock")
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(lock_path, "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    # -- refresh -----------------------------------------------------------
+
+    def _refresh_history(self, symbol: str, cached: Optional[pd.DataFrame], start: pd.Timestamp) -> pd.DataFrame:
+        if cached is None or cached.empty or _covered_from(cached) > start:
+            self.stats["full_fetches"] += 1
+            merged = _normalize_bars(self.provider.fetch_history(symbol, start.to_pydatetime()))
+            covered_from = start
+        else:
+            # Refetch from the last cached bar on, which also replaces a partial session bar
+            self.stats["top_ups"] += 1
+            last = cached.index[-1]
+            new_bars = _normalize_bars(self.provider.fetch_history(symbol, last.to_pydatetime()))
+            merged = _normalize_bars(pd.concat([cached[cached.index < last], new_bars]))
+            covered_from = _covered_from(cached)
+        keep_from = min(pd.Timestamp.now().normalize() - self.retention, start)
+        merged = merged[merged.index >= keep_from]
+        merged.attrs["covered_from"] = max(covered_from, keep_from)
+        return merged
+
+    def _fetch_info(self, symbol: str) -> Dict[str, Any]:
+        info = self.provider.fetch_info(symbol)
+        if not info:
+            raise ValueError(f"Provider returned no reference data for {symbol}")
+        return info
@@ -0,0 +1,346 @@
+# data_management/market_pattern_store_v2_5.py
+# EOTS v2.5 - Indexed market-pattern store with batched writes and a recent-pattern ring
+#
+# Patterns are stored with typed columns (symbol, pattern_type, ts, confidence) next to
+# the JSON payload, so lookbacks use the (symbol, ts) and (symbol, pattern_type, ts)
+# indexes instead of casting JSON fields. Writes are buffered and inserted in batches.
+# A per-symbol, time-ordered ring keeps the most recent patterns in memory and answers
+# lookbacks inside its window without a query.
+#
+# Works on any DB-API connection: PostgreSQL (psycopg, as used by DatabaseManagerV2_5)
+# or sqlite3 as a local stand-in. Without a connection the store is memory-only.
+
+import bisect
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TABLE = "market_pattern_events"
+
+_POSTGRES_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS {table} (
+        id BIGSERIAL PRIMARY KEY,
+        pattern_id TEXT NOT NULL,
+        symbol TEXT NOT NULL,
+        pattern_type TEXT NOT NULL,
+        ts TIMESTAMPTZ NOT NULL,
+        confidence DOUBLE PRECISION NOT NULL,
+        data JSONB NOT NULL
+    )""",
+)
+_SQLITE_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        pattern_id TEXT NOT NULL,
+        symbol TEXT NOT NULL,
+        pattern_type TEXT NOT NULL,
+        ts TEXT NOT NULL,
+        confidence REAL NOT NULL,
+        data TEXT NOT NULL
+    )""",
+)
+_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_{table}_symbol_ts ON {table} (symbol, ts DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_{table}_symbol_type_ts ON {table} (symbol, pattern_type, ts DESC)",
+)
+
+
+def _utc(ts: Optional[datetime]) -> datetime:
+    """Aware UTC timestamp (naive timestamps are taken as local time)."""
+    if ts is None:
+        return datetime.now(timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+
+class _PatternRow:
+    """One stored pattern: typed columns plus the original pattern object."""
+    __slots__ = ("ts", "pattern_id", "pattern_type", "confidence", "pattern")
+
+    def __init__(self, ts: datetime, pattern_id: str, pattern_type: str, confidence: float, pattern: Any):
+        self.ts = ts
+        self.pattern_id = pattern_id
+        self.pattern_type = pattern_type
+        self.confidence = confidence
+        self.pattern = pattern
+
+
+class _SymbolRing:
+    """Time-ordered recent patterns for one symbol, with the time from which it is complete."""
+
+    def __init__(self, complete_since: datetime):
+        self.rows: List[_PatternRow] = []
+        self.complete_since = complete_since
+
+    def insert(self, row: _PatternRow) -> None:
+        if not self.rows or self.rows[-1].ts <= row.ts:
+            self.rows.append(row)
+        else:
+            bisect.insort(self.rows, row, key=lambda r: r.ts)
+
+    def trim(self, oldest: datetime, capacity: int) -> None:
+        start = bisect.bisect_left(self.rows, oldest, key=lambda r: r.ts)
+        if len(self.rows) - start > capacity:
+            start = len(self.rows) - capacity
+        if start:
+            # Anything at or before the newest evicted row may be missing now
+            self.complete_since = max(self.complete_since, self.rows[start - 1].ts)
+            del self.rows[:start]
+
+
+class MarketPatternStoreV2_5:
+    """Typed, indexed pattern store with batched inserts and an in-memory recent window."""
+
+    def __init__(self,
+                 connection_provider: Optional[Callable[[], Any]] = None,
+                 dialect: Optional[str] = None,
+                 table: str = DEFAULT_TABLE,
+                 model_cls: Optional[Type[BaseModel]] = None,
+                 batch_size: int = 50,
+                 flush_interval_seconds: float = 5.0,
+                 max_pending: int = 5000,
+                 ring_window_minutes: float = 60.0,
+                 ring_capacity: int = 512):
+        self.connection_provider = connection_provider
+        self.dialect = dialect  # "postgres" or "sqlite"; None detects sqlite3 connections
+        self.table = table
+        self.model_cls = model_cls
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_pending = max(self.batch_size, max_pending)
+        self.ring_window = timedelta(minutes=ring_window_minutes)
+        self.ring_capacity = max(1, ring_capacity)
+
+        self._rings: Dict[str, _SymbolRing] = {}
+        self._pending: List[Tuple[str, _PatternRow]] = []
+        self._last_flush = time.monotonic()
+        self._schema_ready = False
+        self._lock = threading.RLock()
+        self.stats = defaultdict(int)
+
+    # -- connection --------------------------------------------------------
+
+    def _connection(self) -> Any:
+        if self.connection_provider is None:
+            return None
+        try:
+            return self.connection_provider()
+        except Exception as e:
+            logger.warning(f"Pattern store connection unavailable: {e}")
+            return None
+
+    def _is_sqlite(self, conn: Any) -> bool:
+        if self.dialect is not None:
+            return self.dialect == "sqlite"
+        return isinstance(conn, sqlite3.Connection)
+
+    def _sql(self, conn: Any, statement: str) -> str:
+        statement = statement.format(table=self.table)
+        return statement.replace("%s", "?") if self._is_sqlite(conn) else statement
+
+    def ensure_schema(self) -> bool:
+        """Create the pattern table and its composite indexes if they do not exist."""
+        conn = self._connection()
+        if conn is None:
+            return False
+        statements = (_SQLITE_SCHEMA if self._is_sqlite(conn) else _POSTGRES_SCHEMA) + _INDEXES
+        try:
+            cur = conn.cursor()
+            for statement in statements:
+                cur.execute(self._sql(conn, statement))
+            if self._is_sqlite(conn):
+                conn.commit()
+            self._schema_ready = True
+            return True
+        except Exception as e:
+            logger.error(f"Failed to create pattern store schema: {e}")
+            return False
+
+    # -- writes ------------------------------------------------------------
+
+    def add(self, symbol: str, pattern: Any) -> None:
+        """Record a pattern for ``symbol``; it is written with the next batch."""
+        self.add_many(symbol, [pattern])
+
+    def add_many(self, symbol: str, patterns: Iterable[Any]) -> None:
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            ring = self._rings.get(symbol)
+            if ring is None:
+                # Nothing was recorded for this symbol before now
+                ring = self._rings[symbol] = _SymbolRing(complete_since=now)
+            for pattern in patterns:
+                row = _PatternRow(
+                    ts=_utc(getattr(pattern, "timestamp", None)),
+                    pattern_id=str(getattr(pattern, "pattern_id", None) or uuid.uuid4()),
+                    pattern_type=str(getattr(pattern, "pattern_type", "UNKNOWN")),
+                    confidence=float(getattr(pattern, "confidence_score", 0.0) or 0.0),
+                    pattern=pattern,
+                )
+                ring.insert(row)
+                self._pending.append((symbol, row))
+                self.stats["added"] += 1
+                if len(self._pending) % self.batch_size == 0:
+                    self.flush()  # a full batch (or one more batch of backlog while writes fail)
+            ring.trim(now - self.ring_window, self.ring_capacity)
+
+            overflow = len(self._pending) - self.max_pending
+            if overflow > 0:
+                del self._pending[:overflow]
+                self.stats["dropped"] += overflow
+                logger.warning(f"Pattern store backlog full, dropped {overflow} oldest unwritten patterns")
+            due = bool(self._pending) and time.monotonic() - self._last_flush >= self.flush_interval_seconds
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Insert pending patterns in one batch; returns the number written."""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._pending:
+                return 0
+            conn = self._connection()
+            if conn is None:
+                # Memory-only: the ring still serves lookbacks
+                self.stats["unpersisted"] += len(self._pending)
+                self._pending.clear()
+                return 0
+            if not self._schema_ready and not self.ensure_schema():
+                return 0
+
+            sqlite = self._is_sqlite(conn)
+            json_value = "%s" if sqlite else "%s::jsonb"
+            statement = self._sql(conn, (
+                "INSERT INTO {table} (pattern_id, symbol, pattern_type, ts, confidence, data) "
+                f"VALUES (%s, %s, %s, %s, %s, {json_value})"
+            ))
+            params = [
+                (row.pattern_id, symbol, row.pattern_type,
+                 row.ts.isoformat(timespec="microseconds") if sqlite else row.ts,
+                 row.confidence, self._payload_json(symbol, row))
+                for symbol, row in self._pending
+            ]
+            try:
+                conn.cursor().executemany(statement, params)
+                if sqlite:
+                    conn.commit()
+            except Exception as e:
+                logger.error(f"Failed to write {len(params)} patterns: {e}")
+                self.stats["failed_flushes"] += 1
+                return 0
+            self._pending.clear()
+            self.stats["written"] += len(params)
+            self.stats["batches"] += 1
+            return len(params)
+
+    @staticmethod
+    def _payload_json(symbol: str, row: _PatternRow) -> str:
+        pattern = row.pattern
+        payload = pattern.model_dump(mode="json") if isinstance(pattern, BaseModel) else dict(pattern)
+        payload.setdefault("symbol", symbol)
+        return json.dumps(payload, default=str)
+
+    # -- reads -------------------------------------------------------------
+
+    def recent(self, symbol: str, lookback_minutes: float = 30, pattern_types: Optional[Iterable[str]] = None,
+               limit: Optional[int] = None) -> List[Any]:
+        """Patterns for ``symbol`` from the last ``lookback_minutes``, newest first."""
+        now = datetime.now(timezone.utc)
+        cutoff = now - timedelta(minutes=lookback_minutes)
+        types = set(pattern_types) if pattern_types is not None else None
+
+        with self._lock:
+            ring = self._rings.get(symbol)
+            in_window = cutoff >= now - self.ring_window
+            if in_window and (ring is None or ring.complete_since > cutoff):
+                if self._load_ring(symbol, now):
+                    ring = self._rings.get(symbol)
+            if ring is not None and ring.complete_since <= cutoff:
+                self.stats["ring_hits"] += 1
+                start = bisect.bisect_right(ring.rows, cutoff, key=lambda r: r.ts)
+                rows = [row for row in reversed(ring.rows[start:]) if types is None or row.pattern_type in types]
+                return [row.pattern for row in rows[:limit]]
+
+            # Lookback longer than the ring window: query the store directly
+            fetched = self._query(symbol, cutoff, types, limit)
+            if fetched is None:
+                # No database: the ring is the best available answer
+                rows = ring.rows if ring is not None else []
+                fetched = [(row, row.pattern) for row in reversed(rows)
+                           if row.ts > cutoff and (types is None or row.pattern_type in types)][:limit]
+        return [pattern for _, pattern in fetched]
+
+    def _load_ring(self, symbol: str, now: datetime) -> bool:
+        """Fill the ring for ``symbol`` with the last ring window from the database."""
+        oldest = now - self.ring_window
+        rows = self._query(symbol, oldest, None, self.ring_capacity)
+        if rows is None:
+            return False
+        complete_since = oldest if len(rows) < self.ring_capacity else rows[-1][0].ts
+        ring = _SymbolRing(complete_since=complete_since)
+        for row, _ in reversed(rows):
+            ring.insert(row)
+        # Keep patterns added since that were not flushed yet
+        previous = self._rings.get(symbol)
+        if previous is not None:
+            stored = {row.pattern_id for row in ring.rows}
+            for row in previous.rows:
+                if row.pattern_id not in stored:
+                    ring.insert(row)
+        self._rings[symbol] = ring
+        self.stats["ring_loads"] += 1
+        return True
+
+    def _query(self, symbol: str, since: datetime, types: Optional[set], limit: Optional[int]
+               ) -> Optional[List[Tuple[_PatternRow, Any]]]:
+        """Indexed lookback query; None if there is no database to ask."""
+        self.flush()
+        conn = self._connection()
+        if conn is None or (not self._schema_ready and not self.ensure_schema()):
+            return None
+        sqlite = self._is_sqlite(conn)
+        clauses = ["symbol = %s", "ts > %s"]
+        params: List[Any] = [symbol, since.isoformat(timespec="microseconds") if sqlite else since]
+        if types:
+            clauses.append(f"pattern_type IN ({', '.join(['%s'] * len(types))})")
+            params.extend(sorted(types))
+        statement = ("SELECT pattern_id, pattern_type, ts, confidence, data FROM {table} "
+                     f"WHERE {' AND '.join(clauses)} ORDER BY ts DESC")
+        if limit:
+            statement += f" LIMIT {int(limit)}"
+        try:
+            cur = conn.cursor()
+            cur.execute(self._sql(conn, statement), tuple(params))
+            fetched = cur.fetchall()
+        except Exception as e:
+            logger.error(f"Pattern lookback query failed: {e}")
+            return None
+        self.stats["queries"] += 1
+
+        results = []
+        for record in fetched:
+            if isinstance(record, dict):
+                record = (record["pattern_id"], record["pattern_type"], record["ts"], record["confidence"], record["data"])
+            pattern_id, pattern_type, ts, confidence, data = record
+            if isinstance(data, str):
+                data = json.loads(data)
+            ts = _utc(datetime.fromisoformat(ts) if isinstance(ts, str) else ts)
+            try:
+                pattern = self.model_cls.model_validate(data) if self.model_cls is not None else data
+            except ValueError as e:
+                logger.warning(f"Skipping stored pattern {pattern_id}: {e}")
+                continue
+            results.append((_PatternRow(ts, pattern_id, pattern_type, float(confidence), pattern), pattern))
+        return results
+
+    def close(self) -> None:
+        self.flush()
@@ -0,0 +1,329 @@
+"""
+News Sentiment Store v2.5 for EOTS
+==================================
+
+Per-symbol cache of Alpha Vantage news sentiment with freshness metadata and a
+refresh scheduler that spends the daily request quota deliberately.
+
+- ``get(symbol)`` always answers from the store. It refreshes the symbol first only
+  when the scheduler can afford it; otherwise it returns the last payload marked stale.
+- The scheduler paces the quota (daily limit minus a reserve) across the trading
+  session. Due symbols are ranked by priority x staleness (age / refresh interval);
+  a symbol whose last request failed or came back empty waits out a retry backoff.
+- NEWS_SENTIMENT with several tickers returns only articles mentioning all of them, so
+  multi-symbol refreshes use one market-wide sweep of the latest articles and take
+  each symbol's sentiment from the articles that mention it. Symbols the sweep does
+  not cover well enough get their own request, in priority order.
+- Derived outputs (sentiment regime, narratives) are memoized per payload version via
+  ``derive``, so they are computed once per fresh payload rather than per call, and
+  once more when the payload expires.
+- Payloads and the day's request count survive restarts in a JSON file.
+
+Author: EOTS v2.5 Development Team
+Version: 2.5.0
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_PATH = "data_cache_v2_5/news_sentiment_store.json"
+NEVER_FETCHED_STALENESS = 1e6
+
+
+@dataclass
+class SentimentEntry:
+    """Latest sentiment payload of one symbol plus its derived-output memo."""
+    symbol: str
+    sentiment: Dict[str, Any] = field(default_factory=dict)
+    fetched_at: Optional[datetime] = None
+    last_attempt_at: Optional[datetime] = None
+    source: str = ""
+    version: int = 0
+    derived: Dict[str, Any] = field(default_factory=dict)
+
+
+class SentimentStoreV2_5:
+    """Cached, quota-aware news sentiment per symbol."""
+
+    def __init__(self,
+                 fetcher: Any,
+                 store_path: Optional[str] = DEFAULT_STORE_PATH,
+                 refresh_interval_minutes: float = 60.0,
+                 max_age_minutes: float = 24 * 60,
+                 retry_backoff_minutes: float = 15.0,
+                 reserve_requests: int = 5,
+                 burst_requests: int = 3,
+                 session_start_hour: float = 8.0,
+                 session_end_hour: float = 17.0,
+                 symbol_priorities: Optional[Dict[str, float]] = None,
+                 sweep_topics: str = "financial_markets,economy_monetary,earnings",
+                 sweep_limit: int = 1000,
+                 sweep_min_due_symbols: int = 3,
+                 min_articles_per_symbol: int = 3,
+                 clock: Callable[[], datetime] = datetime.now):
+        self.fetcher = fetcher
+        self.store_path = Path(store_path) if store_path else None
+        self.refresh_interval = timedelta(minutes=refresh_interval_minutes)
+        self.max_age = timedelta(minutes=max_age_minutes)
+        self.retry_backoff = timedelta(minutes=retry_backoff_minutes)
+        self.reserve_requests = reserve_requests
+        self.burst_requests = burst_requests
+        self.session_start_hour = session_start_hour
+        self.session_end_hour = session_end_hour
+        self.symbol_priorities = dict(symbol_priorities or {})
+        self.sweep_topics = sweep_topics
+        self.sweep_limit = sweep_limit
+        self.sweep_min_due_symbols = sweep_min_due_symbols
+        self.min_articles_per_symbol = min_articles_per_symbol
+        self.clock = clock
+
+        self._entries: Dict[str, SentimentEntry] = {}
+        self._quota_date = clock().date()
+        self._quota_used = 0
+        self._lock = threading.RLock()
+        self.stats = {"hits": 0, "stale_served": 0, "symbol_requests": 0, "sweeps": 0, "derived_computed": 0}
+        self._load()
+
+    @classmethod
+    def from_settings(cls, fetcher: Any, settings: Any) -> "SentimentStoreV2_5":
+        return cls(
+            fetcher,
+            store_path=settings.store_path,
+            refresh_interval_minutes=settings.refresh_interval_minutes,
+            max_age_minutes=settings.max_age_minutes,
+            retry_backoff_minutes=settings.retry_backoff_minutes,
+            reserve_requests=settings.reserve_requests,
+            burst_requests=settings.burst_requests,
+            session_start_hour=settings.session_start_hour,
+            session_end_hour=settings.session_end_hour,
+            symbol_priorities=settings.symbol_priorities,
+            sweep_topics=settings.sweep_topics,
+            sweep_limit=settings.sweep_limit,
+            sweep_min_due_symbols=settings.sweep_min_due_symbols,
+            min_articles_per_symbol=settings.min_articles_per_symbol,
+        )
+
+    # -- reads -------------------------------------------------------------
+
+    def watch(self, *symbols: str) -> None:
+        """Register symbols for scheduled refreshes before anything asks for them."""
+        with self._lock:
+            for symbol in symbols:
+                self._entries.setdefault(symbol.upper(), SentimentEntry(symbol.upper()))
+
+    def get(self, symbol: str) -> Dict[str, Any]:
+        """Sentiment payload for ``symbol`` with a ``freshness`` block; empty if never fetched or too old."""
+        symbol = symbol.upper()
+        with self._lock:
+            entry = self._entries.setdefault(symbol, SentimentEntry(symbol))
+            if self._is_due(entry):
+                self.refresh_due()
+            return self._payload(entry)
+
+    def derive(self, symbol: str, name: str, compute: Callable[[Dict[str, Any]], Any]) -> Any:
+        """``compute(sentiment)`` memoized until the symbol's next fresh payload or its expiry."""
+        symbol = symbol.upper()
+        with self._lock:
+            entry = self._entries.setdefault(symbol, SentimentEntry(symbol))
+            key = (entry.version, self._expired(entry))
+            memo = entry.derived.get(name)
+            if memo is not None and memo[0] == key:
+                return memo[1]
+            value = compute(self._payload(entry))
+            entry.derived[name] = (key, value)
+            self.stats["derived_computed"] += 1
+            return value
+
+    def _expired(self, entry: SentimentEntry) -> bool:
+        return entry.fetched_at is None or self.clock() - entry.fetched_at > self.max_age
+
+    def _payload(self, entry: SentimentEntry) -> Dict[str, Any]:
+        if self._expired(entry):
+            return {}
+        age = self.clock() - entry.fetched_at
+        stale = age >= self.refresh_interval
+        self.stats["stale_served" if stale else "hits"] += 1
+        return {
+            **entry.sentiment,
+            "freshness": {
+                "fetched_at": entry.fetched_at.isoformat(),
+                "age_seconds": age.total_seconds(),
+                "stale": stale,
+                "source": entry.source,
+            },
+        }
+
+    # -- scheduling --------------------------------------------------------
+
+    def _staleness(self, entry: SentimentEntry) -> float:
+        if entry.fetched_at is None:
+            return NEVER_FETCHED_STALENESS
+        return (self.clock() - entry.fetched_at) / self.refresh_interval
+
+    def _is_due(self, entry: SentimentEntry) -> bool:
+        """Older than the refresh interval and not within the backoff of a failed or empty request."""
+        if self._staleness(entry) < 1.0:
+            return False
+        return entry.last_attempt_at is None or self.clock() - entry.last_attempt_at >= self.retry_backoff
+
+    def _priority(self, symbol: str) -> float:
+        return self.symbol_priorities.get(symbol, 1.0)
+
+    def quota_status(self) -> Dict[str, Any]:
+        self._roll_quota_day()
+        daily_limit = getattr(self.fetcher, "daily_limit", 25)
+        used = max(self._quota_used, self._fetcher_used_today())
+        budget = max(0, daily_limit - self.reserve_requests)
+        return {"daily_budget": budget, "used": used, "allowance": self._allowance(budget), "remaining": max(0, budget - used)}
+
+    def _allowance(self, budget: int) -> int:
+        """Requests the scheduler may have spent by now: the budget paced over the session plus a burst."""
+        now = self.clock()
+        hours = now.hour + now.minute / 60 + now.second / 3600
+        span = max(self.session_end_hour - self.session_start_hour, 1e-6)
+        progress = min(max((hours - self.session_start_hour) / span, 0.0), 1.0)
+        return min(budget, math.ceil(budget * progress) + self.burst_requests)
+
+    def _affordable(self) -> int:
+        if hasattr(self.fetcher, "is_available") and not self.fetcher.is_available():
+            return 0
+        status = self.quota_status()
+        return max(0, min(status["allowance"], status["daily_budget"]) - status["used"])
+
+    def due_symbols(self) -> List[str]:
+        """Watched symbols whose payload is older than the refresh interval, most urgent first."""
+        scored = [(self._priority(s) * self._staleness(e), s) for s, e in self._entries.items() if self._is_due(e)]
+        return [symbol for _, symbol in sorted(scored, key=lambda item: (-item[0], item[1]))]
+
+    def refresh_due(self) -> List[str]:
+        """Spend what the pacing allows on the most urgent symbols; returns the symbols refreshed."""
+        with self._lock:
+            due = self.due_symbols()
+            if not due:
+                return []
+            affordable = self._affordable()
+            if affordable <= 0:
+                return []
+            refreshed: List[str] = []
+
+            if len(due) >= self.sweep_min_due_symbols:
+                refreshed = self._sweep(due)
+                affordable -= 1
+                due = [s for s in due if s not in refreshed]
+
+            # Dedicated requests for what the sweep did not cover, most urgent first;
+            # a symbol that does not rank within the allowance is served stale for now
+            for symbol in due[:max(0, affordable)]:
+                if self._refresh_symbol(symbol):
+                    refreshed.append(symbol)
+            if refreshed:
+                self._save()
+            return refreshed
+
+    def _fetcher_used_today(self) -> int:
+        """Requests other callers spent through the shared fetcher today."""
+        if getattr(self.fetcher, "last_reset_date", None) != self._quota_date:
+            return 0
+        return getattr(self.fetcher, "daily_request_count", 0)
+
+    def _count_request(self) -> None:
+        self._roll_quota_day()
+        self._quota_used = max(self._quota_used, self._fetcher_used_today()) + 1
+
+    def _roll_quota_day(self) -> None:
+        today = self.clock().date()
+        if today != self._quota_date:
+            self._quota_date = today
+            self._quota_used = 0
+
+    # -- fetching ----------------------------------------------------------
+
+    def _refresh_symbol(self, symbol: str) -> bool:
+        self.stats["symbol_requests"] += 1
+        self._count_request()
+        self._entries[symbol].last_attempt_at = self.clock()
+        raw = self.fetcher.get_news_sentiment(tickers=symbol, topics=self.sweep_topics, limit=50, sort="RELEVANCE")
+        return self._update(symbol, raw, source="symbol")
+
+    def _sweep(self, symbols: List[str]) -> List[str]:
+        """One market-wide request; returns the symbols it covered with enough articles."""
+        self.stats["sweeps"] += 1
+        self._count_request()
+        for symbol in symbols:
+            self._entries[symbol].last_attempt_at = self.clock()
+        raw = self.fetcher.get_news_sentiment_v2(tickers="", topics=self.sweep_topics, sort="LATEST", limit=self.sweep_limit)
+        feed = raw.get("feed", []) if raw else []
+        covered = []
+        for symbol in symbols:
+            articles = [
+                article for article in feed
+                if any(ts.get("ticker", "").upper() == symbol for ts in article.get("ticker_sentiment", []))
+            ]
+            if len(articles) >= self.min_articles_per_symbol and self._update(symbol, {"feed": articles}, source="sweep"):
+                covered.append(symbol)
+        return covered
+
+    def _update(self, symbol: str, raw: Dict[str, Any], source: str) -> bool:
+        parsed = self.fetcher.parse_sentiment_data(raw, symbol) if raw else None
+        if parsed is None:
+            return False
+        entry = self._entries.setdefault(symbol, SentimentEntry(symbol))
+        entry.sentiment = {
+            "score": parsed.overall_sentiment_score,
+            "label": parsed.overall_sentiment_label,
+            "confidence": min(parsed.relevance_score * 100, 95),
+            "article_count": parsed.article_count,
+            "topics": parsed.topics[:5],
+            "insights": self.fetcher._generate_ai_insights(parsed),
+        }
+        entry.fetched_at = self.clock()
+        entry.last_attempt_at = None
+        entry.source = source
+        entry.version += 1
+        entry.derived.clear()
+        return True
+
+    # -- persistence -------------------------------------------------------
+
+    def _load(self) -> None:
+        if self.store_path is None or not self.store_path.exists():
+            return
+        try:
+            data = json.loads(self.store_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable sentiment store {self.store_path}: {e}")
+            return
+        for symbol, item in data.get("entries", {}).items():
+            self._entries[symbol] = SentimentEntry(
+                symbol, item.get("sentiment", {}), datetime.fromisoformat(item["fetched_at"]), item.get("source", ""), version=1
+            )
+        quota = data.get("quota", {})
+        if quota.get("date") == self._quota_date.isoformat():
+            self._quota_used = int(quota.get("used", 0))
+
+    def _save(self) -> None:
+        if self.store_path is None:
+            return
+        data = {
+            "entries": {
+                symbol: {"sentiment": entry.sentiment, "fetched_at": entry.fetched_at.isoformat(), "source": entry.source}
+                for symbol, entry in self._entries.items() if entry.fetched_at is not None
+            },
+            "quota": {"date": self._quota_date.isoformat(), "used": self._quota_used},
+        }
+        try:
+            self.store_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.store_path.with_name(self.store_path.name + ".tmp")
+            tmp.write_text(json.dumps(data, default=str), encoding="utf-8")
+            os.replace(tmp, self.store_path)
+        except OSError as e:
+            logger.warning(f"Could not persist sentiment store to {self.store_path}: {e}")
@@ -0,0 +1,350 @@
+# data_management/shared_bundle_channel_v2_5.py
+# EOTS v2.5 - Shared-memory publication of the latest analysis bundle per symbol
+#
+# The intraday collector publishes every FinalAnalysisBundleV2_5 it computes into one
+# named shared-memory segment per symbol; dashboard workers read the latest bundle
+# straight out of the segment instead of re-running the analysis cycle or going
+# through the enhanced cache's disk tiers.
+#
+# Segment layout:
+#   [0, HEADER.size)        fixed header (magic, layout, flags, seqlock, publish time,
+#                           request parameters, section lengths)
+#   [DATA_OFFSET, ...)      three sections, each 64-byte aligned:
+#                             the bundle's model_dump_json() bytes, served as-is to the
+#                             dashboard store
+#                             options_data_with_metrics as an Arrow IPC stream
+#                             strike_level_data_with_metrics as an Arrow IPC stream
+#
+# Writes are guarded by a seqlock: the sequence number is odd while a write is in
+# progress and is bumped to the next even value when it completes. Readers copy the
+# sections they need out of the mapped buffer and retry if the sequence moved
+# underneath them; decoding happens on the private copy. A segment that has to grow is flagged as retired and replaced under the same
+# name; readers holding the old mapping see the flag and re-attach.
+
+import atexit
+import logging
+import re
+import struct
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+import pyarrow as pa
+from pydantic import BaseModel
+
+from data_management.arrow_frame_codec_v2_5 import encode_frame
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"EOTSBND1"
+LAYOUT_VERSION = 2
+FLAG_RETIRED = 0x1
+ALIGNMENT = 64
+
+# magic, layout, flags, reserved, seq, published_at, dte_min, dte_max, price_range_percent, reserved,
+# bundle JSON length, contracts IPC length, strikes IPC length
+HEADER = struct.Struct("<8sHHIQdiiiiQQQ")
+_SEQ_OFFSET = struct.calcsize("<8sHHI")
+_FLAGS_OFFSET = struct.calcsize("<8sH")
+DATA_OFFSET = (HEADER.size + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+TABLE_SECTIONS = ("options_data_with_metrics", "strike_level_data_with_metrics")
+
+# Segment names created by a publisher in this process (registered with its resource tracker)
+_PUBLISHED_NAMES = set()
+
+
+def segment_name(prefix: str, symbol: str) -> str:
+    """Shared-memory name for ``symbol`` (POSIX names allow no '/' and should stay short)."""
+    return f"{prefix}_{re.sub(r'[^A-Za-z0-9]', '_', symbol.upper())}"
+
+
+def _aligned(n: int) -> int:
+    return (n + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _retire(buf: memoryview) -> None:
+    """Flag a segment that is about to be unlinked and bump its seqlock so in-progress reads retry."""
+    if bytes(buf[:len(MAGIC)]) != MAGIC:
+        return
+    flags = struct.unpack_from("<H", buf, _FLAGS_OFFSET)[0]
+    struct.pack_into("<H", buf, _FLAGS_OFFSET, flags | FLAG_RETIRED)
+    seq = struct.unpack_from("<Q", buf, _SEQ_OFFSET)[0]
+    struct.pack_into("<Q", buf, _SEQ_OFFSET, seq + 2)
+
+
+def _table_rows(bundle: Any, key: str) -> List[Dict[str, Any]]:
+    """JSON-mode row dicts of one per-row table of the bundle's processed data."""
+    processed = getattr(bundle, "processed_data_bundle", None)
+    rows = processed.get(key) if isinstance(processed, dict) else getattr(processed, key, None)
+    return [row.model_dump(mode="json") if isinstance(row, BaseModel) else row for row in rows or []]
+
+
+def _ipc_bytes(rows: List[Dict[str, Any]]) -> bytes:
+    if not rows:
+        return b""
+    table = encode_frame(rows)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+class SharedBundleHeaderV2_5:
+    """Decoded segment header."""
+
+    __slots__ = ("layout", "flags", "seq", "published_at", "dte_min", "dte_max", "price_range_percent", "lengths")
+
+    def __init__(self, buf: memoryview):
+        magic, self.layout, self.flags, _, self.seq, self.published_at, self.dte_min, self.dte_max, \
+            self.price_range_percent, _, *lengths = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError("not an EOTS bundle segment")
+        if self.layout != LAYOUT_VERSION:
+            raise ValueError(f"unsupported bundle segment layout {self.layout}")
+        self.lengths: Tuple[int, int, int] = tuple(lengths)
+
+    @property
+    def retired(self) -> bool:
+        return bool(self.flags & FLAG_RETIRED)
+
+    @property
+    def age_seconds(self) -> float:
+        return time.time() - self.published_at
+
+
+def _copy_sections(buf: memoryview, lengths: Tuple[int, ...]) -> List[bytes]:
+    sections = []
+    offset = DATA_OFFSET
+    for length in lengths:
+        sections.append(bytes(buf[offset:offset + length]))
+        offset += _aligned(length)
+    return sections
+
+
+# ---------------------------------------------------------------------------
+# Writer (intraday collector)
+# ---------------------------------------------------------------------------
+
+class SharedBundlePublisherV2_5:
+    """Owns one shared-memory segment per symbol and publishes the latest bundle into it."""
+
+    def __init__(self, segment_prefix: str = "eots_bundle", initial_capacity_mb: float = 16.0):
+        self.logger = logger.getChild(self.__class__.__name__)
+        self.segment_prefix = segment_prefix
+        self.initial_capacity_bytes = int(initial_capacity_mb * 1024 * 1024)
+        self._segments: Dict[str, shared_memory.SharedMemory] = {}
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "SharedBundlePublisherV2_5":
+        return cls(segment_prefix=settings.segment_prefix, initial_capacity_mb=settings.initial_capacity_mb)
+
+    def _create(self, name: str, size: int) -> shared_memory.SharedMemory:
+        try:
+            return shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # Left behind by a collector that did not shut down cleanly; readers still
+            # mapping it re-attach to the replacement once they see the retired flag
+            stale = shared_memory.SharedMemory(name=name)
+            if stale.size >= HEADER.size:
+                _retire(stale.buf)
+            stale.close()
+            stale.unlink()
+            return shared_memory.SharedMemory(name=name, create=True, size=size)
+
+    def _segment_for(self, symbol: str, payload_size: int) -> shared_memory.SharedMemory:
+        segment = self._segments.get(symbol)
+        if segment is not None and DATA_OFFSET + payload_size <= segment.size:
+            return segment
+        name = segment_name(self.segment_prefix, symbol)
+        if segment is not None:
+            # Readers holding the old mapping re-attach once they see the retired flag
+            _retire(segment.buf)
+            segment.close()
+            segment.unlink()
+        size = max(self.initial_capacity_bytes, _aligned(DATA_OFFSET + int(payload_size * 1.5)))
+        segment = self._create(name, size)
+        _PUBLISHED_NAMES.add(name)
+        HEADER.pack_into(segment.buf, 0, MAGIC, LAYOUT_VERSION, 0, 0, 0, 0.0, 0, 0, 0, 0, 0, 0, 0)
+        self._segments[symbol] = segment
+        self.logger.info(f"Allocated {size / (1024 * 1024):.1f} MB shared bundle segment {name}")
+        return segment
+
+    def publish(self, symbol: str, bundle: Any, dte_min: int, dte_max: int, price_range_percent: int) -> bool:
+        """Write ``bundle`` (a FinalAnalysisBundleV2_5) as the latest bundle for ``symbol``."""
+        try:
+            sections = [bundle.model_dump_json().encode("utf-8")]
+            sections.extend(_ipc_bytes(_table_rows(bundle, key)) for key in TABLE_SECTIONS)
+        except Exception as e:
+            self.logger.warning(f"Could not encode bundle for {symbol}: {e}")
+            return False
+
+        payload_size = sum(_aligned(len(section)) for section in sections)
+        with self._lock:
+            segment = self._segment_for(symbol, payload_size)
+            buf = segment.buf
+            seq = struct.unpack_from("<Q", buf, _SEQ_OFFSET)[0]
+            struct.pack_into("<Q", buf, _SEQ_OFFSET, seq + 1)  # odd: write in progress
+            offset = DATA_OFFSET
+            for section in sections:
+                buf[offset:offset + len(section)] = section
+                offset += _aligned(len(section))
+            HEADER.pack_into(
+                buf, 0, MAGIC, LAYOUT_VERSION, 0, 0, seq + 1, time.time(),
+                int(dte_min), int(dte_max), int(price_range_percent), 0, *(len(section) for section in sections)
+            )
+            struct.pack_into("<Q", buf, _SEQ_OFFSET, seq + 2)
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            segments, self._segments = self._segments, {}
+        for segment in segments.values():
+            _PUBLISHED_NAMES.discard(segment.name)
+            try:
+                _retire(segment.buf)  # a restarted collector creates a new segment under the same name
+                segment.close()
+                segment.unlink()
+            except (FileNotFoundError, BufferError):
+                pass
+
+
+# ---------------------------------------------------------------------------
+# Reader (dashboard workers)
+# ---------------------------------------------------------------------------
+
+class SharedBundleReaderV2_5:
+    """
+    Reads the latest published bundle for a symbol out of shared memory.
+
+    Every read method returns None when the segment is missing, stale, was published
+    for different request parameters, or kept changing for ``max_read_retries``
+    attempts; callers then fall back to the regular analysis path.
+    """
+
+    def __init__(self, segment_prefix: str = "eots_bundle", max_age_seconds: float = 30.0, max_read_retries: int = 8):
+        self.logger = logger.getChild(self.__class__.__name__)
+        self.segment_prefix = segment_prefix
+        self.max_age_seconds = max_age_seconds
+        self.max_read_retries = max(1, max_read_retries)
+        self._segments: Dict[str, shared_memory.SharedMemory] = {}
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "SharedBundleReaderV2_5":
+        return cls(
+            segment_prefix=settings.segment_prefix,
+            max_age_seconds=settings.max_age_seconds,
+            max_read_retries=settings.max_read_retries,
+        )
+
+    def _attach(self, symbol: str) -> Optional[shared_memory.SharedMemory]:
+        segment = self._segments.get(symbol)
+        if segment is not None:
+            return segment
+        try:
+            segment = shared_memory.SharedMemory(name=segment_name(self.segment_prefix, symbol))
+        except FileNotFoundError:
+            return None
+        # The collector owns the segment; keep this process's resource tracker from unlinking it at exit
+        if segment.name not in _PUBLISHED_NAMES:
+            try:
+                resource_tracker.unregister(segment._name, "shared_memory")
+            except Exception:
+                pass
+        self._segments[symbol] = segment
+        return segment
+
+    def _detach(self, symbol: str) -> None:
+        segment = self._segments.pop(symbol, None)
+        if segment is not None:
+            try:
+                segment.close()
+            except BufferError:
+                pass  # a caller still holds a view; the mapping goes away with it
+
+    def header(self, symbol: str) -> Optional[SharedBundleHeaderV2_5]:
+        segment = self._attach(symbol)
+        if segment is None:
+            return None
+        try:
+            return SharedBundleHeaderV2_5(segment.buf)
+        except ValueError:
+            return None
+
+    def _read_sections(self, symbol: str) -> Optional[Tuple[SharedBundleHeaderV2_5, List[bytes]]]:
+        """Header and a consistent private copy of the sections, or None."""
+        for _ in range(self.max_read_retries):
+            segment = self._attach(symbol)
+            if segment is None:
+                return None
+            buf = segment.buf
+            try:
+                header = SharedBundleHeaderV2_5(buf)
+            except ValueError:
+                return None
+            if header.retired:
+                self._detach(symbol)
+                continue
+            if header.seq == 0:
+                return None  # allocated, nothing published yet
+            if header.seq % 2:
+                time.sleep(0)
+                continue
+            sections = _copy_sections(buf, header.lengths)
+            if struct.unpack_from("<Q", buf, _SEQ_OFFSET)[0] == header.seq:
+                return header, sections
+            # Torn read: the writer overwrote the sections mid-copy
+        self.logger.debug(f"Shared bundle for {symbol} kept changing during {self.max_read_retries} reads")
+        return None
+
+    def read(self, symbol: str) -> Optional[Tuple[SharedBundleHeaderV2_5, str, Dict[str, pa.Table]]]:
+        """
+        Header, bundle JSON and the per-row tables as Arrow tables (decode them with
+        ``arrow_frame_codec_v2_5.decode_table`` when DataFrames are needed).
+        """
+        result = self._read_sections(symbol)
+        if result is None:
+            return None
+        header, sections = result
+        try:
+            tables = {
+                key: pa.ipc.open_stream(pa.py_buffer(section)).read_all() if section else pa.table({})
+                for key, section in zip(TABLE_SECTIONS, sections[1:])
+            }
+            return header, sections[0].decode("utf-8"), tables
+        except Exception:
+            self.logger.warning(f"Corrupt shared bundle segment for {symbol}", exc_info=True)
+            return None
+
+    def read_bundle_json(self, symbol: str, dte_min: int, dte_max: int, price_range_percent: int) -> Optional[str]:
+        """The latest bundle as the JSON the dashboard store holds, or None when it cannot be used."""
+        def usable(header: Optional[SharedBundleHeaderV2_5]) -> bool:
+            return (
+                header is not None and header.seq > 0
+                and (header.dte_min, header.dte_max, header.price_range_percent) == (dte_min, dte_max, price_range_percent)
+                and header.age_seconds <= self.max_age_seconds
+            )
+
+        header = self.header(symbol)
+        if symbol in self._segments and (header is None or header.seq == 0 or header.age_seconds > self.max_age_seconds):
+            # A collector that died without retiring its segment leaves this mapping frozen
+            # while its replacement publishes under the same name; re-attach by name
+            self._detach(symbol)
+            header = self.header(symbol)
+        if not usable(header):
+            return None
+        result = self._read_sections(symbol)
+        if result is None or not usable(result[0]):
+            return None
+        try:
+            return result[1][0].decode("utf-8")
+        except UnicodeDecodeError:
+            self.logger.warning(f"Corrupt shared bundle segment for {symbol}")
+            return None
+
+    def close(self) -> None:
+        for symbol in list(self._segments):
+            self._detach(symbol)
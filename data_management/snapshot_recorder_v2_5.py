@@ -0,0 +1,386 @@
+# data_management/snapshot_recorder_v2_5.py
+# EOTS v2.5 - Raw-fetch snapshot recorder and columnar snapshot log reader
+#
+# Every raw fetch made by the orchestrator (options chain, underlying, Tradier OHLC
+# and raw quotes) is appended, with its timestamp and request parameters, to a
+# session directory of Parquet segments. The log can be read back with
+# SnapshotLogReaderV2_5 and fed through ITSOrchestratorV2_5 by the replay driver in
+# data_management/snapshot_replay_v2_5.py.
+#
+# Session layout (one segment number per flush):
+#   <root_dir>/<session_id>/events-00001.parquet      one row per fetch event
+#   <root_dir>/<session_id>/chain-00001.parquet       one row per recorded contract
+#   <root_dir>/<session_id>/underlying-00001.parquet  one row per recorded underlying
+#   <root_dir>/<session_id>/ohlc-00001.parquet        one row per recorded OHLC bar
+
+import atexit
+import contextvars
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow.parquet as pq
+from pydantic import BaseModel, ConfigDict, Field
+
+from data_management.arrow_frame_codec_v2_5 import decode_table, encode_frame
+from data_models import RawOptionsContractV2_5, RawUnderlyingDataCombinedV2_5
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_TABLES = ("events", "chain", "underlying", "ohlc")
+
+# Event kinds
+CYCLE = "cycle"
+CHAIN_AND_UNDERLYING = "chain_and_underlying"
+OHLC = "ohlc"
+QUOTE = "quote"
+
+# Event sources
+CONVEXVALUE = "convexvalue"
+TRADIER = "tradier"
+ORCHESTRATOR = "orchestrator"
+
+
+class SnapshotEventV2_5(BaseModel):
+    """Index entry for one recorded fetch."""
+    seq: int = Field(..., description="Monotonic event number within the session.", ge=0)
+    cycle_id: int = Field(..., description="Analysis cycle the fetch belongs to (a new cycle starts with each orchestrator analysis cycle).", ge=0)
+    kind: str = Field(..., description="Event kind: cycle (analysis cycle start), chain_and_underlying, ohlc or quote.")
+    source: str = Field(..., description="Data provider the fetch was made against (convexvalue or tradier); orchestrator for cycle events.")
+    symbol: str = Field(..., description="Symbol requested.")
+    recorded_at: datetime = Field(..., description="Wall-clock time at which the fetch returned.")
+    latency_ms: float = Field(0.0, description="Time spent inside the live fetch call in milliseconds.", ge=0.0)
+    ok: bool = Field(..., description="Whether the fetch returned data.")
+    params_json: str = Field("{}", description="JSON-encoded request parameters (dte range, price range, days, ...).")
+    payload_json: Optional[str] = Field(None, description="JSON-encoded payload for small unstructured responses (raw quotes).")
+
+    model_config = ConfigDict(extra='forbid')
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        return json.loads(self.params_json or "{}")
+
+
+# ---------------------------------------------------------------------------
+# Recorder
+# ---------------------------------------------------------------------------
+
+class SnapshotRecorderV2_5:
+    """
+    Buffers raw fetch results and flushes them to Parquet segments.
+
+    Fetch events are grouped into analysis cycles: the orchestrator calls
+    ``begin_cycle`` once at the start of every ``run_full_analysis_cycle``, and every
+    fetch made in that context (primary chain, fallback, OHLC enrichment and the
+    regime engine's quotes) is attached to it, even when cycles for several symbols
+    run concurrently. Fetches made outside a begun cycle attach to the latest one.
+    Use ``wrap_fetchers`` to put recording proxies in front of the live fetchers.
+    """
+
+    def __init__(self, root_dir: str = "data_cache_v2_5/snapshots", session_id: Optional[str] = None,
+                 flush_every_events: int = 25, compression: str = "zstd"):
+        self.logger = logger.getChild(self.__class__.__name__)
+        self.session_id = session_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.session_dir = Path(root_dir) / self.session_id
+        self.session_dir.mkdir(parents=True, exist_ok=True)
+        self.flush_every_events = max(1, flush_every_events)
+        self.compression = compression
+
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._cycle_id = -1
+        self._active_cycle: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar(
+            f"snapshot_cycle_{id(self)}", default=None)
+        self._segment = len(list(self.session_dir.glob("events-*.parquet")))
+        self._buffers: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._buffered_events = 0
+        self._closed = False
+        atexit.register(self.close)
+        self.logger.info(f"Recording raw fetch snapshots to {self.session_dir}")
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "SnapshotRecorderV2_5":
+        return cls(
+            root_dir=settings.root_dir,
+            flush_every_events=settings.flush_every_events,
+            compression=settings.compression,
+        )
+
+    def wrap_fetchers(self, convex_fetcher: Any, tradier_fetcher: Any) -> Tuple[Any, Any]:
+        """Return recording proxies for the ConvexValue and Tradier fetchers."""
+        return (
+            RecordingConvexValueFetcherV2_5(convex_fetcher, self) if convex_fetcher is not None else None,
+            RecordingTradierFetcherV2_5(tradier_fetcher, self) if tradier_fetcher is not None else None,
+        )
+
+    # ------------------------------------------------------------------
+    # Recording API
+    # ------------------------------------------------------------------
+    def begin_cycle(self, symbol: str, params: Dict[str, Any], recorded_at: Optional[datetime] = None) -> int:
+        """
+        Open a new analysis cycle for the current task and record its request
+        parameters; returns the cycle id. Fetches recorded later in the same context
+        are attached to this cycle.
+        """
+        with self._lock:
+            self._cycle_id += 1
+            cycle_id = self._cycle_id
+            seq = self._add_event(CYCLE, ORCHESTRATOR, symbol, params, 0.0, ok=True,
+                                  cycle_id=cycle_id, recorded_at=recorded_at)
+            self._after_event(seq)
+        self._active_cycle.set(cycle_id)
+        return cycle_id
+
+    def record_chain_and_underlying(self, source: str, symbol: str, chain: Optional[List[RawOptionsContractV2_5]],
+                                    underlying: Optional[RawUnderlyingDataCombinedV2_5], params: Dict[str, Any],
+                                    latency_ms: float = 0.0, recorded_at: Optional[datetime] = None) -> int:
+        with self._lock:
+            seq = self._add_event(CHAIN_AND_UNDERLYING, source, symbol, params, latency_ms,
+                                  ok=bool(chain) and underlying is not None, recorded_at=recorded_at)
+            for contract in chain or []:
+                row = contract.model_dump()
+                row["event_seq"] = seq
+                self._buffers["chain"].append(row)
+            if underlying is not None:
+                row = underlying.model_dump()
+                row["event_seq"] = seq
+                self._buffers["underlying"].append(row)
+            return self._after_event(seq)
+
+    def record_ohlc(self, source: str, symbol: str, historical: Optional[Dict[str, Any]], params: Dict[str, Any],
+                    latency_ms: float = 0.0, recorded_at: Optional[datetime] = None) -> int:
+        bars = (historical or {}).get("data") or []
+        with self._lock:
+            seq = self._add_event(OHLC, source, symbol, params, latency_ms, ok=historical is not None, recorded_at=recorded_at)
+            for bar in bars:
+                row = dict(bar)
+                row["event_seq"] = seq
+                self._buffers["ohlc"].append(row)
+            return self._after_event(seq)
+
+    def record_quote(self, source: str, symbol: str, quote: Optional[Dict[str, Any]], params: Dict[str, Any],
+                     latency_ms: float = 0.0, recorded_at: Optional[datetime] = None) -> int:
+        payload = json.dumps(quote, default=str) if quote is not None else None
+        with self._lock:
+            seq = self._add_event(QUOTE, source, symbol, params, latency_ms, ok=quote is not None,
+                                  payload_json=payload, recorded_at=recorded_at)
+            return self._after_event(seq)
+
+    def flush(self) -> Optional[int]:
+        """Write buffered events as a new segment; returns the segment number or None if empty."""
+        with self._lock:
+            return self._flush_locked()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _add_event(self, kind: str, source: str, symbol: str, params: Dict[str, Any], latency_ms: float,
+                   ok: bool, cycle_id: Optional[int] = None, payload_json: Optional[str] = None,
+                   recorded_at: Optional[datetime] = None) -> int:
+        if cycle_id is None:
+            cycle_id = self._active_cycle.get()
+        if cycle_id is None:
+            self._cycle_id = max(self._cycle_id, 0)
+            cycle_id = self._cycle_id
+        seq = self._seq
+        self._seq += 1
+        self._buffers["events"].append({
+            "seq": seq,
+            "cycle_id": cycle_id,
+            "kind": kind,
+            "source": source,
+            "symbol": symbol,
+            "recorded_at": recorded_at or datetime.now(),
+            "latency_ms": float(latency_ms),
+            "ok": ok,
+            "params_json": json.dumps(params, default=str, sort_keys=True),
+            "payload_json": payload_json,
+        })
+        return seq
+
+    def _after_event(self, seq: int) -> int:
+        self._buffered_events += 1
+        if self._buffered_events >= self.flush_every_events:
+            self._flush_locked()
+        return seq
+
+    def _flush_locked(self) -> Optional[int]:
+        if not self._buffers.get("events"):
+            return None
+        self._segment += 1
+        for table_name in SNAPSHOT_TABLES:
+            rows = self._buffers.get(table_name)
+            if not rows:
+                continue
+            path = self.session_dir / f"{table_name}-{self._segment:05d}.parquet"
+            pq.write_table(encode_frame(rows), path, compression=self.compression)
+        events = len(self._buffers["events"])
+        self._buffers.clear()
+        self._buffered_events = 0
+        self.logger.debug(f"Flushed {events} snapshot events to segment {self._segment:05d}")
+        return self._segment
+
+
+# ---------------------------------------------------------------------------
+# Recording proxies
+# ---------------------------------------------------------------------------
+
+class _RecordingFetcherBase:
+    """Delegates everything to the wrapped fetcher; subclasses intercept the fetch calls."""
+
+    def __init__(self, inner: Any, recorder: SnapshotRecorderV2_5):
+        self._inner = inner
+        self._recorder = recorder
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._inner, name)
+
+
+class RecordingConvexValueFetcherV2_5(_RecordingFetcherBase):
+    """Records ConvexValueDataFetcherV2_5 chain and underlying fetches."""
+
+    async def fetch_chain_and_underlying(self, session, symbol: str, dte_min: int = 0, dte_max: int = 45, price_range_percent: int = 20):
+        start = time.perf_counter()
+        chain, underlying = await self._inner.fetch_chain_and_underlying(
+            session=session, symbol=symbol, dte_min=dte_min, dte_max=dte_max, price_range_percent=price_range_percent
+        )
+        params = {"dte_min": dte_min, "dte_max": dte_max, "price_range_percent": price_range_percent}
+        self._recorder.record_chain_and_underlying(CONVEXVALUE, symbol, chain, underlying, params,
+                                                   latency_ms=(time.perf_counter() - start) * 1000.0)
+        return chain, underlying
+
+
+class RecordingTradierFetcherV2_5(_RecordingFetcherBase):
+    """Records TradierDataFetcherV2_5 fallback chain, OHLC and quote fetches."""
+
+    async def __aenter__(self):
+        await self._inner.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return await self._inner.__aexit__(exc_type, exc_val, exc_tb)
+
+    async def fetch_chain_and_underlying(self, symbol: str):
+        start = time.perf_counter()
+        chain, underlying = await self._inner.fetch_chain_and_underlying(symbol)
+        self._recorder.record_chain_and_underlying(TRADIER, symbol, chain, underlying, {},
+                                                   latency_ms=(time.perf_counter() - start) * 1000.0)
+        return chain, underlying
+
+    async def fetch_historical_data(self, symbol: str, days: int = 30):
+        start = time.perf_counter()
+        historical = await self._inner.fetch_historical_data(symbol, days=days)
+        self._recorder.record_ohlc(TRADIER, symbol, historical, {"days": days},
+                                   latency_ms=(time.perf_counter() - start) * 1000.0)
+        return historical
+
+    async def fetch_raw_quote_data(self, symbol: str):
+        start = time.perf_counter()
+        quote = await self._inner.fetch_raw_quote_data(symbol)
+        self._recorder.record_quote(TRADIER, symbol, quote, {}, latency_ms=(time.perf_counter() - start) * 1000.0)
+        return quote
+
+
+# ---------------------------------------------------------------------------
+# Reader
+# ---------------------------------------------------------------------------
+
+class SnapshotLogReaderV2_5:
+    """
+    Loads a recorded session into memory and rebuilds the original fetch results.
+
+    Models are re-validated on every call so each replayed cycle receives fresh
+    instances, exactly as the live fetchers would produce them.
+    """
+
+    def __init__(self, session_dir: str):
+        self.session_dir = Path(session_dir)
+        if not self.session_dir.is_dir():
+            raise FileNotFoundError(f"Snapshot session directory not found: {self.session_dir}")
+        self.logger = logger.getChild(self.__class__.__name__)
+
+        frames = {name: self._read_table(name) for name in SNAPSHOT_TABLES}
+        self.events: List[SnapshotEventV2_5] = [
+            SnapshotEventV2_5.model_validate(row) for row in frames["events"].to_dict("records")
+        ]
+        self.events.sort(key=lambda e: e.seq)
+        self._rows = {
+            name: self._group_rows(frames[name]) for name in ("chain", "underlying", "ohlc")
+        }
+        self._events_by_cycle: Dict[int, List[SnapshotEventV2_5]] = defaultdict(list)
+        for event in self.events:
+            self._events_by_cycle[event.cycle_id].append(event)
+        self.logger.info(f"Loaded {len(self.events)} snapshot events ({len(self._events_by_cycle)} cycles) from {self.session_dir}")
+
+    @staticmethod
+    def latest_session(root_dir: str = "data_cache_v2_5/snapshots") -> Optional[Path]:
+        sessions = sorted(p for p in Path(root_dir).glob("*") if p.is_dir() and any(p.glob("events-*.parquet")))
+        return sessions[-1] if sessions else None
+
+    def _read_table(self, name: str) -> pd.DataFrame:
+        paths = sorted(self.session_dir.glob(f"{name}-*.parquet"))
+        if not paths:
+            return pd.DataFrame()
+        return pd.concat([decode_table(pq.read_table(path)) for path in paths], ignore_index=True)
+
+    @staticmethod
+    def _group_rows(frame: pd.DataFrame) -> Dict[int, List[Dict[str, Any]]]:
+        if frame.empty:
+            return {}
+        grouped: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+        for row in frame.to_dict("records"):
+            grouped[int(row.pop("event_seq"))].append(row)
+        return dict(grouped)
+
+    # ------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------
+    @property
+    def cycle_ids(self) -> List[int]:
+        return sorted(self._events_by_cycle)
+
+    def cycle_events(self, cycle_id: int) -> List[SnapshotEventV2_5]:
+        return list(self._events_by_cycle.get(cycle_id, []))
+
+    def cycle_start_event(self, cycle_id: int) -> Optional[SnapshotEventV2_5]:
+        """The cycle's ``begin_cycle`` event, or its first chain fetch in sessions recorded without one."""
+        events = self._events_by_cycle.get(cycle_id, [])
+        for kind in (CYCLE, CHAIN_AND_UNDERLYING):
+            for event in events:
+                if event.kind == kind:
+                    return event
+        return None
+
+    def chain(self, event: SnapshotEventV2_5) -> Optional[List[RawOptionsContractV2_5]]:
+        rows = self._rows["chain"].get(event.seq)
+        if not rows:
+            return None
+        return [RawOptionsContractV2_5.model_validate(row) for row in rows]
+
+    def underlying(self, event: SnapshotEventV2_5) -> Optional[RawUnderlyingDataCombinedV2_5]:
+        rows = self._rows["underlying"].get(event.seq)
+        if not rows:
+            return None
+        return RawUnderlyingDataCombinedV2_5.model_validate(rows[0])
+
+    def ohlc(self, event: SnapshotEventV2_5) -> Optional[Dict[str, Any]]:
+        if not event.ok:
+            return None
+        bars = [dict(row) for row in self._rows["ohlc"].get(event.seq, [])]
+        columns = list(bars[0].keys()) if bars else ['date', 'open', 'high', 'low', 'close', 'volume']
+        return {'symbol': event.symbol, 'data': bars, 'columns': columns}
+
+    def quote(self, event: SnapshotEventV2_5) -> Optional[Dict[str, Any]]:
+        return json.loads(event.payload_json) if event.payload_json is not None else None
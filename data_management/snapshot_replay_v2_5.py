@@ -0,0 +1,332 @@
+# data_management/snapshot_replay_v2_5.py
+# EOTS v2.5 - Deterministic replay of recorded raw-fetch snapshots
+#
+# Feeds a session recorded by SnapshotRecorderV2_5 back through
+# ITSOrchestratorV2_5.run_full_analysis_cycle with the live fetchers swapped for
+# replay stand-ins. Replay can be paced at any multiple of real time or run as fast
+# as possible, which enables offline profiling, regression diffing of
+# FinalAnalysisBundleV2_5 outputs and throughput testing.
+#
+# Usage:
+#   python -m data_management.snapshot_replay_v2_5 --speed max --output run_a.jsonl
+#   python -m data_management.snapshot_replay_v2_5 --speed max --compare run_a.jsonl
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from data_management.snapshot_recorder_v2_5 import (
+    CHAIN_AND_UNDERLYING, CONVEXVALUE, OHLC, QUOTE, TRADIER,
+    SnapshotEventV2_5, SnapshotLogReaderV2_5,
+)
+
+logger = logging.getLogger(__name__)
+
+# Keys whose values depend on wall-clock time rather than on the replayed data.
+DEFAULT_VOLATILE_KEYS = frozenset({
+    "bundle_timestamp", "processing_timestamp", "fetch_timestamp", "timestamp",
+    "scored_signals_v2_5", "system_status_messages",
+})
+
+
+class ReplayResultV2_5(BaseModel):
+    """Summary of one replay run."""
+    session_dir: str = Field(..., description="Snapshot session that was replayed.")
+    speed: Optional[float] = Field(None, description="Replay speed as a multiple of real time; None means as fast as possible.")
+    cycles_replayed: int = Field(0, description="Number of analysis cycles that produced a bundle.", ge=0)
+    cycles_failed: int = Field(0, description="Number of analysis cycles that raised.", ge=0)
+    recorded_span_seconds: float = Field(0.0, description="Wall-clock span covered by the replayed cycles when they were recorded.", ge=0.0)
+    wall_seconds: float = Field(0.0, description="Wall-clock time the replay took.", ge=0.0)
+    cycle_latencies_ms: List[float] = Field(default_factory=list, description="Per-cycle analysis latency in milliseconds.")
+    errors: List[str] = Field(default_factory=list, description="Error messages from failed cycles.")
+
+    model_config = ConfigDict(extra='forbid')
+
+    @property
+    def cycles_per_second(self) -> float:
+        return self.cycles_replayed / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    @property
+    def realtime_multiple(self) -> float:
+        """How many times faster than real time the replay ran."""
+        return self.recorded_span_seconds / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+
+# ---------------------------------------------------------------------------
+# Replay fetchers
+# ---------------------------------------------------------------------------
+
+class _ReplayCursor:
+    """Tracks the cycle being replayed and hands out its recorded events in order, per symbol."""
+
+    def __init__(self, reader: SnapshotLogReaderV2_5):
+        self.reader = reader
+        self.cycle_id: Optional[int] = None
+        self._queues: Dict[Tuple[str, str, str], Deque[SnapshotEventV2_5]] = {}
+
+    def enter_cycle(self, cycle_id: int) -> None:
+        self.cycle_id = cycle_id
+        queues: Dict[Tuple[str, str, str], Deque[SnapshotEventV2_5]] = defaultdict(deque)
+        for event in self.reader.cycle_events(cycle_id):
+            queues[(event.kind, event.source, event.symbol)].append(event)
+        self._queues = queues
+
+    def next_event(self, kind: str, source: str, symbol: str) -> Optional[SnapshotEventV2_5]:
+        queue = self._queues.get((kind, source, symbol))
+        if not queue:
+            logger.debug(f"No recorded {source} {kind} event for {symbol} in cycle {self.cycle_id}")
+            return None
+        return queue.popleft()
+
+
+class ReplayConvexValueFetcherV2_5:
+    """Stand-in for ConvexValueDataFetcherV2_5 serving recorded chain/underlying snapshots."""
+
+    def __init__(self, cursor: _ReplayCursor):
+        self._cursor = cursor
+
+    async def fetch_chain_and_underlying(self, session, symbol: str, dte_min: int = 0, dte_max: int = 45, price_range_percent: int = 20):
+        event = self._cursor.next_event(CHAIN_AND_UNDERLYING, CONVEXVALUE, symbol)
+        if event is None:
+            return None, None
+        return self._cursor.reader.chain(event), self._cursor.reader.underlying(event)
+
+
+class ReplayTradierFetcherV2_5:
+    """Stand-in for TradierDataFetcherV2_5 serving recorded fallback, OHLC and quote snapshots."""
+
+    def __init__(self, cursor: _ReplayCursor):
+        self._cursor = cursor
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return None
+
+    async def fetch_chain_and_underlying(self, symbol: str):
+        event = self._cursor.next_event(CHAIN_AND_UNDERLYING, TRADIER, symbol)
+        if event is None:
+            return None, None
+        return self._cursor.reader.chain(event), self._cursor.reader.underlying(event)
+
+    async def fetch_historical_data(self, symbol: str, days: int = 30):
+        event = self._cursor.next_event(OHLC, TRADIER, symbol)
+        return self._cursor.reader.ohlc(event) if event is not None else None
+
+    async def fetch_raw_quote_data(self, symbol: str):
+        event = self._cursor.next_event(QUOTE, TRADIER, symbol)
+        return self._cursor.reader.quote(event) if event is not None else None
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+class SnapshotReplayDriverV2_5:
+    """
+    Replays recorded cycles through an orchestrator.
+
+    Args:
+        orchestrator: Object exposing ``run_full_analysis_cycle`` and the
+            ``convex_fetcher`` / ``tradier_fetcher`` attributes (ITSOrchestratorV2_5).
+        reader: Loaded snapshot session.
+        speed: Multiple of real time (1.0 replays at the recorded pace). ``None`` or
+            ``math.inf`` replays as fast as possible.
+    """
+
+    def __init__(self, orchestrator: Any, reader: SnapshotLogReaderV2_5, speed: Optional[float] = 1.0):
+        if speed is not None and speed <= 0:
+            raise ValueError(f"speed must be positive or None, got {speed}")
+        self.orchestrator = orchestrator
+        self.reader = reader
+        self.speed = None if speed is None or math.isinf(speed) else float(speed)
+        self.cursor = _ReplayCursor(reader)
+        self.convex_fetcher = ReplayConvexValueFetcherV2_5(self.cursor)
+        self.tradier_fetcher = ReplayTradierFetcherV2_5(self.cursor)
+        self._saved: List[Tuple[Any, str, Any]] = []
+
+    def install(self) -> None:
+        """Swap the orchestrator's (and its regime engine's) fetchers for the replay stand-ins."""
+        if self._saved:
+            return
+        targets = [self.orchestrator, getattr(self.orchestrator, "market_regime_engine", None)]
+        for target in filter(None, targets):
+            for attr, replacement in (("convex_fetcher", self.convex_fetcher), ("tradier_fetcher", self.tradier_fetcher)):
+                if hasattr(target, attr):
+                    self._saved.append((target, attr, getattr(target, attr)))
+                    setattr(target, attr, replacement)
+
+    def restore(self) -> None:
+        for target, attr, original in reversed(self._saved):
+            setattr(target, attr, original)
+        self._saved.clear()
+
+    async def replay(self, cycle_ids: Optional[List[int]] = None,
+                     result: Optional[ReplayResultV2_5] = None) -> AsyncIterator[Tuple[SnapshotEventV2_5, Any]]:
+        """Yield ``(cycle_start_event, bundle_or_exception)`` for each replayed cycle."""
+        starts = [e for e in (self.reader.cycle_start_event(c) for c in (cycle_ids or self.reader.cycle_ids)) if e is not None]
+        if not starts:
+            return
+        result = result or ReplayResultV2_5(session_dir=str(self.reader.session_dir), speed=self.speed)
+        first_recorded = starts[0].recorded_at
+        result.recorded_span_seconds = (starts[-1].recorded_at - first_recorded).total_seconds()
+        self.install()
+        wall_start = time.perf_counter()
+        try:
+            for event in starts:
+                if self.speed is not None:
+                    due = (event.recorded_at - first_recorded).total_seconds() / self.speed
+                    delay = due - (time.perf_counter() - wall_start)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                self.cursor.enter_cycle(event.cycle_id)
+                params = event.params
+                cycle_start = time.perf_counter()
+                try:
+                    outcome = await self.orchestrator.run_full_analysis_cycle(
+                        event.symbol,
+                        dte_min=params.get("dte_min", 0),
+                        dte_max=params.get("dte_max", 45),
+                        price_range_percent=params.get("price_range_percent", 20),
+                    )
+                    result.cycles_replayed += 1
+                except Exception as e:
+                    outcome = e
+                    result.cycles_failed += 1
+                    result.errors.append(f"cycle {event.cycle_id} ({event.symbol}): {e}")
+                result.cycle_latencies_ms.append((time.perf_counter() - cycle_start) * 1000.0)
+                result.wall_seconds = time.perf_counter() - wall_start
+                yield event, outcome
+        finally:
+            self.restore()
+
+    async def run(self, on_bundle: Optional[Callable[[SnapshotEventV2_5, Any], None]] = None,
+                  cycle_ids: Optional[List[int]] = None) -> ReplayResultV2_5:
+        """Replay every cycle (or ``cycle_ids``), passing each successful bundle to ``on_bundle``."""
+        result = ReplayResultV2_5(session_dir=str(self.reader.session_dir), speed=self.speed)
+        async for event, outcome in self.replay(cycle_ids, result):
+            if on_bundle is not None and not isinstance(outcome, Exception):
+                on_bundle(event, outcome)
+        logger.info(
+            f"Replayed {result.cycles_replayed} cycles ({result.cycles_failed} failed) in {result.wall_seconds:.2f}s "
+            f"- {result.realtime_multiple:.1f}x real time"
+        )
+        return result
+
+
+# ---------------------------------------------------------------------------
+# Regression diffing
+# ---------------------------------------------------------------------------
+
+def diff_analysis_bundles(expected: Any, actual: Any, rel_tol: float = 1e-9, abs_tol: float = 1e-12,
+                          ignore_keys: frozenset = DEFAULT_VOLATILE_KEYS, max_diffs: int = 50) -> List[str]:
+    """
+    Compare two FinalAnalysisBundleV2_5 instances (or their ``model_dump`` dicts) and
+    return human-readable paths of the values that differ. Keys in ``ignore_keys``
+    hold wall-clock data and are skipped.
+    """
+    diffs: List[str] = []
+
+    def as_plain(value: Any) -> Any:
+        return value.model_dump(mode="json") if isinstance(value, BaseModel) else value
+
+    def walk(path: str, a: Any, b: Any) -> None:
+        if len(diffs) >= max_diffs:
+            return
+        if isinstance(a, dict) and isinstance(b, dict):
+            for key in sorted(set(a) | set(b), key=str):
+                if key in ignore_keys:
+                    continue
+                if key not in a or key not in b:
+                    diffs.append(f"{path}.{key}: {'missing' if key not in a else 'present'} -> {'missing' if key not in b else 'present'}")
+                    continue
+                walk(f"{path}.{key}", a[key], b[key])
+        elif isinstance(a, list) and isinstance(b, list):
+            if len(a) != len(b):
+                diffs.append(f"{path}: length {len(a)} -> {len(b)}")
+                return
+            for i, (x, y) in enumerate(zip(a, b)):
+                walk(f"{path}[{i}]", x, y)
+        elif isinstance(a, float) and isinstance(b, (int, float)) or isinstance(b, float) and isinstance(a, (int, float)):
+            if math.isnan(a) and math.isnan(b):
+                return
+            if not math.isclose(a, b, rel_tol=rel_tol, abs_tol=abs_tol):
+                diffs.append(f"{path}: {a!r} -> {b!r}")
+        elif a != b:
+            diffs.append(f"{path}: {a!r} -> {b!r}")
+
+    walk("bundle", as_plain(expected), as_plain(actual))
+    return diffs
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+async def _replay_cli(args: argparse.Namespace) -> int:
+    from utils.config_manager_v2_5 import ConfigManagerV2_5
+    from core_analytics_engine.its_orchestrator_v2_5 import ITSOrchestratorV2_5
+
+    session = Path(args.session) if args.session else SnapshotLogReaderV2_5.latest_session(args.root_dir)
+    if session is None:
+        logger.error(f"No recorded snapshot sessions found under {args.root_dir}")
+        return 1
+    reader = SnapshotLogReaderV2_5(str(session))
+    speed = None if args.speed == "max" else float(args.speed)
+    driver = SnapshotReplayDriverV2_5(ITSOrchestratorV2_5(ConfigManagerV2_5()), reader, speed=speed)
+
+    baseline: Dict[int, Dict[str, Any]] = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                baseline[record["cycle_id"]] = record["bundle"]
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else None
+    mismatched = 0
+
+    def on_bundle(event: SnapshotEventV2_5, bundle: Any) -> None:
+        nonlocal mismatched
+        dumped = bundle.model_dump(mode="json")
+        if output is not None:
+            output.write(json.dumps({"cycle_id": event.cycle_id, "symbol": event.symbol, "bundle": dumped}) + "\n")
+        if event.cycle_id in baseline:
+            diffs = diff_analysis_bundles(baseline[event.cycle_id], dumped)
+            if diffs:
+                mismatched += 1
+                logger.warning(f"Cycle {event.cycle_id} ({event.symbol}) differs from baseline:\n  " + "\n  ".join(diffs))
+
+    try:
+        result = await driver.run(on_bundle=on_bundle)
+    finally:
+        if output is not None:
+            output.close()
+    print(result.model_dump_json(indent=2, exclude={"cycle_latencies_ms"}))
+    if args.compare:
+        print(f"{mismatched} of {len(baseline)} baseline cycles differ")
+    return 1 if mismatched or result.cycles_failed else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay recorded EOTS raw-fetch snapshots through the orchestrator.")
+    parser.add_argument("--session", help="Snapshot session directory (default: latest under --root-dir).")
+    parser.add_argument("--root-dir", default="data_cache_v2_5/snapshots", help="Snapshot root directory.")
+    parser.add_argument("--speed", default="1", help="Multiple of real time, or 'max' to replay as fast as possible.")
+    parser.add_argument("--output", help="Write each replayed FinalAnalysisBundleV2_5 as JSON lines.")
+    parser.add_argument("--compare", help="JSON-lines output of a previous replay to diff against.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    return asyncio.run(_replay_cli(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,299 @@
+# data_management/synthetic_chain_generator_v2_5.py
+# EOTS v2.5 - Deterministic synthetic options-chain generator
+#
+# Produces valid RawOptionsContractV2_5 / RawUnderlyingDataCombinedV2_5 payloads
+# for offline benchmarking and profiling of the metrics pipeline. All randomness
+# flows through a single seeded numpy Generator so every snapshot is reproducible.
+
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import List, Literal, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, ConfigDict, Field
+
+from core_analytics_engine.eots_metrics.greek_engine import black_scholes_greeks
+from data_models import RawOptionsContractV2_5, RawUnderlyingDataCombinedV2_5
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_DTE_LADDER = [0, 1, 2, 3, 4, 7, 9, 14, 16, 21, 23, 28, 30, 35, 37, 42, 45, 49, 56, 63]
+
+
+class SyntheticChainSpecV2_5(BaseModel):
+    """Shape of a synthetic options chain snapshot."""
+    symbol: str = Field(default="SYN", description="Ticker symbol stamped on every generated contract.", min_length=1)
+    underlying_price: float = Field(default=5000.0, description="Spot price of the synthetic underlying.", gt=0.0)
+    strikes_per_expiry: int = Field(default=50, description="Number of strikes generated for each expiration.", ge=1)
+    expiry_dtes: List[int] = Field(default_factory=lambda: [0, 1, 7, 14, 30], description="Days-to-expiration ladder, one entry per expiry.")
+    strike_range_pct: float = Field(default=0.10, description="Half-width of the strike ladder as a fraction of spot.", gt=0.0, lt=1.0)
+    base_iv: float = Field(default=0.18, description="ATM implied volatility at the front of the curve.", gt=0.0, le=5.0)
+    skew_shape: Literal["flat", "smirk", "smile", "reverse"] = Field(default="smirk", description="Shape of the implied volatility skew across strikes.")
+    skew_strength: float = Field(default=1.0, description="Multiplier applied to the skew shape (0 disables skew).", ge=0.0)
+    term_slope: float = Field(default=0.02, description="IV added per sqrt(year) of time to expiry (negative for inverted curves).")
+    risk_free_rate: float = Field(default=0.05, description="Continuously compounded risk-free rate used for greeks.")
+    multiplier: float = Field(default=100.0, description="Contract multiplier.", gt=0.0)
+    as_of: datetime = Field(default=datetime(2025, 1, 2, 15, 30), description="Snapshot timestamp; fixed by default for reproducibility.")
+    seed: int = Field(default=7, description="Seed for the numpy random generator.")
+
+    model_config = ConfigDict(extra='forbid')
+
+    @classmethod
+    def for_contract_count(cls, n_contracts: int, **overrides) -> "SyntheticChainSpecV2_5":
+        """Build a spec whose chain holds approximately ``n_contracts`` contracts (calls + puts)."""
+        if n_contracts < 2:
+            raise ValueError(f"n_contracts must be >= 2, got {n_contracts}")
+        n_expiries = int(min(len(_DEFAULT_DTE_LADDER), max(1, round(math.sqrt(n_contracts / 20.0)))))
+        strikes = int(math.ceil(n_contracts / (2 * n_expiries)))
+        params = {"strikes_per_expiry": strikes, "expiry_dtes": _DEFAULT_DTE_LADDER[:n_expiries]}
+        params.update(overrides)
+        return cls(**params)
+
+    @property
+    def contract_count(self) -> int:
+        return 2 * self.strikes_per_expiry * len(self.expiry_dtes)
+
+
+class SyntheticChainGeneratorV2_5:
+    """
+    Deterministic, seedable generator for synthetic chains.
+
+    The chain is built column-wise with numpy (strike grid x expiry ladder x call/put),
+    priced with Black-Scholes under a configurable skew/term structure, and populated
+    with open interest, volume and signed rolling flows that mirror the ConvexValue
+    fields consumed by MetricsCalculatorV2_5.
+    """
+
+    def __init__(self, spec: Optional[SyntheticChainSpecV2_5] = None):
+        self.spec = spec or SyntheticChainSpecV2_5()
+        self.logger = logger.getChild(self.__class__.__name__)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def generate_chain_frame(self) -> pd.DataFrame:
+        """Return the synthetic chain as a DataFrame whose columns match RawOptionsContractV2_5."""
+        spec = self.spec
+        rng = np.random.default_rng(spec.seed)
+        spot = spec.underlying_price
+
+        strikes_1d = np.round(np.linspace(spot * (1.0 - spec.strike_range_pct), spot * (1.0 + spec.strike_range_pct), spec.strikes_per_expiry), 2)
+        dtes_1d = np.asarray(spec.expiry_dtes, dtype=float)
+        n_strikes, n_expiries = len(strikes_1d), len(dtes_1d)
+
+        # Grid layout: expiry-major, then strike, then [call, put]
+        strike = np.tile(np.repeat(strikes_1d, 2), n_expiries)
+        dte = np.repeat(dtes_1d, 2 * n_strikes)
+        is_call = np.tile(np.array([True, False]), n_expiries * n_strikes)
+        n = strike.size
+
+        t_years = np.maximum(dte, 0.25) / 365.0
+        iv = self._implied_vol(strike, t_years)
+        greeks = self._black_scholes(spot, strike, t_years, iv, is_call)
+
+        # Open interest peaks near ATM and at round strikes, decays with distance and DTE
+        distance = np.abs(np.log(strike / spot)) / (spec.base_iv * np.sqrt(t_years))
+        round_bonus = np.where(np.isclose(np.mod(strike, 25.0), 0.0), 2.0, 1.0)
+        oi_scale = 20000.0 * np.exp(-0.5 * distance ** 2) * round_bonus / (1.0 + 0.02 * dte)
+        open_interest = np.floor(rng.gamma(2.0, 0.5, n) * oi_scale + rng.integers(0, 50, n)).astype(float)
+        volm = np.floor(open_interest * rng.uniform(0.05, 0.6, n) * (1.5 if n_expiries == 1 else 1.0) + rng.integers(0, 20, n)).astype(float)
+
+        # Signed flows nest: 5m is part of 15m, which is part of 30m, which is part of 60m
+        bias = np.where(is_call, 0.05, -0.05)
+        volm_bs = np.round(volm * np.clip(rng.normal(bias, 0.3, n), -1.0, 1.0))
+        volmbs_60m = np.round(volm_bs * rng.uniform(0.3, 0.7, n))
+        volmbs_30m = np.round(volmbs_60m * rng.uniform(0.4, 0.8, n))
+        volmbs_15m = np.round(volmbs_30m * rng.uniform(0.4, 0.8, n))
+        volmbs_5m = np.round(volmbs_15m * rng.uniform(0.3, 0.7, n))
+
+        price = np.maximum(greeks["price"], 0.01)
+        half_spread = np.maximum(0.01, price * rng.uniform(0.005, 0.04, n))
+        bid = np.maximum(np.round(price - half_spread, 2), 0.0)
+        ask = np.round(price + half_spread, 2)
+        mult = spec.multiplier
+
+        expiry_dates = [spec.as_of.date() + timedelta(days=int(d)) for d in dtes_1d]
+        expiry_codes = np.repeat(np.array([d.strftime("%y%m%d") for d in expiry_dates]), 2 * n_strikes)
+        kind_codes = np.where(is_call, "C", "P")
+        strike_codes = np.char.zfill(np.round(strike * 1000).astype(np.int64).astype(str), 8)
+        contract_symbol = np.char.add(np.char.add(np.char.add(spec.symbol, expiry_codes), kind_codes), strike_codes)
+
+        frame = pd.DataFrame({
+            "contract_symbol": contract_symbol,
+            "strike": strike,
+            "opt_kind": np.where(is_call, "call", "put"),
+            "dte_calc": dte,
+            "open_interest": open_interest,
+            "iv": iv,
+            "raw_price": price,
+            "delta_contract": greeks["delta"],
+            "gamma_contract": greeks["gamma"],
+            "theta_contract": greeks["theta"],
+            "vega_contract": greeks["vega"],
+            "rho_contract": greeks["rho"],
+            "vanna_contract": greeks["vanna"],
+            "vomma_contract": greeks["vomma"],
+            "charm_contract": greeks["charm"],
+            "dxoi": greeks["delta"] * open_interest,
+            "gxoi": greeks["gamma"] * open_interest,
+            "vxoi": greeks["vega"] * open_interest,
+            "txoi": greeks["theta"] * open_interest,
+            "vannaxoi": greeks["vanna"] * open_interest,
+            "vommaxoi": greeks["vomma"] * open_interest,
+            "charmxoi": greeks["charm"] * open_interest,
+            "dxvolm": greeks["delta"] * volm,
+            "gxvolm": greeks["gamma"] * volm,
+            "vxvolm": greeks["vega"] * volm,
+            "txvolm": greeks["theta"] * volm,
+            "vannaxvolm": greeks["vanna"] * volm,
+            "vommaxvolm": greeks["vomma"] * volm,
+            "charmxvolm": greeks["charm"] * volm,
+            "value_bs": volm_bs * price * mult,
+            "volm_bs": volm_bs,
+            "volm": volm,
+            "valuebs_5m": volmbs_5m * price * mult,
+            "volmbs_5m": volmbs_5m,
+            "valuebs_15m": volmbs_15m * price * mult,
+            "volmbs_15m": volmbs_15m,
+            "valuebs_30m": volmbs_30m * price * mult,
+            "volmbs_30m": volmbs_30m,
+            "valuebs_60m": volmbs_60m * price * mult,
+            "volmbs_60m": volmbs_60m,
+            "bid_price": bid,
+            "ask_price": ask,
+            "mid_price": np.round((bid + ask) / 2.0, 4),
+            "multiplier": np.full(n, mult),
+        })
+        self.logger.debug(f"Generated synthetic chain for {spec.symbol}: {n} contracts, {n_expiries} expiries x {n_strikes} strikes")
+        return frame
+
+    def generate_contracts(self, chain_frame: Optional[pd.DataFrame] = None) -> List[RawOptionsContractV2_5]:
+        """Return the chain as validated RawOptionsContractV2_5 models."""
+        frame = self.generate_chain_frame() if chain_frame is None else chain_frame
+        return [RawOptionsContractV2_5.model_validate(record) for record in frame.to_dict(orient="records")]
+
+    def generate_underlying(self, chain_frame: Optional[pd.DataFrame] = None) -> RawUnderlyingDataCombinedV2_5:
+        """Return underlying data consistent with (and aggregated from) the synthetic chain."""
+        spec = self.spec
+        frame = self.generate_chain_frame() if chain_frame is None else chain_frame
+        rng = np.random.default_rng(spec.seed + 1)
+        spot = spec.underlying_price
+
+        prev_close = round(spot * (1.0 - rng.normal(0.0, 0.006)), 2)
+        day_open = round(prev_close * (1.0 + rng.normal(0.0, 0.003)), 2)
+        day_high = round(max(spot, day_open) * (1.0 + abs(rng.normal(0.0, 0.003))), 2)
+        day_low = round(min(spot, day_open) * (1.0 - abs(rng.normal(0.0, 0.003))), 2)
+        day_volume = float(rng.integers(1_000_000, 5_000_000))
+
+        calls = frame["opt_kind"] == "call"
+        puts = ~calls
+
+        def _sum(column: str, mask: Optional[pd.Series] = None) -> float:
+            series = frame[column] if mask is None else frame.loc[mask, column]
+            return float(series.sum())
+
+        # Customer buy/sell greek flows: split each contract's volume by its signed volume
+        buy_volume = (frame["volm"] + frame["volm_bs"]) / 2.0
+        sell_volume = (frame["volm"] - frame["volm_bs"]) / 2.0
+        mult = frame["multiplier"]
+
+        def _flow(greek: str, volume: pd.Series, mask: Optional[pd.Series] = None) -> float:
+            weighted = frame[f"{greek}_contract"] * volume * mult
+            return float((weighted if mask is None else weighted[mask]).sum())
+
+        return RawUnderlyingDataCombinedV2_5(
+            symbol=spec.symbol,
+            timestamp=spec.as_of,
+            price=spot,
+            price_change_abs_und=round(spot - prev_close, 4),
+            price_change_pct_und=(spot - prev_close) / prev_close,
+            day_open_price_und=day_open,
+            day_high_price_und=day_high,
+            day_low_price_und=day_low,
+            prev_day_close_price_und=prev_close,
+            u_volatility=spec.base_iv,
+            day_volume=day_volume,
+            call_gxoi=_sum("gxoi", calls),
+            put_gxoi=_sum("gxoi", puts),
+            call_dxoi=_sum("dxoi", calls),
+            put_dxoi=_sum("dxoi", puts),
+            call_vxoi=_sum("vxoi", calls),
+            put_vxoi=_sum("vxoi", puts),
+            dxoi=_sum("dxoi"),
+            gxoi=_sum("gxoi"),
+            vxoi=_sum("vxoi"),
+            txoi=_sum("txoi"),
+            value_bs=_sum("value_bs"),
+            volm_bs=_sum("volm_bs"),
+            deltas_buy=_flow("delta", buy_volume),
+            deltas_sell=_flow("delta", sell_volume),
+            gammas_call_buy=_flow("gamma", buy_volume, calls),
+            gammas_call_sell=_flow("gamma", sell_volume, calls),
+            gammas_put_buy=_flow("gamma", buy_volume, puts),
+            gammas_put_sell=_flow("gamma", sell_volume, puts),
+            vegas_buy=_flow("vega", buy_volume),
+            vegas_sell=_flow("vega", sell_volume),
+            thetas_buy=_flow("theta", buy_volume),
+            thetas_sell=_flow("theta", sell_volume),
+            total_call_oi_und=_sum("open_interest", calls),
+            total_put_oi_und=_sum("open_interest", puts),
+            total_call_vol_und=_sum("volm", calls),
+            total_put_vol_und=_sum("volm", puts),
+            tradier_iv5_approx_smv_avg=spec.base_iv,
+            tradier_open=day_open,
+            tradier_high=day_high,
+            tradier_low=day_low,
+            tradier_close=prev_close,
+            tradier_volume=day_volume,
+            tradier_vwap=round((day_high + day_low + spot) / 3.0, 2),
+            # Rolling underlying flows read by FlowAnalytics (extra fields are allowed on the model)
+            net_value_flow_5m_und=_sum("valuebs_5m"),
+            net_vol_flow_5m_und=_sum("volmbs_5m"),
+            net_vol_flow_15m_und=_sum("volmbs_15m"),
+            net_vol_flow_30m_und=_sum("volmbs_30m"),
+        )
+
+    def generate_snapshot(self) -> Tuple[List[RawOptionsContractV2_5], RawUnderlyingDataCombinedV2_5]:
+        """Return ``(contracts, underlying)`` in the shape produced by the live fetchers."""
+        frame = self.generate_chain_frame()
+        return self.generate_contracts(frame), self.generate_underlying(frame)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _implied_vol(self, strike: np.ndarray, t_years: np.ndarray) -> np.ndarray:
+        """IV surface: term structure on the ATM level plus a standardized-moneyness skew."""
+        spec = self.spec
+        atm = spec.base_iv + spec.term_slope * np.sqrt(t_years)
+        x = np.clip(np.log(strike / spec.underlying_price) / (spec.base_iv * np.sqrt(t_years)), -4.0, 4.0)
+        if spec.skew_shape == "flat":
+            shape = np.zeros_like(x)
+        elif spec.skew_shape == "smirk":
+            shape = -0.10 * x + 0.02 * x ** 2
+        elif spec.skew_shape == "smile":
+            shape = 0.05 * x ** 2
+        else:  # reverse (call) skew
+            shape = 0.10 * x + 0.02 * x ** 2
+        return np.clip(atm * (1.0 + spec.skew_strength * shape), 0.01, 5.0)
+
+    def _black_scholes(self, spot: float, strike: np.ndarray, t_years: np.ndarray, iv: np.ndarray, is_call: np.ndarray) -> dict:
+        """Price and greeks from the greek engine's Black-Scholes model (no dividends), plus rho per rate point."""
+        greeks = black_scholes_greeks(np.full(strike.shape, float(spot)), strike, t_years, iv, is_call,
+                                      r=self.spec.risk_free_rate, q=0.0)
+        # With q = 0, K*exp(-rT)*N(d2) = S*delta - price for calls and puts alike
+        rho = t_years * (spot * greeks["delta"] - greeks["price"]) / 100.0
+        return {
+            **greeks,
+            "delta": np.clip(greeks["delta"], -1.0, 1.0),
+            "gamma": np.maximum(greeks["gamma"], 0.0),
+            "vega": np.maximum(greeks["vega"], 0.0),
+            "rho": rho,
+        }
+
+
+def generate_synthetic_snapshot(n_contracts: int, seed: int = 7, **spec_overrides) -> Tuple[List[RawOptionsContractV2_5], RawUnderlyingDataCombinedV2_5]:
+    """Convenience wrapper: build a ~``n_contracts`` chain and its underlying in one call."""
+    spec = SyntheticChainSpecV2_5.for_contract_count(n_contracts, seed=seed, **spec_overrides)
+    return SyntheticChainGeneratorV2_5(spec).generate_snapshot()
@@ -11,30 +11,62 @@ CONSOLIDATED STRUCTURE:
 - trading_market_models: Trading, market context, signals, recommendations
 - dashboard_ui_models: Dashboard and UI component models
 - validation_utils: Validation utilities and helper functions
+
+LAZY LOADING:
+Submodules are no longer star-imported at package import time. ``from data_models import X``
+still works unchanged: the module-level ``__getattr__`` below looks ``X`` up in a name index
+(built by scanning the submodule sources, cached under ``__pycache__``) and imports only the
+submodule that defines it, so a process pays the Pydantic schema-build cost only for the model
+modules it actually touches.
+
+- ``get_import_cost_report()`` / ``log_import_cost_report()``: per-module import time and model count.
+- ``warm_model_registry()``: import model modules up front (optionally on a background thread).
+- ``EOTS_EAGER_DATA_MODELS=1`` restores the previous eager behaviour.
 """
 
-# Import all models from consolidated files to maintain backward compatibility
-from .core_models import *
-from .configuration_models import *
-from .core_system_config import *
-from .ai_ml_models import *
-from .trading_market_models import *
-from .dashboard_ui_models import *
-from .validation_utils import *
-from .impact_analysis_schemas import *
-from .context_schemas import *
-from .learning_schemas import *
+import ast
+import importlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Star-import order of the former eager package; later modules win on name clashes.
+_MODEL_MODULES = (
+    "core_models",
+    "configuration_models",
+    "core_system_config",
+    "ai_ml_models",
+    "trading_market_models",
+    "dashboard_ui_models",
+    "validation_utils",
+    "impact_analysis_schemas",
+    "context_schemas",
+    "learning_schemas",
+)
+
+_PACKAGE_DIR = Path(__file__).resolve().parent
+_INDEX_CACHE_PATH = Path(os.environ.get("EOTS_MODEL_INDEX_CACHE", _PACKAGE_DIR / "__pycache__" / "model_index.json"))
+
+_registry_lock = threading.RLock()
+_name_index: Optional[Dict[str, str]] = None
+_import_costs: Dict[str, Dict[str, Any]] = {}
 
 __all__ = [
     # From core_models
     "DataFrameSchema", "PandasDataFrame", "SystemStateV2_5", "AISystemHealthV2_5", "AuditLogEntry",
     "RawOptionsContractV2_5", "RawUnderlyingDataV2_5", "RawUnderlyingDataCombinedV2_5", "UnprocessedDataBundleV2_5",
-    "ProcessedContractMetricsV2_5", "ProcessedStrikeLevelMetricsV2_5", "ProcessedUnderlyingAggregatesV2_5", "ProcessedDataBundleV2_5",
+    "ProcessedContractMetricsV2_5", "ProcessedStrikeLevelMetricsV2_5", "ProcessedUnderlyingAggregatesV2_5", "ExposureSurfaceV2_5", "ProcessedDataBundleV2_5",
     "FinalAnalysisBundleV2_5", "UnifiedIntelligenceAnalysis", "AdvancedOptionsMetricsV2_5", "NormalizationParams",
 
     # From configuration_models
     "EOTSConfigV2_5", "AnalyticsEngineConfigV2_5", "AdaptiveLearningConfigV2_5", "MarketRegimeEngineSettings", "IntradayCollectorSettings",
-    "TickerContextAnalyzerSettings",
 
     # From core_system_config
     "DashboardModeSettings", "DashboardModeCollection", "VisualizationSettings",
@@ -48,10 +80,10 @@ __all__ = [
     "HuiHuiExpertType", "HuiHuiModelConfigV2_5", "HuiHuiExpertConfigV2_5", "HuiHuiAnalysisRequestV2_5",
     "HuiHuiAnalysisResponseV2_5", "HuiHuiUsageRecordV2_5", "HuiHuiPerformanceMetricsV2_5", "HuiHuiEnsembleConfigV2_5", "HuiHuiUserFeedbackV2_5",
     "MarketIntelligencePattern", "MCPIntelligenceResultV2_5", "MCPToolResultV2_5", "AdaptiveLearningResult", "RecursiveIntelligenceResult",
-    "SentimentDataV2_5", "NewsArticleV2_5", "AIPredictionMetricsV2_5", "LearningBatchV2_5", "EnhancedLearningMetricsV2_5",
+    "AIPredictionMetricsV2_5", "LearningBatchV2_5", "EnhancedLearningMetricsV2_5",
     
     # From trading_market_models
-    "SignalPayloadV2_5", "KeyLevelV2_5", "KeyLevelsDataV2_5",
+    "SignalPayloadV2_5", "KeyLevelV2_5", "KeyLevelsDataV2_5", "KeyLevelDiffV2_5",
     "TradeParametersV2_5", "ActiveRecommendationPayloadV2_5", "ATIFSituationalAssessmentProfileV2_5", "ATIFStrategyDirectivePayloadV2_5", "ATIFManagementDirectiveV2_5",
     "ConsolidatedAnalysisRequest", "SuperiorTradeIntelligence",
     
@@ -76,12 +108,174 @@ __all__ = [
     # From learning_schemas (explicitly adding all, including newly moved ones)
     "EOTSLearningContext",
     "EOTSPredictionOutcome",
-    "AILearningPattern",
-    "AILearningInsight",
-    "AIPredictionRecord",
-    "AILearningStats",
     # (Existing models like LearningInsightV2_5, UnifiedLearningResult etc. from learning_schemas are also included via its star import)
 ]
 
 # Ensure __all__ has unique, sorted entries
 __all__ = sorted(list(set(__all__)))
+
+
+# =============================================================================
+# LAZY MODEL REGISTRY
+# =============================================================================
+
+def _module_exports(module_name: str, seen: Set[str]) -> Set[str]:
+    """Names that ``from .<module_name> import *`` would bind, determined from source."""
+    if module_name in seen:
+        return set()
+    seen.add(module_name)
+    path = _PACKAGE_DIR / f"{module_name}.py"
+    if not path.exists():
+        return set()
+    tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+
+    bound: Set[str] = set()
+    declared_all: Optional[List[str]] = None
+    statements = list(tree.body)
+    while statements:
+        node = statements.pop(0)
+        if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            bound.add(node.name)
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                if isinstance(target, ast.Name):
+                    if target.id == "__all__" and isinstance(node.value, (ast.List, ast.Tuple)):
+                        declared_all = [elt.value for elt in node.value.elts if isinstance(elt, ast.Constant)]
+                    bound.add(target.id)
+        elif isinstance(node, ast.Import):
+            bound.update((alias.asname or alias.name).split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                if alias.name != "*":
+                    bound.add(alias.asname or alias.name)
+                elif node.level == 1 or (node.module or "").startswith(f"{__name__}."):
+                    source = node.module.split(".")[-1] if node.module else None
+                    if source:
+                        bound.update(_module_exports(source, seen))
+        elif isinstance(node, (ast.If, ast.Try)):
+            statements[:0] = node.body + getattr(node, "orelse", []) + getattr(node, "finalbody", []) + \
+                [stmt for handler in getattr(node, "handlers", []) for stmt in handler.body]
+
+    if declared_all is not None:
+        return set(declared_all)
+    return {name for name in bound if not name.startswith("_")}
+
+
+def _source_fingerprint() -> Dict[str, List[int]]:
+    return {
+        path.name: [path.stat().st_mtime_ns, path.stat().st_size]
+        for path in sorted(_PACKAGE_DIR.glob("*.py"))
+    }
+
+
+def _get_name_index() -> Dict[str, str]:
+    """Map exported name -> defining submodule, loading the on-disk cache when still valid."""
+    global _name_index
+    if _name_index is not None:
+        return _name_index
+    with _registry_lock:
+        if _name_index is not None:
+            return _name_index
+        fingerprint = _source_fingerprint()
+        try:
+            cached = json.loads(_INDEX_CACHE_PATH.read_text())
+            if cached.get("fingerprint") == fingerprint and tuple(cached.get("modules", ())) == _MODEL_MODULES:
+                _name_index = cached["index"]
+                return _name_index
+        except (OSError, ValueError, KeyError):
+            pass
+
+        index: Dict[str, str] = {}
+        for module_name in _MODEL_MODULES:
+            for name in _module_exports(module_name, set()):
+                index[name] = module_name
+        _name_index = index
+        try:
+            _INDEX_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            _INDEX_CACHE_PATH.write_text(json.dumps({"modules": list(_MODEL_MODULES), "fingerprint": fingerprint, "index": index}))
+        except OSError as e:
+            logger.debug(f"Could not write data_models name index cache: {e}")
+        return _name_index
+
+
+def _import_model_module(module_name: str):
+    """Import a model submodule, recording its (inclusive) import cost on first load."""
+    qualified = f"{__name__}.{module_name}"
+    nested = qualified in sys.modules
+    start = time.perf_counter()
+    module = importlib.import_module(qualified)
+    elapsed = time.perf_counter() - start
+    if module_name not in _import_costs:
+        from pydantic import BaseModel
+        model_count = sum(
+            1 for value in vars(module).values()
+            if isinstance(value, type) and issubclass(value, BaseModel) and value.__module__ == qualified
+        )
+        _import_costs[module_name] = {
+            "module": module_name,
+            "import_seconds": elapsed,
+            "models": model_count,
+            "nested": nested,  # already imported by another model module; cost is counted there
+        }
+    return module
+
+
+def __getattr__(name: str):
+    module_name = _get_name_index().get(name)
+    if module_name is None:
+        if not name.startswith("_") and (_PACKAGE_DIR / f"{name}.py").exists():
+            return importlib.import_module(f".{name}", __name__)
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        value = getattr(_import_model_module(module_name), name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r} (expected in {module_name})") from None
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_get_name_index()))
+
+
+def warm_model_registry(modules: Optional[Iterable[str]] = None, background: bool = False) -> Optional[threading.Thread]:
+    """
+    Import model modules ahead of first use (all of them by default).
+
+    With ``background=True`` the imports run on a daemon thread so a process can finish
+    booting while the schemas are built; the thread is returned.
+    """
+    targets = tuple(modules) if modules is not None else _MODEL_MODULES
+
+    def _warm():
+        for module_name in targets:
+            try:
+                _import_model_module(module_name)
+            except Exception as e:
+                logger.warning(f"Failed to warm data_models.{module_name}: {e}")
+
+    if not background:
+        _warm()
+        return None
+    thread = threading.Thread(target=_warm, name="data-models-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def get_import_cost_report() -> List[Dict[str, Any]]:
+    """Per-module import cost (seconds, inclusive of nested imports) for the model modules loaded so far."""
+    return sorted((dict(entry) for entry in _import_costs.values()), key=lambda e: e["import_seconds"], reverse=True)
+
+
+def log_import_cost_report(level: int = logging.INFO) -> None:
+    report = get_import_cost_report()
+    total = sum(entry["import_seconds"] for entry in report)
+    logger.log(level, f"data_models: {len(report)}/{len(_MODEL_MODULES)} model modules loaded in {total * 1000:.0f} ms")
+    for entry in report:
+        note = " (loaded by another module)" if entry["nested"] else ""
+        logger.log(level, f"  {entry['module']:<28} {entry['import_seconds'] * 1000:8.1f} ms  {entry['models']:4d} models{note}")
+
+
+if os.environ.get("EOTS_EAGER_DATA_MODELS", "").lower() in ("1", "true", "yes"):
+    warm_model_registry()
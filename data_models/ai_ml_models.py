@@ -1314,4 +1314,3 @@ class PerformanceMetrics(BaseModel):
     error_message: Optional[str] = None
     model_config = ConfigDict(extra='forbid')
 
-[end of data_models/ai_ml_models.py]
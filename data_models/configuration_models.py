@@ -47,6 +47,20 @@ from .core_system_config import (
     # Control Panel & Collector
     ControlPanelParametersV2_5,
     IntradayCollectorSettings,
+
+    # Performance Instrumentation
+    StageTracingSettings,
+    SnapshotRecordingSettings,
+    GreekEnrichmentSettings,
+    AnalysisWorkerPoolSettings,
+    SharedBundleChannelSettings,
+    KeyLevelTrackingSettings,
+    MCPFanOutSettings,
+    NewsSentimentCacheSettings,
+    SignalConditionSettings,
+    SignalRuleSettings,
+    VectorizedSignalSettings,
+    EliteClassifierSettings,
 )
 
 # Expert & AI Configuration
@@ -333,6 +347,16 @@ class EOTSConfigV2_5(BaseModel):
     
     # Optional Components
     intraday_collector_settings: Optional[IntradayCollectorSettings] = Field(None, description="Intraday collector settings")
+    stage_tracing_settings: StageTracingSettings = Field(default_factory=StageTracingSettings, description="Per-stage analysis-cycle tracing settings")
+    snapshot_recording_settings: SnapshotRecordingSettings = Field(default_factory=SnapshotRecordingSettings, description="Raw-fetch snapshot recorder settings for offline replay")
+    greek_enrichment_settings: GreekEnrichmentSettings = Field(default_factory=GreekEnrichmentSettings, description="Vectorized Black-Scholes IV/greek gap-filling settings")
+    analysis_worker_pool_settings: AnalysisWorkerPoolSettings = Field(default_factory=AnalysisWorkerPoolSettings, description="Process-sharded per-symbol analysis worker settings")
+    shared_bundle_channel_settings: SharedBundleChannelSettings = Field(default_factory=SharedBundleChannelSettings, description="Collector-to-dashboard shared-memory bundle channel settings")
+    key_level_tracking_settings: KeyLevelTrackingSettings = Field(default_factory=KeyLevelTrackingSettings, description="Incremental key-level tracking and hysteresis settings")
+    mcp_fanout_settings: MCPFanOutSettings = Field(default_factory=MCPFanOutSettings, description="Deadline-bounded MCP intelligence fan-out settings")
+    news_sentiment_cache_settings: NewsSentimentCacheSettings = Field(default_factory=NewsSentimentCacheSettings, description="Quota-aware news sentiment cache settings")
+    vectorized_signal_settings: VectorizedSignalSettings = Field(default_factory=VectorizedSignalSettings, description="Declarative signal rules evaluated by the columnar signal engine")
+    elite_classifier_settings: EliteClassifierSettings = Field(default_factory=EliteClassifierSettings, description="Trained regime and flow classifier serving settings")
 
     # Additional Configuration Sections - TIER 3: SMART DEFAULTS (System-level, reasonable defaults)
     strategy_settings: Optional[Dict[str, Any]] = Field(
@@ -387,7 +411,9 @@ __all__ = [
     # Core system models
     'SystemSettings', 'DataFetcherSettings', 'DataManagementSettings', 'DatabaseSettings',
     'VisualizationSettings', 'DashboardModeSettings', 'MainDashboardDisplaySettings', 'DashboardDefaults',
-    'IntradayCollectorSettings',
+    'IntradayCollectorSettings', 'StageTracingSettings', 'SnapshotRecordingSettings', 'GreekEnrichmentSettings',
+    'AnalysisWorkerPoolSettings', 'SharedBundleChannelSettings', 'KeyLevelTrackingSettings', 'MCPFanOutSettings',
+    'NewsSentimentCacheSettings', 'SignalConditionSettings', 'SignalRuleSettings', 'VectorizedSignalSettings', 'EliteClassifierSettings',
     
     # Expert & AI models
     'ExpertSystemConfig', 'MOESystemConfig', 'AnalyticsEngineConfigV2_5', 'AdaptiveLearningConfigV2_5', 'PredictionConfigV2_5',
@@ -321,6 +321,12 @@ class TickerContextAnalyzerSettings(BaseModel):
     volume_threshold: Optional[int] = Field(None, description="Volume threshold for ticker context analysis.")
     use_yahoo_finance: Optional[bool] = Field(False, description="Flag to use Yahoo Finance for data.")
     yahoo_finance_rate_limit_seconds: Optional[float] = Field(2.0, description="Rate limit in seconds for Yahoo Finance API calls.")
+    # Market context cache (daily bars and reference data shared across processes)
+    market_data_provider: str = Field("yahoo", description="Market data provider: 'yahoo' or 'fixture' (local files for tests and offline runs).")
+    market_data_cache_dir: str = Field("cache/market_context", description="Directory of the on-disk market context cache.")
+    market_data_fixture_dir: Optional[str] = Field(None, description="Directory of <SYMBOL>.csv / <SYMBOL>.info.json files; required when market_data_provider is 'fixture'.")
+    history_cache_ttl_seconds: float = Field(900.0, ge=0, description="Age after which cached daily bars are topped up from the provider.")
+    info_cache_ttl_seconds: float = Field(86400.0, ge=0, description="Age after which cached ticker reference data is refetched.")
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -331,7 +337,12 @@ class TickerContextAnalyzerSettings(BaseModel):
             'DEFAULT_TICKER_PROFILE': self.DEFAULT_TICKER_PROFILE.to_dict(),
             'volume_threshold': self.volume_threshold,
             'use_yahoo_finance': self.use_yahoo_finance,
-            'yahoo_finance_rate_limit_seconds': self.yahoo_finance_rate_limit_seconds
+            'yahoo_finance_rate_limit_seconds': self.yahoo_finance_rate_limit_seconds,
+            'market_data_provider': self.market_data_provider,
+            'market_data_cache_dir': self.market_data_cache_dir,
+            'market_data_fixture_dir': self.market_data_fixture_dir,
+            'history_cache_ttl_seconds': self.history_cache_ttl_seconds,
+            'info_cache_ttl_seconds': self.info_cache_ttl_seconds
         }
     
     class Config: extra = 'forbid'
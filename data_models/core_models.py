@@ -10,6 +10,7 @@ from typing import Any, TypeVar, Generic, List, Optional, Dict, Union, TYPE_CHEC
 from datetime import datetime, timezone
 
 # Third-party imports
+import numpy as np
 import pandas as pd
 from pydantic import BaseModel, Field, ConfigDict, GetJsonSchemaHandler, GetCoreSchemaHandler, field_validator, model_validator, FieldValidationInfo
 from pydantic.json_schema import JsonSchemaValue
@@ -762,6 +763,50 @@ class ProcessedUnderlyingAggregatesV2_5(RawUnderlyingDataCombinedV2_5):
     )
 
 
+class ExposureSurfaceV2_5(BaseModel):
+    """
+    Strike x expiry grids of dealer exposures and positioning for one analysis cycle.
+
+    Every grid is stored row-major as ``grids[metric][expiry_index][strike_index]`` over the
+    shared ``dtes`` and ``strikes`` axes, with 0.0 where no contract exists. Plain lists keep
+    the bundle JSON-serializable; use the accessors below for numpy/pandas views.
+    """
+    symbol: str = Field(..., description="Underlying symbol the surface was built for.")
+    strikes: List[float] = Field(default_factory=list, description="Sorted strike axis shared by all grids.")
+    dtes: List[float] = Field(default_factory=list, description="Sorted days-to-expiration axis (one entry per expiry) shared by all grids.")
+    grids: Dict[str, List[List[float]]] = Field(default_factory=dict, description="Metric name -> expiry x strike grid (e.g. 'gex', 'dex', 'vex', 'charm', 'vanna', 'open_interest', 'volume').")
+    updated_dtes: List[float] = Field(default_factory=list, description="Expiries whose rows were recomputed for this cycle; the rest were reused from the previous surface.")
+    built_at: datetime = Field(default_factory=datetime.now, description="Timestamp the surface was (re)built.")
+
+    model_config = ConfigDict(extra='forbid')
+
+    @property
+    def metrics(self) -> List[str]:
+        return list(self.grids)
+
+    def grid(self, metric: str) -> np.ndarray:
+        """Expiry x strike array for ``metric``."""
+        values = self.grids.get(metric)
+        if values is None:
+            raise KeyError(f"Exposure surface has no '{metric}' grid (available: {self.metrics})")
+        return np.asarray(values, dtype=float).reshape(len(self.dtes), len(self.strikes))
+
+    def grid_frame(self, metric: str) -> pd.DataFrame:
+        """``grid`` as a DataFrame indexed by DTE with one column per strike."""
+        return pd.DataFrame(self.grid(metric), index=pd.Index(self.dtes, name="dte"), columns=pd.Index(self.strikes, name="strike"))
+
+    def strike_profile(self, metric: str, max_dte: Optional[float] = None) -> pd.Series:
+        """``metric`` summed across expiries (optionally only those with DTE <= ``max_dte``), indexed by strike."""
+        values = self.grid(metric)
+        if max_dte is not None:
+            values = values[np.asarray(self.dtes) <= max_dte]
+        return pd.Series(values.sum(axis=0), index=pd.Index(self.strikes, name="strike"), name=metric)
+
+    def term_structure(self, metric: str) -> pd.Series:
+        """``metric`` summed across strikes, indexed by DTE."""
+        return pd.Series(self.grid(metric).sum(axis=1), index=pd.Index(self.dtes, name="dte"), name=metric)
+
+
 class ProcessedDataBundleV2_5(BaseModel):
     """
     Represents the fully processed data state for an EOTS v2.5 analysis cycle.
@@ -774,6 +819,7 @@ class ProcessedDataBundleV2_5(BaseModel):
     underlying_data_enriched: ProcessedUnderlyingAggregatesV2_5 = Field(..., description="The fully processed data for the underlying asset - REQUIRED")
     processing_timestamp: datetime = Field(..., description="Timestamp indicating when the data processing was completed - REQUIRED")
     errors: List[str] = Field(..., description="List of errors encountered during processing - REQUIRED (empty list if no errors)")
+    exposure_surface: Optional[ExposureSurfaceV2_5] = Field(None, description="Strike x expiry exposure grids built once per cycle and shared by all consumers.")
 
     @field_validator('options_data_with_metrics', 'strike_level_data_with_metrics')
     @classmethod
@@ -829,6 +875,7 @@ class FinalAnalysisBundleV2_5(BaseModel): # This line will be part of the next r
     processed_data_bundle: ProcessedDataBundleV2_5 = Field(..., description="Contains all metric-enriched data: options, strike-level, and underlying aggregates (which includes regime and ticker context).")
     scored_signals_v2_5: Dict[str, List[Any]] = Field(..., min_items=1, description="Dictionary of all scored raw signals generated during the cycle - REQUIRED and must not be empty")
     key_levels_data_v2_5: Any = Field(..., description="All identified key support, resistance, pin, and trigger levels - REQUIRED")
+    key_level_diff_v2_5: Optional[Any] = Field(default=None, description="KeyLevelDiffV2_5 against the previous cycle's key levels when key-level tracking is enabled")
 
     atif_recommendations_v2_5: List[Any] = Field(..., description="List of new strategic directives generated by ATIF - REQUIRED (empty list if none)")
     active_recommendations_v2_5: List[Any] = Field(..., description="List of all active trade recommendations - REQUIRED (empty list if none)")
@@ -933,6 +980,7 @@ __all__ = [
     "ProcessedContractMetricsV2_5",
     "ProcessedStrikeLevelMetricsV2_5",
     "ProcessedUnderlyingAggregatesV2_5",
+    "ExposureSurfaceV2_5",
     "ProcessedDataBundleV2_5",
     "FinalAnalysisBundleV2_5",
     "UnifiedIntelligenceAnalysis",
@@ -386,3 +386,183 @@ class IntradayCollectorSettings(BaseModel):
     fetch_interval_seconds: Optional[int] = Field(30, description="Fetch interval in seconds")
 
     model_config = ConfigDict(extra='forbid') # Changed from 'allow'
+
+
+# =============================================================================
+# PERFORMANCE INSTRUMENTATION SETTINGS
+# =============================================================================
+
+class StageTracingSettings(BaseModel):
+    """Settings for per-stage tracing of the analysis cycle (utils/stage_tracer_v2_5.py)."""
+    enabled: bool = Field(False, description="If true, analysis-cycle stages are timed into Prometheus histograms and the slow-cycle buffer.")
+    slowest_cycles_to_keep: int = Field(20, ge=1, le=1000, description="Number of slowest analysis cycles retained with their full span trees.")
+
+    model_config = ConfigDict(extra='forbid')
+
+
+class GreekEnrichmentSettings(BaseModel):
+    """Settings for the vectorized Black-Scholes gap-filling stage (core_analytics_engine/eots_metrics/greek_engine.py)."""
+    enabled: bool = Field(False, description="If true, missing or inconsistent vendor IV and greeks are recomputed before metrics are calculated.")
+    risk_free_rate: float = Field(0.05, description="Continuously compounded risk-free rate.")
+    dividend_yield: float = Field(0.0, description="Continuous dividend yield of the underlying.")
+    min_time_to_expiry_days: float = Field(0.25, gt=0.0, description="Floor applied to dte_calc so 0DTE contracts keep finite greeks.")
+    iv_lower_bound: float = Field(0.005, gt=0.0, description="Lowest implied volatility accepted from the vendor or solved for.")
+    iv_upper_bound: float = Field(5.0, gt=0.0, description="Highest implied volatility accepted from the vendor or solved for.")
+    iv_price_tolerance: float = Field(1e-8, gt=0.0, description="Relative option-price tolerance for IV convergence.")
+    iv_max_iterations: int = Field(50, ge=1, le=500, description="Maximum Newton/bisection iterations for the IV solver.")
+    delta_tolerance: float = Field(0.15, ge=0.0, description="Vendor delta differing from the model delta at the vendor IV by more than this is treated as stale.")
+    recompute_exposures: bool = Field(True, description="Rebuild *xoi / *xvolm exposure columns for recomputed greeks.")
+
+    model_config = ConfigDict(extra='forbid')
+
+
+class AnalysisWorkerPoolSettings(BaseModel):
+    """Settings for the process-sharded per-symbol analysis workers (core_analytics_engine/analysis_worker_pool_v2_5.py)."""
+    enabled: bool = Field(False, description="If true, metric calculation and key-level scoring run in a pool of worker processes with sticky symbol affinity.")
+    worker_count: int = Field(0, ge=0, le=256, description="Number of worker processes; 0 uses one per CPU core minus one.")
+    max_in_flight_per_worker: int = Field(2, ge=1, le=64, description="Requests queued on one worker before callers wait (backpressure).")
+    task_timeout_seconds: float = Field(60.0, gt=0.0, description="A worker that has not finished a started request within this time is restarted.")
+    startup_timeout_seconds: float = Field(120.0, gt=0.0, description="Extra allowance for a worker to import and build its analysis runtime before its first request starts.")
+    max_restarts: int = Field(5, ge=0, description="Restarts allowed per worker within restart_window_seconds before the worker is retired and its symbols fail over.")
+    restart_window_seconds: float = Field(300.0, gt=0.0, description="Sliding window over which worker restarts are counted.")
+    start_method: str = Field("spawn", description="multiprocessing start method for worker processes (spawn, forkserver or fork).")
+    compress_threshold_bytes: int = Field(65536, ge=0, description="Pipe messages larger than this many bytes are zlib-compressed.")
+
+    model_config = ConfigDict(extra='forbid')
+
+
+class SharedBundleChannelSettings(BaseModel):
+    """Settings for the collector -> dashboard shared-memory bundle channel (data_management/shared_bundle_channel_v2_5.py)."""
+    enabled: bool = Field(False, description="If true, the intraday collector publishes each symbol's latest bundle to shared memory and the dashboard reads it from there.")
+    segment_prefix: str = Field("eots_bundle", description="Prefix of the per-symbol shared-memory segment names.")
+    initial_capacity_mb: float = Field(16.0, gt=0.0, description="Initial size of each per-symbol segment; segments grow when a bundle does not fit.")
+    max_age_seconds: float = Field(30.0, gt=0.0, description="Published bundles older than this are treated as stale and the dashboard runs its own analysis cycle.")
+    max_read_retries: int = Field(8, ge=1, le=1000, description="Reads retried while the collector is mid-write before falling back.")
+
+    model_config = ConfigDict(extra='forbid')
+
+
+class KeyLevelTrackingSettings(BaseModel):
+    """Settings for incremental key levels with hysteresis (core_analytics_engine/key_level_tracker_v2_5.py)."""
+    enabled: bool = Field(False, description="If true, real-time key levels are tracked incrementally per symbol and each cycle carries a key-level diff.")
+    input_tolerance_pct: float = Field(0.01, ge=0.0, description="A strike is rescanned when any of its inputs moved by more than this fraction of that input's largest absolute value.")
+    hysteresis_band: float = Field(0.1, ge=0.0, le=1.0, description="A reported level is kept until its conviction falls this far below the reporting threshold.")
+    strength_delta: float = Field(0.05, ge=0.0, description="Conviction change at which a kept level is reported as strengthened or weakened (smaller changes keep the previous level).")
+    absent_cycles_to_remove: int = Field(2, ge=1, le=100, description="Consecutive cycles a reported level may be missing from the candidates before it is removed.")
+
+    model_config = ConfigDict(extra='forbid')
+
+
+class SnapshotRecordingSettings(BaseModel):
+    """Settings for the raw-fetch snapshot recorder (data_management/snapshot_recorder_v2_5.py)."""
+    enabled: bool = Field(False, description="If true, every raw chain, underlying, OHLC and quote fetch is appended to a local columnar snapshot log.")
+    root_dir: str = Field("data_cache_v2_5/snapshots", description="Directory under which one snapshot session directory is created per process.")
+    flush_every_events: int = Field(25, ge=1, le=10000, description="Number of buffered fetch events written per Parquet segment.")
+    compression: str = Field("zstd", description="Parquet compression codec for snapshot segments.")
+
+    model_config = ConfigDict(extra='forbid')
+
+
+class MCPFanOutSettings(BaseModel):
+    """Settings for the deadline-bounded MCP intelligence fan-out (core_analytics_engine/mcp_fanout_executor_v2_5.py)."""
+    global_deadline_seconds: float = Field(20.0, gt=0.0, description="Wall-clock budget for one unified-intelligence request; sources still running at the deadline are cancelled and the partial result is returned.")
+    default_task_budget_seconds: float = Field(8.0, gt=0.0, description="Budget of each intelligence source or tool gather without an explicit entry in task_budgets.")
+    task_budgets: Dict[str, float] = Field(default_factory=dict, description="Per-source budgets in seconds keyed by source name (e.g. 'memory', 'hot_news', 'database', 'recursive_analysis').")
+    learning_budget_seconds: float = Field(10.0, gt=0.0, description="Budget of the recursive-analysis and adaptive-learning agents, which run concurrently after the gather phase.")
+    cancel_grace_seconds: float = Field(0.5, ge=0.0, description="Time cancelled stragglers get to unwind before the partial result is returned.")
+    server_restart_backoff_seconds: float = Field(30.0, ge=0.0, description="Minimum time between respawns of an MCP server process that exited; live servers are reused across requests.")
+
+    model_config = ConfigDict(extra='forbid')
+
+
+class NewsSentimentCacheSettings(BaseModel):
+    """Settings for the quota-aware news sentiment store (data_management/sentiment_store_v2_5.py)."""
+    store_path: str = Field("data_cache_v2_5/news_sentiment_store.json", description="JSON file holding the last sentiment payload per symbol and the day's request count across restarts.")
+    refresh_interval_minutes: float = Field(60.0, gt=0.0, description="Age after which a symbol's sentiment is due for refresh; older payloads are still served, marked stale.")
+    max_age_minutes: float = Field(1440.0, gt=0.0, description="Age after which a cached payload is no longer served at all.")
+    retry_backoff_minutes: float = Field(15.0, ge=0.0, description="Time a due symbol waits after a failed or empty request before it is requested again.")
+    reserve_requests: int = Field(5, ge=0, description="Alpha Vantage daily requests kept back from sentiment refreshes for other callers.")
+    burst_requests: int = Field(3, ge=0, description="Requests the scheduler may spend ahead of the session pacing, e.g. for the first refresh of the day.")
+    session_start_hour: float = Field(8.0, ge=0.0, le=24.0, description="Local hour at which the daily sentiment budget starts to be released.")
+    session_end_hour: float = Field(17.0, ge=0.0, le=24.0, description="Local hour by which the whole daily sentiment budget is released.")
+    symbol_priorities: Dict[str, float] = Field(default_factory=dict, description="Refresh priority per symbol (default 1.0); due symbols are ranked by priority x staleness.")
+    sweep_topics: str = Field("financial_markets,economy_monetary,earnings", description="NEWS_SENTIMENT topics used for market-wide sweeps and per-symbol requests.")
+    sweep_limit: int = Field(1000, ge=1, le=1000, description="Articles requested by one market-wide sweep.")
+    sweep_min_due_symbols: int = Field(3, ge=1, description="Number of due symbols from which one market-wide sweep is tried before per-symbol requests.")
+    min_articles_per_symbol: int = Field(3, ge=1, description="Articles a sweep must contain about a symbol to refresh it; other symbols get a dedicated request.")
+
+    model_config = ConfigDict(extra='forbid')
+
+
+class SignalConditionSettings(BaseModel):
+    """One comparison of a metric against a (regime-dependent) threshold within a signal rule."""
+    metric: str = Field(..., min_length=1, description="Underlying or strike column compared (e.g. 'vapi_fa_z_score_und', 'a_dag_strike').")
+    op: str = Field("abs_gt", description="Comparison: 'gt', 'ge', 'lt', 'le', 'abs_gt' or 'abs_lt'.")
+    threshold: float = Field(..., description="Threshold used when the current regime has no entry in regime_thresholds.")
+    regime_thresholds: Dict[str, float] = Field(default_factory=dict, description="Threshold per market regime, overriding threshold.")
+
+    model_config = ConfigDict(extra='forbid')
+
+    @field_validator('op')
+    @classmethod
+    def validate_op(cls, v: str) -> str:
+        if v not in ('gt', 'ge', 'lt', 'le', 'abs_gt', 'abs_lt'):
+            raise ValueError("op must be one of 'gt', 'ge', 'lt', 'le', 'abs_gt', 'abs_lt'")
+        return v
+
+
+class SignalRuleSettings(BaseModel):
+    """A declarative signal: fires where all conditions hold, scored from one metric."""
+    name: str = Field(..., min_length=1, description="Signal name carried by the generated SignalPayloadV2_5.")
+    category: str = Field(..., description="Signal group: 'directional', 'volatility', 'time_decay', 'complex' or 'v2_5_enhanced_flow'.")
+    scope: str = Field("underlying", description="'underlying' evaluates the underlying aggregates once; 'strike' evaluates every strike row.")
+    conditions: List[SignalConditionSettings] = Field(..., min_length=1, description="Conditions that must all hold for the signal to fire.")
+    strength_metric: Optional[str] = Field(None, description="Metric the strength score is read from; defaults to the first condition's metric.")
+    strength_scale: float = Field(1.0, description="Multiplier applied to the strength metric (the score is clipped to [-5, 5]).")
+    direction: str = Field("sign", description="'sign' takes the direction from the strength sign; otherwise a fixed 'Bullish', 'Bearish' or 'Neutral'.")
+    signal_type: Optional[str] = Field(None, description="SignalPayloadV2_5 signal_type; defaults by category.")
+    max_signals: int = Field(3, ge=1, description="For strike rules, the number of strongest firing strikes that become signals.")
+
+    model_config = ConfigDict(extra='forbid')
+
+    @model_validator(mode='after')
+    def validate_rule(self) -> 'SignalRuleSettings':
+        if self.category not in ('directional', 'volatility', 'time_decay', 'complex', 'v2_5_enhanced_flow'):
+            raise ValueError(f"Unknown signal category '{self.category}'")
+        if self.scope not in ('underlying', 'strike'):
+            raise ValueError("scope must be 'underlying' or 'strike'")
+        if self.direction not in ('sign', 'Bullish', 'Bearish', 'Neutral'):
+            raise ValueError("direction must be 'sign', 'Bullish', 'Bearish' or 'Neutral'")
+        return self
+
+
+def _default_signal_rules() -> List[SignalRuleSettings]:
+    """The enhanced-flow signals of SignalGeneratorV2_5 with their default thresholds."""
+    return [
+        SignalRuleSettings(name=name, category="v2_5_enhanced_flow", conditions=[SignalConditionSettings(metric=metric, threshold=threshold)])
+        for name, metric, threshold in (
+            ("VAPI-FA_Momentum_Surge", "vapi_fa_z_score_und", 2.0),
+            ("DWFD_Smart_Money_Flow", "dwfd_z_score_und", 2.0),
+            ("TW-LAF_Sustained_Trend", "tw_laf_z_score_und", 1.5),
+        )
+    ]
+
+
+class VectorizedSignalSettings(BaseModel):
+    """Settings for the columnar signal rule engine (core_analytics_engine/vectorized_signal_engine_v2_5.py)."""
+    enabled: bool = Field(True, description="Generate signals with the rule engine; when disabled SignalGeneratorV2_5 uses its per-category methods.")
+    rules: List[SignalRuleSettings] = Field(default_factory=_default_signal_rules, description="Signal rules evaluated together over the underlying aggregates and the strike frame.")
+
+    model_config = ConfigDict(extra='forbid')
+
+
+class EliteClassifierSettings(BaseModel):
+    """Settings for the trained regime and flow classifiers (core_analytics_engine/eots_metrics/elite_classifiers.py)."""
+    enabled: bool = Field(True, description="Serve trained classifiers when present; without a usable model the rule-based classification is used.")
+    model_dir: str = Field("models/elite_classifiers", description="Directory written by train_elite_classifiers_v2_5.py.")
+    regime_model_version: str = Field("latest", description="Regime model version to serve, or 'latest' for the promoted one.")
+    flow_model_version: str = Field("latest", description="Flow model version to serve, or 'latest' for the promoted one.")
+    latency_budget_ms: float = Field(25.0, gt=0.0, description="Per-call inference budget in milliseconds.")
+    max_budget_breaches: int = Field(5, ge=1, description="Consecutive over-budget calls after which a model is disabled for the session.")
+
+    model_config = ConfigDict(extra='forbid')
@@ -4,7 +4,7 @@ This module defines Pydantic models to replace Dict[str, Any] patterns in learni
 and intelligence systems, providing type safety and validation.
 """
 from typing import Any, Dict, List, Optional, Union
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 from datetime import datetime
 
 class MarketContextData(BaseModel):
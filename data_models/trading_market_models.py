@@ -367,6 +367,28 @@ class KeyLevelsDataV2_5(BaseModel):
         return v
 
 
+class KeyLevelDiffV2_5(BaseModel):
+    """
+    Change in the reported key-level set between two consecutive analysis cycles for
+    one symbol, as published by KeyLevelTrackerV2_5. Lets consumers (e.g. dashboard
+    level overlays) apply updates instead of redrawing every level.
+    """
+    added: List[KeyLevelV2_5] = Field(default_factory=list, description="Levels reported this cycle that were not reported in the previous one.")
+    removed: List[KeyLevelV2_5] = Field(default_factory=list, description="Levels reported in the previous cycle that are no longer reported (as last reported).")
+    strengthened: List[KeyLevelV2_5] = Field(default_factory=list, description="Levels whose conviction rose by at least the tracker's strength delta.")
+    weakened: List[KeyLevelV2_5] = Field(default_factory=list, description="Levels whose conviction fell by at least the tracker's strength delta.")
+    unchanged_count: int = Field(0, ge=0, description="Number of reported levels carried over unchanged.")
+    rescanned_strikes: int = Field(0, ge=0, description="Number of strikes whose inputs moved beyond tolerance and were rescanned.")
+    full_rescan: bool = Field(False, description="True when the strike grid changed (or on the first cycle) and every strike was scanned.")
+    timestamp: datetime = Field(..., description="Timestamp of the cycle this diff leads to.")
+
+    model_config = ConfigDict(extra='forbid')
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.strengthened or self.weakened)
+
+
 # =============================================================================
 # FROM recommendation_schemas.py
 # =============================================================================
@@ -8,13 +8,28 @@ Communication system for HuiHui AI experts including:
 - Response aggregation and consensus building
 - Performance monitoring and optimization
 
+Delivery model:
+- Every registered expert has its own mailbox: a priority heap (CRITICAL first, FIFO
+  within a priority) drained by up to ``max_concurrency`` workers, so a slow expert
+  only delays its own messages.
+- Every message carries a delivery deadline (explicit, or a per-priority default).
+  Messages still queued past their deadline expire without reaching the handler, and
+  handlers are cut off at the deadline or the expert's handler timeout.
+- A full mailbox evicts its lowest-priority message for a higher-priority one and
+  otherwise rejects the new message.
+
 Author: EOTS v2.5 AI Architecture Division
 """
 
 import asyncio
+import heapq
+import itertools
 import logging
-from datetime import datetime
-from typing import Dict, Any, Optional, List, Callable
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List, Callable, Deque
 from enum import Enum
 from pydantic import BaseModel, Field
 
@@ -39,6 +54,20 @@ class MessagePriority(str, Enum):
     HIGH = "high"
     CRITICAL = "critical"
 
+# Dequeue order (lower first) and default delivery deadline per priority
+PRIORITY_RANK = {
+    MessagePriority.CRITICAL: 0,
+    MessagePriority.HIGH: 1,
+    MessagePriority.NORMAL: 2,
+    MessagePriority.LOW: 3,
+}
+DEFAULT_DELIVERY_TTL_SECONDS = {
+    MessagePriority.CRITICAL: 10.0,
+    MessagePriority.HIGH: 30.0,
+    MessagePriority.NORMAL: 60.0,
+    MessagePriority.LOW: 300.0,
+}
+
 class ExpertMessage(BaseModel):
     """Message structure for inter-expert communication."""
     message_id: str = Field(..., description="Unique message identifier")
@@ -50,207 +79,391 @@ class ExpertMessage(BaseModel):
     payload: Dict[str, Any] = Field(default_factory=dict, description="Message payload")
     requires_response: bool = Field(default=False, description="Whether message requires response")
     correlation_id: Optional[str] = Field(None, description="ID for correlating request/response pairs")
+    deadline: Optional[datetime] = Field(None, description="Deliver before this time or expire (None: per-priority default)")
+
+class MessageExpiredError(Exception):
+    """A message reached the front of its mailbox after its delivery deadline."""
+
+class MessageDroppedError(Exception):
+    """A queued message was evicted for a higher-priority one, or its expert was unregistered."""
+
+@dataclass(order=True)
+class _Envelope:
+    """One message queued for one expert."""
+    rank: int
+    seq: int
+    message: ExpertMessage = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    expires_at: float = field(compare=False)
+    future: Optional[asyncio.Future] = field(compare=False, default=None)
+
+    def resolve(self, result: Any = None, error: Optional[BaseException] = None) -> None:
+        if self.future is None or self.future.done():
+            return
+        if error is not None:
+            self.future.set_exception(error)
+        else:
+            self.future.set_result(result)
+
+class _ExpertMailbox:
+    """Priority heap of pending envelopes for one expert plus its delivery statistics."""
+
+    def __init__(self, expert_id: str, handler: Callable, max_concurrency: int,
+                 handler_timeout_seconds: float, max_depth: int, latency_window: int):
+        self.expert_id = expert_id
+        self.handler = handler
+        self.max_concurrency = max(1, max_concurrency)
+        self.handler_timeout_seconds = handler_timeout_seconds
+        self.max_depth = max(1, max_depth)
+        self.heap: List[_Envelope] = []
+        self.not_empty = asyncio.Event()
+        self.workers: List[asyncio.Task] = []
+        self.in_flight = 0
+        self.latencies_ms: Deque[float] = deque(maxlen=latency_window)
+        self.counts = {"delivered": 0, "failed": 0, "timed_out": 0, "expired": 0, "dropped": 0}
+
+    def push(self, envelope: _Envelope) -> bool:
+        """Queue an envelope, evicting the lowest-priority one if full; False if rejected."""
+        if len(self.heap) >= self.max_depth:
+            worst = max(self.heap)
+            if worst.rank <= envelope.rank:
+                return False
+            self.heap.remove(worst)
+            heapq.heapify(self.heap)
+            self.counts["dropped"] += 1
+            worst.resolve(error=MessageDroppedError(f"Evicted from {self.expert_id} mailbox by higher-priority message"))
+        heapq.heappush(self.heap, envelope)
+        self.not_empty.set()
+        return True
+
+    def latency_percentiles(self) -> Dict[str, float]:
+        if not self.latencies_ms:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+        ordered = sorted(self.latencies_ms)
+        last = len(ordered) - 1
+        return {name: ordered[round(q * last)] for name, q in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))}
 
 class ExpertCommunicationProtocol:
     """
     Communication protocol for HuiHui experts.
-    
+
     Handles message routing, delivery, and coordination between experts.
     """
-    
-    def __init__(self):
+
+    def __init__(self, max_concurrency_per_expert: int = 2, handler_timeout_seconds: float = 30.0,
+                 max_mailbox_depth: int = 1000, latency_window: int = 1000):
         self.logger = logger.getChild("ExpertCommunication")
         self.message_handlers: Dict[str, Callable] = {}
         self.expert_endpoints: Dict[str, Any] = {}
-        self.message_queue: asyncio.Queue = asyncio.Queue()
+        self.max_concurrency_per_expert = max_concurrency_per_expert
+        self.handler_timeout_seconds = handler_timeout_seconds
+        self.max_mailbox_depth = max_mailbox_depth
+        self.latency_window = latency_window
+        self.mailboxes: Dict[str, _ExpertMailbox] = {}
+        self._sequence = itertools.count()
         self.running = False
         self.stats = {
             "messages_sent": 0,
             "messages_received": 0,
             "messages_failed": 0,
+            "messages_expired": 0,
             "average_response_time_ms": 0.0
         }
-    
-    def register_expert(self, expert_id: str, message_handler: Callable) -> None:
+
+    def register_expert(self, expert_id: str, message_handler: Callable,
+                        max_concurrency: Optional[int] = None,
+                        handler_timeout_seconds: Optional[float] = None) -> None:
         """
         Register an expert with the communication protocol.
-        
+
         Args:
             expert_id: Unique identifier for the expert
             message_handler: Function to handle incoming messages
+            max_concurrency: Messages this expert handles at once (default: protocol setting)
+            handler_timeout_seconds: Cut-off for one handler call (default: protocol setting)
         """
+        if expert_id in self.mailboxes:
+            self._close_mailbox(self.mailboxes.pop(expert_id))
         self.message_handlers[expert_id] = message_handler
+        self.mailboxes[expert_id] = _ExpertMailbox(
+            expert_id,
+            message_handler,
+            max_concurrency or self.max_concurrency_per_expert,
+            handler_timeout_seconds or self.handler_timeout_seconds,
+            self.max_mailbox_depth,
+            self.latency_window
+        )
         self.expert_endpoints[expert_id] = {
             "registered_at": datetime.now(),
             "last_seen": datetime.now(),
             "message_count": 0,
             "status": "active"
         }
+        if self.running:
+            self._start_workers(self.mailboxes[expert_id])
         self.logger.info(f"📡 Registered expert for communication: {expert_id}")
-    
+
     def unregister_expert(self, expert_id: str) -> None:
         """Unregister an expert from the communication protocol."""
         if expert_id in self.message_handlers:
             del self.message_handlers[expert_id]
         if expert_id in self.expert_endpoints:
             del self.expert_endpoints[expert_id]
+        if expert_id in self.mailboxes:
+            self._close_mailbox(self.mailboxes.pop(expert_id))
         self.logger.info(f"📡 Unregistered expert: {expert_id}")
-    
+
     async def send_message(self, message: ExpertMessage) -> bool:
         """
         Send a message to an expert or broadcast to all experts.
-        
+
         Args:
             message: The message to send
-            
+
         Returns:
-            bool: True if message was queued successfully
+            bool: True if message was queued successfully (for every recipient of a broadcast)
         """
-        try:
-            await self.message_queue.put(message)
-            self.stats["messages_sent"] += 1
-            self.logger.debug(f"📤 Queued message {message.message_id} from {message.sender_expert_id}")
-            return True
-        except Exception as e:
-            self.logger.error(f"Failed to queue message: {e}")
+        envelopes = self._enqueue(message)
+        return envelopes is not None
+
+    def _enqueue(self, message: ExpertMessage, with_futures: bool = False) -> Optional[Dict[str, _Envelope]]:
+        """Queue ``message`` in each recipient's mailbox; None if any recipient rejected it."""
+        if message.recipient_expert_id:
+            recipients = [message.recipient_expert_id]
+        else:
+            # Broadcast to all experts except sender
+            recipients = [expert_id for expert_id in self.mailboxes if expert_id != message.sender_expert_id]
+
+        now = time.monotonic()
+        if message.deadline is not None:
+            expires_at = now + (message.deadline - datetime.now()).total_seconds()
+        else:
+            expires_at = now + DEFAULT_DELIVERY_TTL_SECONDS[message.priority]
+        loop = asyncio.get_running_loop() if with_futures else None
+
+        envelopes: Dict[str, _Envelope] = {}
+        accepted = True
+        for expert_id in recipients:
+            mailbox = self.mailboxes.get(expert_id)
+            if mailbox is None:
+                self.logger.warning(f"Expert {expert_id} not registered for message delivery")
+                accepted = False
+                continue
+            envelope = _Envelope(
+                PRIORITY_RANK[message.priority], next(self._sequence), message, now, expires_at,
+                loop.create_future() if loop is not None else None
+            )
+            if mailbox.push(envelope):
+                envelopes[expert_id] = envelope
+            else:
+                self.logger.warning(f"Mailbox for {expert_id} is full, rejected message {message.message_id}")
+                accepted = False
+
+        if not accepted:
             self.stats["messages_failed"] += 1
-            return False
-    
+            return None
+        self.stats["messages_sent"] += 1
+        self.logger.debug(f"📤 Queued message {message.message_id} from {message.sender_expert_id} for {len(envelopes)} expert(s)")
+        return envelopes
+
     async def process_messages(self) -> None:
-        """Process messages from the queue."""
+        """Run delivery until the protocol is stopped (start() does this in the background)."""
+        self.running = True
+        for mailbox in self.mailboxes.values():
+            self._start_workers(mailbox)
         while self.running:
-            try:
-                # Wait for message with timeout
-                message = await asyncio.wait_for(self.message_queue.get(), timeout=1.0)
-                await self._deliver_message(message)
-                self.message_queue.task_done()
-            except asyncio.TimeoutError:
-                continue
-            except Exception as e:
-                self.logger.error(f"Error processing message: {e}")
-    
-    async def _deliver_message(self, message: ExpertMessage) -> None:
-        """Deliver a message to the appropriate expert(s)."""
+            await asyncio.sleep(1.0)
+
+    def _start_workers(self, mailbox: _ExpertMailbox) -> None:
+        mailbox.workers = [worker for worker in mailbox.workers if not worker.done()]
+        while len(mailbox.workers) < mailbox.max_concurrency:
+            mailbox.workers.append(asyncio.create_task(self._mailbox_worker(mailbox)))
+
+    def _close_mailbox(self, mailbox: _ExpertMailbox) -> None:
+        for worker in mailbox.workers:
+            worker.cancel()
+        mailbox.workers = []
+        for envelope in mailbox.heap:
+            envelope.resolve(error=MessageDroppedError(f"Expert {mailbox.expert_id} was unregistered"))
+        mailbox.heap.clear()
+
+    async def _mailbox_worker(self, mailbox: _ExpertMailbox) -> None:
+        """Deliver envelopes from one mailbox, highest priority first."""
+        while True:
+            while not mailbox.heap:
+                mailbox.not_empty.clear()
+                await mailbox.not_empty.wait()
+            envelope = heapq.heappop(mailbox.heap)
+            await self._deliver_to_expert(mailbox, envelope)
+
+    async def _deliver_to_expert(self, mailbox: _ExpertMailbox, envelope: _Envelope) -> None:
+        """Deliver one envelope to its expert within the message deadline and handler timeout."""
+        message = envelope.message
+        remaining = envelope.expires_at - time.monotonic()
+        if remaining <= 0:
+            mailbox.counts["expired"] += 1
+            self.stats["messages_expired"] += 1
+            self.logger.debug(f"⌛ Message {message.message_id} expired before delivery to {mailbox.expert_id}")
+            envelope.resolve(error=MessageExpiredError(f"Message {message.message_id} expired before delivery"))
+            return
+
+        mailbox.in_flight += 1
         try:
-            start_time = datetime.now()
-            
-            if message.recipient_expert_id:
-                # Direct message to specific expert
-                await self._deliver_to_expert(message.recipient_expert_id, message)
-            else:
-                # Broadcast to all experts except sender
-                for expert_id in self.message_handlers:
-                    if expert_id != message.sender_expert_id:
-                        await self._deliver_to_expert(expert_id, message)
-            
-            # Update stats
-            processing_time = (datetime.now() - start_time).total_seconds() * 1000
-            self._update_response_time_stats(processing_time)
-            self.stats["messages_received"] += 1
-            
+            result = await asyncio.wait_for(mailbox.handler(message), min(remaining, mailbox.handler_timeout_seconds))
+        except asyncio.TimeoutError as e:
+            mailbox.counts["timed_out"] += 1
+            self.stats["messages_failed"] += 1
+            self.logger.warning(f"Expert {mailbox.expert_id} timed out handling message {message.message_id}")
+            envelope.resolve(error=e)
+        except asyncio.CancelledError:
+            envelope.resolve(error=MessageDroppedError(f"Delivery to {mailbox.expert_id} was cancelled"))
+            raise
         except Exception as e:
-            self.logger.error(f"Failed to deliver message {message.message_id}: {e}")
+            mailbox.counts["failed"] += 1
             self.stats["messages_failed"] += 1
-    
-    async def _deliver_to_expert(self, expert_id: str, message: ExpertMessage) -> None:
-        """Deliver message to a specific expert."""
-        if expert_id not in self.message_handlers:
-            self.logger.warning(f"Expert {expert_id} not registered for message delivery")
-            return
-        
-        try:
-            handler = self.message_handlers[expert_id]
-            await handler(message)
-            
+            self.logger.error(f"Failed to deliver message to expert {mailbox.expert_id}: {e}")
+            envelope.resolve(error=e)
+        else:
+            mailbox.counts["delivered"] += 1
+            processing_time = (time.monotonic() - envelope.enqueued_at) * 1000
+            mailbox.latencies_ms.append(processing_time)
+            self._update_response_time_stats(processing_time)
+            self.stats["messages_received"] += 1
+
             # Update expert endpoint stats
-            if expert_id in self.expert_endpoints:
-                self.expert_endpoints[expert_id]["last_seen"] = datetime.now()
-                self.expert_endpoints[expert_id]["message_count"] += 1
-                
-        except Exception as e:
-            self.logger.error(f"Failed to deliver message to expert {expert_id}: {e}")
-    
+            if mailbox.expert_id in self.expert_endpoints:
+                self.expert_endpoints[mailbox.expert_id]["last_seen"] = datetime.now()
+                self.expert_endpoints[mailbox.expert_id]["message_count"] += 1
+            envelope.resolve(result)
+        finally:
+            mailbox.in_flight -= 1
+
     def _update_response_time_stats(self, processing_time_ms: float) -> None:
         """Update average response time statistics."""
         current_avg = self.stats["average_response_time_ms"]
         message_count = self.stats["messages_received"] + 1
-        
+
         # Calculate running average
         self.stats["average_response_time_ms"] = (
             (current_avg * (message_count - 1) + processing_time_ms) / message_count
         )
-    
-    async def broadcast_analysis_request(self, sender_id: str, request: HuiHuiAnalysisRequestV2_5) -> List[str]:
+
+    async def _fan_out(self, sender_id: str, id_prefix: str, message_type: MessageType, priority: MessagePriority,
+                       payload: Dict[str, Any], timeout_seconds: float) -> Dict[str, _Envelope]:
+        """Queue one message per expert (all but the sender) with a shared deadline."""
+        deadline = datetime.now() + timedelta(seconds=timeout_seconds)
+        envelopes: Dict[str, _Envelope] = {}
+        for expert_id in list(self.mailboxes):
+            if expert_id == sender_id:
+                continue
+            message = ExpertMessage(
+                message_id=f"{id_prefix}_{expert_id}_{datetime.now().timestamp()}",
+                message_type=message_type,
+                priority=priority,
+                sender_expert_id=sender_id,
+                recipient_expert_id=expert_id,
+                payload=payload,
+                requires_response=True,
+                deadline=deadline
+            )
+            queued = self._enqueue(message, with_futures=True)
+            if queued:
+                envelopes[expert_id] = queued[expert_id]
+        return envelopes
+
+    @staticmethod
+    async def _await_deliveries(envelopes: Dict[str, _Envelope], timeout_seconds: float) -> None:
+        """Wait for every delivery; ones still queued at the deadline are abandoned."""
+        if not envelopes:
+            return
+        _, pending = await asyncio.wait([envelope.future for envelope in envelopes.values()], timeout=timeout_seconds)
+        for future in pending:
+            future.cancel()
+
+    async def broadcast_analysis_request(self, sender_id: str, request: HuiHuiAnalysisRequestV2_5,
+                                         timeout_seconds: float = 30.0, wait: bool = False) -> List[str]:
         """
         Broadcast analysis request to all experts.
-        
+
+        Each expert gets its own message in its own mailbox, so experts handle the
+        request in parallel; each delivery is bounded by ``timeout_seconds``.
+
         Args:
             sender_id: ID of the requesting expert/orchestrator
             request: Analysis request to broadcast
-            
+            timeout_seconds: Per-expert delivery deadline
+            wait: Wait for the deliveries and return only the messages that were handled
+
         Returns:
             List of message IDs for tracking responses
         """
-        message_ids = []
-        
-        for expert_id in self.message_handlers:
-            if expert_id != sender_id:
-                message_id = f"analysis_{expert_id}_{datetime.now().timestamp()}"
-                message = ExpertMessage(
-                    message_id=message_id,
-                    message_type=MessageType.ANALYSIS_REQUEST,
-                    priority=MessagePriority.HIGH,
-                    sender_expert_id=sender_id,
-                    recipient_expert_id=expert_id,
-                    payload=request.model_dump(),  # 🚀 PYDANTIC-FIRST: Use model_dump()
-                    requires_response=True
-                )
-                
-                if await self.send_message(message):
-                    message_ids.append(message_id)
-        
-        return message_ids
-    
-    async def send_health_check(self, sender_id: str) -> Dict[str, Any]:
-        """Send health check to all experts and collect responses."""
+        envelopes = await self._fan_out(
+            sender_id, "analysis", MessageType.ANALYSIS_REQUEST, MessagePriority.HIGH,
+            request.model_dump(),  # 🚀 PYDANTIC-FIRST: Use model_dump()
+            timeout_seconds
+        )
+        if wait:
+            await self._await_deliveries(envelopes, timeout_seconds)
+            return [
+                envelope.message.message_id for envelope in envelopes.values()
+                if not envelope.future.cancelled() and envelope.future.exception() is None
+            ]
+        return [envelope.message.message_id for envelope in envelopes.values()]
+
+    async def send_health_check(self, sender_id: str, timeout_seconds: float = 5.0) -> Dict[str, Any]:
+        """Send health check to all experts and collect responses (or the error per expert)."""
+        envelopes = await self._fan_out(
+            sender_id, "health", MessageType.HEALTH_CHECK, MessagePriority.CRITICAL, {}, timeout_seconds
+        )
+        await self._await_deliveries(envelopes, timeout_seconds)
         responses = {}
-        
-        for expert_id in self.message_handlers:
-            if expert_id != sender_id:
-                message = ExpertMessage(
-                    message_id=f"health_{expert_id}_{datetime.now().timestamp()}",
-                    message_type=MessageType.HEALTH_CHECK,
-                    priority=MessagePriority.NORMAL,
-                    sender_expert_id=sender_id,
-                    recipient_expert_id=expert_id,
-                    requires_response=True
-                )
-                
-                await self.send_message(message)
-        
+        for expert_id, envelope in envelopes.items():
+            error = MessageExpiredError() if envelope.future.cancelled() else envelope.future.exception()
+            if error is None:
+                responses[expert_id] = {"healthy": True, "response": envelope.future.result()}
+            else:
+                responses[expert_id] = {"healthy": False, "error": type(error).__name__}
         return responses
-    
+
     def get_communication_stats(self) -> Dict[str, Any]:
-        """Get communication protocol statistics."""
+        """Get communication protocol statistics, including per-expert queue depth and latency."""
+        experts = {
+            expert_id: {
+                "queue_depth": len(mailbox.heap),
+                "in_flight": mailbox.in_flight,
+                "max_concurrency": mailbox.max_concurrency,
+                **mailbox.counts,
+                "latency_ms": mailbox.latency_percentiles()
+            }
+            for expert_id, mailbox in self.mailboxes.items()
+        }
         return {
             "stats": self.stats.copy(),
             "registered_experts": len(self.message_handlers),
             "expert_endpoints": self.expert_endpoints.copy(),
-            "queue_size": self.message_queue.qsize(),
+            "experts": experts,
+            "queue_size": sum(len(mailbox.heap) for mailbox in self.mailboxes.values()),
             "running": self.running
         }
-    
+
     async def start(self) -> None:
         """Start the communication protocol."""
         self.running = True
         self.logger.info("🚀 Expert communication protocol started")
-        
-        # Start message processing task
-        asyncio.create_task(self.process_messages())
-    
+
+        # Start per-expert delivery workers
+        for mailbox in self.mailboxes.values():
+            self._start_workers(mailbox)
+
     async def stop(self) -> None:
         """Stop the communication protocol."""
         self.running = False
+        workers = [worker for mailbox in self.mailboxes.values() for worker in mailbox.workers]
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        for mailbox in self.mailboxes.values():
+            mailbox.workers = []
         self.logger.info("🛑 Expert communication protocol stopped")
 
 # Global communication protocol instance
@@ -11,18 +11,19 @@ Features:
 - Expert coordination effectiveness measurement
 - Adaptive parameter optimization
 - Market pattern recognition and learning
+- Write-behind persistence with in-memory baselines (see HuiHuiLearningStoreV2_5)
 
 Author: EOTS v2.5 Development Team - "HuiHui Learning Division"
 """
 
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
-import json
+from typing import Dict, Iterator, List, Any, Optional
 import numpy as np
 from collections import defaultdict, deque
 
 from data_models import UnifiedLearningResult
+from huihui_integration.learning.learning_store import CYCLE, PREDICTION, HuiHuiLearningStoreV2_5
 
 logger = logging.getLogger(__name__)
 
@@ -35,11 +36,14 @@ class HuiHuiLearningSystem:
     for the entire HuiHui expert ecosystem.
     """
     
-    def __init__(self, config_manager=None, db_manager=None):
+    def __init__(self, config_manager=None, db_manager=None, learning_store: Optional[HuiHuiLearningStoreV2_5] = None):
         self.config_manager = config_manager
         self.db_manager = db_manager
         self.logger = logger.getChild("HuiHuiLearning")
         
+        # Results are written behind the learning cycle; baselines and history come from the store
+        self.learning_store = learning_store or HuiHuiLearningStoreV2_5.from_db_manager(db_manager)
+        
         # Learning state
         self.learning_history = deque(maxlen=1000)
         self.performance_metrics = defaultdict(list)
@@ -209,7 +213,9 @@ class HuiHuiLearningSystem:
         try:
             return {
                 'system_version': 'v3.0',
-                'learning_cycles_completed': len(self.learning_history),
+                'learning_cycles_completed': self.learning_store.total(CYCLE).count,
+                'performance_baselines': self.learning_store.baselines(CYCLE),
+                'pending_writes': self.learning_store.pending_count,
                 'expert_effectiveness': dict(self.expert_effectiveness),
                 'performance_metrics': {
                     'average_accuracy': np.mean([m for metrics in self.performance_metrics.values() for m in metrics]) if self.performance_metrics else 0.0,
@@ -319,16 +325,34 @@ class HuiHuiLearningSystem:
             self.logger.error(f"Failed to update performance tracking: {e}")
     
     def get_performance_baseline(self) -> Dict[str, Any]:
-        """Get performance baseline for the system."""
+        """Get performance baseline for the system (evaluated outcomes once there are any)."""
         
+        predictions = self.learning_store.total(PREDICTION)
         return {
-            'accuracy_baseline': 0.75,
-            'confidence_baseline': 0.70,
+            'accuracy_baseline': predictions.mean if predictions.count else 0.75,
+            'accuracy_std': predictions.std,
+            'confidence_baseline': predictions.mean_confidence if predictions.count else 0.70,
+            'predictions_evaluated': predictions.count,
             'learning_rate_baseline': 0.1,
             'expert_coordination_baseline': 0.80,
             'system_health_baseline': 'good'
         }
     
+    def get_learning_history(self, symbol: Optional[str] = None, page_size: int = 50) -> Iterator[Dict[str, Any]]:
+        """Stored learning results, newest first, paged from the store as they are consumed."""
+        
+        return self.learning_store.iter_history(symbol, page_size)
+    
+    def compact_learning_history(self, older_than_days: float = 90.0) -> Dict[str, int]:
+        """Fold old learning results and outcomes into per-day summaries."""
+        
+        return self.learning_store.compact(older_than_days)
+    
+    async def shutdown(self):
+        """Write any learning results still queued."""
+        
+        await self.learning_store.close()
+    
     def get_system_status(self) -> Dict[str, Any]:
         """Get comprehensive system status."""
         
@@ -383,42 +407,12 @@ class HuiHuiLearningSystem:
         if not self.db_manager:
             return
         
-        try:
-            conn = self.db_manager.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS huihui_learning_cycles (
-                    id SERIAL PRIMARY KEY,
-                    symbol TEXT NOT NULL,
-                    learning_type TEXT NOT NULL,
-                    learning_result TEXT NOT NULL,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    performance_score REAL,
-                    confidence_score REAL
-                )
-            """)
-            
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS huihui_prediction_learning (
-                    id SERIAL PRIMARY KEY,
-                    prediction_id INTEGER,
-                    learning_data TEXT NOT NULL,
-                    performance_analysis TEXT NOT NULL,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            conn.commit()
-            
-        except Exception as e:
-            self.logger.error(f"Failed to create learning tables: {e}")
+        self.learning_store.ensure_schema()
     
     def _load_learning_history(self):
-        """Load historical learning data."""
+        """Reset in-session history; stored history is paged on demand (get_learning_history)."""
         
         try:
-            # Initialize with empty history - would load from database in production
             self.learning_history.clear()
             self.logger.info("Learning history initialized")
             
@@ -493,36 +487,10 @@ class HuiHuiLearningSystem:
         return recommendations
     
     def _store_learning_result(self, result: UnifiedLearningResult):
-        """Store learning result in database."""
-        
-        if not self.db_manager:
-            return
+        """Queue learning result for the write-behind store."""
         
         try:
-            conn = self.db_manager.get_connection()
-            cursor = conn.cursor()
-            
-            # Convert model to dict with datetime serialization
-            result_dict = result.model_dump()
-            
-            # Convert datetime objects to ISO format strings
-            for key, value in result_dict.items():
-                if isinstance(value, datetime):
-                    result_dict[key] = value.isoformat()
-            
-            cursor.execute("""
-                INSERT INTO huihui_learning_cycles 
-                (symbol, learning_type, learning_result, performance_score, confidence_score)
-                VALUES (%s, %s, %s, %s, %s)
-            """, (
-                result.symbol,
-                result.learning_cycle_type,
-                json.dumps(result_dict, default=str),  # Use default=str for remaining datetime objects
-                result.performance_improvement_score,
-                result.confidence_score
-            ))
-            
-            conn.commit()
+            self.learning_store.record_cycle(result)
             
         except Exception as e:
             self.logger.error(f"Failed to store learning result: {e}")
@@ -541,26 +509,10 @@ class HuiHuiLearningSystem:
             return 0.6  # Moderate reliability
     
     def _store_prediction_learning(self, learning_data: Dict[str, Any], performance_analysis: Dict[str, Any]):
-        """Store prediction learning data."""
-        
-        if not self.db_manager:
-            return
+        """Queue prediction learning data for the write-behind store."""
         
         try:
-            conn = self.db_manager.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO huihui_prediction_learning 
-                (prediction_id, learning_data, performance_analysis)
-                VALUES (%s, %s, %s)
-            """, (
-                learning_data.get('prediction_id'),
-                json.dumps(learning_data),
-                json.dumps(performance_analysis)
-            ))
-            
-            conn.commit()
+            self.learning_store.record_prediction(learning_data, performance_analysis)
             
         except Exception as e:
             self.logger.error(f"Failed to store prediction learning: {e}")
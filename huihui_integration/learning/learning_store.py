@@ -0,0 +1,601 @@
+"""
+HuiHui Learning Store
+=====================
+
+Persistence behind HuiHuiLearningSystem that keeps the learning cycle off the database:
+- Learning results and prediction outcomes are queued in memory (write-behind) and
+  written in batches by a single flusher task; the database work runs in a worker
+  thread so the event loop never waits on it. Without a running loop, a full batch
+  is written inline and anything left is written by ``flush_sync()``/``close()``.
+- Performance baselines (count, mean, deviation, confidence per symbol) are kept in
+  memory and updated per record. They are seeded once, lazily, from aggregate queries
+  over the live tables and the compacted summaries - history rows are never loaded.
+- History is read a page at a time with keyset pagination (newest first).
+- ``compact()`` folds rows older than a cutoff into per-day summary aggregates and
+  deletes them, so the live tables stay small; baselines are unchanged by compaction.
+
+Works on any DB-API connection: PostgreSQL (psycopg, as used by DatabaseManagerV2_5)
+or sqlite3 as a local stand-in (opened with ``check_same_thread=False``, since batches
+are written from a worker thread). Without a connection the store is memory-only.
+
+Author: EOTS v2.5 Development Team - "HuiHui Learning Division"
+"""
+
+import asyncio
+import json
+import logging
+import math
+import sqlite3
+import threading
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+CYCLES_TABLE = "huihui_learning_cycles"
+PREDICTIONS_TABLE = "huihui_prediction_learning"
+SUMMARIES_TABLE = "huihui_learning_summaries"
+
+CYCLE = "cycle"
+PREDICTION = "prediction"
+
+# The two live tables keep the columns HuiHuiLearningSystem has always written
+_POSTGRES_SCHEMA = (
+    f"""CREATE TABLE IF NOT EXISTS {CYCLES_TABLE} (
+        id SERIAL PRIMARY KEY,
+        symbol TEXT NOT NULL,
+        learning_type TEXT NOT NULL,
+        learning_result TEXT NOT NULL,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        performance_score REAL,
+        confidence_score REAL
+    )""",
+    f"""CREATE TABLE IF NOT EXISTS {PREDICTIONS_TABLE} (
+        id SERIAL PRIMARY KEY,
+        prediction_id INTEGER,
+        learning_data TEXT NOT NULL,
+        performance_analysis TEXT NOT NULL,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+    f"""CREATE TABLE IF NOT EXISTS {SUMMARIES_TABLE} (
+        id SERIAL PRIMARY KEY,
+        record_kind TEXT NOT NULL,
+        symbol TEXT NOT NULL,
+        learning_type TEXT NOT NULL,
+        period_start TEXT NOT NULL,
+        record_count INTEGER NOT NULL,
+        score_sum DOUBLE PRECISION NOT NULL,
+        score_sq_sum DOUBLE PRECISION NOT NULL,
+        confidence_sum DOUBLE PRECISION NOT NULL,
+        score_min DOUBLE PRECISION,
+        score_max DOUBLE PRECISION,
+        last_timestamp TIMESTAMP
+    )""",
+)
+_SQLITE_SCHEMA = tuple(
+    statement.replace("SERIAL PRIMARY KEY", "INTEGER PRIMARY KEY AUTOINCREMENT").replace("DOUBLE PRECISION", "REAL")
+    for statement in _POSTGRES_SCHEMA
+)
+_INDEXES = (
+    f"CREATE INDEX IF NOT EXISTS idx_{CYCLES_TABLE}_symbol_id ON {CYCLES_TABLE} (symbol, id DESC)",
+    f"CREATE INDEX IF NOT EXISTS idx_{CYCLES_TABLE}_timestamp ON {CYCLES_TABLE} (timestamp)",
+    f"CREATE INDEX IF NOT EXISTS idx_{PREDICTIONS_TABLE}_timestamp ON {PREDICTIONS_TABLE} (timestamp)",
+    f"CREATE INDEX IF NOT EXISTS idx_{SUMMARIES_TABLE}_kind_symbol ON {SUMMARIES_TABLE} (record_kind, symbol)",
+)
+
+# Typed expressions over the stored prediction JSON, and the day bucket of a timestamp
+_DIALECT_EXPRESSIONS = {
+    "postgres": {
+        "json_text": "(({column})::jsonb->>'{field}')",
+        "json_float": "CAST(({column})::jsonb->>'{field}' AS DOUBLE PRECISION)",
+        "day": "CAST(CAST({column} AS DATE) AS TEXT)",
+    },
+    "sqlite": {
+        "json_text": "json_extract({column}, '$.{field}')",
+        "json_float": "CAST(json_extract({column}, '$.{field}') AS REAL)",
+        "day": "date({column})",
+    },
+}
+
+
+@dataclass
+class LearningBaseline:
+    """Additive running aggregates for one (record kind, symbol)."""
+    count: int = 0
+    score_sum: float = 0.0
+    score_sq_sum: float = 0.0
+    confidence_sum: float = 0.0
+    last_timestamp: Optional[datetime] = None
+
+    def add(self, score: float, confidence: float, timestamp: Optional[datetime]) -> None:
+        self.count += 1
+        self.score_sum += score
+        self.score_sq_sum += score * score
+        self.confidence_sum += confidence
+        if timestamp is not None and (self.last_timestamp is None or timestamp > self.last_timestamp):
+            self.last_timestamp = timestamp
+
+    def merge(self, count: int, score_sum: float, score_sq_sum: float, confidence_sum: float,
+              last_timestamp: Optional[datetime]) -> None:
+        self.count += int(count or 0)
+        self.score_sum += float(score_sum or 0.0)
+        self.score_sq_sum += float(score_sq_sum or 0.0)
+        self.confidence_sum += float(confidence_sum or 0.0)
+        if last_timestamp is not None and (self.last_timestamp is None or last_timestamp > self.last_timestamp):
+            self.last_timestamp = last_timestamp
+
+    @property
+    def mean(self) -> float:
+        return self.score_sum / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        if self.count < 2:
+            return 0.0
+        variance = (self.score_sq_sum - self.count * self.mean ** 2) / (self.count - 1)
+        return math.sqrt(max(0.0, variance))
+
+    @property
+    def mean_confidence(self) -> float:
+        return self.confidence_sum / self.count if self.count else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_score": self.mean,
+            "score_std": self.std,
+            "mean_confidence": self.mean_confidence,
+            "last_timestamp": self.last_timestamp.isoformat() if self.last_timestamp else None,
+        }
+
+
+class HuiHuiLearningStoreV2_5:
+    """Write-behind store for learning results and prediction outcomes with in-memory baselines."""
+
+    def __init__(self,
+                 connection_provider: Optional[Callable[[], Any]] = None,
+                 dialect: Optional[str] = None,
+                 batch_size: int = 100,
+                 flush_interval_seconds: float = 5.0,
+                 max_pending: int = 20000,
+                 max_backoff_seconds: float = 60.0):
+        self.connection_provider = connection_provider
+        self.dialect = dialect  # "postgres" or "sqlite"; None detects sqlite3 connections
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_pending = max(self.batch_size, max_pending)
+        self.max_backoff_seconds = max_backoff_seconds
+
+        self._pending: Deque[Tuple[str, Any]] = deque()
+        self._baselines: Dict[Tuple[str, str], LearningBaseline] = {}
+        self._baselines_seeded = connection_provider is None
+        self._schema_ready = False
+        self._lock = threading.Lock()      # pending queue and baselines
+        self._db_lock = threading.RLock()  # one statement sequence on the connection at a time
+        self._consecutive_failures = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._closed = False
+        self.stats = {"queued": 0, "written": 0, "batches": 0, "failed_batches": 0,
+                      "dropped": 0, "unpersisted": 0, "compacted": 0}
+
+    @classmethod
+    def from_db_manager(cls, db_manager: Any, **kwargs) -> "HuiHuiLearningStoreV2_5":
+        return cls(connection_provider=db_manager.get_connection if db_manager is not None else None, **kwargs)
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    # -- connection --------------------------------------------------------
+
+    def _connection(self) -> Any:
+        if self.connection_provider is None:
+            return None
+        try:
+            return self.connection_provider()
+        except Exception as e:
+            logger.warning(f"Learning store connection unavailable: {e}")
+            return None
+
+    def _is_sqlite(self, conn: Any) -> bool:
+        if self.dialect is not None:
+            return self.dialect == "sqlite"
+        return isinstance(conn, sqlite3.Connection)
+
+    def _sql(self, conn: Any, statement: str) -> str:
+        return statement.replace("%s", "?") if self._is_sqlite(conn) else statement
+
+    def _expr(self, conn: Any, name: str, **fields) -> str:
+        return _DIALECT_EXPRESSIONS["sqlite" if self._is_sqlite(conn) else "postgres"][name].format(**fields)
+
+    def _ts(self, conn: Any, ts: datetime) -> Any:
+        return ts.isoformat(sep=" ", timespec="microseconds") if self._is_sqlite(conn) else ts
+
+    @contextmanager
+    def _transaction(self, conn: Any) -> Iterator[Any]:
+        """One atomic unit of work, also on autocommit psycopg connections."""
+        if hasattr(conn, "transaction"):
+            with conn.transaction():
+                yield conn.cursor()
+            return
+        try:
+            yield conn.cursor()
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    def ensure_schema(self) -> bool:
+        """Create the learning tables, the summary table and their indexes if they do not exist."""
+        conn = self._connection()
+        if conn is None:
+            return False
+        statements = (_SQLITE_SCHEMA if self._is_sqlite(conn) else _POSTGRES_SCHEMA) + _INDEXES
+        try:
+            with self._db_lock, self._transaction(conn) as cur:
+                for statement in statements:
+                    cur.execute(statement)
+            self._schema_ready = True
+            return True
+        except Exception as e:
+            logger.error(f"Failed to create learning store schema: {e}")
+            return False
+
+    def _ready_connection(self) -> Any:
+        conn = self._connection()
+        if conn is None or (not self._schema_ready and not self.ensure_schema()):
+            return None
+        return conn
+
+    # -- recording ---------------------------------------------------------
+
+    def record_cycle(self, result: Any) -> None:
+        """Queue a learning result (UnifiedLearningResult); never waits on the database."""
+        timestamp = getattr(result, "analysis_timestamp", None) or datetime.now()
+        self._record(CYCLE, result, str(getattr(result, "symbol", "SYSTEM")),
+                     float(getattr(result, "performance_improvement_score", 0.0) or 0.0),
+                     float(getattr(result, "confidence_score", 0.0) or 0.0), timestamp)
+
+    def record_prediction(self, learning_data: Dict[str, Any], performance_analysis: Dict[str, Any]) -> None:
+        """Queue a prediction outcome and its analysis; never waits on the database."""
+        timestamp = datetime.now()
+        self._record(PREDICTION, (dict(learning_data), dict(performance_analysis), timestamp),
+                     str(learning_data.get("symbol") or "UNKNOWN"),
+                     float(learning_data.get("accuracy", 0.0) or 0.0),
+                     float(learning_data.get("confidence_score", 0.0) or 0.0), timestamp)
+
+    def _record(self, kind: str, item: Any, symbol: str, score: float, confidence: float, timestamp: datetime) -> None:
+        with self._lock:
+            self.stats["queued"] += 1
+            if self._baselines_seeded:
+                self._baseline(kind, symbol).add(score, confidence, timestamp)
+            self._pending.append((kind, item))
+            overflow = len(self._pending) - self.max_pending
+            for _ in range(max(0, overflow)):
+                self._pending.popleft()
+            if overflow > 0:
+                self.stats["dropped"] += overflow
+                logger.warning(f"Learning store backlog full, dropped {overflow} oldest unwritten records")
+            full = len(self._pending) >= self.batch_size
+        if not self._ensure_flusher(full) and full:
+            self.flush_sync(max_batches=1)  # no event loop to hand the write to
+
+    def _baseline(self, kind: str, symbol: str) -> LearningBaseline:
+        key = (kind, symbol)
+        if key not in self._baselines:
+            self._baselines[key] = LearningBaseline()
+        return self._baselines[key]
+
+    # -- flushing ----------------------------------------------------------
+
+    def _ensure_flusher(self, wake: bool) -> bool:
+        """Start (or wake) the flusher task on the running loop; False if there is no loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        if self._closed:
+            return False
+        if self._flusher is None or self._flusher.done() or self._loop is not loop:
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._flusher = loop.create_task(self._run())
+        if wake and self._consecutive_failures == 0:
+            self._wakeup.set()
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+            if self._consecutive_failures:
+                backoff = self.flush_interval_seconds * 2 ** (self._consecutive_failures - 1)
+                await asyncio.sleep(min(self.max_backoff_seconds, backoff))
+
+    async def flush(self) -> int:
+        """Write pending records from a worker thread; returns the number written."""
+        return await asyncio.to_thread(self.flush_sync)
+
+    def flush_sync(self, max_batches: Optional[int] = None) -> int:
+        """Write pending records in batches until empty, a batch fails or ``max_batches`` is reached."""
+        written = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            with self._lock:
+                batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+            if not batch:
+                break
+            batches += 1
+            stored = self._write_batch(batch)
+            if stored is None:
+                with self._lock:
+                    self._pending.extendleft(reversed(batch))
+                break
+            written += stored
+        return written
+
+    def _write_batch(self, batch: List[Tuple[str, Any]]) -> Optional[int]:
+        """Insert one batch in a single transaction; None if it failed and should be retried."""
+        conn = self._ready_connection()
+        if conn is None:
+            if self.connection_provider is None:
+                self.stats["unpersisted"] += len(batch)  # memory-only: baselines still hold the totals
+                return 0
+            self._failed(len(batch), "no database connection")
+            return None
+
+        cycles, predictions = [], []
+        for kind, item in batch:
+            if kind == CYCLE:
+                cycles.append(self._cycle_params(conn, item))
+            else:
+                learning_data, performance_analysis, timestamp = item
+                predictions.append((learning_data.get("prediction_id"), json.dumps(learning_data, default=str),
+                                    json.dumps(performance_analysis, default=str), self._ts(conn, timestamp)))
+        try:
+            with self._db_lock, self._transaction(conn) as cur:
+                if cycles:
+                    cur.executemany(self._sql(conn, (
+                        f"INSERT INTO {CYCLES_TABLE} "
+                        "(symbol, learning_type, learning_result, performance_score, confidence_score, timestamp) "
+                        "VALUES (%s, %s, %s, %s, %s, %s)"
+                    )), cycles)
+                if predictions:
+                    cur.executemany(self._sql(conn, (
+                        f"INSERT INTO {PREDICTIONS_TABLE} (prediction_id, learning_data, performance_analysis, timestamp) "
+                        "VALUES (%s, %s, %s, %s)"
+                    )), predictions)
+        except Exception as e:
+            self._failed(len(batch), e)
+            return None
+        self._consecutive_failures = 0
+        self.stats["written"] += len(batch)
+        self.stats["batches"] += 1
+        return len(batch)
+
+    def _failed(self, size: int, reason: Any) -> None:
+        self._consecutive_failures += 1
+        self.stats["failed_batches"] += 1
+        logger.warning(f"Learning store batch of {size} records failed: {reason}")
+
+    def _cycle_params(self, conn: Any, result: Any) -> Tuple[Any, ...]:
+        payload = result.model_dump(mode="json") if isinstance(result, BaseModel) else dict(result)
+        return (
+            str(getattr(result, "symbol", payload.get("symbol", "SYSTEM"))),
+            str(getattr(result, "learning_cycle_type", payload.get("learning_cycle_type", "general"))),
+            json.dumps(payload, default=str),
+            float(getattr(result, "performance_improvement_score", 0.0) or 0.0),
+            float(getattr(result, "confidence_score", 0.0) or 0.0),
+            self._ts(conn, getattr(result, "analysis_timestamp", None) or datetime.now()),
+        )
+
+    async def close(self) -> None:
+        """Stop the flusher and write whatever is pending."""
+        self._closed = True
+        flusher, self._flusher = self._flusher, None
+        if flusher is not None and not flusher.done():
+            flusher.cancel()
+            if self._loop is asyncio.get_running_loop():
+                try:
+                    await flusher
+                except asyncio.CancelledError:
+                    pass
+        await self.flush()
+
+    # -- baselines ---------------------------------------------------------
+
+    def baselines(self, kind: str = CYCLE) -> Dict[str, Dict[str, Any]]:
+        """Performance baseline per symbol for ``kind`` ('cycle' or 'prediction')."""
+        self._seed_baselines()
+        with self._lock:
+            return {symbol: b.as_dict() for (k, symbol), b in self._baselines.items() if k == kind}
+
+    def total(self, kind: str = CYCLE) -> LearningBaseline:
+        """Baseline over every symbol for ``kind``."""
+        self._seed_baselines()
+        total = LearningBaseline()
+        with self._lock:
+            for (k, _), b in self._baselines.items():
+                if k == kind:
+                    total.merge(b.count, b.score_sum, b.score_sq_sum, b.confidence_sum, b.last_timestamp)
+        return total
+
+    def _seed_baselines(self) -> None:
+        """Aggregate stored history once; later records update the baselines incrementally."""
+        if self._baselines_seeded:
+            return
+        self.flush_sync()
+        conn = self._ready_connection()
+        if conn is None:
+            return  # try again on next use
+        accuracy = self._expr(conn, "json_float", column="learning_data", field="accuracy")
+        confidence = self._expr(conn, "json_float", column="learning_data", field="confidence_score")
+        symbol = self._expr(conn, "json_text", column="learning_data", field="symbol")
+        queries = (
+            (CYCLE, f"SELECT symbol, COUNT(*), SUM(COALESCE(performance_score, 0)), "
+                    f"SUM(COALESCE(performance_score, 0) * COALESCE(performance_score, 0)), "
+                    f"SUM(COALESCE(confidence_score, 0)), MAX(timestamp) FROM {CYCLES_TABLE} GROUP BY symbol"),
+            (PREDICTION, f"SELECT COALESCE({symbol}, 'UNKNOWN'), COUNT(*), SUM(COALESCE({accuracy}, 0)), "
+                         f"SUM(COALESCE({accuracy}, 0) * COALESCE({accuracy}, 0)), SUM(COALESCE({confidence}, 0)), "
+                         f"MAX(timestamp) FROM {PREDICTIONS_TABLE} GROUP BY COALESCE({symbol}, 'UNKNOWN')"),
+            (None, f"SELECT record_kind, symbol, SUM(record_count), SUM(score_sum), SUM(score_sq_sum), "
+                   f"SUM(confidence_sum), MAX(last_timestamp) FROM {SUMMARIES_TABLE} GROUP BY record_kind, symbol"),
+        )
+        try:
+            with self._db_lock:
+                cur = conn.cursor()
+                fetched = []
+                for kind, statement in queries:
+                    cur.execute(statement)
+                    fetched.append((kind, cur.fetchall()))
+        except Exception as e:
+            logger.error(f"Failed to seed learning baselines: {e}")
+            return
+
+        with self._lock:
+            seeded: Dict[Tuple[str, str], LearningBaseline] = {}
+            for kind, rows in fetched:
+                for row in rows:
+                    row = tuple(row.values()) if isinstance(row, dict) else tuple(row)
+                    key_kind, row = (kind, row) if kind is not None else (row[0], row[1:])
+                    key = (key_kind, str(row[0]))
+                    seeded.setdefault(key, LearningBaseline()).merge(*row[1:5], self._as_datetime(row[5]))
+            self._baselines = seeded
+            self._baselines_seeded = True
+
+    @staticmethod
+    def _as_datetime(value: Any) -> Optional[datetime]:
+        if value is None or isinstance(value, datetime):
+            return value
+        return datetime.fromisoformat(str(value))
+
+    # -- history -----------------------------------------------------------
+
+    def history_page(self, symbol: Optional[str] = None, before_id: Optional[int] = None,
+                     limit: int = 50) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        One page of stored learning results, newest first, and the cursor for the next
+        page (None when exhausted). Pending results are written first.
+        """
+        self.flush_sync()
+        conn = self._ready_connection()
+        if conn is None:
+            return [], None
+        clauses, params = [], []
+        if symbol is not None:
+            clauses.append("symbol = %s")
+            params.append(symbol)
+        if before_id is not None:
+            clauses.append("id < %s")
+            params.append(before_id)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        statement = (f"SELECT id, symbol, learning_type, timestamp, performance_score, confidence_score, learning_result "
+                     f"FROM {CYCLES_TABLE} {where}ORDER BY id DESC LIMIT {int(limit)}")
+        try:
+            with self._db_lock:
+                cur = conn.cursor()
+                cur.execute(self._sql(conn, statement), tuple(params))
+                rows = cur.fetchall()
+        except Exception as e:
+            logger.error(f"Learning history query failed: {e}")
+            return [], None
+
+        page = []
+        for row in rows:
+            row = tuple(row.values()) if isinstance(row, dict) else tuple(row)
+            record_id, row_symbol, learning_type, timestamp, performance, confidence, payload = row
+            page.append({
+                "id": record_id,
+                "symbol": row_symbol,
+                "learning_type": learning_type,
+                "timestamp": self._as_datetime(timestamp),
+                "performance_score": performance,
+                "confidence_score": confidence,
+                "result": json.loads(payload) if isinstance(payload, str) else payload,
+            })
+        next_cursor = page[-1]["id"] if len(page) == limit else None
+        return page, next_cursor
+
+    def iter_history(self, symbol: Optional[str] = None, page_size: int = 50) -> Iterator[Dict[str, Any]]:
+        """Stored learning results, newest first, fetched a page at a time as they are consumed."""
+        cursor = None
+        while True:
+            page, cursor = self.history_page(symbol, cursor, page_size)
+            yield from page
+            if cursor is None:
+                return
+
+    # -- compaction --------------------------------------------------------
+
+    def compact(self, older_than_days: float = 30.0, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Fold learning results and prediction outcomes older than ``older_than_days`` into
+        per-day summaries (per symbol and learning type) and delete the compacted rows,
+        in one transaction. Returns the number of rows compacted per table.
+        """
+        self.flush_sync()
+        conn = self._ready_connection()
+        if conn is None:
+            return {CYCLES_TABLE: 0, PREDICTIONS_TABLE: 0}
+        cutoff = self._ts(conn, (now or datetime.now()) - timedelta(days=older_than_days))
+        accuracy = self._expr(conn, "json_float", column="learning_data", field="accuracy")
+        confidence = self._expr(conn, "json_float", column="learning_data", field="confidence_score")
+        symbol = f"COALESCE({self._expr(conn, 'json_text', column='learning_data', field='symbol')}, 'UNKNOWN')"
+        sources = (
+            (CYCLES_TABLE, CYCLE, "symbol", "learning_type",
+             "COALESCE(performance_score, 0)", "COALESCE(confidence_score, 0)"),
+            (PREDICTIONS_TABLE, PREDICTION, symbol, "'prediction_outcome'",
+             f"COALESCE({accuracy}, 0)", f"COALESCE({confidence}, 0)"),
+        )
+        compacted = {}
+        try:
+            with self._db_lock, self._transaction(conn) as cur:
+                for table, kind, symbol_expr, type_expr, score, conf in sources:
+                    day = self._expr(conn, "day", column="timestamp")
+                    group_by = ", ".join(e for e in (symbol_expr, type_expr, day) if not e.startswith("'"))
+                    cur.execute(self._sql(conn, (
+                        f"INSERT INTO {SUMMARIES_TABLE} (record_kind, symbol, learning_type, period_start, record_count, "
+                        f"score_sum, score_sq_sum, confidence_sum, score_min, score_max, last_timestamp) "
+                        f"SELECT '{kind}', {symbol_expr}, {type_expr}, {day}, COUNT(*), SUM({score}), "
+                        f"SUM({score} * {score}), SUM({conf}), MIN({score}), MAX({score}), MAX(timestamp) "
+                        f"FROM {table} WHERE timestamp < %s GROUP BY {group_by}"
+                    )), (cutoff,))
+                    cur.execute(self._sql(conn, f"DELETE FROM {table} WHERE timestamp < %s"), (cutoff,))
+                    compacted[table] = max(0, cur.rowcount)
+        except Exception as e:
+            logger.error(f"Learning store compaction failed: {e}")
+            return {CYCLES_TABLE: 0, PREDICTIONS_TABLE: 0}
+        self.stats["compacted"] += sum(compacted.values())
+        logger.info(f"Compacted learning history older than {older_than_days} days: {compacted}")
+        return compacted
+
+    def summaries(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Compacted per-day aggregates, oldest first."""
+        conn = self._ready_connection()
+        if conn is None:
+            return []
+        where, params = ("WHERE symbol = %s ", (symbol,)) if symbol is not None else ("", ())
+        statement = (f"SELECT record_kind, symbol, learning_type, period_start, record_count, score_sum, "
+                     f"confidence_sum, score_min, score_max FROM {SUMMARIES_TABLE} {where}ORDER BY period_start, id")
+        try:
+            with self._db_lock:
+                cur = conn.cursor()
+                cur.execute(self._sql(conn, statement), params)
+                rows = cur.fetchall()
+        except Exception as e:
+            logger.error(f"Learning summary query failed: {e}")
+            return []
+        keys = ("record_kind", "symbol", "learning_type", "period_start", "record_count",
+                "score_sum", "confidence_sum", "score_min", "score_max")
+        return [dict(zip(keys, tuple(row.values()) if isinstance(row, dict) else tuple(row))) for row in rows]
@@ -12,7 +12,7 @@ Author: EOTS v2.5 AI Database Division
 import asyncio
 import json
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from pathlib import Path
@@ -21,8 +21,11 @@ from pathlib import Path
 try:
     import asyncpg
     ASYNCPG_AVAILABLE = True
+    # Errors caused by the row itself (value too long, out of range, constraint violation)
+    _ROW_REJECTION_ERRORS = (asyncpg.DataError, asyncpg.IntegrityConstraintViolationError)
 except ImportError:
     ASYNCPG_AVAILABLE = False
+    _ROW_REJECTION_ERRORS = ()
 
 # Import existing database manager
 try:
@@ -63,6 +66,42 @@ class HuiHuiUsageRecordV2_5(BaseModel):
 # Legacy alias for backward compatibility
 HuiHuiUsageRecord = HuiHuiUsageRecordV2_5
 
+# Columns written by batched usage inserts (created_at carries the record timestamp,
+# since a batch reaches the database some time after its calls were made)
+USAGE_RECORD_COLUMNS = (
+    "expert_name", "request_type", "input_tokens", "output_tokens", "total_tokens",
+    "processing_time_seconds", "success", "market_condition", "vix_level", "symbol",
+    "error_type", "retry_count", "timeout_occurred", "api_token_hash", "user_session_id",
+    "request_metadata", "response_metadata", "created_at"
+)
+
+def _usage_record_row(record: HuiHuiUsageRecordV2_5) -> tuple:
+    """Row tuple for a usage record in USAGE_RECORD_COLUMNS order."""
+    created_at = record.timestamp.astimezone(timezone.utc)  # naive timestamps are local time
+    return (
+        record.expert_name, record.request_type, record.input_tokens,
+        record.output_tokens, record.total_tokens, record.processing_time_seconds,
+        record.success, record.market_condition, record.vix_level, record.symbol,
+        record.error_type, record.retry_count, record.timeout_occurred,
+        record.api_token_hash, record.user_session_id,
+        json.dumps(record.request_metadata or {}),
+        json.dumps(record.response_metadata or {}),
+        created_at
+    )
+
+class UsageRecordsRejectedError(Exception):
+    """
+    Raised by ``store_usage_records`` when the database rejected some records of a
+    batch. Every other record of the batch was stored; retrying the rejected ones
+    cannot succeed.
+    """
+
+    def __init__(self, rejected: List["HuiHuiUsageRecordV2_5"], stored: int, reason: str):
+        super().__init__(f"{len(rejected)} usage records rejected ({reason}), {stored} stored")
+        self.rejected = rejected
+        self.stored = stored
+        self.reason = reason
+
 @dataclass
 class HuiHuiOptimizationRecommendation:
     """Optimization recommendation for Supabase storage."""
@@ -210,6 +249,59 @@ class HuiHuiSupabaseManager:
             logger.error(f"❌ Failed to store usage record: {e}")
             return False
     
+    async def store_usage_records(self, records: List[HuiHuiUsageRecordV2_5]) -> int:
+        """
+        Store a batch of usage records in one round trip.
+
+        Uses COPY (``copy_records_to_table``) and falls back to a multi-row
+        ``executemany`` insert if COPY is rejected. If the database rejects rows
+        themselves (a value too long for its column, a constraint violation), the
+        records are inserted one by one so the others are still stored, and
+        ``UsageRecordsRejectedError`` reports the rejected ones.
+
+        Returns the number of records stored: all of them, or 0 if the batch failed
+        for any other reason (the caller retries it).
+        """
+        if not records:
+            return 0
+        if not self._initialized:
+            logger.warning("Supabase manager not initialized, skipping storage")
+            return 0
+
+        rows = [_usage_record_row(record) for record in records]
+        placeholders = ", ".join(f"${i}" for i in range(1, len(USAGE_RECORD_COLUMNS) + 1))
+        insert = f"INSERT INTO huihui_usage_records ({', '.join(USAGE_RECORD_COLUMNS)}) VALUES ({placeholders})"
+        rejected: List[HuiHuiUsageRecordV2_5] = []
+        reason = ""
+        try:
+            async with self.connection_pool.acquire() as conn:
+                try:
+                    await conn.copy_records_to_table(
+                        "huihui_usage_records", records=rows, columns=list(USAGE_RECORD_COLUMNS)
+                    )
+                except asyncpg.PostgresError as copy_error:
+                    logger.warning(f"COPY of usage records rejected ({copy_error}), using multi-row insert")
+                    try:
+                        await conn.executemany(insert, rows)
+                    except _ROW_REJECTION_ERRORS as insert_error:
+                        logger.warning(f"Usage batch rejected ({insert_error}), inserting records one by one")
+                        for record, row in zip(records, rows):
+                            try:
+                                await conn.execute(insert, *row)
+                            except _ROW_REJECTION_ERRORS as row_error:
+                                rejected.append(record)
+                                reason = str(row_error)
+
+        except Exception as e:
+            logger.error(f"❌ Failed to store {len(rows)} usage records: {e}")
+            return 0
+
+        stored = len(rows) - len(rejected)
+        logger.debug(f"✅ Stored {stored} usage records")
+        if rejected:
+            raise UsageRecordsRejectedError(rejected, stored, reason)
+        return stored
+
     async def store_optimization_recommendation(self, recommendation: HuiHuiOptimizationRecommendation) -> bool:
         """Store an optimization recommendation in Supabase."""
         if not self._initialized:
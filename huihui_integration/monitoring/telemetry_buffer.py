@@ -0,0 +1,329 @@
+"""
+HuiHui Usage Telemetry Buffer
+=============================
+
+Bounded in-process buffer between HuiHuiUsageMonitor.record_usage and Supabase:
+- Recording only appends to the buffer. There is no task per call, and it works
+  without a running event loop.
+- A single flusher task writes batches once ``batch_size`` records are pending or
+  ``flush_interval_seconds`` has passed, and backs off while writes fail.
+- When the database is slow or down, records beyond ``max_pending`` are spilled to a
+  local JSONL file (or dropped, per ``overflow_policy``). Spilled records are replayed
+  once writes succeed again.
+- Records the database rejects outright (``UsageRecordsRejectedError`` from the sink)
+  are moved to a quarantine file instead of being retried, so one bad row cannot hold
+  back the rest of the telemetry.
+- ``close()`` flushes on shutdown; anything that still cannot be written is spilled.
+- A window of recent records stays in memory for usage statistics.
+
+Author: EOTS v2.5 AI Optimization Division
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from collections import Counter, deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from huihui_integration.monitoring.supabase_manager import HuiHuiUsageRecordV2_5, UsageRecordsRejectedError
+
+logger = logging.getLogger(__name__)
+
+# Stores a batch and returns how many records were written (0 = the batch failed). A sink
+# raises UsageRecordsRejectedError after storing the records the database accepted.
+BatchSink = Callable[[List[HuiHuiUsageRecordV2_5]], Awaitable[int]]
+
+OVERFLOW_POLICIES = ("spill", "drop")
+DEFAULT_SPILL_PATH = Path("logs/huihui_usage_spill.jsonl")
+DEFAULT_QUARANTINE_PATH = Path("logs/huihui_usage_rejected.jsonl")
+
+
+@dataclass
+class TelemetryBufferStats:
+    """Counters for the telemetry buffer."""
+    recorded: int = 0
+    flushed: int = 0
+    batches: int = 0
+    failed_batches: int = 0
+    spilled: int = 0
+    replayed: int = 0
+    dropped: int = 0
+    rejected: int = 0
+
+
+class UsageTelemetryBuffer:
+    """Bounded, batching buffer for HuiHui usage records."""
+
+    def __init__(self, sink: BatchSink, batch_size: int = 500, flush_interval_seconds: float = 2.0,
+                 max_pending: int = 20000, flush_timeout_seconds: float = 10.0,
+                 max_backoff_seconds: float = 60.0, overflow_policy: str = "spill",
+                 spill_path: Optional[Path] = DEFAULT_SPILL_PATH,
+                 quarantine_path: Optional[Path] = DEFAULT_QUARANTINE_PATH,
+                 recent_window_seconds: float = 24 * 3600, recent_capacity: int = 100000):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow_policy must be one of {OVERFLOW_POLICIES}, got {overflow_policy!r}")
+        self.sink = sink
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_pending = max(self.batch_size, max_pending)
+        self.flush_timeout_seconds = flush_timeout_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.overflow_policy = overflow_policy
+        self.spill_path = Path(spill_path) if spill_path is not None else None
+        self.quarantine_path = Path(quarantine_path) if quarantine_path is not None else None
+        self.recent_window = timedelta(seconds=recent_window_seconds)
+        self.recent_capacity = max(1, recent_capacity)
+        self.stats = TelemetryBufferStats()
+
+        self._pending: Deque[HuiHuiUsageRecordV2_5] = deque()
+        self._recent: Deque[HuiHuiUsageRecordV2_5] = deque()
+        self._lock = threading.Lock()
+        self._tracking_since = datetime.now()
+        self._evicted_through: Optional[datetime] = None
+        self._consecutive_failures = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._closed = False
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    # -- recording ---------------------------------------------------------
+
+    def add(self, record: HuiHuiUsageRecordV2_5) -> None:
+        """Buffer a record; never blocks on the database."""
+        with self._lock:
+            self.stats.recorded += 1
+            self._remember(record)
+            self._pending.append(record)
+            overflow = self._take_overflow()
+            wake = len(self._pending) >= self.batch_size
+        if overflow:
+            self._spill(overflow)
+        self._ensure_flusher(wake)
+
+    def _remember(self, record: HuiHuiUsageRecordV2_5) -> None:
+        cutoff = record.timestamp - self.recent_window
+        while self._recent and self._recent[0].timestamp < cutoff:
+            self._recent.popleft()
+        if len(self._recent) >= self.recent_capacity:
+            self._evicted_through = self._recent.popleft().timestamp
+        self._recent.append(record)
+
+    def _take_overflow(self) -> List[HuiHuiUsageRecordV2_5]:
+        """Oldest pending records beyond max_pending, a batch at a time (caller holds the lock)."""
+        if len(self._pending) <= self.max_pending:
+            return []
+        count = min(len(self._pending), max(self.batch_size, len(self._pending) - self.max_pending))
+        return [self._pending.popleft() for _ in range(count)]
+
+    def _ensure_flusher(self, wake: bool) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop here: records wait for the running flusher or close()
+        if self._closed:
+            return
+        if self._flusher is None or self._flusher.done() or self._loop is not loop:
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._flusher = loop.create_task(self._run())
+        if wake and self._consecutive_failures == 0:
+            self._wakeup.set()
+
+    # -- flushing ----------------------------------------------------------
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+            if self._consecutive_failures:
+                backoff = self.flush_interval_seconds * 2 ** (self._consecutive_failures - 1)
+                await asyncio.sleep(min(self.max_backoff_seconds, backoff))
+
+    async def flush(self) -> int:
+        """Write pending records in batches until empty or a batch fails; returns records written."""
+        written = 0
+        while True:
+            with self._lock:
+                batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+            if not batch:
+                break
+            stored = await self._write(batch)
+            if stored is None:
+                self._requeue(batch)
+                break
+            written += stored
+        if written and not self._pending:
+            self._replay_spill()
+        return written
+
+    async def _write(self, batch: List[HuiHuiUsageRecordV2_5]) -> Optional[int]:
+        """Records of ``batch`` that were stored, or None if the whole batch has to be retried."""
+        try:
+            # A batch that times out may still have been committed; it is retried anyway
+            stored = await asyncio.wait_for(self.sink(batch), self.flush_timeout_seconds)
+        except UsageRecordsRejectedError as e:
+            logger.warning(f"⚠️ Usage batch of {len(batch)} records: {e}")
+            self._quarantine(e.rejected, e.reason)
+            stored = e.stored
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ Usage batch of {len(batch)} records timed out after {self.flush_timeout_seconds}s")
+            stored = None
+        except Exception as e:
+            logger.warning(f"⚠️ Usage batch of {len(batch)} records failed: {e}")
+            stored = None
+        else:
+            stored = stored or None
+        if stored is not None:
+            self.stats.flushed += stored
+            self.stats.batches += 1
+            self._consecutive_failures = 0
+        else:
+            self.stats.failed_batches += 1
+            self._consecutive_failures += 1
+        return stored
+
+    def _requeue(self, batch: List[HuiHuiUsageRecordV2_5]) -> None:
+        with self._lock:
+            self._pending.extendleft(reversed(batch))
+            overflow = self._take_overflow()
+        if overflow:
+            self._spill(overflow)
+
+    async def close(self) -> None:
+        """Stop the flusher, flush what is pending and spill whatever could not be written."""
+        self._closed = True
+        flusher, self._flusher = self._flusher, None
+        if flusher is not None and not flusher.done():
+            flusher.cancel()
+            if self._loop is asyncio.get_running_loop():
+                try:
+                    await flusher
+                except asyncio.CancelledError:
+                    pass
+        await self.flush()
+        self.spill_pending()
+
+    def spill_pending(self) -> int:
+        """Synchronously move every pending record to the spill file (for interpreter exit)."""
+        with self._lock:
+            remaining = list(self._pending)
+            self._pending.clear()
+        if remaining:
+            self._spill(remaining)
+        return len(remaining)
+
+    # -- spill file --------------------------------------------------------
+
+    def _spill(self, records: List[HuiHuiUsageRecordV2_5]) -> None:
+        if self.overflow_policy == "spill" and self.spill_path is not None:
+            try:
+                self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.spill_path, "a", encoding="utf-8") as f:
+                    f.writelines(record.model_dump_json() + "\n" for record in records)
+                self.stats.spilled += len(records)
+                logger.warning(f"⚠️ Spilled {len(records)} usage records to {self.spill_path}")
+                return
+            except OSError as e:
+                logger.error(f"❌ Failed to spill usage records to {self.spill_path}: {e}")
+        self.stats.dropped += len(records)
+        logger.warning(f"⚠️ Dropped {len(records)} usage records (pending buffer full)")
+
+    def _quarantine(self, records: List[HuiHuiUsageRecordV2_5], reason: str) -> None:
+        """Set aside records the database rejected; they are never retried or replayed."""
+        self.stats.rejected += len(records)
+        if self.quarantine_path is not None:
+            try:
+                self.quarantine_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.quarantine_path, "a", encoding="utf-8") as f:
+                    f.writelines(record.model_dump_json() + "\n" for record in records)
+                logger.warning(f"⚠️ Quarantined {len(records)} rejected usage records to {self.quarantine_path}: {reason}")
+                return
+            except OSError as e:
+                logger.error(f"❌ Failed to quarantine rejected usage records to {self.quarantine_path}: {e}")
+        logger.warning(f"⚠️ Dropped {len(records)} rejected usage records: {reason}")
+
+    def _replay_spill(self) -> None:
+        """Move spilled records back into the pending buffer, up to its free room."""
+        if self.spill_path is None or not self.spill_path.exists():
+            return
+        replaying = self.spill_path.with_name(self.spill_path.name + ".replaying")
+        try:
+            os.replace(self.spill_path, replaying)
+            lines = replaying.read_text(encoding="utf-8").splitlines()
+        except OSError as e:
+            logger.error(f"❌ Failed to read spilled usage records: {e}")
+            return
+
+        room = max(0, self.max_pending - len(self._pending))
+        records = []
+        for line in lines[:room]:
+            try:
+                records.append(HuiHuiUsageRecordV2_5.model_validate_json(line))
+            except ValueError:
+                self.stats.dropped += 1
+        remainder = lines[room:]
+        try:
+            if remainder:
+                with open(self.spill_path, "a", encoding="utf-8") as f:
+                    f.writelines(line + "\n" for line in remainder)
+            replaying.unlink()
+        except OSError as e:
+            logger.error(f"❌ Failed to rewrite spilled usage records: {e}")
+
+        with self._lock:
+            self._pending.extend(records)
+        self.stats.replayed += len(records)
+        if records:
+            logger.info(f"✅ Replaying {len(records)} spilled usage records")
+            self._ensure_flusher(True)
+
+    # -- recent statistics -------------------------------------------------
+
+    def covers(self, hours: float) -> bool:
+        """Whether every record of the last ``hours`` is still held in memory."""
+        span = timedelta(hours=hours)
+        cutoff = datetime.now() - span
+        return (
+            span <= self.recent_window
+            and self._tracking_since <= cutoff
+            and (self._evicted_through is None or self._evicted_through < cutoff)
+        )
+
+    def recent_stats(self, expert: str, hours: float = 24) -> Dict[str, Any]:
+        """Usage statistics for ``expert`` over the last ``hours`` from the in-memory window."""
+        cutoff = datetime.now() - timedelta(hours=hours)
+        with self._lock:
+            records = [r for r in self._recent if r.expert_name == expert and r.timestamp >= cutoff]
+        total = len(records)
+        if total == 0:
+            return {"expert": expert, "hours": hours, "total_requests": 0}
+
+        per_minute = Counter(r.timestamp.replace(second=0, microsecond=0) for r in records)
+        return {
+            "expert": expert,
+            "hours": hours,
+            "total_requests": total,
+            "avg_processing_time": sum(r.processing_time_seconds for r in records) / total,
+            "avg_input_tokens": sum(r.input_tokens for r in records) / total,
+            "avg_output_tokens": sum(r.output_tokens for r in records) / total,
+            "avg_tokens": sum(r.total_tokens for r in records) / total,
+            "max_input_tokens": max(r.input_tokens for r in records),
+            "max_output_tokens": max(r.output_tokens for r in records),
+            "max_tokens": max(r.total_tokens for r in records),
+            "success_rate": sum(1 for r in records if r.success) / total,
+            "timeout_rate": sum(1 for r in records if r.timeout_occurred) / total,
+            "peak_requests_per_minute": float(max(per_minute.values())),
+            "market_conditions": dict(Counter(r.market_condition for r in records)),
+        }
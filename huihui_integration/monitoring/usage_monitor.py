@@ -13,13 +13,16 @@ Author: EOTS v2.5 AI Optimization Division
 """
 
 import asyncio
+import atexit
 import logging
 import statistics
 from datetime import datetime
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from pydantic import BaseModel, Field
 
+from huihui_integration.monitoring.telemetry_buffer import UsageTelemetryBuffer
+
 # SUPABASE-ONLY: Import only Supabase database manager
 try:
     from huihui_integration.monitoring.supabase_manager import (
@@ -93,18 +96,22 @@ class HuiHuiUsageMonitor:
     
     Features:
     - Real-time usage tracking
+    - Batched, bounded telemetry writes (see UsageTelemetryBuffer)
     - Pattern analysis and optimization
     - Dynamic threshold recommendations
     - Market condition correlation
     """
     
-    def __init__(self):
+    def __init__(self, telemetry: Optional["UsageTelemetryBuffer"] = None):
         """SUPABASE-ONLY: Initialize HuiHui usage monitoring with Supabase."""
         self.current_market_condition = "normal"
         self.current_vix = None
         self.supabase_manager = None
         self._supabase_initialized = False
         self._init_supabase_only()
+        self.telemetry = telemetry or UsageTelemetryBuffer(sink=self._store_batch_in_supabase)
+        # Records still pending when the interpreter exits go to the spill file
+        atexit.register(self.telemetry.spill_pending)
 
     def _init_supabase_only(self):
         """Initialize ONLY Supabase for usage tracking - no local databases."""
@@ -123,56 +130,51 @@ class HuiHuiUsageMonitor:
     def record_usage(self, expert: str, request_type: str, input_tokens: int,
                     output_tokens: int, processing_time: float, success: bool = True,
                     error_type: Optional[str] = None):
-        """SUPABASE-ONLY: Record detailed usage for pattern analysis."""
-        record = UsageRecord(
-            timestamp=datetime.now(),
-            expert=expert,
-            request_type=request_type,
-            input_tokens=input_tokens,
-            output_tokens=output_tokens,
-            total_tokens=input_tokens + output_tokens,
-            processing_time=processing_time,
-            market_condition=self.current_market_condition,
-            vix_level=self.current_vix,
-            success=success,
-            error_type=error_type
-        )
+        """SUPABASE-ONLY: Record detailed usage for pattern analysis.
 
+        The record is buffered and written to Supabase in batches; this never waits on
+        the database and works with or without a running event loop.
+        """
         # SUPABASE-ONLY: Store only in Supabase - no local database
         if not SUPABASE_AVAILABLE:
             logger.error("❌ Cannot store usage record - Supabase not available!")
             raise RuntimeError("HuiHui monitoring requires Supabase database connection")
 
-        asyncio.create_task(self._store_in_supabase(record))
-        logger.debug(f"✅ Recorded usage in Supabase: {expert} - {input_tokens}+{output_tokens}={record.total_tokens} tokens")
-
-    async def _store_in_supabase(self, record: UsageRecord):
-        """SUPABASE-ONLY: Store usage record in Supabase asynchronously."""
         try:
-            if not self._supabase_initialized:
-                self.supabase_manager = await get_supabase_manager()
-                self._supabase_initialized = True
-
-            # Convert to Supabase record format
-            supabase_record = HuiHuiUsageRecord(
-                expert_name=record.expert,
-                request_type=record.request_type,
-                input_tokens=record.input_tokens,
-                output_tokens=record.output_tokens,
-                total_tokens=record.total_tokens,
-                processing_time_seconds=record.processing_time,
-                success=record.success,
-                market_condition=record.market_condition,
-                vix_level=record.vix_level,
-                error_type=record.error_type
+            record = HuiHuiUsageRecordV2_5(
+                expert_name=expert,
+                request_type=request_type,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                total_tokens=input_tokens + output_tokens,
+                processing_time_seconds=processing_time,
+                success=success,
+                market_condition=self.current_market_condition,
+                vix_level=self.current_vix,
+                error_type=error_type,
+                timestamp=datetime.now()
             )
+        except ValueError as e:
+            logger.error(f"❌ Invalid usage record for {expert}: {e}")
+            return
 
-            await self.supabase_manager.store_usage_record(supabase_record)
-            logger.debug(f"✅ Stored usage record in Supabase for {record.expert}")
+        self.telemetry.add(record)
+        logger.debug(f"✅ Buffered usage record: {expert} - {input_tokens}+{output_tokens}={record.total_tokens} tokens")
 
-        except Exception as e:
-            logger.error(f"❌ Failed to store in Supabase: {e}")
-            raise  # Re-raise to ensure failures are noticed
+    async def _store_batch_in_supabase(self, records: List[HuiHuiUsageRecordV2_5]) -> int:
+        """SUPABASE-ONLY: Telemetry sink - store a batch of usage records in Supabase."""
+        if not self._supabase_initialized:
+            self.supabase_manager = await get_supabase_manager()
+            self._supabase_initialized = True
+        return await self.supabase_manager.store_usage_records(records)
+
+    async def flush_usage(self) -> int:
+        """Write buffered usage records now; returns the number written."""
+        return await self.telemetry.flush()
+
+    async def shutdown(self):
+        """Flush buffered usage records on shutdown (unwritten records are spilled to disk)."""
+        await self.telemetry.close()
 
     def update_market_condition(self, vix_level: float):
         """Update current market condition based on VIX level."""
@@ -187,8 +189,17 @@ class HuiHuiUsageMonitor:
         
         logger.info(f"Market condition updated: {self.current_market_condition} (VIX: {vix_level})")
     
-    async def analyze_usage_patterns(self, expert: str, hours: int = 24) -> UsagePattern:
-        """SUPABASE-ONLY: Analyze usage patterns for specific expert."""
+    async def analyze_usage_patterns(self, expert: str, hours: int = 24, source: str = "auto") -> UsagePattern:
+        """SUPABASE-ONLY: Analyze usage patterns for specific expert.
+
+        ``source`` selects where the statistics come from: ``"database"`` (Supabase),
+        ``"buffer"`` (the in-memory telemetry window, including records not yet flushed)
+        or ``"auto"``. Auto uses the buffer when it holds the whole window. Otherwise
+        it uses Supabase, falling back to the buffer if Supabase returns nothing.
+        """
+        if source == "buffer" or (source == "auto" and self.telemetry.covers(hours)):
+            return self._pattern_from_buffer(expert, hours)
+
         try:
             if not self._supabase_initialized:
                 self.supabase_manager = await get_supabase_manager()
@@ -196,41 +207,14 @@ class HuiHuiUsageMonitor:
 
             # Get usage summary from Supabase
             summary = await self.supabase_manager.get_usage_summary(expert, hours)
-
-            if not summary or summary.get("total_requests", 0) == 0:
-                return UsagePattern(
-                    expert=expert,
-                    time_period=f"{hours}h",
-                    total_requests=0,
-                    avg_requests_per_minute=0.0,
-                    peak_requests_per_minute=0.0,
-                    avg_input_tokens=0.0,
-                    avg_output_tokens=0.0,
-                    avg_total_tokens=0.0,
-                    max_input_tokens=0,
-                    max_output_tokens=0,
-                    max_total_tokens=0,
-                    avg_processing_time=0.0,
-                    success_rate=0.0
-                )
         except Exception as e:
             logger.error(f"❌ Failed to analyze usage patterns: {e}")
-            # Return empty pattern on error
-            return UsagePattern(
-                expert=expert,
-                time_period=f"{hours}h",
-                total_requests=0,
-                avg_requests_per_minute=0.0,
-                peak_requests_per_minute=0.0,
-                avg_input_tokens=0.0,
-                avg_output_tokens=0.0,
-                avg_total_tokens=0.0,
-                max_input_tokens=0,
-                max_output_tokens=0,
-                max_total_tokens=0,
-                avg_processing_time=0.0,
-                success_rate=0.0
-            )
+            summary = {}
+
+        if not summary or summary.get("total_requests", 0) == 0:
+            if source == "auto":
+                return self._pattern_from_buffer(expert, hours)
+            return self._empty_pattern(expert, hours)
 
         # SUPABASE-ONLY: Build pattern from Supabase summary data
         total_requests = summary.get("total_requests", 0)
@@ -256,6 +240,49 @@ class HuiHuiUsageMonitor:
             success_rate=summary.get("success_rate", 0.0),
             market_conditions={"normal": total_requests}  # Simplified - could be enhanced
         )
+
+    def _pattern_from_buffer(self, expert: str, hours: int) -> UsagePattern:
+        """Usage pattern from the in-memory telemetry window (exact token splits and peak rate)."""
+        stats = self.telemetry.recent_stats(expert, hours)
+        total_requests = stats["total_requests"]
+        if total_requests == 0:
+            return self._empty_pattern(expert, hours)
+
+        time_span_minutes = hours * 60
+        return UsagePattern(
+            expert=expert,
+            time_period=f"{hours}h",
+            total_requests=total_requests,
+            avg_requests_per_minute=total_requests / time_span_minutes if time_span_minutes > 0 else 0.0,
+            peak_requests_per_minute=stats["peak_requests_per_minute"],
+            avg_input_tokens=stats["avg_input_tokens"],
+            avg_output_tokens=stats["avg_output_tokens"],
+            avg_total_tokens=stats["avg_tokens"],
+            max_input_tokens=stats["max_input_tokens"],
+            max_output_tokens=stats["max_output_tokens"],
+            max_total_tokens=stats["max_tokens"],
+            avg_processing_time=stats["avg_processing_time"],
+            success_rate=stats["success_rate"],
+            market_conditions=stats["market_conditions"]
+        )
+
+    @staticmethod
+    def _empty_pattern(expert: str, hours: int) -> UsagePattern:
+        return UsagePattern(
+            expert=expert,
+            time_period=f"{hours}h",
+            total_requests=0,
+            avg_requests_per_minute=0.0,
+            peak_requests_per_minute=0.0,
+            avg_input_tokens=0.0,
+            avg_output_tokens=0.0,
+            avg_total_tokens=0.0,
+            max_input_tokens=0,
+            max_output_tokens=0,
+            max_total_tokens=0,
+            avg_processing_time=0.0,
+            success_rate=0.0
+        )
     
     async def get_optimization_recommendations(self, expert: str, hours: int = 24) -> OptimizationRecommendation:
         """SUPABASE-ONLY: Generate optimization recommendations based on usage patterns."""
@@ -397,8 +424,8 @@ async def test_usage_monitor():
     # Update market condition
     monitor.update_market_condition(25.5)  # Volatile market
 
-    # Wait a moment for async operations
-    await asyncio.sleep(1)
+    # Write the buffered records before reading them back
+    await monitor.flush_usage()
 
     # Generate report
     report = await monitor.generate_usage_report(1)
@@ -410,6 +437,7 @@ async def test_usage_monitor():
         print(f"✅ {expert}: Rate {rec.current_rate_limit} → {rec.recommended_rate_limit}, "
               f"Tokens {rec.current_token_limit} → {rec.recommended_token_limit}")
 
+    await monitor.shutdown()
     print("✅ Usage monitor test completed (Supabase-only)")
 
 if __name__ == "__main__":
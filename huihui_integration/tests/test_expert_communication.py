@@ -0,0 +1,176 @@
+"""
+Test suite for the HuiHui expert communication protocol: per-expert priority mailboxes,
+delivery deadlines and handler timeouts, and the per-expert statistics.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from huihui_integration.core.expert_communication import (
+    ExpertCommunicationProtocol,
+    ExpertMessage,
+    MessageDroppedError,
+    MessagePriority,
+    MessageType,
+)
+
+
+def _message(message_id, recipient="regime", priority=MessagePriority.NORMAL, deadline=None):
+    return ExpertMessage(
+        message_id=message_id,
+        message_type=MessageType.COORDINATION_REQUEST,
+        priority=priority,
+        sender_expert_id="orchestrator",
+        recipient_expert_id=recipient,
+        deadline=deadline,
+    )
+
+
+def _recorder(delivered, delay=0.0):
+    async def handler(message):
+        await asyncio.sleep(delay)
+        delivered.append(message.message_id)
+        return message.message_id
+    return handler
+
+
+async def _drain(protocol, expected, timeout=2.0):
+    """Wait until ``expected`` messages have been handled, expired or dropped across all mailboxes."""
+    async def settled():
+        while sum(
+            sum(mailbox.counts.values()) for mailbox in protocol.mailboxes.values()
+        ) < expected:
+            await asyncio.sleep(0.005)
+    await asyncio.wait_for(settled(), timeout)
+
+
+def test_mailbox_delivers_highest_priority_first_and_fifo_within_a_priority():
+    async def run():
+        protocol = ExpertCommunicationProtocol()
+        delivered = []
+        protocol.register_expert("regime", _recorder(delivered), max_concurrency=1)
+        for message_id, priority in [
+            ("low", MessagePriority.LOW),
+            ("normal-1", MessagePriority.NORMAL),
+            ("critical", MessagePriority.CRITICAL),
+            ("high", MessagePriority.HIGH),
+            ("normal-2", MessagePriority.NORMAL),
+        ]:
+            assert await protocol.send_message(_message(message_id, priority=priority))
+        await protocol.start()
+        await _drain(protocol, 5)
+        await protocol.stop()
+        return delivered
+
+    assert asyncio.run(run()) == ["critical", "high", "normal-1", "normal-2", "low"]
+
+
+def test_full_mailbox_evicts_lower_priority_and_rejects_the_rest():
+    async def run():
+        protocol = ExpertCommunicationProtocol(max_mailbox_depth=2)
+        delivered = []
+        protocol.register_expert("regime", _recorder(delivered), max_concurrency=1)
+        assert await protocol.send_message(_message("low", priority=MessagePriority.LOW))
+        assert await protocol.send_message(_message("normal", priority=MessagePriority.NORMAL))
+        assert await protocol.send_message(_message("high", priority=MessagePriority.HIGH))  # evicts "low"
+        assert not await protocol.send_message(_message("late-low", priority=MessagePriority.LOW))
+        assert not await protocol.send_message(_message("nobody", recipient="missing"))
+
+        await protocol.start()
+        await _drain(protocol, 3)
+        await protocol.stop()
+        return delivered, protocol.get_communication_stats()
+
+    delivered, stats = asyncio.run(run())
+    assert delivered == ["high", "normal"]
+    assert stats["experts"]["regime"]["dropped"] == 1
+    assert stats["stats"]["messages_sent"] == 3 and stats["stats"]["messages_failed"] == 2
+
+
+def test_slow_expert_times_out_without_delaying_the_others():
+    async def run():
+        protocol = ExpertCommunicationProtocol(handler_timeout_seconds=5.0)
+        fast, slow = [], []
+        protocol.register_expert("fast", _recorder(fast))
+        protocol.register_expert("slow", _recorder(slow, delay=1.0), handler_timeout_seconds=0.05)
+        await protocol.start()
+        started = asyncio.get_running_loop().time()
+        responses = await protocol.send_health_check("orchestrator", timeout_seconds=2.0)
+        elapsed = asyncio.get_running_loop().time() - started
+        await protocol.stop()
+        return responses, elapsed, protocol.get_communication_stats()
+
+    responses, elapsed, stats = asyncio.run(run())
+    assert responses["fast"]["healthy"] is True
+    assert responses["slow"] == {"healthy": False, "error": "TimeoutError"}
+    assert elapsed < 0.5  # bounded by the slow expert's own handler timeout
+    assert stats["experts"]["slow"]["timed_out"] == 1 and stats["experts"]["fast"]["delivered"] == 1
+
+
+def test_messages_past_their_deadline_expire_unhandled():
+    async def run():
+        protocol = ExpertCommunicationProtocol()
+        delivered = []
+        protocol.register_expert("regime", _recorder(delivered))
+        deadline = datetime.now() + timedelta(milliseconds=10)
+        assert await protocol.send_message(_message("stale", deadline=deadline))
+        assert await protocol.send_message(_message("fresh"))
+        await asyncio.sleep(0.05)
+        await protocol.start()
+        await _drain(protocol, 2)
+        await protocol.stop()
+        return delivered, protocol.get_communication_stats()
+
+    delivered, stats = asyncio.run(run())
+    assert delivered == ["fresh"]
+    assert stats["experts"]["regime"]["expired"] == 1 and stats["stats"]["messages_expired"] == 1
+
+
+def test_health_check_fans_out_and_stats_track_each_expert():
+    async def run():
+        protocol = ExpertCommunicationProtocol(max_concurrency_per_expert=3)
+        received = {expert: [] for expert in ("regime", "flow", "sentiment")}
+        for expert, messages in received.items():
+            protocol.register_expert(expert, _recorder(messages, delay=0.01))
+
+        async def failing(message):
+            raise RuntimeError("model unavailable")
+        protocol.register_expert("broken", failing)
+
+        await protocol.start()
+        for i in range(5):
+            await protocol.send_message(_message(f"flow-{i}", recipient="flow"))
+        await _drain(protocol, 5)
+        responses = await protocol.send_health_check("orchestrator", timeout_seconds=1.0)
+        stats = protocol.get_communication_stats()
+        await protocol.stop()
+        return responses, received, stats
+
+    responses, received, stats = asyncio.run(run())
+    assert responses["broken"] == {"healthy": False, "error": "RuntimeError"}
+    assert all(responses[expert]["healthy"] for expert in received)
+    assert len(received["flow"]) == 6 and len(received["regime"]) == 1
+    flow = stats["experts"]["flow"]
+    assert flow["delivered"] == 6 and flow["queue_depth"] == 0 and flow["in_flight"] == 0
+    assert flow["max_concurrency"] == 3
+    assert 0.0 < flow["latency_ms"]["p50"] <= flow["latency_ms"]["p95"] <= flow["latency_ms"]["p99"]
+    assert stats["experts"]["broken"]["failed"] == 1
+    assert stats["stats"]["messages_received"] == 8 and stats["stats"]["average_response_time_ms"] > 0.0
+    assert stats["registered_experts"] == 4 and stats["running"] is True and stats["queue_size"] == 0
+
+
+def test_unregistering_an_expert_drops_its_queued_messages():
+    async def run():
+        protocol = ExpertCommunicationProtocol()
+        protocol.register_expert("regime", _recorder([]))
+        envelopes = await protocol._fan_out("orchestrator", "sync", MessageType.COORDINATION_REQUEST,
+                                            MessagePriority.NORMAL, {}, 1.0)
+        protocol.unregister_expert("regime")
+        with pytest.raises(MessageDroppedError):
+            await envelopes["regime"].future
+        return protocol.get_communication_stats()
+
+    stats = asyncio.run(run())
+    assert stats["registered_experts"] == 0 and stats["queue_size"] == 0
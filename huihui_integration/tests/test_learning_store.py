@@ -0,0 +1,137 @@
+"""
+Test suite for the write-behind HuiHui learning store.
+"""
+
+import asyncio
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from data_models import UnifiedLearningResult
+
+from huihui_integration.learning.feedback_loops import HuiHuiLearningSystem
+from huihui_integration.learning.learning_store import (
+    CYCLE,
+    CYCLES_TABLE,
+    PREDICTION,
+    PREDICTIONS_TABLE,
+    HuiHuiLearningStoreV2_5,
+)
+
+
+@pytest.fixture
+def conn(tmp_path):
+    connection = sqlite3.connect(tmp_path / "learning.db", check_same_thread=False)
+    yield connection
+    connection.close()
+
+
+def _store(conn, **kwargs):
+    kwargs.setdefault("batch_size", 10)
+    return HuiHuiLearningStoreV2_5(connection_provider=lambda: conn, **kwargs)
+
+
+def _result(symbol="SPY", score=0.5, confidence=0.8, when=None):
+    return UnifiedLearningResult(
+        symbol=symbol,
+        analysis_timestamp=when or datetime.now(),
+        next_learning_cycle=datetime.now() + timedelta(days=1),
+        learning_cycle_type="daily",
+        lookback_period_days=7,
+        performance_improvement_score=score,
+        confidence_score=confidence,
+    )
+
+
+def _count(conn, table):
+    return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_results_are_written_behind_in_batches(conn):
+    async def run():
+        store = _store(conn, flush_interval_seconds=60.0)
+        store.ensure_schema()
+        for i in range(4):
+            store.record_cycle(_result(score=i / 10))
+        assert _count(conn, CYCLES_TABLE) == 0  # the learning cycle never waited on the database
+        assert store.pending_count == 4
+        await store.close()
+        return store
+
+    store = asyncio.run(run())
+    assert _count(conn, CYCLES_TABLE) == 4
+    assert store.stats["batches"] == 1
+
+
+def test_full_batch_without_event_loop_is_written_inline(conn):
+    store = _store(conn, batch_size=3)
+    for i in range(7):
+        store.record_prediction({"prediction_id": i, "symbol": "QQQ", "accuracy": 1.0, "confidence_score": 0.9}, {})
+    assert _count(conn, PREDICTIONS_TABLE) == 6 and store.pending_count == 1
+    store.flush_sync()
+    assert _count(conn, PREDICTIONS_TABLE) == 7
+
+
+def test_baselines_are_seeded_from_aggregates_and_updated_incrementally(conn):
+    store = _store(conn)
+    for score in (0.2, 0.4, 0.6):
+        store.record_cycle(_result(score=score))
+    store.record_prediction({"symbol": "SPY", "accuracy": 1.0, "confidence_score": 0.6}, {})
+    store.record_prediction({"symbol": "SPY", "accuracy": 0.0, "confidence_score": 0.4}, {})
+    store.flush_sync()
+
+    reopened = _store(conn)
+    spy = reopened.baselines(CYCLE)["SPY"]
+    assert spy["count"] == 3 and spy["mean_score"] == pytest.approx(0.4) and spy["score_std"] == pytest.approx(0.2)
+    assert reopened.total(PREDICTION).mean == pytest.approx(0.5)
+
+    reopened.record_cycle(_result(symbol="IWM", score=1.0))  # counted before it is even written
+    assert reopened.total(CYCLE).count == 4
+    assert reopened.baselines(CYCLE)["IWM"]["mean_score"] == 1.0
+
+
+def test_history_is_paged_newest_first(conn):
+    store = _store(conn)
+    for i in range(7):
+        store.record_cycle(_result(symbol="SPY" if i % 2 else "QQQ", score=i / 10))
+
+    page, cursor = store.history_page(limit=3)
+    assert [row["performance_score"] for row in page] == pytest.approx([0.6, 0.5, 0.4])
+    assert page[0]["result"]["learning_cycle_type"] == "daily"
+    assert [row["performance_score"] for row in store.iter_history("SPY", page_size=2)] == pytest.approx([0.5, 0.3, 0.1])
+    assert len(list(store.iter_history(page_size=3))) == 7
+
+
+def test_compaction_folds_old_rows_into_summaries_without_changing_baselines(conn):
+    store = _store(conn)
+    now = datetime(2026, 10, 19, 12, 0)
+    for days_ago, score in ((40, 0.2), (40, 0.4), (35, 0.9), (1, 0.7)):
+        store.record_cycle(_result(score=score, when=now - timedelta(days=days_ago)))
+    store.flush_sync()
+    before = _store(conn).baselines(CYCLE)["SPY"]
+
+    compacted = store.compact(older_than_days=30, now=now)
+    assert compacted[CYCLES_TABLE] == 3
+    assert _count(conn, CYCLES_TABLE) == 1
+    summaries = store.summaries("SPY")
+    assert [(s["period_start"], s["record_count"]) for s in summaries] == [("2026-09-09", 2), ("2026-09-14", 1)]
+    assert summaries[0]["score_max"] == pytest.approx(0.4)
+
+    after = _store(conn).baselines(CYCLE)["SPY"]
+    assert after["count"] == before["count"] == 4
+    assert after["mean_score"] == pytest.approx(before["mean_score"])
+    assert after["score_std"] == pytest.approx(before["score_std"])
+
+
+def test_learning_system_queues_outcomes_through_the_store(conn):
+    system = HuiHuiLearningSystem(learning_store=_store(conn, batch_size=100))
+    system.evaluate_prediction_outcome({"prediction_id": 1, "symbol": "SPY", "accuracy": 1.0, "confidence_score": 0.9})
+    system.evaluate_prediction_outcome({"prediction_id": 2, "symbol": "SPY", "accuracy": 0.0, "confidence_score": 0.9})
+
+    assert system.learning_store.pending_count == 2
+    asyncio.run(system.shutdown())
+    assert _count(conn, PREDICTIONS_TABLE) == 2
+
+    baseline = system.get_performance_baseline()
+    assert baseline["predictions_evaluated"] == 2 and baseline["accuracy_baseline"] == pytest.approx(0.5)
@@ -0,0 +1,231 @@
+"""
+Test suite for the batching HuiHui usage telemetry buffer and the usage monitor on top of it.
+"""
+
+import asyncio
+
+import pytest
+
+from huihui_integration.monitoring.supabase_manager import HuiHuiUsageRecordV2_5, UsageRecordsRejectedError
+from huihui_integration.monitoring.telemetry_buffer import UsageTelemetryBuffer
+from huihui_integration.monitoring.usage_monitor import HuiHuiUsageMonitor
+
+
+class _Sink:
+    """
+    Batch sink that records what it stored and can be switched to fail. Like the
+    Supabase store, it rejects records whose error_type exceeds VARCHAR(100).
+    """
+
+    def __init__(self):
+        self.batches = []
+        self.failing = False
+
+    async def __call__(self, records):
+        if self.failing:
+            raise ConnectionError("database unavailable")
+        accepted = [record for record in records if len(record.error_type or "") <= 100]
+        if accepted:
+            self.batches.append([record.request_type for record in accepted])
+        if len(accepted) < len(records):
+            rejected = [record for record in records if record not in accepted]
+            raise UsageRecordsRejectedError(rejected, len(accepted), "value too long for type character varying(100)")
+        return len(records)
+
+    @property
+    def stored(self):
+        return [request for batch in self.batches for request in batch]
+
+
+@pytest.fixture
+def sink():
+    return _Sink()
+
+
+@pytest.fixture
+def spill_path(tmp_path):
+    return tmp_path / "spill" / "usage.jsonl"
+
+
+@pytest.fixture
+def quarantine_path(tmp_path):
+    return tmp_path / "spill" / "rejected.jsonl"
+
+
+def _record(i, expert="market_regime", success=True, error_type=None):
+    return HuiHuiUsageRecordV2_5(
+        expert_name=expert, request_type=str(i), input_tokens=100 + i, output_tokens=50,
+        total_tokens=150 + i, processing_time_seconds=0.5, success=success, market_condition="normal",
+        error_type=error_type,
+    )
+
+
+def test_records_are_flushed_in_order_in_batches(sink, spill_path):
+    buffer = UsageTelemetryBuffer(sink, batch_size=10, spill_path=spill_path)
+    for i in range(25):
+        buffer.add(_record(i))  # no event loop: recording only buffers
+    assert buffer.pending_count == 25 and not sink.batches
+
+    assert asyncio.run(buffer.flush()) == 25
+    assert [len(batch) for batch in sink.batches] == [10, 10, 5]
+    assert sink.stored == [str(i) for i in range(25)]
+    assert (buffer.stats.recorded, buffer.stats.flushed, buffer.stats.batches) == (25, 25, 3)
+    assert buffer.pending_count == 0 and not spill_path.exists()
+
+
+def test_full_batch_wakes_the_flusher(sink, spill_path):
+    async def run():
+        buffer = UsageTelemetryBuffer(sink, batch_size=5, flush_interval_seconds=60.0, spill_path=spill_path)
+        for i in range(4):
+            buffer.add(_record(i))
+        await asyncio.sleep(0.05)
+        assert not sink.batches  # below batch_size and the interval has not passed
+        buffer.add(_record(4))
+        await asyncio.sleep(0.05)
+        assert sink.batches == [[str(i) for i in range(5)]]
+        await buffer.close()
+
+    asyncio.run(run())
+
+
+def test_overflow_spills_to_disk_and_is_replayed_once_writes_recover(sink, spill_path):
+    buffer = UsageTelemetryBuffer(sink, batch_size=5, max_pending=10, spill_path=spill_path)
+    sink.failing = True
+    for i in range(13):
+        buffer.add(_record(i))
+    # The oldest batch went to disk when the buffer passed max_pending
+    assert buffer.stats.spilled == 5 and buffer.pending_count == 8
+    assert len(spill_path.read_text(encoding="utf-8").splitlines()) == 5
+
+    assert asyncio.run(buffer.flush()) == 0
+    assert buffer.stats.failed_batches == 1 and buffer.pending_count == 8  # failed batch requeued in order
+
+    sink.failing = False
+    assert asyncio.run(buffer.flush()) == 8
+    assert buffer.stats.replayed == 5 and not spill_path.exists()
+    assert asyncio.run(buffer.flush()) == 5
+    assert sink.stored == [str(i) for i in range(5, 13)] + [str(i) for i in range(5)]
+    assert buffer.stats.dropped == 0
+
+
+def test_close_spills_unwritten_records_for_the_next_buffer(sink, spill_path):
+    sink.failing = True
+    buffer = UsageTelemetryBuffer(sink, batch_size=5, spill_path=spill_path)
+    for i in range(3):
+        buffer.add(_record(i))
+    asyncio.run(buffer.close())
+    assert buffer.pending_count == 0 and buffer.stats.spilled == 3
+
+    sink.failing = False
+    restarted = UsageTelemetryBuffer(sink, batch_size=5, spill_path=spill_path)
+    restarted.add(_record(3))
+    assert asyncio.run(restarted.flush()) == 1
+    assert asyncio.run(restarted.flush()) == 3
+    assert sink.stored == ["3", "0", "1", "2"] and not spill_path.exists()
+
+
+def test_drop_policy_discards_overflow(sink, spill_path):
+    sink.failing = True
+    buffer = UsageTelemetryBuffer(sink, batch_size=5, max_pending=5, overflow_policy="drop", spill_path=spill_path)
+    for i in range(8):
+        buffer.add(_record(i))
+    assert buffer.stats.dropped == 5 and buffer.pending_count == 3 and not spill_path.exists()
+    with pytest.raises(ValueError):
+        UsageTelemetryBuffer(sink, overflow_policy="block")
+
+
+def test_rejected_records_are_quarantined_and_do_not_block_the_rest(sink, spill_path, quarantine_path):
+    buffer = UsageTelemetryBuffer(sink, batch_size=5, max_pending=10, spill_path=spill_path, quarantine_path=quarantine_path)
+    bad = _record(2, success=False, error_type="E" * 150)
+    sink.failing = True
+    for i in range(13):
+        buffer.add(bad if i == 2 else _record(i))  # the bad record is spilled with the oldest batch
+    assert asyncio.run(buffer.flush()) == 0
+
+    sink.failing = False
+    assert asyncio.run(buffer.flush()) == 8
+    assert asyncio.run(buffer.flush()) == 4  # replayed spill: the bad record is set aside, not requeued
+    assert asyncio.run(buffer.flush()) == 0 and buffer.pending_count == 0 and not spill_path.exists()
+
+    assert sorted(sink.stored, key=int) == [str(i) for i in range(13) if i != 2]
+    assert (buffer.stats.flushed, buffer.stats.rejected) == (12, 1)
+    [quarantined] = quarantine_path.read_text(encoding="utf-8").splitlines()
+    assert HuiHuiUsageRecordV2_5.model_validate_json(quarantined) == bad
+
+    # A batch the database rejects entirely is not retried either
+    buffer.add(_record(20, error_type="E" * 101))
+    buffer.add(_record(21, error_type="E" * 101))
+    assert asyncio.run(buffer.flush()) == 0 and buffer.pending_count == 0
+    assert buffer.stats.rejected == 3 and buffer.stats.failed_batches == 1
+
+
+def test_store_inserts_row_by_row_when_the_database_rejects_a_batch():
+    asyncpg = pytest.importorskip("asyncpg")
+    from huihui_integration.monitoring.supabase_manager import HuiHuiSupabaseManager
+
+    too_long = asyncpg.exceptions.StringDataRightTruncationError("value too long for type character varying(100)")
+
+    class _Connection:
+        def __init__(self, down=False):
+            self.down = down
+            self.inserted = []
+
+        async def copy_records_to_table(self, table, records, columns):
+            raise too_long
+
+        async def executemany(self, query, rows):
+            raise too_long
+
+        async def execute(self, query, *row):
+            if self.down:
+                raise ConnectionResetError("connection lost")
+            if len(row[10] or "") > 100:  # error_type
+                raise too_long
+            self.inserted.append(row[1])
+
+    class _Pool:
+        def __init__(self, conn):
+            self.conn = conn
+
+        def acquire(self):
+            pool = self
+
+            class _Acquire:
+                async def __aenter__(self):
+                    return pool.conn
+
+                async def __aexit__(self, *exc):
+                    return False
+            return _Acquire()
+
+    manager = HuiHuiSupabaseManager.__new__(HuiHuiSupabaseManager)
+    manager._initialized = True
+    records = [_record(0), _record(1, error_type="E" * 150), _record(2)]
+
+    manager.connection_pool = _Pool(_Connection())
+    with pytest.raises(UsageRecordsRejectedError) as rejection:
+        asyncio.run(manager.store_usage_records(records))
+    assert rejection.value.rejected == [records[1]] and rejection.value.stored == 2
+    assert manager.connection_pool.conn.inserted == ["0", "2"]
+
+    # Anything other than a row-level rejection fails the whole batch so it is retried
+    manager.connection_pool = _Pool(_Connection(down=True))
+    assert asyncio.run(manager.store_usage_records(records)) == 0
+
+
+def test_usage_monitor_buffers_records_and_reads_patterns_from_the_window(sink, spill_path):
+    async def run():
+        monitor = HuiHuiUsageMonitor(telemetry=UsageTelemetryBuffer(sink, batch_size=100, spill_path=spill_path))
+        for i in range(4):
+            monitor.record_usage("market_regime", "analysis", 1000 + i, 200, 1.5, success=i != 3)
+        monitor.record_usage("options_flow", "analysis", 10, 10, 0.1)
+
+        pattern = await monitor.analyze_usage_patterns("market_regime", hours=1, source="buffer")
+        assert pattern.total_requests == 4 and pattern.success_rate == 0.75
+        assert pattern.max_input_tokens == 1003 and pattern.avg_output_tokens == 200
+
+        assert await monitor.flush_usage() == 5
+        await monitor.shutdown()
+
+    asyncio.run(run())
+    assert len(sink.stored) == 5
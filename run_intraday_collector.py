@@ -19,11 +19,13 @@ from core_analytics_engine.atif_engine_v2_5 import ATIFEngineV2_5
 from core_analytics_engine.its_orchestrator_v2_5 import ITSOrchestratorV2_5
 from data_models import (
     EOTSConfigV2_5, 
-    IntradayCollectorSettings
+    IntradayCollectorSettings,
+    log_import_cost_report,
 )
 
 from data_models import ProcessedDataBundleV2_5
 from core_analytics_engine.eots_metrics.elite_intelligence import EliteConfig
+from data_management.shared_bundle_channel_v2_5 import SharedBundlePublisherV2_5
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger("IntradayCollector")
@@ -60,6 +62,7 @@ def sanitize_symbol(symbol: str) -> str:
     return symbol.replace('/', '_').replace(':', '_')
 
 def main():
+    log_import_cost_report(logging.DEBUG)
     config_manager = ConfigManagerV2_5()
     elite_config: EliteConfig = config_manager.config.elite_config or EliteConfig()
     
@@ -93,6 +96,13 @@ def main():
 
     logger.info(f"Loaded intraday collector config: {intraday_settings}")
 
+    # Publish each symbol's latest bundle to shared memory for the dashboard processes
+    bundle_publisher = None
+    shared_bundle_settings = config_manager.config.shared_bundle_channel_settings
+    if shared_bundle_settings.enabled:
+        bundle_publisher = SharedBundlePublisherV2_5.from_settings(shared_bundle_settings)
+        logger.info(f"Publishing bundles to shared memory segments '{shared_bundle_settings.segment_prefix}_*'")
+
     def clear_intraday_cache():
         if cache_dir.exists():
             shutil.rmtree(cache_dir)
@@ -122,6 +132,8 @@ def main():
                             price_range_percent=5
                         ))
                         logger.info(f"Completed {symbol}.")
+                        if bundle_publisher is not None and bundle is not None:
+                            bundle_publisher.publish(symbol, bundle, dte_min=0, dte_max=5, price_range_percent=5)
                         # 🚀 PYDANTIC-FIRST: Extract enriched underlying data as Pydantic model
                         und_data = None
                         if bundle and hasattr(bundle, 'processed_data_bundle') and bundle.processed_data_bundle is not None:
@@ -210,6 +222,8 @@ def main():
     except Exception as e:
         logger.error(f"💥 Unexpected error in main loop: {e}")
     finally:
+        if bundle_publisher is not None:
+            bundle_publisher.close()
         logger.info("🏁 Intraday collector shutdown complete.")
 
 if __name__ == "__main__":
@@ -111,6 +111,8 @@ logger.info("Successfully imported root package")
 
 # Import application core
 from dashboard_application.app_main import main
+from data_models import log_import_cost_report
+log_import_cost_report(logging.DEBUG)
 
 # Monitoring utilities disabled (Docker not required)
 
@@ -0,0 +1,136 @@
+"""
+Fixtures for the EOTS v2.5 metrics-pipeline benchmark suite.
+
+Run with:
+    python -m pytest tests/benchmarks -q
+Refresh the stored baseline after an intentional performance change with:
+    python -m pytest tests/benchmarks -q --eots-update-baseline
+"""
+
+import json
+import platform
+import statistics
+import timeit
+import tracemalloc
+import warnings
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+import pytest
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "metrics_pipeline_baseline.json"
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("eots-benchmarks")
+    group.addoption("--eots-update-baseline", action="store_true", default=False,
+                    help="Rewrite the stored metrics-pipeline benchmark baseline with this run's results.")
+    group.addoption("--eots-time-tolerance", type=float, default=1.30,
+                    help="Fail when a stage's median time exceeds baseline * tolerance (default 1.30).")
+    group.addoption("--eots-memory-tolerance", type=float, default=1.25,
+                    help="Fail when a stage's peak memory exceeds baseline * tolerance (default 1.25).")
+
+
+@pytest.fixture(scope="session")
+def config_manager():
+    from utils.config_manager_v2_5 import ConfigManagerV2_5
+    return ConfigManagerV2_5()
+
+
+@pytest.fixture(scope="session")
+def metrics_calculator(config_manager, tmp_path_factory):
+    from core_analytics_engine.eots_metrics import MetricsCalculatorV2_5
+    from data_management.enhanced_cache_manager_v2_5 import EnhancedCacheManagerV2_5
+
+    cache = EnhancedCacheManagerV2_5(cache_root=str(tmp_path_factory.mktemp("bench_cache")), memory_limit_mb=100, disk_limit_mb=200)
+    return MetricsCalculatorV2_5(config_manager=config_manager, historical_data_manager=None, enhanced_cache_manager=cache)
+
+
+@pytest.fixture(scope="session")
+def synthetic_snapshot():
+    """Cached factory: chain size -> (contracts, underlying, chain_frame)."""
+    from data_management.synthetic_chain_generator_v2_5 import SyntheticChainGeneratorV2_5, SyntheticChainSpecV2_5
+
+    @lru_cache(maxsize=None)
+    def build(n_contracts: int):
+        generator = SyntheticChainGeneratorV2_5(SyntheticChainSpecV2_5.for_contract_count(n_contracts))
+        frame = generator.generate_chain_frame()
+        return generator.generate_contracts(frame), generator.generate_underlying(frame), frame
+
+    return build
+
+
+@pytest.fixture(scope="session")
+def measure_peak_memory() -> Callable[[Callable[[], Any]], int]:
+    """Returns a helper that runs ``fn`` once under tracemalloc and reports peak bytes."""
+    def measure(fn: Callable[[], Any]) -> int:
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return peak
+
+    return measure
+
+
+class BaselineGuard:
+    """Compares benchmark results against the stored baseline and optionally rewrites it."""
+
+    def __init__(self, path: Path, update: bool, time_tolerance: float, memory_tolerance: float):
+        self.path = path
+        self.update = update
+        self.time_tolerance = time_tolerance
+        self.memory_tolerance = memory_tolerance
+        self.results: Dict[str, Dict[str, float]] = {}
+        self.baseline: Dict[str, Dict[str, float]] = {}
+        if path.exists():
+            self.baseline = json.loads(path.read_text()).get("stages", {})
+
+    def check(self, name: str, benchmark, run: Callable[[], Any], peak_bytes: int, rounds: int = 3) -> None:
+        if benchmark.stats is not None:
+            median_s = float(benchmark.stats.stats.median)
+        else:  # --benchmark-disable: still time the stage so the guard is enforced
+            median_s = statistics.median(timeit.repeat(run, number=1, repeat=rounds))
+        peak_mb = peak_bytes / (1024 * 1024)
+        self.results[name] = {"median_s": median_s, "peak_mb": peak_mb}
+        benchmark.extra_info["peak_mb"] = round(peak_mb, 3)
+
+        reference = self.baseline.get(name)
+        if self.update:
+            return
+        if reference is None:
+            warnings.warn(f"{name}: no stored baseline in {self.path.name}; record one with --eots-update-baseline")
+            return
+        time_limit = reference["median_s"] * self.time_tolerance
+        memory_limit = reference["peak_mb"] * self.memory_tolerance
+        if median_s > time_limit:
+            pytest.fail(f"{name}: median {median_s * 1000:.1f} ms exceeds baseline {reference['median_s'] * 1000:.1f} ms x {self.time_tolerance}")
+        if peak_mb > memory_limit:
+            pytest.fail(f"{name}: peak memory {peak_mb:.1f} MB exceeds baseline {reference['peak_mb']:.1f} MB x {self.memory_tolerance}")
+
+    def write(self) -> None:
+        merged = dict(self.baseline)
+        merged.update(self.results)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps({
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "machine": f"{platform.system()} {platform.machine()} / Python {platform.python_version()}",
+            "stages": dict(sorted(merged.items())),
+        }, indent=2) + "\n")
+
+
+@pytest.fixture(scope="session")
+def baseline_guard(request):
+    guard = BaselineGuard(
+        BASELINE_PATH,
+        update=request.config.getoption("--eots-update-baseline"),
+        time_tolerance=request.config.getoption("--eots-time-tolerance"),
+        memory_tolerance=request.config.getoption("--eots-memory-tolerance"),
+    )
+    yield guard
+    if guard.update and guard.results:
+        guard.write()
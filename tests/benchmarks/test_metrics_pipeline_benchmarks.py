@@ -0,0 +1,82 @@
+"""
+Scaling benchmarks for the EOTS v2.5 metrics pipeline on synthetic chains.
+
+Each stage is timed with pytest-benchmark at 500, 5k and 50k contracts, its peak
+memory is traced once with tracemalloc, and both are compared against the stored
+baseline in ``baselines/metrics_pipeline_baseline.json``.
+"""
+
+import asyncio
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+CHAIN_SIZES = [500, 5_000, 50_000]
+
+
+@pytest.mark.parametrize("n_contracts", CHAIN_SIZES)
+def test_synthetic_generator_is_deterministic(n_contracts):
+    from data_management.synthetic_chain_generator_v2_5 import SyntheticChainGeneratorV2_5, SyntheticChainSpecV2_5
+
+    spec = SyntheticChainSpecV2_5.for_contract_count(n_contracts)
+    first = SyntheticChainGeneratorV2_5(spec).generate_chain_frame()
+    second = SyntheticChainGeneratorV2_5(spec).generate_chain_frame()
+    pd.testing.assert_frame_equal(first, second)
+    assert abs(len(first) - n_contracts) / n_contracts < 0.01
+
+
+@pytest.mark.parametrize("n_contracts", CHAIN_SIZES)
+def test_calculate_all_metrics(benchmark, baseline_guard, metrics_calculator, synthetic_snapshot, measure_peak_memory, n_contracts):
+    _, underlying, frame = synthetic_snapshot(n_contracts)
+
+    def run():
+        return metrics_calculator.calculate_all_metrics(options_df_raw=frame, und_data_api_raw=underlying, dte_max=45)
+
+    df_strike, _, enriched = benchmark.pedantic(run, rounds=3, iterations=1, warmup_rounds=1)
+    assert not df_strike.empty
+    assert enriched.symbol == underlying.symbol
+    baseline_guard.check(f"calculate_all_metrics[{n_contracts}]", benchmark, run, measure_peak_memory(run))
+
+
+@pytest.mark.parametrize("n_contracts", CHAIN_SIZES)
+def test_key_level_identification(benchmark, baseline_guard, config_manager, metrics_calculator, synthetic_snapshot, measure_peak_memory, n_contracts):
+    from core_analytics_engine.key_level_identifier_v2_5 import KeyLevelIdentifierV2_5
+
+    _, underlying, frame = synthetic_snapshot(n_contracts)
+    df_strike, _, enriched = metrics_calculator.calculate_all_metrics(options_df_raw=frame, und_data_api_raw=underlying, dte_max=45)
+    identifier = KeyLevelIdentifierV2_5(config_manager)
+
+    def run():
+        return identifier.identify_and_score_key_levels(df_strike, enriched)
+
+    levels = benchmark.pedantic(run, rounds=5, iterations=1, warmup_rounds=1)
+    assert levels.timestamp == enriched.timestamp
+    baseline_guard.check(f"key_levels[{n_contracts}]", benchmark, run, measure_peak_memory(run), rounds=5)
+
+
+@pytest.mark.parametrize("n_contracts", CHAIN_SIZES)
+def test_market_regime_determination(benchmark, baseline_guard, config_manager, metrics_calculator, synthetic_snapshot, measure_peak_memory, n_contracts):
+    from core_analytics_engine.market_regime_engine_v2_5 import MarketRegimeEngineV2_5
+    from data_models import ProcessedDataBundleV2_5, ProcessedStrikeLevelMetricsV2_5, ProcessedContractMetricsV2_5
+
+    _, underlying, frame = synthetic_snapshot(n_contracts)
+    df_strike, df_chain, enriched = metrics_calculator.calculate_all_metrics(options_df_raw=frame, und_data_api_raw=underlying, dte_max=45)
+    # Same conversion as InitialDataProcessorV2_5, so the regime rules see the computed strike metrics
+    bundle = ProcessedDataBundleV2_5(
+        strike_level_data_with_metrics=[ProcessedStrikeLevelMetricsV2_5(**{str(k): v for k, v in row.items()}) for row in df_strike.to_dict('records')],
+        options_data_with_metrics=[ProcessedContractMetricsV2_5(**{str(k): v for k, v in row.items()}) for row in df_chain.to_dict('records')],
+        underlying_data_enriched=enriched,
+        processing_timestamp=datetime.now(),
+        errors=[],
+    )
+    engine = MarketRegimeEngineV2_5(config_manager, config_manager.get_setting("elite_config"))
+
+    def run():
+        return asyncio.run(engine.determine_market_regime(bundle))
+
+    regime = benchmark.pedantic(run, rounds=3, iterations=1, warmup_rounds=1)
+    assert regime
+    baseline_guard.check(f"market_regime[{n_contracts}]", benchmark, run, measure_peak_memory(run))
@@ -0,0 +1,56 @@
+"""
+Scaling benchmark for the process-sharded analysis worker pool.
+
+The same synthetic chain is analyzed for a set of symbols on one worker and on N
+workers; throughput should scale close to linearly with the worker count.
+"""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+N_CONTRACTS = 5_000
+N_SYMBOLS = 8
+SCALING_EFFICIENCY_FLOOR = 0.6  # speedup / workers
+
+CPU_COUNT = os.cpu_count() or 1
+pytestmark = pytest.mark.skipif(CPU_COUNT < 2, reason="worker scaling needs at least two CPU cores")
+
+
+def _throughput(worker_count, requests):
+    from core_analytics_engine.analysis_worker_pool_v2_5 import AnalysisWorkerPoolV2_5
+
+    pool = AnalysisWorkerPoolV2_5(worker_count=worker_count, max_in_flight_per_worker=2, task_timeout_seconds=300)
+    try:
+        async def run():
+            # One warm-up pass so worker start-up and runtime imports are not timed
+            await pool.analyze_many(requests)
+            started = time.perf_counter()
+            results = await pool.analyze_many(requests)
+            return results, time.perf_counter() - started
+
+        results, elapsed = asyncio.run(run())
+    finally:
+        pool.close()
+    failures = {symbol: result for symbol, result in results.items() if isinstance(result, Exception)}
+    assert not failures, failures
+    return results, len(requests) / elapsed
+
+
+def test_worker_pool_scales_with_worker_count(synthetic_snapshot):
+    contracts, underlying, _ = synthetic_snapshot(N_CONTRACTS)
+    symbols = [f"SYN{i}" for i in range(N_SYMBOLS)]
+    requests = [(symbol, contracts, underlying) for symbol in symbols]
+    workers = min(4, CPU_COUNT)
+
+    single, single_rate = _throughput(1, requests)
+    sharded, sharded_rate = _throughput(workers, requests)
+
+    for symbol in symbols:
+        assert len(sharded[symbol].processed_bundle.options_data_with_metrics) == len(single[symbol].processed_bundle.options_data_with_metrics)
+    efficiency = (sharded_rate / single_rate) / workers
+    assert efficiency >= SCALING_EFFICIENCY_FLOOR, (
+        f"{workers} workers: {sharded_rate:.2f} symbols/s vs {single_rate:.2f} on one worker (efficiency {efficiency:.2f})"
+    )
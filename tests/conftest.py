@@ -0,0 +1,94 @@
+"""
+Shared fixtures for the EOTS v2.5 test suite.
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+SPECIFICITY_RULES = [
+    {"name": "strong_bull", "conditions": {"bias": "Bullish", "min_conviction": 3.0, "regime_contains": ["BULL", "TREND"]},
+     "strategy_output": {"strategy_type": "LongCall", "target_dte": [7, 21], "delta_range_long": [0.4, 0.6]}},
+    {"name": "any_bull", "conditions": {"bias": "Bullish", "min_conviction": 1.0, "max_conviction": 4.0, "regime_contains": ["BULL", "UNKNOWN"]},
+     "strategy_output": {"strategy_type": "BullCallSpread", "target_dte": [14, 30]}},
+    {"name": "bear_low_iv", "conditions": {"bias": "Bearish", "max_iv_rank": 40, "regime_contains": ["BEAR"]},
+     "strategy_output": {"strategy_type": "LongPut", "target_dte": [7, 21]}},
+    {"name": "bear", "conditions": {"bias": "Bearish", "min_conviction": 0.5, "regime_contains": ["BEAR", "VOL"]},
+     "strategy_output": {"strategy_type": "BearPutSpread", "target_dte": [14, 45]}},
+]
+BUNDLE_REGIMES = ("REGIME_BULL_TREND", "REGIME_BEAR_VOL", "REGIME_HIGH_VOL", None, "REGIME_BULLISH_CHOP")
+
+
+
+
+class _PerformanceTracker:
+    """Deterministic win rates per (symbol, regime, bias) setup."""
+
+    def get_historical_performance_for_setup(self, symbol, regime, bias):
+        return {"win_rate": 0.35 + (sum(map(ord, f"{symbol}|{regime}|{bias}")) % 31) / 100.0}
+
+
+@pytest.fixture
+def atif_framework():
+    """ATIF framework with dict-shaped settings, as the per-symbol rule lookups read them."""
+    from core_analytics_engine import adaptive_trade_idea_framework_v2_5 as framework
+
+    atif = framework.AdaptiveTradeIdeaFrameworkV2_5.__new__(framework.AdaptiveTradeIdeaFrameworkV2_5)
+    atif.logger = framework.logger
+    atif.performance_tracker = _PerformanceTracker()
+    atif.atif_settings = SimpleNamespace(
+        regime_context_weight_multipliers={"REGIME_BULL_TREND": {"REGIME_BULL_TREND": 1.3}, "DEFAULT": {"DEFAULT": 0.9}},
+        conviction_mapping_params={"REGIME_BEAR_VOL": {"bias_boost": {"Bearish": 0.4}}, "UNKNOWN": {"bias_boost": {"Bullish": 0.2}}},
+        strategy_specificity_rules=SPECIFICITY_RULES,
+    )
+    atif.min_conviction_to_trade = 1.0
+    return atif
+
+
+@pytest.fixture(scope="session")
+def atif_inputs():
+    """Factory: (symbol count, seed) -> aligned per-symbol bundles, scored signals and key levels."""
+    return _atif_inputs
+
+
+def _atif_inputs(n_symbols: int, seed: int):
+    from data_models import (
+        KeyLevelsDataV2_5, ProcessedContractMetricsV2_5, ProcessedDataBundleV2_5,
+        ProcessedStrikeLevelMetricsV2_5, ProcessedUnderlyingAggregatesV2_5, SignalPayloadV2_5,
+    )
+
+    rng = np.random.default_rng(seed)
+    now = datetime(2026, 1, 5, 15, 30)
+    bundles, signals, levels = [], [], []
+    for i in range(n_symbols):
+        symbol = f"SYM{i:03d}"
+        underlying = ProcessedUnderlyingAggregatesV2_5(
+            symbol=symbol, timestamp=now, price=float(rng.uniform(20, 500)),
+            current_market_regime_v2_5=BUNDLE_REGIMES[i % len(BUNDLE_REGIMES)],
+            gib_oi_based_und=0.0, td_gib_und=0.0, hp_eod_und=0.0,
+            net_cust_delta_flow_und=0.0, net_cust_gamma_flow_und=0.0, net_cust_vega_flow_und=0.0, net_cust_theta_flow_und=0.0,
+            vapi_fa_z_score_und=0.0, dwfd_z_score_und=0.0, tw_laf_z_score_und=0.0,
+            elite_impact_score_und=55.0, institutional_flow_score_und=40.0, flow_momentum_index_und=0.0,
+            market_regime_elite="medium_vol_ranging", flow_type_elite="retail_unsophisticated", volatility_regime_elite="medium_vol",
+            confidence=0.5, transition_risk=0.1,
+        )
+        bundles.append(ProcessedDataBundleV2_5(
+            options_data_with_metrics=[ProcessedContractMetricsV2_5(contract_symbol=f"{symbol}C", strike=100.0, opt_kind="call", dte_calc=10.0)],
+            strike_level_data_with_metrics=[ProcessedStrikeLevelMetricsV2_5(strike=100.0)],
+            underlying_data_enriched=underlying,
+            processing_timestamp=now,
+            errors=[],
+        ))
+        by_type = {}
+        for j in range(int(rng.integers(0, 6))):
+            direction = ("Bullish", "Bearish", "Neutral")[int(rng.integers(0, 3))]
+            by_type.setdefault(f"type_{j % 2}", []).append(SignalPayloadV2_5(
+                signal_id=f"{symbol}-{j}", signal_name="synthetic", symbol=symbol, timestamp=now,
+                signal_type="Directional", direction=direction, strength_score=float(np.round(rng.uniform(-1.0, 3.0), 2)),
+                supporting_metrics={"momentum_indicators": {"flow": float(j)}},
+            ))
+        signals.append(by_type)
+        levels.append(KeyLevelsDataV2_5(timestamp=now))
+    return bundles, signals, levels
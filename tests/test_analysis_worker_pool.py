@@ -0,0 +1,84 @@
+"""
+Tests for the process-sharded analysis worker pool with a stand-in runtime: results
+come back from the pinned worker, and a worker that dies mid-request fails that
+request (with no unretrieved future left behind), is restarted in place and serves
+the next request.
+"""
+
+import asyncio
+import gc
+import multiprocessing
+import os
+
+import pytest
+
+from core_analytics_engine.analysis_worker_pool_v2_5 import AnalysisWorkerError, AnalysisWorkerPoolV2_5
+
+# The stand-in runtime needs none of the engine, so skip a spawned child's re-import of it
+START_METHOD = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+class _EchoRuntime:
+    """Returns its inputs; the CRASH symbol kills the worker process."""
+
+    def __init__(self, worker_id):
+        self.worker_id = worker_id
+
+    def analyze(self, symbol, contracts, underlying):
+        if symbol == "CRASH":
+            os._exit(3)
+        return {"symbol": symbol, "contracts": len(contracts)}, underlying
+
+
+def _run(pool, coro_factory):
+    unhandled = []
+
+    async def run():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: unhandled.append(context))
+        try:
+            return await coro_factory()
+        finally:
+            gc.collect()  # unretrieved future exceptions are reported when the future is collected
+            await asyncio.sleep(0)
+
+    try:
+        return asyncio.run(run()), unhandled
+    finally:
+        pool.close()
+
+
+def test_results_come_back_from_the_pinned_worker():
+    pool = AnalysisWorkerPoolV2_5(worker_count=2, runtime_factory=_EchoRuntime, task_timeout_seconds=30, start_method=START_METHOD)
+    requests = [(symbol, [1, 2, 3], symbol.lower()) for symbol in ("SPY", "QQQ", "IWM")]
+
+    results, unhandled = _run(pool, lambda: pool.analyze_many(requests))
+
+    assert not unhandled
+    for symbol, _, underlying in requests:
+        result = results[symbol]
+        assert result.processed_bundle == {"symbol": symbol, "contracts": 3}
+        assert result.key_levels == underlying
+        assert result.worker_id == pool.worker_for(symbol)
+    assert sum(h.completed for h in pool.health()) == len(requests)
+
+
+def test_crashed_worker_fails_the_request_and_restarts():
+    pool = AnalysisWorkerPoolV2_5(worker_count=1, runtime_factory=_EchoRuntime, task_timeout_seconds=30, start_method=START_METHOD)
+
+    async def crash_then_recover():
+        with pytest.raises(AnalysisWorkerError, match="lost on analysis worker 0"):
+            await pool.analyze("CRASH", [], None)
+        # The exit is handled off the loop; wait for the replacement process
+        for _ in range(200):
+            if pool.health()[0].alive and pool.health()[0].restarts == 1:
+                break
+            await asyncio.sleep(0.05)
+        return await pool.analyze("SPY", [1], "spy")
+
+    result, unhandled = _run(pool, crash_then_recover)
+
+    assert not unhandled, unhandled
+    assert result.processed_bundle == {"symbol": "SPY", "contracts": 1}
+    health = pool.health()[0]
+    assert health.restarts == 1 and health.failed == 1 and health.completed == 1
+    assert "exitcode=3" in health.last_error
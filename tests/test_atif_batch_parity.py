@@ -0,0 +1,122 @@
+"""
+Parity between the batched cross-ticker ATIF paths and their per-symbol counterparts.
+
+The batch kernels must reproduce the per-symbol results exactly (not approximately):
+fusion, conviction and strategy parameters are compared with ``==``.
+"""
+
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+N_SYMBOLS = 80
+SIGNAL_TYPES = ("technical", "sentiment", "order_flow", "fundamental", "gamma_pressure")
+REGIMES = ("extreme_bull", "bull", "neutral", "bear", "extreme_bear", "bullish", "bearish", "REGIME_UNCLEAR")
+
+
+def _universe(seed: int):
+    rng = np.random.default_rng(seed)
+    symbols = [f"SYM{i:03d}" for i in range(N_SYMBOLS)]
+    signals = {}
+    for name in SIGNAL_TYPES:
+        values = rng.uniform(-0.2, 1.3, N_SYMBOLS)
+        values[rng.random(N_SYMBOLS) < 0.25] = np.nan
+        signals[name] = values
+    for name in SIGNAL_TYPES[:4]:
+        signals[name][:3] = np.nan  # rows with no weighted signal at all
+    regimes = [REGIMES[i] for i in rng.integers(0, len(REGIMES), N_SYMBOLS)]
+    volatilities = rng.choice([0.05, 0.15, 0.2, 0.3, 0.45, np.nan], N_SYMBOLS)
+    performance = []
+    for i in range(N_SYMBOLS):
+        kind = i % 4
+        if kind == 0:
+            performance.append(None)
+        elif kind == 1:
+            performance.append({})
+        elif kind == 2:
+            performance.append({"win_rate": float(rng.uniform(0.3, 0.7))})
+        else:
+            performance.append({"win_rate": float(rng.uniform(0.3, 0.7)), "profit_factor": float(rng.uniform(0.5, 2.5))})
+    return symbols, signals, regimes, volatilities, performance
+
+
+@pytest.fixture(scope="module")
+def atif_engine():
+    """ATIF engine with only its adaptive components (skips the database-backed intelligence engine)."""
+    from core_analytics_engine import atif_engine_v2_5 as atif
+
+    engine = atif.ATIFEngineV2_5.__new__(atif.ATIFEngineV2_5)
+    engine.logger = atif.logger
+    engine.signal_engine = atif._SignalFusionEngine(config={})
+    engine.conviction_engine = atif._ConvictionEngine(config={})
+    engine.strategy_selector = atif._StrategySelector(config={})
+    return engine
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_adaptive_strategy_batch_matches_per_symbol(atif_engine, seed):
+    symbols, signals, regimes, volatilities, performance = _universe(seed)
+
+    batch = atif_engine.generate_adaptive_strategies_batch(symbols, signals, regimes, volatilities, performance)
+
+    async def per_symbol():
+        results = {}
+        for i, symbol in enumerate(symbols):
+            symbol_signals = {name: float(values[i]) for name, values in signals.items() if not np.isnan(values[i])}
+            context = {"regime": regimes[i]}
+            if not np.isnan(volatilities[i]):
+                context["volatility"] = float(volatilities[i])
+            results[symbol] = await atif_engine.generate_adaptive_strategy(symbol_signals, context, performance[i])
+        return results
+
+    expected = asyncio.run(per_symbol())
+    assert list(batch) == list(expected)
+    for symbol in symbols:
+        assert batch[symbol] == expected[symbol], symbol
+
+
+def test_specificity_rule_table_matches_per_symbol_rules(atif_framework):
+    from core_analytics_engine import adaptive_trade_idea_framework_v2_5 as framework
+    from core_analytics_engine.atif_batch_v2_5 import SpecificityRuleTableV2_5
+    from data_models import ATIFSituationalAssessmentProfileV2_5
+
+    rules = atif_framework.atif_settings.strategy_specificity_rules
+    rng = np.random.default_rng(7)
+    regimes = ["REGIME_BULL_TREND", "REGIME_BEAR_VOL", "REGIME_HIGH_VOL", "UNKNOWN", "REGIME_BULLISH_CHOP"]
+    bias = rng.choice(["Bullish", "Bearish"], 200).astype(object)
+    conviction = np.round(rng.uniform(0.0, 5.0, 200), 1)
+    row_regimes = [regimes[i] for i in rng.integers(0, len(regimes), 200)]
+
+    matched = SpecificityRuleTableV2_5(rules).match(bias, conviction, row_regimes, np.full(200, 50.0))
+
+    owner = SimpleNamespace(atif_settings=SimpleNamespace(strategy_specificity_rules=rules))
+    owner._build_directive = lambda rule, *args: rule
+    assessment = ATIFSituationalAssessmentProfileV2_5.model_construct(timestamp=datetime.now())
+    for i in range(200):
+        bundle = SimpleNamespace(underlying_data_enriched=SimpleNamespace(current_market_regime_v2_5=row_regimes[i], price=100.0))
+        rule = framework.AdaptiveTradeIdeaFrameworkV2_5._determine_strategy_specificity(
+            owner, assessment, float(conviction[i]), bias[i], bundle
+        )
+        assert (rules[matched[i]] if matched[i] >= 0 else None) is rule
+
+
+def _comparable(directives):
+    return [d.model_dump(exclude={"assessment_profile": {"timestamp"}}) for d in directives]
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_trade_directives_batch_matches_per_symbol(atif_framework, atif_inputs, seed):
+    atif = atif_framework
+    bundles, signals, levels = atif_inputs(60, seed)
+
+    batch = atif.generate_trade_directives_batch(bundles, signals, levels)
+
+    assert list(batch) == [b.underlying_data_enriched.symbol for b in bundles]
+    for bundle, symbol_signals, symbol_levels in zip(bundles, signals, levels):
+        symbol = bundle.underlying_data_enriched.symbol
+        expected = atif.generate_trade_directives(bundle, symbol_signals, symbol_levels)
+        assert _comparable(batch[symbol]) == _comparable(expected), symbol
+    assert 0 < sum(1 for directives in batch.values() if directives) < len(bundles)
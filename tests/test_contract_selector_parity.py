@@ -0,0 +1,104 @@
+"""
+Parity tests for ContractSelectorV2_5 against the per-query DataFrame filters the
+Trade Parameter Optimizer used before the chain was pre-indexed: nearest |delta|
+inside a DTE window and most liquid contract inside a DTE window and |delta| band,
+fuzzed over chains with missing deltas, repeated deltas and one-sided quotes.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core_analytics_engine.contract_selector_v2_5 import VOLUME_WEIGHT, ContractSelectorV2_5
+
+
+def _chain(n=4_000, seed=0):
+    rng = np.random.default_rng(seed)
+    kind = rng.choice(["call", "put"], n)
+    delta = np.round(rng.uniform(0.0, 1.0, n), 2) * np.where(kind == "call", 1.0, -1.0)
+    delta[rng.random(n) < 0.15] = np.nan
+    bid = np.round(rng.uniform(0.0, 20.0, n), 2)
+    ask = bid + np.round(rng.uniform(0.0, 2.0, n), 2)
+    bid[rng.random(n) < 0.05] = np.nan
+    return pd.DataFrame({
+        "opt_kind": kind,
+        "dte_calc": rng.integers(0, 60, n).astype(float),
+        "delta_contract": delta,
+        "open_interest": rng.integers(0, 5_000, n).astype(float),
+        "volm": np.where(rng.random(n) < 0.1, np.nan, rng.integers(0, 2_000, n)),
+        "bid_price": bid,
+        "ask_price": ask,
+    })
+
+
+def _legacy_nearest_delta(chain, option_type, target_delta, target_dte, dte_tolerance=2.0, min_dte=1.0):
+    candidates = chain[
+        (chain["opt_kind"] == option_type)
+        & (chain["dte_calc"] <= target_dte + dte_tolerance)
+        & (chain["dte_calc"] >= max(min_dte, target_dte - dte_tolerance))
+    ]
+    delta_diff = (candidates["delta_contract"].abs() - abs(target_delta)).abs()
+    return -1 if delta_diff.isna().all() else int(delta_diff.idxmin())
+
+
+def _legacy_most_liquid(chain, option_type, dte_min, dte_max, delta_min=None, delta_max=None):
+    candidates = chain[
+        (chain["opt_kind"] == option_type) & (chain["dte_calc"] >= dte_min) & (chain["dte_calc"] <= dte_max)
+    ]
+    if delta_min is not None:
+        candidates = candidates[candidates["delta_contract"].abs().between(delta_min, delta_max)]
+    if candidates.empty:
+        return -1
+    bid, ask = candidates["bid_price"], candidates["ask_price"]
+    quoted = (bid > 0) & (ask >= bid)
+    spread = ((ask - bid) / ((ask + bid) / 2)).where(quoted, 0.0).clip(0.0, 1.0)
+    score = (candidates["open_interest"].fillna(0) + VOLUME_WEIGHT * candidates["volm"].fillna(0)) * (1.0 - spread)
+    return int(score.idxmax())
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_nearest_delta_matches_the_legacy_filter(seed):
+    chain = _chain(seed=seed)
+    selector = ContractSelectorV2_5(chain)
+    rng = np.random.default_rng(100 + seed)
+    types = rng.choice(["call", "put"], 500)
+    targets = np.round(rng.uniform(-1.1, 1.1, 500), 3)
+    dtes = rng.integers(-3, 65, 500).astype(float)
+
+    positions = selector.nearest_delta(types, targets, dtes)
+    expected = [_legacy_nearest_delta(chain, t, d, e) for t, d, e in zip(types, targets, dtes)]
+    np.testing.assert_array_equal(positions, expected)
+    assert (positions >= 0).mean() > 0.9
+
+
+def test_nearest_delta_skips_neighbours_without_a_delta():
+    chain = pd.DataFrame({
+        "opt_kind": ["call"] * 4,
+        "dte_calc": [7.0] * 4,
+        "delta_contract": [0.20, 0.40, np.nan, np.nan],
+    })
+    selector = ContractSelectorV2_5(chain)
+    # Targets above every delta land next to the contracts without one
+    np.testing.assert_array_equal(selector.nearest_delta("call", [0.45, 0.9, 0.3], 7.0), [1, 1, 0])
+    assert selector.nearest_delta("call", np.nan, 7.0)[0] == -1
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_most_liquid_matches_the_legacy_filter(seed):
+    chain = _chain(seed=seed)
+    selector = ContractSelectorV2_5(chain)
+    rng = np.random.default_rng(200 + seed)
+    n = 500
+    types = rng.choice(["call", "put"], n)
+    dte_min = rng.integers(0, 60, n).astype(float)
+    dte_max = dte_min + rng.integers(0, 10, n)
+    delta_min = np.round(rng.uniform(0.0, 0.8, n), 2)
+    delta_max = delta_min + np.round(rng.uniform(0.0, 0.3, n), 2)
+    banded = rng.random(n) < 0.7
+    lo = [float(v) if b else None for v, b in zip(delta_min, banded)]
+    hi = [float(v) if b else None for v, b in zip(delta_max, banded)]
+
+    positions = selector.most_liquid(types, dte_min, dte_max, lo, hi)
+    expected = [_legacy_most_liquid(chain, *query) for query in zip(types, dte_min, dte_max, lo, hi)]
+    np.testing.assert_array_equal(positions, expected)
+    assert (positions >= 0).mean() > 0.5
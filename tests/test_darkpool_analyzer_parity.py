@@ -0,0 +1,129 @@
+"""
+Parity between the columnar DarkpoolAnalyzer and the row-frame pipeline it replaced.
+
+The reference below is the previous implementation of the level selection, strike
+ranking and plausibility steps (seven filtered frame copies, a Python ``set`` join per
+strike group and a per-row ``apply``). Outputs are compared exactly.
+"""
+
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / "~darkpool~" / "data_processing_framework.py"
+LEVEL_COLUMNS = ['date', 'strike', 'method', 'score', 'gxoi', 'dxoi',
+                 'volmbs_15m', 'charmxoi', 'vannaxoi', 'vommaxoi', 'gxvolm', 'value_bs']
+
+
+@pytest.fixture(scope="module")
+def framework():
+    spec = importlib.util.spec_from_file_location("darkpool_data_processing_framework", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def analyzer(framework, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # the analyzer creates ./output
+    return framework.DarkpoolAnalyzer(symbol="SPY", days_back=5)
+
+
+def _reference_levels(data):
+    def select(column, method):
+        threshold = data[column].quantile(0.9)
+        selected = data[data[column] > threshold].copy()
+        selected['method'] = method
+        selected['score'] = selected[column]
+        return selected
+
+    data['delta_gamma_divergence'] = (data['gxoi_zscore'] - data['dxoi_zscore']).abs()
+    data['flow_anomaly'] = data['volmbs_15m_zscore'].abs() + (data['volmbs_15m_zscore'] - data['volmbs_60m_zscore']).abs()
+    data['vol_sensitivity'] = data['vannaxoi_zscore'].abs() + data['vommaxoi_zscore'].abs()
+    data['charm_adjusted_gamma'] = data['gxoi_zscore'] * (1 + data['charmxoi_zscore'].abs())
+    data['active_hedging'] = data['gxoi_zscore'] * data['gxvolm_zscore']
+    data['value_volume_divergence'] = (data['value_bs_zscore'] - data['volmbs_15m_zscore']).abs()
+    all_levels = pd.concat([
+        select('gxoi_zscore', 'High Gamma Imbalance'),
+        select('delta_gamma_divergence', 'Delta-Gamma Divergence'),
+        select('flow_anomaly', 'Flow Anomaly'),
+        select('vol_sensitivity', 'Volatility Sensitivity'),
+        select('charm_adjusted_gamma', 'Charm-Adjusted Gamma'),
+        select('active_hedging', 'Active Hedging Detection'),
+        select('value_volume_divergence', 'Value-Volume Divergence'),
+    ])
+    return all_levels[LEVEL_COLUMNS].sort_values('score', ascending=False)
+
+
+def _reference_top(levels, n):
+    strike_scores = levels.groupby('strike').agg({
+        'score': 'sum',
+        'method': lambda x: ', '.join(set(x)),
+        'gxoi': 'mean', 'dxoi': 'mean', 'volmbs_15m': 'mean', 'charmxoi': 'mean',
+        'vannaxoi': 'mean', 'vommaxoi': 'mean', 'gxvolm': 'mean', 'value_bs': 'mean'
+    }).reset_index()
+    return strike_scores.sort_values('score', ascending=False).head(n)
+
+
+def _reference_ultra(top, n):
+    top = top.copy()
+    top['plausibility'] = (
+        top['gxoi'].abs() / top['gxoi'].abs().max() +
+        (1 - (top['gxoi'] * top['dxoi']).abs() / ((top['gxoi'].abs() * top['dxoi'].abs()).replace(0, 1))) +
+        top['volmbs_15m'].abs() / top['volmbs_15m'].abs().max() +
+        top['charmxoi'].abs() / top['charmxoi'].abs().max() +
+        top['method'].apply(lambda x: len(x.split(', '))) / 7
+    )
+    return top, top.sort_values('plausibility', ascending=False).head(n)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2, 3])
+def test_columnar_pipeline_matches_reference(analyzer, seed):
+    np.random.seed(seed)
+    analyzer.load_sample_data()
+    analyzer.preprocess_data()
+    reference_data = analyzer.data.copy()
+
+    levels = analyzer.identify_darkpool_levels()
+    top = analyzer.rank_top_levels(n=7)
+    ultra = analyzer.refine_to_ultra_levels(n=3)
+
+    expected_levels = _reference_levels(reference_data)
+    expected_top = _reference_top(expected_levels, 7)
+    expected_top, expected_ultra = _reference_ultra(expected_top, 3)
+
+    pd.testing.assert_frame_equal(analyzer.data, reference_data, check_exact=True)
+    pd.testing.assert_frame_equal(levels, expected_levels, check_exact=True)
+    pd.testing.assert_frame_equal(top, expected_top, check_exact=True)
+    pd.testing.assert_frame_equal(ultra, expected_ultra, check_exact=True)
+
+
+def test_streamed_chunks_match_in_memory_load(analyzer, framework, tmp_path):
+    np.random.seed(11)
+    sample = analyzer.load_sample_data()
+    path = tmp_path / "strikes.csv"
+    sample.to_csv(path, index=False)
+
+    analyzer.data = pd.read_csv(path)
+    analyzer.preprocess_data()
+    expected = analyzer.identify_darkpool_levels()
+
+    streamed = framework.DarkpoolAnalyzer(symbol="SPY", days_back=5)
+    streamed.load_csv(path, chunksize=17)
+    streamed.preprocess_data()
+    pd.testing.assert_frame_equal(streamed.identify_darkpool_levels(), expected, check_exact=True)
+
+
+def test_accumulation_profile_rolls_over_dates(analyzer):
+    np.random.seed(5)
+    data = analyzer.load_sample_data()
+    profile = analyzer.accumulation_profile(window=2)
+
+    totals = data.groupby(['date', 'strike'])['value_bs'].sum().unstack()
+    expected_rolling = totals.rolling(2, min_periods=1).sum()
+    assert len(profile) == totals.size
+    np.testing.assert_allclose(profile['value_bs'].to_numpy(), totals.to_numpy().ravel())
+    np.testing.assert_allclose(profile['value_bs_rolling'].to_numpy(), expected_rolling.to_numpy().ravel())
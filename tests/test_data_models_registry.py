@@ -0,0 +1,58 @@
+"""
+Tests for the lazy data_models name registry: every exported name resolves to the
+same object the former eager star-imports bound, and the source-scanned index matches
+what those star-imports export, whether built fresh or read back from its cache.
+"""
+
+import importlib
+
+import pytest
+
+import data_models
+
+
+@pytest.fixture(scope="module")
+def eager_namespace():
+    """What the package bound when it star-imported every model module in order."""
+    namespace = {}
+    for module_name in data_models._MODEL_MODULES:
+        exec(f"from data_models.{module_name} import *", namespace)
+    namespace.pop("__builtins__")
+    return namespace
+
+
+@pytest.mark.parametrize("name", data_models.__all__)
+def test_every_exported_name_resolves_to_the_eager_object(name, eager_namespace):
+    namespace = {}
+    exec(f"from data_models import {name}", namespace)
+    assert namespace[name] is eager_namespace[name]
+    assert getattr(data_models, name) is eager_namespace[name]
+
+
+def test_star_import_binds_all_exports():
+    namespace = {}
+    exec("from data_models import *", namespace)
+    assert set(data_models.__all__) <= set(namespace)
+
+
+def test_index_matches_the_star_imports_fresh_and_cached(eager_namespace, tmp_path, monkeypatch):
+    cache_path = tmp_path / "model_index.json"
+    monkeypatch.setattr(data_models, "_INDEX_CACHE_PATH", cache_path)
+    monkeypatch.setattr(data_models, "_name_index", None)
+
+    index = data_models._get_name_index()
+    assert set(index) == set(eager_namespace)
+    for name, module_name in index.items():
+        # Later modules win on name clashes, as with the star-imports
+        assert getattr(importlib.import_module(f"data_models.{module_name}"), name) is eager_namespace[name]
+    assert cache_path.exists()
+
+    monkeypatch.setattr(data_models, "_name_index", None)
+    assert data_models._get_name_index() == index
+
+
+def test_unknown_names_raise_attribute_error():
+    with pytest.raises(AttributeError, match="NoSuchModelV2_5"):
+        data_models.NoSuchModelV2_5
+    with pytest.raises(ImportError):
+        exec("from data_models import NoSuchModelV2_5", {})
@@ -0,0 +1,115 @@
+"""
+Tests for the sampling decorator telemetry backend: per-thread shards merge into
+exact counts, shards of exited threads are folded in and dropped, and
+track_performance still logs the exceptions it re-raises.
+"""
+
+import asyncio
+import logging
+import threading
+
+import pytest
+
+from utils.decorator_telemetry_v2_5 import DecoratorTelemetryV2_5
+
+
+@pytest.fixture
+def backend():
+    return DecoratorTelemetryV2_5(flush_interval_seconds=0)
+
+
+def _flaky(x):
+    if x % 10 == 0:
+        raise ValueError(f"bad input {x}")
+    return x
+
+
+def _call_all(fn, values):
+    for x in values:
+        try:
+            fn(x)
+        except ValueError:
+            pass
+
+
+def test_repeated_merges_count_each_call_once(backend):
+    decorated = backend.instrument(_flaky, name="flaky")
+    for _ in range(3):
+        _call_all(decorated, range(100))
+        backend.flush()
+    assert backend.flush() == []  # nothing new since the last merge
+
+    snapshot = backend.report("flaky")["flaky"]
+    assert (snapshot.sampled_calls, snapshot.errors) == (300, 30)
+    assert sum(snapshot.histogram) == 300 and snapshot.estimated_calls == 300
+
+
+def test_thread_per_request_shards_are_folded_and_dropped(backend):
+    decorated = backend.instrument(_flaky, name="flaky")
+    handle = backend.register("flaky")
+
+    for _ in range(5):
+        threads = [threading.Thread(target=_call_all, args=(decorated, range(50))) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert handle.shard_count == 20  # earlier batches were already dropped
+        backend.flush()
+        assert handle.shard_count == 0
+
+    snapshot = backend.report("flaky")["flaky"]
+    assert (snapshot.sampled_calls, snapshot.errors) == (5 * 20 * 50, 5 * 20 * 5)
+    assert sum(snapshot.histogram) == snapshot.sampled_calls
+
+
+def test_live_thread_keeps_its_shard_across_merges(backend):
+    decorated = backend.instrument(_flaky, name="flaky")
+    handle = backend.register("flaky")
+    proceed, merged = threading.Event(), threading.Event()
+
+    def worker():
+        _call_all(decorated, range(1, 10))
+        merged.set()
+        proceed.wait()
+        _call_all(decorated, range(10, 20))
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    merged.wait()
+    assert backend.report("flaky")["flaky"].sampled_calls == 9 and handle.shard_count == 1
+    proceed.set()
+    thread.join()
+
+    snapshot = backend.report("flaky")["flaky"]
+    assert (snapshot.sampled_calls, snapshot.errors) == (19, 1) and handle.shard_count == 0
+
+
+def test_reset_starts_a_fresh_aggregate(backend):
+    decorated = backend.instrument(_flaky, name="flaky", capture_cpu=True)
+    _call_all(decorated, range(20))
+    backend.reset()
+    _call_all(decorated, range(1, 6))
+
+    snapshot = backend.report("flaky")["flaky"]
+    assert (snapshot.sampled_calls, snapshot.errors) == (5, 0) and snapshot.cpu_ms_total is not None
+
+
+@pytest.mark.parametrize("sample_rate", [1.0, 0.0])
+def test_track_performance_logs_and_reraises_errors(sample_rate, caplog):
+    from compliance_decorators_v2_5 import track_performance
+
+    @track_performance(sample_rate=sample_rate)
+    def failing():
+        raise ValueError("boom")
+
+    @track_performance(sample_rate=sample_rate, capture_cpu=True)
+    async def failing_async():
+        raise ValueError("async boom")
+
+    with caplog.at_level(logging.ERROR, logger="compliance_decorators_v2_5"):
+        with pytest.raises(ValueError):
+            failing()
+        with pytest.raises(ValueError):
+            asyncio.run(failing_async())
+    assert [r.getMessage() for r in caplog.records] == ["Error in failing: boom", "Error in failing_async: async boom"]
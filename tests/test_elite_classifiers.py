@@ -0,0 +1,100 @@
+"""
+Tests for the offline-trained elite regime and flow classifiers: forward-outcome
+labelling, training and versioned serialization, schema checks at load time,
+batched inference and the rule-based fallback in EliteImpactCalculator.
+"""
+
+from types import SimpleNamespace
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from core_analytics_engine.eots_metrics.elite_classifiers import (
+    FLOW,
+    REGIME,
+    EliteClassifierRuntimeV2_5,
+    EliteModelRegistryV2_5,
+    build_flow_dataset,
+    build_regime_dataset,
+    regime_labels,
+    train_classifier,
+)
+from core_analytics_engine.eots_metrics.elite_intelligence import EliteImpactCalculator, FlowType, MarketRegime
+
+
+def _records(n=600, seed=3):
+    rng = np.random.default_rng(seed)
+    calm = np.repeat(rng.random(n // 50) < 0.5, 50)[:n]
+    vol = np.where(calm, 0.10, 0.40) + rng.normal(0, 0.01, n)
+    price = 400.0 * np.exp(np.cumsum(rng.normal(0, np.where(calm, 0.001, 0.01))))
+    value_bs = rng.normal(0, 2e6, n)
+    return pd.DataFrame({
+        "symbol": "SPY",
+        "timestamp": pd.date_range("2026-01-02 09:30", periods=n, freq="5min"),
+        "price": price,
+        "u_volatility": vol,
+        "price_change_pct_und": rng.normal(0, 0.01, n),
+        "day_high_price_und": price * 1.01,
+        "day_low_price_und": price * 0.99,
+        "day_volume": rng.uniform(1e6, 5e7, n),
+        "value_bs": value_bs,
+        "flow_type_label": np.where(np.abs(value_bs) > 1e6, "institutional_large", "retail_unsophisticated"),
+    })
+
+
+def test_regime_labels_use_the_forward_path_only():
+    prices = pd.Series([100.0, 100.0, 100.0, 110.0, 110.0, 110.0])
+    labels = regime_labels(prices, horizon=2, periods_per_year=1.0, vol_thresholds=(0.01, 0.5))
+    assert labels.tolist()[:4] == ["low_vol_ranging", "medium_vol_trending", "medium_vol_trending", "low_vol_ranging"]
+    assert labels.iloc[4:].isna().all()  # no full forward window yet
+
+
+def test_train_save_and_serve_batched_predictions(tmp_path):
+    records = _records()
+    features, labels = build_regime_dataset(records, horizon=12, periods_per_year=252 * 78)
+    assert len(features) == len(records) - 12
+    artifact = train_classifier(REGIME, features, labels, model_type="random_forest")
+    assert artifact.holdout_accuracy is not None and set(artifact.classes) <= {m.value for m in MarketRegime}
+
+    registry = EliteModelRegistryV2_5(str(tmp_path))
+    registry.save(artifact)
+    runtime = EliteClassifierRuntimeV2_5(model_dir=str(tmp_path))
+    assert runtime.available(REGIME) and not runtime.available(FLOW)
+    assert runtime.version(REGIME) == artifact.version
+
+    batched = runtime.predict(REGIME, records)
+    assert len(batched) == len(records)
+    one = runtime.predict_one(REGIME, SimpleNamespace(**records.iloc[10].to_dict()))
+    assert one == batched[10]
+
+
+def test_models_with_another_feature_schema_are_not_served(tmp_path):
+    features, labels = build_flow_dataset(_records())
+    artifact = train_classifier(FLOW, features, labels, model_type="logistic", holdout_fraction=0.0)
+    path = EliteModelRegistryV2_5(str(tmp_path)).save(artifact)
+
+    payload = joblib.load(path)
+    payload["metadata"]["feature_names"] = payload["metadata"]["feature_names"][:-1]
+    joblib.dump(payload, path)
+    assert not EliteClassifierRuntimeV2_5(model_dir=str(tmp_path)).available(FLOW)
+
+
+def test_impact_calculator_uses_models_and_falls_back_to_rules(tmp_path):
+    records = _records()
+    registry = EliteModelRegistryV2_5(str(tmp_path))
+    registry.save(train_classifier(FLOW, *build_flow_dataset(records), model_type="random_forest"))
+    runtime = EliteClassifierRuntimeV2_5(model_dir=str(tmp_path), latency_budget_ms=1e6)
+
+    und = SimpleNamespace(**records.iloc[0].to_dict(), net_value_flow_5m_und=0.0)
+    calculator = EliteImpactCalculator(classifier_runtime=runtime)
+    flow = calculator._classify_flow_type(pd.DataFrame(), und)
+    assert flow == FlowType(runtime.predict_one(FLOW, und))
+    # no regime model was trained: the heuristic regime is used
+    assert calculator._determine_market_regime(und) == calculator._determine_market_regime_simple(und)
+
+    runtime.latency_budget_ms, runtime.max_budget_breaches = 0.0, 2
+    calculator._classify_flow_type(pd.DataFrame(), und)
+    calculator._classify_flow_type(pd.DataFrame(), und)
+    assert not runtime.available(FLOW)
+    assert calculator._classify_flow_type(pd.DataFrame(), und) == calculator._classify_flow_type_simple(pd.DataFrame(), und)
@@ -0,0 +1,81 @@
+"""
+Tests for the strike x expiry exposure surface: an incrementally maintained
+surface (changed expiries only, partial re-fetches, dropped expiries) must equal
+one built fresh from the same chain, and its strike profile must equal the
+per-strike groupby the metrics calculator used to run.
+"""
+
+import numpy as np
+import pytest
+
+from core_analytics_engine.eots_metrics.exposure_surface import SURFACE_METRICS, ExposureSurfaceEngine
+from data_management.synthetic_chain_generator_v2_5 import SyntheticChainGeneratorV2_5, SyntheticChainSpecV2_5
+
+
+@pytest.fixture(scope="module")
+def chain():
+    return SyntheticChainGeneratorV2_5(SyntheticChainSpecV2_5.for_contract_count(3_000)).generate_chain_frame()
+
+
+def _shift_expiry(frame, dte, scale=1.5):
+    shifted = frame.copy()
+    rows = shifted["dte_calc"] == dte
+    shifted.loc[rows, list(SURFACE_METRICS.values())] *= scale
+    return shifted
+
+
+def _assert_same_surface(actual, expected):
+    assert actual.strikes == expected.strikes
+    assert actual.dtes == expected.dtes
+    assert set(actual.grids) == set(expected.grids)
+    for metric in expected.grids:
+        np.testing.assert_allclose(actual.grid(metric), expected.grid(metric), rtol=1e-12, atol=1e-9)
+
+
+def test_rebuild_after_one_expiry_changes_equals_a_fresh_build(chain):
+    engine = ExposureSurfaceEngine()
+    engine.build(chain, "SPY")
+    dte = sorted(chain["dte_calc"].unique())[2]
+    updated = _shift_expiry(chain, dte)
+
+    incremental = engine.build(updated, "SPY")
+    assert incremental.updated_dtes == [float(dte)]
+    _assert_same_surface(incremental, ExposureSurfaceEngine().build(updated, "SPY"))
+
+    repeated = engine.build(updated, "SPY")
+    assert repeated.updated_dtes == []
+    _assert_same_surface(repeated, incremental)
+
+
+def test_partial_refetch_carries_other_expiries_over(chain):
+    engine = ExposureSurfaceEngine()
+    engine.build(chain, "SPY")
+    dte = sorted(chain["dte_calc"].unique())[0]
+    updated = _shift_expiry(chain, dte, scale=0.25)
+
+    incremental = engine.build(updated[updated["dte_calc"] == dte], "SPY", partial=True)
+    assert incremental.updated_dtes == [float(dte)]
+    _assert_same_surface(incremental, ExposureSurfaceEngine().build(updated, "SPY"))
+
+
+def test_expiries_missing_from_a_full_chain_are_dropped(chain):
+    engine = ExposureSurfaceEngine()
+    engine.build(chain, "SPY")
+    front = chain["dte_calc"].min()
+    rolled = chain[chain["dte_calc"] != front]
+
+    incremental = engine.build(rolled, "SPY")
+    assert float(front) not in incremental.dtes
+    _assert_same_surface(incremental, ExposureSurfaceEngine().build(rolled, "SPY"))
+
+
+def test_strike_profile_equals_the_per_strike_groupby(chain):
+    surface = ExposureSurfaceEngine().build(chain, "SPY")
+    for metric, column in SURFACE_METRICS.items():
+        expected = chain.groupby("strike")[column].sum()
+        profile = surface.strike_profile(metric)
+        np.testing.assert_allclose(profile.reindex(expected.index).to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-9)
+
+    near = surface.strike_profile("gex", max_dte=7)
+    expected = chain[chain["dte_calc"] <= 7].groupby("strike")["gxoi"].sum()
+    np.testing.assert_allclose(near.reindex(expected.index).to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-9)
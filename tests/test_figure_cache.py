@@ -0,0 +1,147 @@
+"""
+Tests for the dashboard figure layer: the chart cache hands out independent copies,
+figure patches are built only for data-only changes, and the update planner keeps
+what each rendered page was sent apart from every other page.
+"""
+
+from datetime import datetime
+
+import plotly.graph_objects as go
+import pytest
+from dash import Patch, dcc, html, no_update
+
+from dashboard_application.utils.figure_cache_v2_5 import (
+    FIGURE_GRAPH_TYPE,
+    FigureCacheV2_5,
+    FigureUpdatePlannerV2_5,
+    build_figure_patch,
+)
+
+
+def _figure(y, title="GEX", note="Updated: 10:30:00"):
+    figure = go.Figure(go.Bar(x=[1, 2, 3], y=y))
+    figure.update_layout(title=title)
+    figure.add_annotation(text=note, x=1, y=0, showarrow=False)
+    return figure
+
+
+def _page(y, heading="Structure"):
+    return html.Div([
+        html.H4(heading),
+        dcc.Graph(id={"type": FIGURE_GRAPH_TYPE, "chart": "structure.gex#0"}, figure=_figure(y)),
+    ])
+
+
+def _outputs(*charts):
+    return [{"id": {"type": FIGURE_GRAPH_TYPE, "chart": chart}, "property": "figure"} for chart in charts]
+
+
+def _operations(patch):
+    return {tuple(op["location"]): op["params"]["value"] for op in patch.to_plotly_json()["operations"]}
+
+
+@pytest.fixture
+def cache():
+    return FigureCacheV2_5(max_entries=4)
+
+
+def test_cache_hits_return_independent_copies_with_a_fresh_timestamp(cache, monkeypatch):
+    stamps = []
+    monkeypatch.setattr("dashboard_application.utils.figure_cache_v2_5.refresh_timestamp_annotations",
+                        lambda figure, timestamp: stamps.append((figure, timestamp)))
+    builds = []
+
+    def build():
+        builds.append(1)
+        return html.Div(dcc.Graph(figure=_figure([1, 2, 3])))
+
+    first = cache.get_or_build("structure.gex", ("SPY", [1, 2, 3]), build)
+    first.children.figure.data[0].y = (9, 9, 9)  # the caller's copy, not the cache's
+    second = cache.get_or_build("structure.gex", ("SPY", [1, 2, 3]), build, timestamp=datetime(2024, 1, 2, 10, 31))
+    third = cache.get_or_build("structure.gex", ("SPY", [1, 2, 3]), build)
+
+    assert len(builds) == 1 and second is not first and third is not second
+    assert second.children.figure.data[0].y == (1, 2, 3) and third.children.figure.data[0].y == (1, 2, 3)
+    assert second.children.id == {"type": FIGURE_GRAPH_TYPE, "chart": "structure.gex#0"}
+    # Only the copy handed out with a timestamp was refreshed
+    assert [(figure is second.children.figure, stamp) for figure, stamp in stamps] == [(True, datetime(2024, 1, 2, 10, 31))]
+
+    cache.get_or_build("structure.gex", ("SPY", [1, 2, 4]), build)
+    [report] = cache.get_chart_report()
+    assert (report["builds"], report["cache_hits"]) == (2, 2)
+
+
+def test_patch_only_for_trace_values_and_annotation_texts():
+    old = _figure([1, 2, 3]).to_plotly_json()
+    changed = _figure([1, 5, 3], note="Updated: 10:31:00").to_plotly_json()
+
+    patch = build_figure_patch(old, changed)
+    assert isinstance(patch, Patch)
+    assert _operations(patch) == {
+        ("data", 0, "y"): changed["data"][0]["y"],
+        ("layout", "annotations", 0, "text"): "Updated: 10:31:00",
+    }
+    assert build_figure_patch(old, old) is None
+    assert build_figure_patch(old, _figure([1, 5, 3], title="DEX").to_plotly_json()) is None
+    assert build_figure_patch(old, go.Figure([go.Bar(y=[1]), go.Bar(y=[2])]).to_plotly_json()) is None
+
+
+def test_pages_are_planned_against_what_each_was_sent(cache):
+    planner = FigureUpdatePlannerV2_5(cache)
+    outputs = _outputs("structure.gex#0")
+
+    # Two browser tabs render the same page and get their own tokens
+    content_a, figures_a, token_a = planner.plan("/structure", _page([1, 2, 3]), [])
+    content_b, figures_b, token_b = planner.plan("/structure", _page([1, 2, 3]), [])
+    assert content_a is not no_update and content_b is not no_update and token_a != token_b
+    assert planner.page_count == 2
+
+    # Tab A gets new data: a patch against what A was sent
+    content, [update], token = planner.plan("/structure", _page([1, 7, 3]), outputs, token_a)
+    assert content is no_update and token is no_update
+    assert list(_operations(update)) == [("data", 0, "y")]
+
+    # Tab B still shows the original figure: unchanged data needs nothing, and its first
+    # change is patched against its own figure, not the one A received
+    assert planner.plan("/structure", _page([1, 2, 3]), outputs, token_b)[1] == [no_update]
+    _, [update], _ = planner.plan("/structure", _page([1, 7, 3]), outputs, token_b)
+    assert list(_operations(update)) == [("data", 0, "y")]
+    assert planner.plan("/structure", _page([1, 7, 3]), outputs, token_a)[1] == [no_update]
+
+
+def test_unknown_tokens_and_layout_changes_get_a_full_render(cache):
+    planner = FigureUpdatePlannerV2_5(cache, max_pages=2)
+    outputs = _outputs("structure.gex#0")
+
+    def full_render(page_key, layout, sent_token):
+        content, updates, new_token = planner.plan(page_key, layout, outputs, sent_token)
+        assert content is layout and updates == [no_update] and new_token not in (no_update, sent_token)
+        return new_token
+
+    token = full_render("/structure", _page([1, 2, 3]), None)  # first render of a tab
+    full_render("/structure", _page([1, 2, 3]), "from-another-worker")
+    token = full_render("/structure", _page([1, 2, 3], heading="Changed"), token)
+    token = full_render("/flow", _page([1, 2, 3]), token)
+    assert planner.plan("/flow", _page([1, 2, 3]), outputs, token)[0] is no_update
+
+    # Oldest pages are evicted; an evicted page is simply rendered in full again
+    assert planner.page_count == 2
+    first = full_render("/flow", _page([1, 2, 3]), None)
+    full_render("/flow", _page([1, 2, 3]), None)
+    full_render("/flow", _page([1, 2, 3]), None)
+    full_render("/flow", _page([1, 2, 3]), first)
+
+    report = {entry["chart_id"]: entry for entry in cache.get_chart_report()}
+    assert report["structure.gex"]["full_updates"] == 8 and report["structure.gex"]["unchanged_updates"] == 1
+
+
+def test_planner_names_unmanaged_graphs_by_page():
+    planner = FigureUpdatePlannerV2_5(FigureCacheV2_5())
+    layout = html.Div([dcc.Graph(figure=_figure([1])), dcc.Graph(id="fixed", figure=_figure([2]))])
+    _, _, token = planner.plan("/flow", layout, [])
+    assert layout.children[0].id == {"type": FIGURE_GRAPH_TYPE, "chart": "/flow/graph#0"}
+    assert layout.children[1].id == "fixed"
+
+    layout = html.Div([dcc.Graph(figure=_figure([5])), dcc.Graph(id="fixed", figure=_figure([2]))])
+    content, [update], _ = planner.plan("/flow", layout, _outputs("/flow/graph#0"), token)
+    assert content is no_update and list(_operations(update)) == [("data", 0, "y")]
@@ -0,0 +1,147 @@
+"""
+Accuracy tests for the vectorized Black-Scholes greek/IV engine: closed-form
+reference values, greeks against finite differences of the model price, IV
+round trips across moneyness and expiry, and gap repair on a damaged chain.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core_analytics_engine.eots_metrics.greek_engine import (
+    GREEK_COLUMNS,
+    BlackScholesGreekEngine,
+    black_scholes_greeks,
+    implied_volatility,
+)
+from data_management.synthetic_chain_generator_v2_5 import SyntheticChainGeneratorV2_5, SyntheticChainSpecV2_5
+from data_models import GreekEnrichmentSettings
+
+
+def _greeks(S, K, T, sigma, call, r=0.0, q=0.0):
+    out = black_scholes_greeks(np.atleast_1d(float(S)), np.atleast_1d(float(K)), np.atleast_1d(float(T)),
+                               np.atleast_1d(float(sigma)), np.atleast_1d(call), r, q)
+    return {name: float(value[0]) for name, value in out.items()}
+
+
+def test_prices_and_first_order_greeks_match_closed_form_references():
+    # Hull, Options, Futures and Other Derivatives: S=42, K=40, r=10%, sigma=20%, T=0.5
+    call = _greeks(42.0, 40.0, 0.5, 0.2, True, r=0.1)
+    put = _greeks(42.0, 40.0, 0.5, 0.2, False, r=0.1)
+    assert call["price"] == pytest.approx(4.7594, abs=1e-4)
+    assert put["price"] == pytest.approx(0.8086, abs=1e-4)
+    assert call["delta"] == pytest.approx(0.7791, abs=1e-4)
+    assert put["delta"] == pytest.approx(call["delta"] - 1.0, abs=1e-12)
+    assert call["gamma"] == pytest.approx(put["gamma"]) == pytest.approx(0.04996, abs=1e-5)
+    assert call["vega"] == pytest.approx(0.0881, abs=1e-4)  # per vol point
+
+
+@pytest.mark.parametrize("call", [True, False])
+@pytest.mark.parametrize("S,K,T,sigma,r,q", [
+    (100.0, 100.0, 30 / 365, 0.20, 0.05, 0.00),
+    (5000.0, 4700.0, 7 / 365, 0.15, 0.05, 0.01),
+    (450.0, 520.0, 1.0, 0.35, 0.02, 0.015),
+])
+def test_greeks_match_finite_differences_of_the_model_price(call, S, K, T, sigma, r, q):
+    g = _greeks(S, K, T, sigma, call, r, q)
+
+    def price(s=S, t=T, v=sigma):
+        return _greeks(s, K, t, v, call, r, q)["price"]
+
+    def delta(t=T, v=sigma):
+        return _greeks(S, K, t, v, call, r, q)["delta"]
+
+    hs, hv, ht = S * 1e-5, 1e-4, 1e-5
+    assert g["delta"] == pytest.approx((price(s=S + hs) - price(s=S - hs)) / (2 * hs), rel=1e-5, abs=1e-8)
+    assert g["gamma"] == pytest.approx((price(s=S + hs) - 2 * price() + price(s=S - hs)) / hs ** 2, rel=1e-3)
+    assert g["vega"] == pytest.approx((price(v=sigma + hv) - price(v=sigma - hv)) / (2 * hv) / 100.0, rel=1e-5)
+    assert g["theta"] == pytest.approx(-(price(t=T + ht) - price(t=T - ht)) / (2 * ht) / 365.0, rel=1e-4, abs=1e-9)
+    assert g["vanna"] == pytest.approx((delta(v=sigma + hv) - delta(v=sigma - hv)) / (2 * hv) / 100.0, rel=1e-4, abs=1e-9)
+    assert g["charm"] == pytest.approx(-(delta(t=T + ht) - delta(t=T - ht)) / (2 * ht) / 365.0, rel=1e-4, abs=1e-9)
+    vega_up = _greeks(S, K, T, sigma + hv, call, r, q)["vega"]
+    vega_down = _greeks(S, K, T, sigma - hv, call, r, q)["vega"]
+    assert g["vomma"] == pytest.approx((vega_up - vega_down) / (2 * hv), rel=1e-4, abs=1e-9)
+
+
+def test_implied_volatility_round_trips_across_moneyness_and_expiry():
+    rng = np.random.default_rng(5)
+    n = 5_000
+    spot = np.full(n, 5000.0)
+    strike = spot * np.exp(rng.uniform(-0.3, 0.3, n))
+    t_years = rng.uniform(0.5, 365.0, n) / 365.0
+    sigma = rng.uniform(0.05, 1.5, n)
+    is_call = rng.random(n) < 0.5
+    price = black_scholes_greeks(spot, strike, t_years, sigma, is_call, 0.05, 0.0)["price"]
+
+    solved = implied_volatility(price, spot, strike, t_years, is_call, 0.05, 0.0)
+    # Far wings are worth fractions of a cent and deep ITM quotes carry almost no time
+    # value, so their price (converged to 1e-8 relative) does not pin down the IV
+    vega = black_scholes_greeks(spot, strike, t_years, sigma, is_call, 0.05, 0.0)["vega"] * 100.0
+    identifiable = (price > 1e-6) & (vega > 1e-2 * price)
+    assert identifiable.mean() > 0.9
+    assert np.isfinite(solved[identifiable]).all()
+    np.testing.assert_allclose(solved[identifiable], sigma[identifiable], rtol=1e-5)
+
+
+def test_implied_volatility_rejects_prices_outside_no_arbitrage_bounds():
+    spot, strike, t = np.full(4, 100.0), np.full(4, 90.0), np.full(4, 0.25)
+    is_call = np.array([True, True, False, True])
+    # below intrinsic, above the spot ceiling, a zero premium, and a NaN quote
+    solved = implied_volatility(np.array([5.0, 150.0, 0.0, np.nan]), spot, strike, t, is_call)
+    assert np.isnan(solved).all()
+
+
+def test_enrich_chain_repairs_damaged_rows_to_the_reference_greeks():
+    spec = SyntheticChainSpecV2_5.for_contract_count(2_000)
+    clean = SyntheticChainGeneratorV2_5(spec).generate_chain_frame()
+    rng = np.random.default_rng(11)
+    damaged = clean.copy()
+    lost_iv = rng.random(len(clean)) < 0.1
+    null_gamma = rng.random(len(clean)) < 0.1
+    damaged.loc[lost_iv, "iv"] = np.nan
+    damaged.loc[lost_iv, ["bid_price", "ask_price"]] = np.nan  # solve from raw_price
+    damaged.loc[lost_iv, list(GREEK_COLUMNS.values())] = np.nan
+    damaged.loc[null_gamma, "gamma_contract"] = None
+    damaged.loc[null_gamma, ["gxoi", "gxvolm"]] = 0.0
+
+    engine = BlackScholesGreekEngine(GreekEnrichmentSettings(enabled=True, risk_free_rate=spec.risk_free_rate))
+    repaired, report = engine.enrich_chain(damaged, spec.underlying_price)
+
+    # The generator floors prices at 0.01, and deep ITM / 0DTE quotes have no time value left
+    identifiable = lost_iv & ((clean["raw_price"] > 0.05) & (clean["vega_contract"] > 1e-2 * clean["raw_price"])).to_numpy()
+    assert identifiable.sum() > 50
+    assert report.iv_solved >= identifiable.sum()
+    np.testing.assert_allclose(repaired.loc[identifiable, "iv"], clean.loc[identifiable, "iv"], rtol=1e-5)
+    for column in GREEK_COLUMNS.values():
+        np.testing.assert_allclose(repaired.loc[identifiable, column], clean.loc[identifiable, column], rtol=1e-4, atol=1e-9)
+    # Null vendor gammas are refilled at the vendor IV; unidentifiable rows use the expiry median IV
+    known_iv = ~lost_iv | identifiable
+    np.testing.assert_allclose(repaired.loc[known_iv, "gamma_contract"], clean.loc[known_iv, "gamma_contract"], rtol=1e-4, atol=1e-12)
+    np.testing.assert_allclose(repaired.loc[known_iv, "gxoi"], clean.loc[known_iv, "gxoi"], rtol=1e-4, atol=1e-9)
+    np.testing.assert_allclose(repaired["gxoi"], repaired["gamma_contract"] * repaired["open_interest"], rtol=1e-9)
+
+    untouched = ~(lost_iv | null_gamma)
+    pd.testing.assert_frame_equal(repaired[untouched], clean[untouched])
+
+
+def test_clean_chain_is_returned_unchanged():
+    frame = SyntheticChainGeneratorV2_5(SyntheticChainSpecV2_5.for_contract_count(500)).generate_chain_frame()
+    engine = BlackScholesGreekEngine(GreekEnrichmentSettings(enabled=True))
+    out, report = engine.enrich_chain(frame, 5000.0)
+    assert report.iv_solved == 0 and report.rows_recomputed == 0 and report.inconsistent_rows == 0
+    pd.testing.assert_frame_equal(out, frame)
+
+
+def test_vendor_zero_greeks_are_values_not_gaps():
+    frame = SyntheticChainGeneratorV2_5(SyntheticChainSpecV2_5.for_contract_count(500)).generate_chain_frame()
+    frame["vomma_contract"] = 0.0
+    frame.loc[frame.index[:10], "charm_contract"] = 0.0
+    frame = frame.drop(columns=["vanna_contract"])
+    engine = BlackScholesGreekEngine(GreekEnrichmentSettings(enabled=True))
+
+    out, report = engine.enrich_chain(frame, 5000.0)
+
+    assert (out["vomma_contract"] == 0.0).all() and (out["charm_contract"].iloc[:10] == 0.0).all()
+    # An absent column is all-missing and is filled for every contract
+    assert report.rows_recomputed == 0 and report.cells_filled == len(frame)
+    assert out["vanna_contract"].notna().all()
@@ -0,0 +1,156 @@
+"""
+Tests for incremental key levels: windowed A-MSPI extrema equal a full find_peaks
+rescan, levels with no hysteresis equal the identifier's full rebuild, and the
+hysteresis band, absence budget and per-cycle diffs behave as documented.
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core_analytics_engine.key_level_identifier_v2_5 import SOURCE_COLUMNS, KeyLevelIdentifierV2_5
+from core_analytics_engine.key_level_tracker_v2_5 import KeyLevelTrackerV2_5, _local_extrema
+
+PRICE = 500.0
+STRIKES = np.arange(480.0, 521.0)
+
+
+class _Settings:
+    """Config manager stand-in: every setting at its default."""
+
+    def get_setting(self, path, default=None):
+        return default
+
+
+def _identifier():
+    return KeyLevelIdentifierV2_5(_Settings())
+
+
+def _underlying(price=PRICE):
+    return SimpleNamespace(price=price, timestamp=datetime(2024, 1, 2, 10, 30))
+
+
+def _frame(strikes=STRIKES, **series):
+    frame = pd.DataFrame({"strike": strikes})
+    for source, column in SOURCE_COLUMNS.items():
+        frame[column] = series.get(source, np.zeros(len(strikes)))
+    return frame
+
+
+def _nvp(tracked_score, anchor_score=10e6):
+    """Anchor NVP support at 495 (conviction 1.0); tracked support at 498 scales against it."""
+    nvp = np.zeros(len(STRIKES))
+    nvp[STRIKES == 495.0] = anchor_score
+    nvp[STRIKES == 498.0] = tracked_score
+    return nvp
+
+
+def _prices(levels):
+    return sorted(level.level_price for level in levels)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_windowed_extrema_equal_a_full_rescan(seed):
+    rng = np.random.default_rng(seed)
+    tracker = KeyLevelTrackerV2_5(_identifier(), input_tolerance_pct=0.0)
+    # Coarse integer values so plateaus form and break as strikes change
+    a_mspi = rng.integers(-3, 4, len(STRIKES)).astype(float)
+    tracker.update("SPY", _frame(a_mspi=a_mspi), _underlying())
+
+    for _ in range(60):
+        positions = rng.choice(len(STRIKES), size=rng.integers(1, 4), replace=False)
+        a_mspi[positions] = rng.integers(-3, 4, len(positions))
+        _, diff = tracker.update("SPY", _frame(a_mspi=a_mspi), _underlying())
+        assert not diff.full_rescan
+
+        state = tracker._states["SPY"]
+        np.testing.assert_array_equal(state.reference["a_mspi"], a_mspi)
+        is_peak, is_trough = _local_extrema(a_mspi)
+        np.testing.assert_array_equal(state.is_peak, is_peak)
+        np.testing.assert_array_equal(state.is_trough, is_trough)
+
+
+def test_levels_without_hysteresis_equal_the_identifier():
+    rng = np.random.default_rng(7)
+    identifier = _identifier()
+    tracker = KeyLevelTrackerV2_5(identifier, input_tolerance_pct=0.0, hysteresis_band=0.0,
+                                  strength_delta=0.0, absent_cycles_to_remove=1)
+    series = {
+        "a_mspi": rng.normal(0.0, 1.0, len(STRIKES)),
+        "nvp": rng.normal(0.0, 2e6, len(STRIKES)),
+        "sgdhp": rng.normal(0.0, 1.0, len(STRIKES)),
+        "ugch": rng.normal(0.0, 1.0, len(STRIKES)),
+    }
+    for cycle in range(10):
+        for values in series.values():
+            positions = rng.choice(len(STRIKES), size=3, replace=False)
+            values[positions] += rng.normal(0.0, values.std(), 3)
+        underlying = _underlying(PRICE + cycle * 0.7)
+        frame = _frame(**series)
+
+        tracked, _ = tracker.update("SPY", frame, underlying)
+        expected = identifier.identify_and_score_key_levels(frame, underlying)
+        for side in ("supports", "resistances"):
+            actual = {(l.level_price, l.source_identifier): l.conviction_score for l in getattr(tracked, side)}
+            wanted = {(l.level_price, l.source_identifier): l.conviction_score for l in getattr(expected, side)}
+            assert actual.keys() == wanted.keys()
+            for key, conviction in wanted.items():
+                assert actual[key] == pytest.approx(conviction)
+
+
+def test_hysteresis_band_and_diffs():
+    tracker = KeyLevelTrackerV2_5(_identifier(), hysteresis_band=0.1, strength_delta=0.05, absent_cycles_to_remove=2)
+    assert (tracker.enter_conviction, tracker.exit_conviction) == (0.5, pytest.approx(0.4))
+
+    def cycle(tracked_score):
+        levels, diff = tracker.update("SPY", _frame(nvp=_nvp(tracked_score)), _underlying())
+        assert tracker.last_diff("SPY") is diff
+        return levels, diff
+
+    levels, diff = cycle(6e6)  # conviction 0.6: enters
+    assert diff.full_rescan and diff.rescanned_strikes == len(STRIKES)
+    assert _prices(diff.added) == [495.0, 498.0] and _prices(levels.supports) == [495.0, 498.0]
+
+    levels, diff = cycle(6e6)
+    assert diff.is_empty and diff.unchanged_count == 2 and diff.rescanned_strikes == 0 and not diff.full_rescan
+
+    levels, diff = cycle(4.5e6)  # 0.45: inside the band, stays and is reported weaker
+    assert _prices(diff.weakened) == [498.0] and diff.weakened[0].conviction_score == pytest.approx(0.45)
+    assert diff.rescanned_strikes == 1 and _prices(levels.supports) == [495.0, 498.0]
+
+    levels, diff = cycle(4.7e6)  # moved by less than strength_delta: model kept as is
+    assert diff.is_empty and levels.supports[0].conviction_score == pytest.approx(0.45)
+
+    levels, diff = cycle(3.5e6)  # 0.35: below the exit conviction
+    assert _prices(diff.removed) == [498.0] and _prices(levels.supports) == [495.0]
+
+    levels, diff = cycle(4.5e6)  # back inside the band, but below the entry conviction
+    assert diff.is_empty and _prices(levels.supports) == [495.0]
+
+    levels, diff = cycle(5.5e6)
+    assert _prices(diff.added) == [498.0]
+    _, diff = cycle(5.5e6 * 1.2)
+    assert _prices(diff.strengthened) == [498.0]
+
+
+def test_absent_levels_survive_one_cycle_and_resets_drop_everything():
+    tracker = KeyLevelTrackerV2_5(_identifier(), absent_cycles_to_remove=2)
+    tracker.update("SPY", _frame(nvp=_nvp(6e6)), _underlying())
+
+    # Below the NVP threshold: no candidate at 498 any more
+    levels, diff = tracker.update("SPY", _frame(nvp=_nvp(0.5e6)), _underlying())
+    assert diff.is_empty and _prices(levels.supports) == [495.0, 498.0]
+    levels, diff = tracker.update("SPY", _frame(nvp=_nvp(0.5e6)), _underlying())
+    assert _prices(diff.removed) == [498.0] and _prices(levels.supports) == [495.0]
+
+    # A different strike grid is a full rescan that keeps the tracked levels
+    _, diff = tracker.update("SPY", _frame(STRIKES[1:], nvp=_nvp(0.5e6)[1:]), _underlying())
+    assert diff.full_rescan and diff.is_empty
+
+    # Unusable input drops every tracked level
+    levels, diff = tracker.update("SPY", _frame(STRIKES[:0]), _underlying())
+    assert _prices(diff.removed) == [495.0] and diff.full_rescan and not levels.supports
+    assert "SPY" not in tracker._states
@@ -0,0 +1,178 @@
+"""
+Tests for the persistent market context cache, run offline against the fixture provider.
+
+Covers cold fetches and cross-instance disk reuse, TTL expiry with incremental top-up,
+coalescing of concurrent callers, reference-data TTLs and stale fallback.
+"""
+
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_management.market_context_cache_v2_5 import (
+    FixtureMarketDataProviderV2_5,
+    MarketContextCacheV2_5,
+)
+
+
+def _bars(days=120, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=days, name="date")
+    close = 400 + rng.normal(0, 2, days).cumsum()
+    return pd.DataFrame({
+        "Open": close - 0.5, "High": close + 1.0, "Low": close - 1.0, "Close": close,
+        "Volume": rng.integers(1_000_000, 5_000_000, days).astype(float),
+    }, index=index)
+
+
+class _CountingProvider(FixtureMarketDataProviderV2_5):
+    """Fixture provider that records every fetch and can be slowed down or made to fail."""
+
+    def __init__(self, *args, delay=0.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.delay = delay
+        self.fail = False
+        self.history_calls = []
+        self.info_calls = 0
+
+    def fetch_history(self, symbol, start):
+        self.history_calls.append((symbol, start))
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("provider down")
+        return super().fetch_history(symbol, start)
+
+    def fetch_info(self, symbol):
+        self.info_calls += 1
+        return super().fetch_info(symbol)
+
+
+def _age(cache, dataset, symbol, seconds):
+    path = cache._path(dataset, symbol)
+    mtime = path.stat().st_mtime - seconds
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def provider():
+    return _CountingProvider({"SPY": _bars()}, {"SPY": {"sector": "ETF", "beta": 1.0, "marketCap": 5e11,
+                                                         "industry": "Index", "quoteType": "ETF"}})
+
+
+def test_history_is_fetched_once_and_shared_through_disk(provider, tmp_path):
+    cache = MarketContextCacheV2_5(provider, cache_dir=tmp_path)
+    first = cache.get_history("SPY", period_days=92)
+    assert list(first.columns) == ["open", "high", "low", "close", "volume"]
+    assert first.index[0] >= pd.Timestamp.now().normalize() - pd.Timedelta(days=92)
+    pd.testing.assert_frame_equal(cache.get_history("SPY", period_days=92), first)
+
+    # A second instance (another analyzer or process) reads the file instead of the provider
+    other = MarketContextCacheV2_5(provider, cache_dir=tmp_path)
+    pd.testing.assert_frame_equal(other.get_history("SPY", period_days=92), first)
+    assert len(provider.history_calls) == 1
+    assert other.stats["disk_hits"] == 1
+
+
+def test_expired_history_is_topped_up_from_the_last_cached_bar(provider, tmp_path):
+    full = provider.histories["SPY"]
+    provider.histories["SPY"] = full.iloc[:-5]
+    cache = MarketContextCacheV2_5(provider, cache_dir=tmp_path, history_ttl_seconds=60)
+    cache.get_history("SPY", period_days=92)
+
+    provider.histories["SPY"] = full
+    _age(cache, "history", "SPY", 120)
+    refreshed = cache.get_history("SPY", period_days=92)
+
+    assert cache.stats["top_ups"] == 1
+    assert provider.history_calls[-1][1] == full.index[-6]  # refetched from the last cached bar on
+    expected = full[full.index >= refreshed.index[0]]
+    np.testing.assert_allclose(refreshed["close"].to_numpy(), expected["close"].to_numpy())
+    assert refreshed.index.equals(expected.index)
+
+
+def test_longer_period_than_cached_triggers_full_fetch(provider, tmp_path):
+    cache = MarketContextCacheV2_5(provider, cache_dir=tmp_path)
+    cache.get_history("SPY", period_days=30)
+    longer = cache.get_history("SPY", period_days=150)
+    assert cache.stats["full_fetches"] == 2
+    bars = provider.histories["SPY"]
+    assert longer.index.equals(bars.index[bars.index >= pd.Timestamp.now().normalize() - pd.Timedelta(days=150)])
+    # The shorter window is now answered from the wider cached range
+    cache.get_history("SPY", period_days=30)
+    assert len(provider.history_calls) == 2
+
+
+def test_concurrent_callers_share_one_fetch(tmp_path):
+    provider = _CountingProvider({"QQQ": _bars(seed=1)}, delay=0.2)
+    cache = MarketContextCacheV2_5(provider, cache_dir=tmp_path)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_history("QQQ"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(provider.history_calls) == 1
+    assert len(results) == 8 and all(r.equals(results[0]) for r in results)
+
+
+def test_info_has_its_own_ttl(provider, tmp_path):
+    cache = MarketContextCacheV2_5(provider, cache_dir=tmp_path, history_ttl_seconds=60, info_ttl_seconds=3600)
+    assert cache.get_info("SPY")["sector"] == "ETF"
+    cache.get_history("SPY")
+    _age(cache, "info", "SPY", 120)
+    _age(cache, "history", "SPY", 120)
+    cache.get_info("SPY")
+    cache.get_history("SPY")
+    assert provider.info_calls == 1  # still within the info TTL
+    assert len(provider.history_calls) == 2  # history expired and was topped up
+
+
+def test_stale_data_is_served_when_the_provider_fails(provider, tmp_path):
+    cache = MarketContextCacheV2_5(provider, cache_dir=tmp_path, history_ttl_seconds=60)
+    cached = cache.get_history("SPY")
+    provider.fail = True
+    _age(cache, "history", "SPY", 120)
+    pd.testing.assert_frame_equal(cache.get_history("SPY"), cached)
+    assert cache.stats["stale_served"] == 1
+    with pytest.raises(ConnectionError):
+        cache.get_history("IWM")
+
+
+def test_fixture_provider_loads_directory(tmp_path):
+    fixtures = tmp_path / "fixtures"
+    fixtures.mkdir()
+    _bars(seed=3).to_csv(fixtures / "XLK.csv")
+    (fixtures / "XLK.info.json").write_text('{"sector": "Technology"}', encoding="utf-8")
+    cache = MarketContextCacheV2_5.from_settings({
+        "market_data_provider": "fixture",
+        "market_data_fixture_dir": str(fixtures),
+        "market_data_cache_dir": str(tmp_path / "cache"),
+    })
+    assert cache.get_info("XLK") == {"sector": "Technology"}
+    assert not cache.get_history("XLK", period_days=30).empty
+
+
+def test_cache_only_reads_never_wait_on_or_create_lock_files(provider, tmp_path):
+    MarketContextCacheV2_5(provider, cache_dir=tmp_path).get_history("SPY")
+    locks = set(tmp_path.rglob("*.lock"))
+    cache_only = MarketContextCacheV2_5(None, cache_dir=tmp_path, history_ttl_seconds=60)
+    _age(cache_only, "history", "SPY", 120)
+    assert not cache_only.get_history("SPY").empty
+    assert cache_only.stats["stale_served"] == 1
+    with pytest.raises(LookupError):
+        cache_only.get_info("SPY")
+    assert set(tmp_path.rglob("*.lock")) == locks
+
+
+def test_missing_fixture_directory_leaves_the_cache_without_a_provider(tmp_path):
+    cache = MarketContextCacheV2_5.from_settings({
+        "market_data_provider": "fixture",
+        "market_data_fixture_dir": str(tmp_path / "missing"),
+        "market_data_cache_dir": str(tmp_path / "cache"),
+    })
+    assert cache.provider is None
+    assert MarketContextCacheV2_5.from_settings({"market_data_provider": "fixture"}).provider is None
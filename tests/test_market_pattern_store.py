@@ -0,0 +1,151 @@
+"""
+Tests for the indexed market-pattern store against a SQLite stand-in.
+
+Covers batched inserts, ring-served lookbacks (no query), index use by the
+lookback query, and reloading the ring from the database in a fresh store.
+"""
+
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import pytest
+from pydantic import BaseModel, Field
+
+from data_management.market_pattern_store_v2_5 import MarketPatternStoreV2_5
+
+TABLE = "market_pattern_events"
+
+
+class _Pattern(BaseModel):
+    pattern_id: str
+    pattern_type: str
+    confidence_score: float
+    timestamp: datetime
+    supporting_metrics: dict = Field(default_factory=dict)
+    symbol: Optional[str] = None
+
+
+class _CountingConnection:
+    """sqlite3 connection wrapper that counts executed statements by kind."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.selects = 0
+        self.executemany_calls = 0
+
+    def __call__(self):
+        return self
+
+    def cursor(self):
+        outer = self
+        cursor = self.conn.cursor()
+
+        class _Cursor:
+            def execute(self, statement, params=()):
+                if statement.lstrip().upper().startswith("SELECT"):
+                    outer.selects += 1
+                return cursor.execute(statement, params)
+
+            def executemany(self, statement, rows):
+                outer.executemany_calls += 1
+                return cursor.executemany(statement, rows)
+
+            def fetchall(self):
+                return cursor.fetchall()
+
+        return _Cursor()
+
+    def commit(self):
+        self.conn.commit()
+
+
+@pytest.fixture
+def conn():
+    connection = sqlite3.connect(":memory:")
+    yield connection
+    connection.close()
+
+
+def _patterns(symbol, minutes_ago, start=0):
+    now = datetime.now(timezone.utc)
+    return [
+        _Pattern(
+            pattern_id=f"{symbol}-{start + i}",
+            pattern_type=("ACCUMULATION", "CONSOLIDATION", "TREND_CONTINUATION")[i % 3],
+            confidence_score=0.5 + 0.01 * i,
+            timestamp=now - timedelta(minutes=m),
+        )
+        for i, m in enumerate(minutes_ago)
+    ]
+
+
+def _store(connection_provider, **kwargs):
+    return MarketPatternStoreV2_5(connection_provider=connection_provider, dialect="sqlite", model_cls=_Pattern,
+                                  flush_interval_seconds=3600, **kwargs)
+
+
+def test_patterns_are_written_in_batches(conn):
+    store = _store(lambda: conn, batch_size=10)
+    store.add_many("SPY", _patterns("SPY", range(25)))
+    assert conn.execute(f"SELECT COUNT(*) FROM {TABLE}").fetchone()[0] == 20  # two full batches so far
+    store.close()
+    rows = conn.execute(f"SELECT symbol, pattern_type, confidence, data FROM {TABLE} ORDER BY id").fetchall()
+    assert len(rows) == 25
+    assert store.stats["batches"] == 3
+    assert rows[0][0] == "SPY" and rows[0][1] == "ACCUMULATION" and rows[0][2] == pytest.approx(0.5)
+    assert '"pattern_id": "SPY-0"' in rows[0][3]
+
+
+def test_recent_lookback_is_served_from_the_ring(conn):
+    counter = _CountingConnection(conn)
+    store = _store(counter, batch_size=5)
+    store.add_many("SPY", _patterns("SPY", [45, 20, 10]))
+    store.add_many("QQQ", _patterns("QQQ", [2]))
+
+    # The first lookback loads the ring window from the database once
+    assert [p.pattern_id for p in store.recent("SPY", lookback_minutes=30)] == ["SPY-2", "SPY-1"]
+    assert counter.selects == 1
+
+    store.add_many("SPY", _patterns("SPY", [5, 1], start=3))
+    recent = store.recent("SPY", lookback_minutes=30)
+    assert [p.pattern_id for p in recent] == ["SPY-4", "SPY-3", "SPY-2", "SPY-1"]
+    assert [p.pattern_id for p in store.recent("SPY", 30, pattern_types=["ACCUMULATION"])] == ["SPY-3"]
+    assert counter.selects == 1
+    # Four patterns were flushed before the first lookback; two are still pending
+    assert counter.executemany_calls == 1
+    assert store.stats["written"] == 4
+
+
+def test_fresh_store_reloads_ring_from_database(conn):
+    writer = _store(lambda: conn)
+    writer.add_many("SPY", _patterns("SPY", [90, 40, 25, 12, 3]))
+    writer.add_many("IWM", _patterns("IWM", [4]))
+    writer.close()
+
+    counter = _CountingConnection(conn)
+    reader = _store(counter, ring_window_minutes=60)
+    assert [p.pattern_id for p in reader.recent("SPY", 30)] == ["SPY-4", "SPY-3", "SPY-2"]
+    assert counter.selects == 1
+    # Second lookback inside the loaded window does not query again
+    assert [p.pattern_id for p in reader.recent("SPY", 15)] == ["SPY-4", "SPY-3"]
+    assert counter.selects == 1
+    # Beyond the ring window the indexed query answers directly
+    assert [p.pattern_id for p in reader.recent("SPY", 120)] == ["SPY-4", "SPY-3", "SPY-2", "SPY-1", "SPY-0"]
+    assert counter.selects == 2
+
+
+def test_lookback_query_uses_composite_index(conn):
+    store = _store(lambda: conn)
+    store.ensure_schema()
+    plan = conn.execute(
+        f"EXPLAIN QUERY PLAN SELECT data FROM {TABLE} WHERE symbol = ? AND ts > ? ORDER BY ts DESC",
+        ("SPY", "2024-01-01"),
+    ).fetchall()
+    assert any("USING INDEX idx_market_pattern_events_symbol_ts" in row[-1] for row in plan), plan
+
+
+def test_memory_only_store_answers_from_ring():
+    store = MarketPatternStoreV2_5(connection_provider=None, model_cls=_Pattern, batch_size=1)
+    store.add_many("SPY", _patterns("SPY", [50, 10, 2]))
+    assert [p.pattern_id for p in store.recent("SPY", 30)] == ["SPY-2", "SPY-1"]
@@ -0,0 +1,145 @@
+"""
+Tests for the deadline-bounded MCP fan-out executor and the warm MCP server pool.
+"""
+
+import asyncio
+import sys
+import time
+
+import psutil
+
+from core_analytics_engine.mcp_fanout_executor_v2_5 import (
+    DeadlineFanOutExecutorV2_5,
+    FanOutOutcome,
+    FanOutTask,
+    MCPServerPoolV2_5,
+)
+
+
+def _source(result=None, delay=0.0, error=None):
+    async def run():
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return result
+    return run
+
+
+def test_sources_run_concurrently_and_stragglers_are_cancelled():
+    cancelled = []
+
+    async def hung():
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    tasks = [
+        FanOutTask("memory", _source("m", delay=0.2)),
+        FanOutTask("news", _source("n", delay=0.2)),
+        FanOutTask("database", hung, weight=2.0),
+        FanOutTask("research", _source(error=RuntimeError("down"))),
+    ]
+    executor = DeadlineFanOutExecutorV2_5(default_budget_seconds=5.0, cancel_grace_seconds=0.1)
+    started = time.monotonic()
+    outcome = asyncio.run(executor.run(tasks, deadline_seconds=0.5))
+
+    assert time.monotonic() - started < 1.0  # sources overlapped; the hung one did not hold the result
+    assert outcome.ordered(["memory", "news", "database"]) == ["m", "n"]
+    assert outcome.timed_out == ["database"] and cancelled == [True]
+    assert outcome.failed == {"research": "RuntimeError: down"}
+    assert outcome.completeness == 2 / 5
+    assert outcome.partial
+
+
+def test_per_source_budgets_override_the_default():
+    executor = DeadlineFanOutExecutorV2_5(default_budget_seconds=1.0, task_budgets={"slow": 0.05})
+    outcome = asyncio.run(executor.run([
+        FanOutTask("slow", _source("s", delay=0.3)),
+        FanOutTask("fast", _source("f", delay=0.1), budget_seconds=0.2),
+    ], deadline_seconds=2.0))
+    assert outcome.results == {"fast": "f"}
+    assert outcome.timed_out == ["slow"]
+
+
+def test_exhausted_deadline_skips_sources_and_outcomes_combine():
+    executor = DeadlineFanOutExecutorV2_5()
+    gathered = asyncio.run(executor.run([FanOutTask("memory", _source("m"))], deadline_seconds=1.0))
+    skipped = asyncio.run(executor.run([FanOutTask("recursive_analysis", _source("r"))], deadline_seconds=0.0))
+    combined = FanOutOutcome.combine(gathered, skipped)
+    assert skipped.skipped == ["recursive_analysis"]
+    assert combined.completeness == 0.5
+    assert combined.summary()["completed_sources"] == ["memory"]
+
+
+def test_server_pool_reuses_live_processes():
+    configs = {"echo": {"command": sys.executable, "args": ["-c", "import sys; sys.stdin.read()"], "env": {}}}
+
+    async def scenario():
+        pool = MCPServerPoolV2_5(configs, restart_backoff_seconds=0.0)
+        assert await pool.start(["echo"]) == {"echo": True}
+        pid = pool.processes["echo"].pid
+        await pool.start(["echo"])
+        reused = pool.processes["echo"].pid == pid
+
+        pool.processes["echo"].kill()
+        await pool.processes["echo"].wait()
+        assert pool.live_servers() == []  # exited: respawned in the background
+        await asyncio.sleep(0.2)
+        respawned = pool.is_alive("echo") and pool.processes["echo"].pid != pid
+        await pool.stop()
+        return reused, respawned, pool.processes
+
+    reused, respawned, processes = asyncio.run(scenario())
+    assert reused and respawned
+    assert processes == {}
+
+
+
+def test_servers_left_running_are_terminated_without_a_loop():
+    configs = {"echo": {"command": sys.executable, "args": ["-c", "import sys; sys.stdin.read()"], "env": {}}}
+    pool = MCPServerPoolV2_5(configs)
+
+    async def scenario():
+        await pool.start(["echo"])
+        return pool.processes["echo"].pid
+
+    pid = asyncio.run(scenario())  # loop closed, server still running (as at interpreter exit)
+    assert psutil.pid_exists(pid)
+    pool.terminate_sync(timeout_seconds=2.0)
+    assert pool.processes == {}
+    assert not psutil.pid_exists(pid)
+
+def test_source_cancelled_from_inside_is_reported_as_failed():
+    async def gives_up():
+        raise asyncio.CancelledError()
+
+    tasks = [FanOutTask("memory", _source("m")), FanOutTask("news", gives_up)]
+    outcome = asyncio.run(DeadlineFanOutExecutorV2_5(cancel_grace_seconds=0.0).run(tasks, deadline_seconds=1.0))
+    assert outcome.results == {"memory": "m"}
+    assert outcome.failed == {"news": "CancelledError"} and outcome.timed_out == []
+
+
+def test_chatty_server_output_never_blocks_it(tmp_path):
+    # Far more output than a pipe buffer holds; an unread pipe would stall the server
+    script = (
+        "import sys; sys.stdout.write('x' * 1_000_000); sys.stdout.flush();"
+        "sys.stderr.write('e' * 1_000_000); sys.stderr.flush(); sys.stdin.read()"
+    )
+    configs = {"chatty": {"command": sys.executable, "args": ["-c", script], "env": {}}}
+
+    async def scenario():
+        pool = MCPServerPoolV2_5(configs, log_dir=str(tmp_path))
+        assert await pool.start(["chatty"]) == {"chatty": True}
+        log = tmp_path / "chatty.log"
+        for _ in range(200):
+            if log.exists() and log.stat().st_size >= 1_000_000:
+                break
+            await asyncio.sleep(0.02)
+        alive = pool.is_alive("chatty")
+        await pool.stop()
+        return log.stat().st_size, alive
+
+    logged, alive = asyncio.run(scenario())
+    assert logged == 1_000_000 and alive
@@ -0,0 +1,115 @@
+"""
+Parity tests for the incremental flow-momentum engine against the per-series
+EliteMomentumDetector functions, plus ring-buffer wrap-around, drift, the
+batched multi-symbol update and the FlowAnalytics wiring.
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core_analytics_engine.eots_metrics.elite_momentum_detector import EliteMomentumDetector
+from core_analytics_engine.eots_metrics.flow_analytics import FlowAnalytics
+from core_analytics_engine.eots_metrics.momentum_features import (
+    TRACKED_FLOW_SERIES,
+    FlowMomentumFeatureEngine,
+    flow_momentum_matrix,
+)
+
+SERIES = ("net_vol_flow_5m_und", "vapi_fa_raw", "dwfd_raw")
+
+
+def _flows(n, seed=7):
+    rng = np.random.default_rng(seed)
+    walk = np.cumsum(rng.normal(0, 1e5, (n, len(SERIES))), axis=0)
+    walk[:, 2] = np.round(walk[:, 2] / 2e5)  # coarse series with repeated values
+    return walk
+
+
+def _legacy(detector, window_values, period):
+    rows = []
+    for column in window_values.T:
+        series = pd.Series(column)
+        rows.append((
+            detector.calculate_flow_velocity(series, period),
+            detector.calculate_flow_acceleration(series, period),
+            detector.calculate_momentum_persistence(series),
+        ))
+    return np.array(rows).T
+
+
+@pytest.mark.parametrize("period", [1, 3, 5])
+def test_incremental_features_match_the_per_series_functions(period):
+    detector = EliteMomentumDetector()
+    engine = FlowMomentumFeatureEngine(SERIES, period=period, window=20)
+    flows = _flows(75)
+    for t in range(len(flows)):
+        features = engine.update("SPY", dict(zip(SERIES, flows[t])))
+        expected = _legacy(detector, flows[max(0, t + 1 - engine.window):t + 1], period)
+        np.testing.assert_allclose(features.velocity, expected[0], rtol=1e-9, atol=1e-6)
+        np.testing.assert_allclose(features.acceleration, expected[1], rtol=1e-9, atol=1e-6)
+        np.testing.assert_allclose(features.persistence, expected[2], rtol=1e-9, atol=1e-9)
+        np.testing.assert_allclose(np.vstack(flow_momentum_matrix(flows[max(0, t + 1 - engine.window):t + 1], period)),
+                                   expected, rtol=1e-9, atol=1e-6)
+
+
+def test_flat_series_and_missing_values_follow_the_callers_conventions():
+    detector = EliteMomentumDetector()
+    engine = FlowMomentumFeatureEngine(("flat", "gappy"), period=2, window=12)
+    for t in range(12):
+        features = engine.update("QQQ", {"flat": 3.0, "gappy": None if t % 4 == 0 else float(t)})
+    gappy = pd.Series([0.0 if t % 4 == 0 else float(t) for t in range(12)])
+    assert features.get("flat") == {"velocity": 0.0, "acceleration": 0.0, "persistence": 0.0}
+    assert features.get("gappy")["persistence"] == pytest.approx(detector.calculate_momentum_persistence(gappy))
+
+
+def test_running_aggregates_do_not_drift_over_long_sessions():
+    detector = EliteMomentumDetector()
+    engine = FlowMomentumFeatureEngine(SERIES, window=30)
+    flows = _flows(5000, seed=11) + 1e9  # large level, small steps
+    for row in flows:
+        features = engine.update("SPY", row)
+    expected = _legacy(detector, flows[-30:], 5)
+    np.testing.assert_allclose(features.persistence, expected[2], rtol=1e-7)
+    np.testing.assert_allclose(features.velocity, expected[0], rtol=1e-9)
+
+
+def test_batch_update_across_symbols_matches_single_symbol_updates():
+    flows = {symbol: _flows(40, seed=i) for i, symbol in enumerate(("SPY", "QQQ", "IWM", "DIA", "TLT"))}
+    batched = FlowMomentumFeatureEngine(SERIES, window=15, initial_symbols=2)
+    single = FlowMomentumFeatureEngine(SERIES, window=15)
+    for t in range(40):
+        result = batched.update_batch({symbol: values[t] for symbol, values in flows.items()})
+    for symbol, values in flows.items():
+        expected = single.seed(symbol, values)
+        assert result[symbol].observations == expected.observations == 15
+        np.testing.assert_allclose(result[symbol].persistence, expected.persistence, rtol=1e-9)
+        np.testing.assert_allclose(result[symbol].acceleration, expected.acceleration, rtol=1e-9, atol=1e-6)
+    assert batched.symbols == tuple(flows)
+
+    batched.reset("QQQ")
+    assert batched.update("QQQ", flows["QQQ"][0]).observations == 1
+    assert batched.features("SPY").observations == 15
+
+
+def test_flow_analytics_tracks_the_computed_raw_flow_metrics():
+    analytics = FlowAnalytics(None, None, None)
+    period = analytics.flow_momentum.period
+    for t in range(2 * period + 3):
+        und_data = SimpleNamespace(
+            net_vol_flow_5m_und=1000.0 * (t + 1) ** 2, net_vol_flow_15m_und=2500.0 * (t + 1),
+            net_vol_flow_30m_und=4000.0 * (t + 1), net_value_flow_5m_und=5e5 + 1e4 * t,
+            net_value_flow_15m_und=1.2e6, u_volatility=0.2, price=500.0, day_volume=1e7,
+        )
+        analytics.calculate_all_enhanced_flow_metrics(und_data, "SPY")
+
+    momentum = analytics.get_flow_momentum("SPY")
+    assert momentum.observations == 2 * period + 3 and momentum.series_names == TRACKED_FLOW_SERIES
+    # The published index keeps its 30m/15m/5m snapshot formula however long the history
+    velocity = und_data.net_vol_flow_5m_und - und_data.net_vol_flow_15m_und
+    acceleration = velocity - (und_data.net_vol_flow_15m_und - und_data.net_vol_flow_30m_und)
+    expected = (abs(velocity) * 0.6 + abs(acceleration) * 0.4) / und_data.net_vol_flow_5m_und
+    assert und_data.momentum_acceleration_index_und == pytest.approx(min(expected, 10.0))
+    assert analytics.get_flow_momentum("QQQ") is None
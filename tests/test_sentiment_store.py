@@ -0,0 +1,186 @@
+"""
+Tests for the quota-aware news sentiment store, run against an offline fetcher.
+
+Covers cache hits and stale serving, session pacing of the daily quota, the
+market-wide sweep for several due symbols, the retry backoff after empty responses,
+derived-output memoization and persistence across restarts.
+"""
+
+from datetime import datetime, timedelta
+
+from data_management.alpha_vantage_fetcher_v2_5 import AlphaVantageDataFetcherV2_5
+from data_management.sentiment_store_v2_5 import SentimentStoreV2_5
+
+
+def _article(tickers, score=0.3):
+    return {
+        "overall_sentiment_score": score,
+        "topics": [{"topic": "Financial Markets"}],
+        "ticker_sentiment": [
+            {"ticker": t, "ticker_sentiment_score": str(score), "relevance_score": "0.8"} for t in tickers
+        ],
+    }
+
+
+class _OfflineFetcher(AlphaVantageDataFetcherV2_5):
+    """Real parsing, canned NEWS_SENTIMENT responses, counted requests."""
+
+    def __init__(self, sweep_feed=None, symbol_score=0.3):
+        super().__init__(api_key="test")
+        self.sweep_feed = sweep_feed or []
+        self.symbol_score = symbol_score
+        self.empty = False  # the API answered without any articles (or an error note)
+        self.calls = []
+        self.last_reset_date = None  # the store keeps the count against its own clock here
+
+    def is_available(self):
+        return self.daily_request_count < self.daily_limit
+
+    def get_news_sentiment(self, tickers="SPY", topics=None, time_from=None, time_to=None, limit=50, sort="LATEST"):
+        self.calls.append(("symbol", tickers))
+        self.daily_request_count += 1
+        if self.empty:
+            return {}
+        return {"feed": [_article([tickers], self.symbol_score) for _ in range(5)]}
+
+    def get_news_sentiment_v2(self, tickers="", topics="", time_from="", time_to="", sort="LATEST", limit=50):
+        self.calls.append(("sweep", tickers))
+        self.daily_request_count += 1
+        return {"feed": self.sweep_feed}
+
+
+class _Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _store(fetcher, clock, tmp_path, **kwargs):
+    kwargs.setdefault("burst_requests", 3)
+    return SentimentStoreV2_5(fetcher, store_path=str(tmp_path / "sentiment.json"), clock=clock, **kwargs)
+
+
+def test_fresh_payload_is_served_from_cache_and_stale_when_over_budget(tmp_path):
+    clock = _Clock(datetime(2026, 10, 19, 8, 0))  # before the session: only the burst is available
+    fetcher = _OfflineFetcher()
+    store = _store(fetcher, clock, tmp_path, burst_requests=1, session_start_hour=10.0)
+
+    first = store.get("SPY")
+    assert first["freshness"]["stale"] is False and first["article_count"] == 5
+    assert store.get("SPY")["score"] == first["score"]
+    assert len(fetcher.calls) == 1
+
+    clock.now += timedelta(minutes=90)  # due again, but pacing allows no further request yet
+    stale = store.get("SPY")
+    assert len(fetcher.calls) == 1
+    assert stale["score"] == first["score"] and stale["freshness"]["stale"] is True
+
+    clock.now += timedelta(days=1)  # a new day releases a new burst
+    assert store.get("SPY")["freshness"]["stale"] is False
+    assert len(fetcher.calls) == 2
+
+
+def test_quota_is_paced_across_the_session_and_reserve_is_kept(tmp_path):
+    clock = _Clock(datetime(2026, 10, 19, 12, 30))  # half-way through an 8-17h session
+    fetcher = _OfflineFetcher()
+    store = _store(fetcher, clock, tmp_path, reserve_requests=5, burst_requests=0, sweep_min_due_symbols=100)
+
+    status = store.quota_status()
+    assert status["daily_budget"] == 20 and status["allowance"] == 10
+
+    for i in range(15):
+        store.get(f"T{i}")
+    assert len(fetcher.calls) == 10  # the remaining symbols wait for the pacing to catch up
+
+    clock.now = clock.now.replace(hour=18)  # session over: the whole budget is released
+    assert all(store.get(f"T{i}") for i in range(10, 15))
+    assert fetcher.daily_request_count == 20  # the 5-request reserve is never touched
+    assert store.quota_status()["remaining"] == 0
+
+
+def test_due_symbols_share_one_sweep(tmp_path):
+    sweep_feed = [_article(["SPY", "QQQ"], 0.5) for _ in range(4)] + [_article(["IWM"], -0.5)]
+    clock = _Clock(datetime(2026, 10, 19, 12, 0))
+    fetcher = _OfflineFetcher(sweep_feed=sweep_feed, symbol_score=0.1)
+    store = _store(fetcher, clock, tmp_path, min_articles_per_symbol=3, symbol_priorities={"QQQ": 2.0})
+
+    store.watch("SPY", "QQQ", "IWM")
+    assert store.due_symbols()[0] == "QQQ"
+
+    refreshed = store.refresh_due()
+    assert fetcher.calls == [("sweep", ""), ("symbol", "IWM")]  # IWM had too few sweep articles
+    assert sorted(refreshed) == ["IWM", "QQQ", "SPY"]
+    assert store.get("SPY")["freshness"]["source"] == "sweep"
+    assert store.get("IWM")["freshness"]["source"] == "symbol"
+    assert len(fetcher.calls) == 2
+
+
+def test_empty_responses_back_off_instead_of_spending_every_get(tmp_path):
+    clock = _Clock(datetime(2026, 10, 19, 12, 0))
+    fetcher = _OfflineFetcher()
+    fetcher.empty = True
+    store = _store(fetcher, clock, tmp_path, retry_backoff_minutes=15.0)
+
+    assert store.get("SPY") == {}
+    assert store.get("SPY") == {} and store.due_symbols() == []
+    assert len(fetcher.calls) == 1
+
+    clock.now += timedelta(minutes=15)  # backoff over: due again
+    fetcher.empty = False
+    assert store.due_symbols() == ["SPY"]
+    assert store.get("SPY")["freshness"]["stale"] is False
+    assert len(fetcher.calls) == 2
+
+
+def test_derived_outputs_are_computed_once_per_payload(tmp_path):
+    clock = _Clock(datetime(2026, 10, 19, 12, 0))
+    store = _store(_OfflineFetcher(), clock, tmp_path)
+    computed = []
+
+    def regime(payload):
+        computed.append(payload["score"])
+        return "BULLISH" if payload["score"] > 0 else "BEARISH"
+
+    store.get("SPY")
+    assert store.derive("SPY", "regime", regime) == "BULLISH"
+    assert store.derive("SPY", "regime", regime) == "BULLISH"
+    assert len(computed) == 1
+
+    clock.now += timedelta(hours=2)
+    store.get("SPY")  # refreshed: the memo is recomputed on next use
+    store.derive("SPY", "regime", regime)
+    assert len(computed) == 2
+
+
+def test_derived_outputs_follow_the_payload_into_expiry(tmp_path):
+    clock = _Clock(datetime(2026, 10, 19, 12, 0))
+    fetcher = _OfflineFetcher()
+    store = _store(fetcher, clock, tmp_path, max_age_minutes=120.0)
+
+    def regime(payload):
+        return payload.get("label", "UNKNOWN")
+
+    store.get("SPY")
+    assert store.derive("SPY", "regime", regime) != "UNKNOWN"
+
+    fetcher.daily_limit = 0  # no further refreshes: the payload just ages
+    clock.now += timedelta(hours=3)
+    assert store.get("SPY") == {}
+    assert store.derive("SPY", "regime", regime) == "UNKNOWN"
+
+
+def test_payloads_and_quota_survive_a_restart(tmp_path):
+    clock = _Clock(datetime(2026, 10, 19, 12, 0))
+    store = _store(_OfflineFetcher(), clock, tmp_path)
+    score = store.get("SPY")["score"]
+
+    fetcher = _OfflineFetcher()
+    reopened = _store(fetcher, clock, tmp_path)
+    assert reopened.get("SPY")["score"] == score
+    assert fetcher.calls == []
+    assert reopened.quota_status()["used"] == 1
+
+    clock.now += timedelta(days=1)
+    assert reopened.quota_status()["used"] == 0
@@ -0,0 +1,126 @@
+"""
+Tests for the shared-memory bundle channel: a published bundle reads back as its own
+JSON plus Arrow per-row tables, a read torn by a concurrent publish retries onto the
+new bundle, and
+readers follow a collector restart onto the replacement segment instead of keeping
+the old mapping.
+"""
+
+import json
+import os
+from itertools import count
+
+import pytest
+from pydantic import BaseModel
+
+from data_management import shared_bundle_channel_v2_5 as channel
+from data_management.arrow_frame_codec_v2_5 import decode_table
+from data_management.shared_bundle_channel_v2_5 import SharedBundlePublisherV2_5, SharedBundleReaderV2_5
+
+REQUEST = (0, 45, 20)  # dte_min, dte_max, price_range_percent
+_prefixes = count()
+
+
+class _Bundle(BaseModel):
+    target_symbol: str
+    version: int
+    processed_data_bundle: dict
+
+
+def _bundle(version, n_rows=5):
+    return _Bundle(target_symbol="SPY", version=version, processed_data_bundle={
+        "options_data_with_metrics": [{"strike": 500.0 + i, "gxoi": float(version * i)} for i in range(n_rows)],
+        "strike_level_data_with_metrics": [{"strike": 500.0 + i, "net_gex": float(-version * i)} for i in range(n_rows)],
+    })
+
+
+@pytest.fixture
+def prefix():
+    return f"eots_t{os.getpid()}_{next(_prefixes)}"
+
+
+@pytest.fixture
+def reader(prefix):
+    reader = SharedBundleReaderV2_5(segment_prefix=prefix)
+    yield reader
+    reader.close()
+
+
+def _version(reader):
+    payload = reader.read_bundle_json("SPY", *REQUEST)
+    return None if payload is None else json.loads(payload)["version"]
+
+
+def test_published_bundle_reads_back_with_its_tables(prefix, reader):
+    publisher = SharedBundlePublisherV2_5(segment_prefix=prefix, initial_capacity_mb=0.01)
+    try:
+        assert reader.read("SPY") is None
+        assert publisher.publish("SPY", _bundle(1), *REQUEST)
+
+        header, bundle_json, tables = reader.read("SPY")
+        assert header.seq == 2 and (header.dte_min, header.dte_max, header.price_range_percent) == REQUEST
+        assert bundle_json == _bundle(1).model_dump_json()
+        assert tables["strike_level_data_with_metrics"].column("net_gex").to_pylist() == [-1.0 * i for i in range(5)]
+        assert decode_table(tables["options_data_with_metrics"]).to_dict("records") == \
+            _bundle(1).processed_data_bundle["options_data_with_metrics"]
+
+        # The dashboard store gets the published JSON verbatim
+        assert reader.read_bundle_json("SPY", *REQUEST) == _bundle(1).model_dump_json()
+        assert reader.read_bundle_json("SPY", 0, 30, 20) is None  # published for other request parameters
+
+        # Outgrowing the segment retires it; the reader re-attaches to the larger one
+        assert publisher.publish("SPY", _bundle(2, n_rows=2_000), *REQUEST)
+        assert _version(reader) == 2
+    finally:
+        publisher.close()
+
+
+def test_read_torn_by_a_concurrent_publish_retries(prefix, reader, monkeypatch):
+    publisher = SharedBundlePublisherV2_5(segment_prefix=prefix, initial_capacity_mb=0.01)
+    try:
+        publisher.publish("SPY", _bundle(1), *REQUEST)
+        copy = channel._copy_sections
+        calls = []
+
+        def copy_while_publishing(buf, lengths):
+            calls.append(lengths)
+            if len(calls) == 1:
+                publisher.publish("SPY", _bundle(2), *REQUEST)  # lands between the header and the seqlock re-check
+            return copy(buf, lengths)
+
+        monkeypatch.setattr(channel, "_copy_sections", copy_while_publishing)
+        header, bundle_json, tables = reader.read("SPY")
+        assert len(calls) == 2 and header.seq == 4 and json.loads(bundle_json)["version"] == 2
+        assert tables["options_data_with_metrics"].column("gxoi").to_pylist() == [2.0 * i for i in range(5)]
+    finally:
+        publisher.close()
+
+
+def test_reader_follows_a_restarted_collector(prefix, reader):
+    first = SharedBundlePublisherV2_5(segment_prefix=prefix, initial_capacity_mb=0.01)
+    first.publish("SPY", _bundle(1), *REQUEST)
+    assert _version(reader) == 1
+    first.close()
+
+    second = SharedBundlePublisherV2_5(segment_prefix=prefix, initial_capacity_mb=0.01)
+    try:
+        assert _version(reader) is None  # retired and not yet replaced
+        second.publish("SPY", _bundle(2), *REQUEST)
+        assert _version(reader) == 2
+    finally:
+        second.close()
+
+
+def test_reader_follows_a_collector_restarted_after_a_crash(prefix, reader):
+    crashed = SharedBundlePublisherV2_5(segment_prefix=prefix, initial_capacity_mb=0.01)
+    crashed.publish("SPY", _bundle(1), *REQUEST)
+    assert _version(reader) == 1
+    orphan = crashed._segments.pop("SPY")  # never closed or unlinked by its owner
+
+    restarted = SharedBundlePublisherV2_5(segment_prefix=prefix, initial_capacity_mb=0.01)
+    try:
+        restarted.publish("SPY", _bundle(2), *REQUEST)  # replaces the leftover segment
+        assert _version(reader) == 2
+    finally:
+        restarted.close()
+        orphan.close()
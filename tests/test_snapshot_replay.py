@@ -0,0 +1,219 @@
+"""
+Round-trip and throughput tests for the raw-fetch snapshot recorder and replay driver.
+
+A session of synthetic chain snapshots recorded one minute apart is replayed through
+a minimal orchestrator that performs the same fetch calls as
+``ITSOrchestratorV2_5.run_full_analysis_cycle``.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+N_CYCLES = 30
+CYCLE_SPACING = timedelta(minutes=1)
+
+
+class _FetchOnlyOrchestrator:
+    """Calls the fetchers the way the real orchestrator does and returns what it received."""
+
+    def __init__(self, convex_fetcher=None, tradier_fetcher=None, snapshot_recorder=None):
+        self.convex_fetcher = convex_fetcher or object()
+        self.tradier_fetcher = tradier_fetcher or object()
+        self.snapshot_recorder = snapshot_recorder
+
+    async def run_full_analysis_cycle(self, ticker, dte_min, dte_max, price_range_percent, **kwargs):
+        if self.snapshot_recorder is not None:
+            self.snapshot_recorder.begin_cycle(
+                ticker, {"dte_min": dte_min, "dte_max": dte_max, "price_range_percent": price_range_percent})
+        chain, underlying = await self.convex_fetcher.fetch_chain_and_underlying(
+            session=None, symbol=ticker, dte_min=dte_min, dte_max=dte_max, price_range_percent=price_range_percent
+        )
+        if not chain:
+            async with self.tradier_fetcher as tradier:
+                chain, underlying = await tradier.fetch_chain_and_underlying(ticker)
+        async with self.tradier_fetcher as tradier:
+            historical = await tradier.fetch_historical_data(ticker, days=2)
+        return chain, underlying, historical
+
+
+class _RegimeFetchOrchestrator(_FetchOnlyOrchestrator):
+    """Also fetches the VIX chain alongside the ticker's, as the market regime engine does."""
+
+    async def run_full_analysis_cycle(self, ticker, dte_min, dte_max, price_range_percent, **kwargs):
+        own, vix = await asyncio.gather(
+            super().run_full_analysis_cycle(ticker, dte_min, dte_max, price_range_percent),
+            self.convex_fetcher.fetch_chain_and_underlying(session=None, symbol="VIX"),
+        )
+        return own, vix
+
+
+class _LiveConvexValueFetcher:
+    """Serves a small synthetic chain per symbol after a per-symbol delay."""
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.calls = 0
+
+    async def fetch_chain_and_underlying(self, session, symbol, dte_min=0, dte_max=45, price_range_percent=20):
+        from data_management.synthetic_chain_generator_v2_5 import SyntheticChainGeneratorV2_5, SyntheticChainSpecV2_5
+
+        self.calls += 1
+        await asyncio.sleep(self.delays[symbol])
+        generator = SyntheticChainGeneratorV2_5(SyntheticChainSpecV2_5.for_contract_count(40, seed=self.calls, symbol=symbol))
+        frame = generator.generate_chain_frame()
+        return generator.generate_contracts(frame), generator.generate_underlying(frame)
+
+
+class _LiveTradierFetcher:
+    def __init__(self, delays):
+        self.delays = delays
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return None
+
+    async def fetch_historical_data(self, symbol, days=30):
+        await asyncio.sleep(self.delays[symbol])
+        return {"symbol": symbol, "data": [{"date": "2025-01-01", "close": float(len(symbol))}], "columns": ["date", "close"]}
+
+
+@pytest.fixture(scope="module")
+def recorded_session(tmp_path_factory):
+    from data_management.snapshot_recorder_v2_5 import CONVEXVALUE, TRADIER, SnapshotRecorderV2_5
+    from data_management.synthetic_chain_generator_v2_5 import SyntheticChainGeneratorV2_5, SyntheticChainSpecV2_5
+
+    recorder = SnapshotRecorderV2_5(root_dir=str(tmp_path_factory.mktemp("snapshots")), session_id="session", flush_every_events=7)
+    start = datetime(2025, 1, 2, 9, 30)
+    recorded = []
+    for cycle in range(N_CYCLES):
+        generator = SyntheticChainGeneratorV2_5(SyntheticChainSpecV2_5.for_contract_count(500, seed=cycle, symbol="SPY"))
+        frame = generator.generate_chain_frame()
+        contracts, underlying = generator.generate_contracts(frame), generator.generate_underlying(frame)
+        at = start + cycle * CYCLE_SPACING
+        params = {"dte_min": 0, "dte_max": 45, "price_range_percent": 20}
+        recorder.begin_cycle("SPY", params, recorded_at=at)
+        if cycle % 10 == 9:
+            # ConvexValue miss followed by a Tradier fallback
+            recorder.record_chain_and_underlying(CONVEXVALUE, "SPY", None, None, params, recorded_at=at)
+            recorder.record_chain_and_underlying(TRADIER, "SPY", contracts, underlying, {}, recorded_at=at)
+        else:
+            recorder.record_chain_and_underlying(CONVEXVALUE, "SPY", contracts, underlying, params, recorded_at=at)
+        ohlc = {"symbol": "SPY", "data": [{"date": "2025-01-01", "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 10 + cycle}],
+                "columns": ["date", "open", "high", "low", "close", "volume"]}
+        recorder.record_ohlc(TRADIER, "SPY", ohlc, {"days": 2}, recorded_at=at)
+        recorded.append((contracts, underlying, ohlc))
+    recorder.close()
+    return recorder.session_dir, recorded
+
+
+def test_recorded_session_round_trips(recorded_session):
+    from data_management.snapshot_recorder_v2_5 import SnapshotLogReaderV2_5
+
+    session_dir, recorded = recorded_session
+    reader = SnapshotLogReaderV2_5(str(session_dir))
+    assert reader.cycle_ids == list(range(N_CYCLES))
+
+    for cycle_id, (contracts, underlying, ohlc) in zip(reader.cycle_ids, recorded):
+        events = {(e.kind, e.source): e for e in reader.cycle_events(cycle_id) if e.ok}
+        chain_event = events.get(("chain_and_underlying", "convexvalue")) or events[("chain_and_underlying", "tradier")]
+        assert reader.chain(chain_event) == contracts
+        assert reader.underlying(chain_event) == underlying
+        assert reader.ohlc(events[("ohlc", "tradier")]) == ohlc
+
+
+def test_replay_feeds_recorded_fetches_through_orchestrator(recorded_session):
+    from data_management.snapshot_recorder_v2_5 import SnapshotLogReaderV2_5
+    from data_management.snapshot_replay_v2_5 import SnapshotReplayDriverV2_5
+
+    session_dir, recorded = recorded_session
+    orchestrator = _FetchOnlyOrchestrator()
+    original_fetchers = (orchestrator.convex_fetcher, orchestrator.tradier_fetcher)
+    outputs = []
+    driver = SnapshotReplayDriverV2_5(orchestrator, SnapshotLogReaderV2_5(str(session_dir)), speed=None)
+
+    result = asyncio.run(driver.run(on_bundle=lambda event, output: outputs.append(output)))
+
+    assert result.cycles_replayed == N_CYCLES and result.cycles_failed == 0
+    assert outputs == recorded
+    assert (orchestrator.convex_fetcher, orchestrator.tradier_fetcher) == original_fetchers
+
+
+def test_max_speed_replay_runs_many_times_faster_than_real_time(recorded_session):
+    from data_management.snapshot_recorder_v2_5 import SnapshotLogReaderV2_5
+    from data_management.snapshot_replay_v2_5 import SnapshotReplayDriverV2_5
+
+    session_dir, _ = recorded_session
+    driver = SnapshotReplayDriverV2_5(_FetchOnlyOrchestrator(), SnapshotLogReaderV2_5(str(session_dir)), speed=None)
+
+    result = asyncio.run(driver.run())
+
+    assert result.recorded_span_seconds == (N_CYCLES - 1) * CYCLE_SPACING.total_seconds()
+    assert result.realtime_multiple > 1000
+
+
+def test_paced_replay_follows_recorded_timestamps(recorded_session):
+    from data_management.snapshot_recorder_v2_5 import SnapshotLogReaderV2_5
+    from data_management.snapshot_replay_v2_5 import SnapshotReplayDriverV2_5
+
+    session_dir, _ = recorded_session
+    speed = 6000.0  # one recorded minute every 10 ms
+    driver = SnapshotReplayDriverV2_5(_FetchOnlyOrchestrator(), SnapshotLogReaderV2_5(str(session_dir)), speed=speed)
+
+    result = asyncio.run(driver.run(cycle_ids=list(range(11))))
+
+    expected = 10 * CYCLE_SPACING.total_seconds() / speed
+    assert result.cycles_replayed == 11
+    assert expected <= result.wall_seconds < expected + 1.0
+
+
+def _record_live_cycles(tmp_path, orchestrator_cls, delays, symbols):
+    from data_management.snapshot_recorder_v2_5 import SnapshotRecorderV2_5
+
+    recorder = SnapshotRecorderV2_5(root_dir=str(tmp_path), session_id="live")
+    convex, tradier = recorder.wrap_fetchers(_LiveConvexValueFetcher(delays), _LiveTradierFetcher(delays))
+    orchestrator = orchestrator_cls(convex, tradier, snapshot_recorder=recorder)
+
+    async def run():
+        return await asyncio.gather(*(orchestrator.run_full_analysis_cycle(s, 0, 45, 20) for s in symbols))
+
+    outputs = asyncio.run(run())
+    recorder.close()
+    return recorder.session_dir, outputs
+
+
+def test_concurrent_cycles_are_recorded_once_per_analysis_cycle(tmp_path):
+    from data_management.snapshot_recorder_v2_5 import CYCLE, SnapshotLogReaderV2_5
+
+    # QQQ's fetches complete while SPY's cycle is still waiting on its own
+    session_dir, _ = _record_live_cycles(tmp_path, _FetchOnlyOrchestrator, {"SPY": 0.02, "QQQ": 0.0}, ["SPY", "QQQ"])
+    reader = SnapshotLogReaderV2_5(str(session_dir))
+
+    assert reader.cycle_ids == [0, 1]
+    for cycle_id, symbol in zip(reader.cycle_ids, ["SPY", "QQQ"]):
+        events = reader.cycle_events(cycle_id)
+        assert {e.symbol for e in events} == {symbol}
+        assert [e.kind for e in events] == [CYCLE, "chain_and_underlying", "ohlc"]
+        assert reader.cycle_start_event(cycle_id).params == {"dte_min": 0, "dte_max": 45, "price_range_percent": 20}
+
+
+def test_replay_serves_each_symbol_its_own_events_within_a_cycle(tmp_path):
+    from data_management.snapshot_recorder_v2_5 import SnapshotLogReaderV2_5
+    from data_management.snapshot_replay_v2_5 import SnapshotReplayDriverV2_5
+
+    # VIX is recorded before SPY inside SPY's cycle; replay asks for SPY first
+    session_dir, [recorded] = _record_live_cycles(tmp_path, _RegimeFetchOrchestrator, {"SPY": 0.02, "VIX": 0.0}, ["SPY"])
+    reader = SnapshotLogReaderV2_5(str(session_dir))
+    assert reader.cycle_ids == [0]
+    assert [e.symbol for e in reader.cycle_events(0) if e.kind == "chain_and_underlying"] == ["VIX", "SPY"]
+
+    outputs = []
+    driver = SnapshotReplayDriverV2_5(_RegimeFetchOrchestrator(), reader, speed=None)
+    result = asyncio.run(driver.run(on_bundle=lambda event, output: outputs.append(output)))
+
+    assert result.cycles_replayed == 1 and outputs == [recorded]
+    (_, spy_underlying, _), (_, vix_underlying) = outputs[0]
+    assert (spy_underlying.symbol, vix_underlying.symbol) == ("SPY", "VIX")
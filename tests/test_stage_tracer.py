@@ -0,0 +1,157 @@
+"""
+Tests for per-stage tracing: span nesting (also across concurrent async cycles),
+the Prometheus stage histogram, the slowest-cycles ring and the stage trace report
+served by the dashboard.
+"""
+
+import asyncio
+import itertools
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from utils import stage_tracer_v2_5
+from utils.stage_tracer_v2_5 import StageTracerV2_5
+
+_namespaces = itertools.count()
+
+
+@pytest.fixture
+def tracer():
+    return StageTracerV2_5(enabled=True, slowest_cycles_to_keep=2, namespace=f"eots_test{next(_namespaces)}")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Deterministic perf_counter: each span's duration is whatever the test advances."""
+    now = [0.0]
+    monkeypatch.setattr(stage_tracer_v2_5, "time", SimpleNamespace(perf_counter=lambda: now[0]))
+
+    def advance(seconds):
+        now[0] += seconds
+    return advance
+
+
+def _shape(span):
+    return (span["stage"], span["symbol"], [_shape(child) for child in span["children"]])
+
+
+def test_nested_spans_form_one_tree_per_cycle(tracer, clock):
+    with tracer.span("cycle", symbol="SPY", cycle_id=1):
+        with tracer.span("metrics"):
+            with tracer.span("gex"):
+                clock(0.25)
+        with tracer.span("key_levels"):
+            clock(0.5)
+            assert tracer.current_span().stage == "key_levels"
+    assert tracer.current_span() is None
+
+    [cycle] = tracer.get_slowest_cycles()
+    assert _shape(cycle) == ("cycle", "SPY", [
+        ("metrics", "SPY", [("gex", "SPY", [])]),
+        ("key_levels", "SPY", []),
+    ])
+    assert cycle["duration_ms"] == 750.0 and cycle["attributes"] == {"cycle_id": 1}
+    assert tracer.get_stage_summary()["gex"] == {"count": 1, "total_ms": 250.0, "max_ms": 250.0, "mean_ms": 250.0}
+
+
+def test_concurrent_async_cycles_keep_their_own_children(tracer):
+    @tracer.traced(stage="fetch", symbol_arg="symbol")
+    async def fetch(symbol, delay):
+        await asyncio.sleep(delay)
+
+    async def cycle(symbol, delay):
+        with tracer.span("cycle", symbol=symbol):
+            await fetch(symbol, delay)
+            with tracer.span("metrics"):
+                await asyncio.sleep(delay)
+
+    async def run():
+        await asyncio.gather(cycle("SPY", 0.01), cycle("QQQ", 0.005))
+
+    asyncio.run(run())
+    cycles = {span["symbol"]: span for span in tracer.get_slowest_cycles()}
+    for symbol in ("SPY", "QQQ"):
+        assert _shape(cycles[symbol]) == ("cycle", symbol, [("fetch", symbol, []), ("metrics", symbol, [])])
+
+
+def test_every_closed_span_is_observed_in_the_stage_histogram(tracer, clock):
+    prometheus_client = pytest.importorskip("prometheus_client")
+    for seconds in (0.002, 0.2):
+        with tracer.span("cycle", symbol="SPY"):
+            with tracer.span("market_regime"):
+                clock(seconds)
+
+    def sample(suffix, **labels):
+        return prometheus_client.REGISTRY.get_sample_value(
+            f"{tracer.namespace}_stage_duration_seconds{suffix}", {"symbol": "SPY", "stage": "market_regime", **labels})
+
+    assert sample("_count") == 2
+    assert sample("_sum") == pytest.approx(0.202)
+    assert sample("_bucket", le="0.005") == 1 and sample("_bucket", le="0.25") == 2
+    assert prometheus_client.REGISTRY.get_sample_value(
+        f"{tracer.namespace}_stage_duration_seconds_count", {"symbol": "SPY", "stage": "cycle"}) == 2
+
+
+def test_ring_keeps_the_slowest_cycles_and_errors_are_recorded(tracer, clock):
+    for symbol, seconds in (("SPY", 1.0), ("QQQ", 3.0), ("IWM", 2.0), ("DIA", 0.5)):
+        with tracer.span("cycle", symbol=symbol):
+            clock(seconds)
+    assert [span["symbol"] for span in tracer.get_slowest_cycles()] == ["QQQ", "IWM"]
+    assert [span["symbol"] for span in tracer.get_slowest_cycles(symbol="IWM")] == ["IWM"]
+
+    with pytest.raises(ZeroDivisionError):
+        with tracer.span("cycle", symbol="SPY"):
+            clock(5.0)
+            1 / 0
+    slowest = tracer.get_slowest_cycles(limit=1)[0]
+    assert slowest["symbol"] == "SPY" and slowest["error"].startswith("ZeroDivisionError")
+
+    tracer.reset()
+    assert tracer.get_slowest_cycles() == []
+
+
+def test_disabled_tracer_records_nothing(tracer):
+    tracer.enabled = False
+    with tracer.span("cycle", symbol="SPY") as span:
+        assert span is None and tracer.current_span() is None
+
+    @tracer.traced()
+    def work():
+        return 42
+
+    assert work() == 42 and tracer.get_slowest_cycles() == []
+
+
+def test_stage_trace_report_is_served_as_json(tracer, clock):
+    from dash import Dash, html
+
+    from dashboard_application.app_main import register_status_routes
+
+    for symbol, seconds in (("SPY", 1.0), ("QQQ", 2.0)):
+        with tracer.span("cycle", symbol=symbol):
+            with tracer.span("atif"):
+                clock(seconds)
+    # Same report ITSOrchestratorV2_5.get_stage_trace_report assembles
+    orchestrator = SimpleNamespace(get_stage_trace_report=lambda limit=None, symbol=None: {
+        "enabled": tracer.enabled,
+        "slowest_cycles": tracer.get_slowest_cycles(limit=limit, symbol=symbol),
+        "stage_summary": tracer.get_stage_summary(symbol=symbol),
+    })
+
+    app = Dash(__name__)
+    app.layout = html.Div()
+    register_status_routes(app, orchestrator)
+    client = app.server.test_client()
+
+    response = client.get("/status/stage-traces?limit=1")
+    assert response.status_code == 200 and response.mimetype == "application/json"
+    report = json.loads(response.data)
+    assert report["enabled"] is True
+    assert [span["symbol"] for span in report["slowest_cycles"]] == ["QQQ"]
+    assert report["stage_summary"]["atif"]["count"] == 2
+
+    report = json.loads(client.get("/status/stage-traces?symbol=SPY").data)
+    assert _shape(report["slowest_cycles"][0]) == ("cycle", "SPY", [("atif", "SPY", [])])
+    assert report["stage_summary"]["atif"]["max_ms"] == 1000.0
@@ -0,0 +1,95 @@
+"""
+Tests for the columnar signal rule engine behind SignalGeneratorV2_5.
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from core_analytics_engine.vectorized_signal_engine_v2_5 import VectorizedSignalEngineV2_5
+from data_models.core_system_config import SignalRuleSettings, VectorizedSignalSettings
+
+
+def _und(**metrics):
+    base = {"symbol": "SPY", "vapi_fa_z_score_und": 0.0, "dwfd_z_score_und": 0.0, "tw_laf_z_score_und": 0.0}
+    return SimpleNamespace(**{**base, **metrics})
+
+
+def _rule(**kwargs):
+    return SignalRuleSettings(**kwargs)
+
+
+def test_default_rules_match_the_enhanced_flow_thresholds():
+    engine = VectorizedSignalEngineV2_5.from_settings(VectorizedSignalSettings())
+    signals = engine.evaluate(_und(vapi_fa_z_score_und=-2.4, dwfd_z_score_und=1.9, tw_laf_z_score_und=1.6), None, "REGIME_X")
+
+    flow = signals["v2_5_enhanced_flow"]
+    assert [s.signal_name for s in flow] == ["VAPI-FA_Momentum_Surge", "TW-LAF_Sustained_Trend"]
+    assert [s.direction for s in flow] == ["Bearish", "Bullish"]
+    assert flow[0].strength_score == -2.4 and flow[0].signal_type == "Momentum"
+    assert flow[0].supporting_metrics.momentum_indicators == {"vapi_fa_z_score_und": -2.4, "vapi_fa_z_score_und_threshold": 2.0}
+    assert all(not signals[c] for c in ("directional", "volatility", "time_decay", "complex"))
+
+
+def test_regime_thresholds_and_missing_metrics():
+    engine = VectorizedSignalEngineV2_5([
+        _rule(name="VAPI", category="v2_5_enhanced_flow",
+              conditions=[{"metric": "vapi_fa_z_score_und", "threshold": 2.0, "regime_thresholds": {"CALM": 1.0}}]),
+        _rule(name="Ghost", category="complex", conditions=[{"metric": "not_a_metric", "op": "lt", "threshold": 1.0}]),
+    ])
+    assert not engine.evaluate(_und(vapi_fa_z_score_und=1.5), None, "TRENDING")["v2_5_enhanced_flow"]
+    fired = engine.evaluate(_und(vapi_fa_z_score_und=1.5), None, "CALM")
+    assert [s.signal_name for s in fired["v2_5_enhanced_flow"]] == ["VAPI"]
+    assert fired["complex"] == []  # a missing metric never fires
+    assert not engine.evaluate(_und(vapi_fa_z_score_und=None), None, "CALM")["v2_5_enhanced_flow"]
+
+
+def test_strike_rules_fire_on_all_conditions_and_keep_the_strongest():
+    strikes = np.arange(400.0, 420.0)
+    frame = pd.DataFrame({
+        "strike": strikes,
+        "a_dag_strike": np.linspace(-10, 10, len(strikes)),
+        "vri_2_0_strike": np.where(strikes < 405, 5.0, 0.5),
+        "d_tdpi_strike": [np.nan] * 5 + [1.0] * 15,
+    }).set_index("strike", drop=False)
+
+    engine = VectorizedSignalEngineV2_5([
+        _rule(name="ADAG_Wall", category="directional", scope="strike", max_signals=2,
+              conditions=[{"metric": "a_dag_strike", "op": "abs_gt", "threshold": 8.0}]),
+        _rule(name="Vol_Pocket", category="volatility", scope="strike", strength_metric="vri_2_0_strike",
+              strength_scale=0.5, direction="Bearish",
+              conditions=[{"metric": "vri_2_0_strike", "op": "ge", "threshold": 5.0},
+                          {"metric": "a_dag_strike", "op": "lt", "threshold": -8.5}]),
+        _rule(name="Pin", category="time_decay", scope="strike",
+              conditions=[{"metric": "d_tdpi_strike", "op": "gt", "threshold": 0.5}], max_signals=20),
+    ])
+    signals = engine.evaluate(_und(), frame, "UNKNOWN")
+
+    walls = signals["directional"]
+    assert [s.strike_impacted for s in walls] == [400.0, 419.0]  # the two largest |a_dag| of the 4 firing strikes
+    assert [s.direction for s in walls] == ["Bearish", "Bullish"]
+
+    pockets = signals["volatility"]
+    assert [s.strike_impacted for s in pockets] == [400.0, 401.0]  # both conditions hold only here
+    assert all(s.strength_score == 2.5 and s.direction == "Bearish" for s in pockets)
+    assert pockets[0].supporting_metrics.volatility_indicators["a_dag_strike_threshold"] == -8.5
+
+    assert len(signals["time_decay"]) == 15  # NaN strikes do not fire
+    assert signals["time_decay"][0].signal_type == "Structural"
+
+
+def test_many_rules_over_many_strikes_materialize_only_fired_signals():
+    rng = np.random.default_rng(7)
+    frame = pd.DataFrame({"strike": np.arange(1.0, 5001.0), "a_mspi_strike": rng.normal(size=5000)})
+    rules = [
+        _rule(name=f"MSPI_{i}", category="complex", scope="strike", max_signals=1,
+              conditions=[{"metric": "a_mspi_strike", "op": "gt", "threshold": float(t)}])
+        for i, t in enumerate(np.linspace(0.0, 10.0, 200))
+    ]
+    signals = VectorizedSignalEngineV2_5(rules).evaluate(_und(), frame, "UNKNOWN")["complex"]
+
+    top = frame["a_mspi_strike"].max()
+    expected = sum(1 for t in np.linspace(0.0, 10.0, 200) if top > t)
+    assert len(signals) == expected
+    assert {s.strike_impacted for s in signals} == {float(frame.loc[frame["a_mspi_strike"].idxmax(), "strike"])}
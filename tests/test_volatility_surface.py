@@ -0,0 +1,92 @@
+"""
+Tests for the per-snapshot volatility surface: the fit recovers a known
+total-variance smile, VolatilitySurfaceFeatures reads the expected ATM level,
+term slope, skew and curvature off it, refits happen only when the snapshot
+changes, and the elite impact calculator reads the shared fit instead of its own.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core_analytics_engine.eots_metrics.elite_intelligence import EliteConfig, EliteImpactCalculator
+from core_analytics_engine.eots_metrics.elite_volatility_surface import EliteVolatilitySurface, VolatilitySurfaceGrid
+
+SPOT = 5000.0
+DTES = (7.0, 30.0, 60.0, 90.0)
+ATM_VARIANCE = {7.0: 0.22 ** 2, 30.0: 0.20 ** 2, 60.0: 0.19 ** 2, 90.0: 0.185 ** 2}
+SLOPE, CONVEXITY = -0.02, 0.05  # total variance / T = atm^2 + SLOPE * k + CONVEXITY * k^2
+
+
+def _smile_iv(k, dte):
+    return np.sqrt(ATM_VARIANCE[dte] + SLOPE * k + CONVEXITY * k * k)
+
+
+def _chain(level_shift=0.0):
+    k = np.linspace(-0.25, 0.25, 41)
+    rows = [(SPOT * np.exp(ki), dte, _smile_iv(ki, dte) + level_shift) for dte in DTES for ki in k]
+    return pd.DataFrame(rows, columns=["strike", "dte_calc", "iv"])
+
+
+def test_fit_recovers_the_generating_smile_at_every_expiry():
+    chain = _chain()
+    grid = VolatilitySurfaceGrid.fit(chain["strike"].to_numpy(), chain["dte_calc"].to_numpy(), chain["iv"].to_numpy(), SPOT)
+    assert grid.contracts == len(chain) and len(grid.t_years) == len(DTES)
+    assert grid.fit_rmse < 1e-4
+
+    strikes = SPOT * np.exp(np.linspace(-0.2, 0.2, 9))
+    for dte in DTES:
+        expected = _smile_iv(np.log(strikes / SPOT), dte)
+        np.testing.assert_allclose(grid.implied_vol(strikes, np.full(strikes.shape, dte)), expected, rtol=1e-3)
+    # Constant IV outside the fitted expiries
+    np.testing.assert_allclose(grid.atm_vol(np.array([1.0, 365.0])), [0.22, 0.185], rtol=1e-3)
+
+
+def test_features_read_level_term_structure_and_smile_shape():
+    surface = EliteVolatilitySurface(EliteConfig())
+    surface.fit_surface(_chain(), SPOT)
+    features = surface.features()
+
+    atm = {dte: np.sqrt(v) for dte, v in ATM_VARIANCE.items()}
+    assert features.atm_iv_front == pytest.approx(atm[7.0], rel=1e-3)
+    assert features.atm_iv_30d == pytest.approx(atm[30.0], rel=1e-3)
+    assert features.term_slope == pytest.approx((atm[30.0] - atm[7.0]) / (23.0 / 365.0), rel=1e-2)
+    # d/dk sqrt(f) = f' / (2 sqrt f); d2/dk2 sqrt(f) = (2 f f'' - f'^2) / (4 f^1.5)
+    f = ATM_VARIANCE[30.0]
+    assert features.skew_30d == pytest.approx(SLOPE / (2 * np.sqrt(f)), rel=1e-2)
+    assert features.smile_curvature_30d == pytest.approx((4 * f * CONVEXITY - SLOPE ** 2) / (4 * f ** 1.5), rel=2e-2)
+    wings = _smile_iv(np.array([0.1, -0.1]), 30.0)
+    assert features.risk_reversal_30d == pytest.approx(wings[0] - wings[1], rel=1e-2)
+    assert features.atm_term_dispersion == pytest.approx(np.std(list(atm.values())), rel=1e-2)
+    assert features.expiries == len(DTES) and features.contracts == len(DTES) * 41
+    assert features.regime == "medium_vol"
+
+
+@pytest.mark.parametrize("shift,regime", [(0.25, "high_vol"), (-0.08, "low_vol")])
+def test_regime_follows_the_fitted_30d_atm_level(shift, regime):
+    surface = EliteVolatilitySurface(EliteConfig())
+    assert surface.get_volatility_regime(_chain(shift), SPOT) == regime
+
+
+def test_unchanged_snapshot_reuses_the_fit():
+    surface = EliteVolatilitySurface(EliteConfig())
+    chain = _chain()
+    first = surface.fit_surface(chain, SPOT)
+    assert surface.fit_surface(chain.copy(), SPOT) is first
+    assert surface.fit_count == 1
+    surface.fit_surface(_chain(0.01), SPOT)
+    assert surface.fit_count == 2
+    assert surface.fit_surface(chain.drop(columns="iv"), SPOT) is None and surface.features() is None
+
+
+def test_elite_calculator_reads_the_shared_surface_without_refitting():
+    shared = EliteVolatilitySurface(EliteConfig())
+    calculator = EliteImpactCalculator(EliteConfig(), volatility_surface=shared)
+    assert calculator.volatility_surface is shared
+
+    shared.fit_surface(_chain(0.25), SPOT)
+    underlying = type("Underlying", (), {"u_volatility": 0.20})()
+    assert calculator._determine_volatility_regime_simple(underlying) == "high_vol"
+    assert shared.fit_count == 1
+    # Without a fitted surface the underlying IV level decides
+    assert EliteImpactCalculator(EliteConfig())._determine_volatility_regime_simple(underlying) == "medium_vol"
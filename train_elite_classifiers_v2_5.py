@@ -0,0 +1,123 @@
+# train_elite_classifiers_v2_5.py
+# EOTS v2.5 - OFFLINE TRAINING OF THE ELITE REGIME AND FLOW CLASSIFIERS
+
+"""
+Trains the regime and flow classifiers served by EliteImpactCalculator and writes
+them to the versioned model directory (elite_classifier_settings.model_dir).
+
+Examples:
+    # Regime model labelled from the recorded intraday price path (5-minute cycles)
+    python train_elite_classifiers_v2_5.py --kind regime --snapshots data_cache_v2_5/snapshots \
+        --horizon 12 --periods-per-year 19656
+
+    # Regime model labelled from daily closes in the historical database
+    python train_elite_classifiers_v2_5.py --kind regime --snapshots data_cache_v2_5/snapshots \
+        --symbol SPY --daily-labels --horizon 5
+
+    # Flow model from curated records carrying a flow_type_label column
+    python train_elite_classifiers_v2_5.py --kind flow --records labelled_flow.parquet
+"""
+
+import argparse
+import logging
+import sys
+
+import pandas as pd
+
+from core_analytics_engine.eots_metrics.elite_classifiers import (
+    FLOW,
+    MODEL_TYPES,
+    REGIME,
+    EliteModelRegistryV2_5,
+    build_flow_dataset,
+    build_regime_dataset,
+    load_daily_closes,
+    load_record_file,
+    load_snapshot_records,
+    train_classifier,
+)
+
+
+def _load_records(args) -> pd.DataFrame:
+    frames = []
+    if args.snapshots:
+        frames.append(load_snapshot_records(args.snapshots, args.symbol))
+    if args.records:
+        frames.append(load_record_file(args.records))
+    records = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if args.symbol and "symbol" in records:
+        records = records[records["symbol"] == args.symbol]
+    if "timestamp" in records:
+        records = records.sort_values("timestamp", kind="stable")
+    return records.reset_index(drop=True)
+
+
+def _daily_closes(args):
+    from utils.config_manager_v2_5 import ConfigManagerV2_5
+    from data_management.database_manager_v2_5 import DatabaseManagerV2_5
+    from data_management.historical_data_manager_v2_5 import HistoricalDataManagerV2_5
+
+    config_manager = ConfigManagerV2_5()
+    historical_data_manager = HistoricalDataManagerV2_5(config_manager, DatabaseManagerV2_5(config_manager))
+    closes = load_daily_closes(historical_data_manager, args.symbol, args.lookback_days)
+    if closes is None:
+        raise ValueError(f"No daily OHLCV history for {args.symbol}")
+    return closes
+
+
+def main(args) -> int:
+    records = _load_records(args)
+    if records.empty:
+        logging.error("No training records found; pass --snapshots and/or --records")
+        return 1
+    logging.info(f"Loaded {len(records)} underlying records")
+
+    registry = EliteModelRegistryV2_5(args.model_dir)
+    kinds = (REGIME, FLOW) if args.kind == "both" else (args.kind,)
+    for kind in kinds:
+        if kind == REGIME:
+            if args.daily_labels and not args.symbol:
+                raise ValueError("--daily-labels needs --symbol")
+            closes = _daily_closes(args) if args.daily_labels else None
+            features, labels = build_regime_dataset(records, args.horizon, args.periods_per_year, daily_closes=closes)
+            info = {"horizon": args.horizon, "periods_per_year": args.periods_per_year,
+                    "label_source": "daily_closes" if closes is not None else "records"}
+        else:
+            features, labels = build_flow_dataset(records, args.label_column)
+            info = {"label_column": args.label_column}
+        info["symbol"] = args.symbol
+
+        logging.info(f"Training {kind} classifier on {len(labels)} labelled rows: {labels.value_counts().to_dict()}")
+        artifact = train_classifier(kind, features, labels, model_type=args.model,
+                                    holdout_fraction=args.holdout_fraction, training_info=info)
+        path = registry.save(artifact, promote=not args.no_promote)
+        logging.info(f"Saved {kind} classifier {artifact.version} to {path} "
+                     f"(holdout accuracy {artifact.holdout_accuracy}, promoted={not args.no_promote})")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EOTS v2.5 offline training of the elite regime and flow classifiers.")
+    parser.add_argument("--kind", choices=(REGIME, FLOW, "both"), default="both", help="Which classifier(s) to train.")
+    parser.add_argument("--snapshots", type=str, help="Snapshot recorder root or session directory.")
+    parser.add_argument("--records", type=str, help="Parquet or CSV file of underlying records.")
+    parser.add_argument("--symbol", type=str, help="Restrict training to one symbol.")
+    parser.add_argument("--daily-labels", action="store_true", help="Label regimes from daily closes in the historical database.")
+    parser.add_argument("--lookback-days", type=int, default=730, help="Daily history loaded for --daily-labels.")
+    parser.add_argument("--horizon", type=int, default=12, help="Forward steps (records, or days with --daily-labels) defining the regime label.")
+    parser.add_argument("--periods-per-year", type=float, default=None, help="Annualization of forward volatility (default 252 with --daily-labels, else 19656 for 5-minute cycles).")
+    parser.add_argument("--label-column", type=str, default="flow_type_label", help="Column holding curated flow labels.")
+    parser.add_argument("--model", choices=MODEL_TYPES, default="hist_gradient_boosting", help="Estimator to fit.")
+    parser.add_argument("--holdout-fraction", type=float, default=0.2, help="Most recent share of rows used to report accuracy.")
+    parser.add_argument("--model-dir", type=str, default="models/elite_classifiers", help="Versioned model directory.")
+    parser.add_argument("--no-promote", action="store_true", help="Save the model without making it the served version.")
+    args = parser.parse_args()
+    if args.periods_per_year is None:
+        args.periods_per_year = 252.0 if args.daily_labels else 252.0 * 78
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - [%(module)s] - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    sys.exit(main(args))
@@ -0,0 +1,481 @@
+# utils/decorator_telemetry_v2_5.py
+# EOTS v2.5 - Sampling telemetry backend for the compliance/performance decorators
+
+"""
+Low-overhead telemetry backend used by ``compliance_decorators_v2_5.track_performance``.
+
+- Calls are sampled with probability ``sample_rate``. An unsampled call costs one
+  ``random()`` comparison.
+- By default, a sampled call is timed with ``time.perf_counter_ns``. CPU time
+  (``time.thread_time_ns``) and RSS deltas are captured only when requested.
+- Each thread writes into its own shard of per-function counters and a log2
+  latency histogram. Every shard has a single writer, so the hot path takes no
+  locks. A daemon thread periodically merges shard deltas into the aggregate view;
+  the shard of a thread that has exited is folded in one last time and dropped, so
+  servers that start a thread per request do not accumulate shards. If
+  ``metrics_file`` is set, that thread also appends one JSON summary line per
+  active function.
+"""
+
+import functools
+import inspect
+import json
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict, Field
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+try:
+    from filelock import FileLock
+    FILELOCK_AVAILABLE = True
+except ImportError:
+    FILELOCK_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Bucket i holds durations in [2**(i-1), 2**i) ns; the last bucket is open-ended (>= ~34 s).
+HISTOGRAM_BUCKETS = 36
+
+
+class FunctionTelemetrySnapshotV2_5(BaseModel):
+    """Aggregated telemetry for one decorated function."""
+    function_name: str = Field(..., description="Qualified name of the decorated function.")
+    sample_rate: float = Field(..., description="Sampling probability the function was decorated with.", ge=0.0, le=1.0)
+    sampled_calls: int = Field(0, description="Number of calls that were sampled.", ge=0)
+    estimated_calls: float = Field(0.0, description="sampled_calls scaled by 1/sample_rate.", ge=0.0)
+    errors: int = Field(0, description="Sampled calls that raised.", ge=0)
+    total_ns: int = Field(0, description="Sum of sampled wall-clock durations in nanoseconds.", ge=0)
+    max_ns: int = Field(0, description="Largest sampled wall-clock duration in nanoseconds.", ge=0)
+    mean_ms: float = Field(0.0, description="Mean sampled wall-clock duration in milliseconds.", ge=0.0)
+    p50_ms: float = Field(0.0, description="Median duration (histogram bucket upper bound) in milliseconds.", ge=0.0)
+    p95_ms: float = Field(0.0, description="95th-percentile duration (histogram bucket upper bound) in milliseconds.", ge=0.0)
+    p99_ms: float = Field(0.0, description="99th-percentile duration (histogram bucket upper bound) in milliseconds.", ge=0.0)
+    cpu_ms_total: Optional[float] = Field(None, description="Sum of sampled thread CPU time in milliseconds (capture_cpu only).")
+    rss_delta_mb_total: Optional[float] = Field(None, description="Sum of sampled RSS deltas in MB (capture_memory only).")
+    histogram: List[int] = Field(default_factory=list, description="Log2 latency histogram; bucket i counts durations below 2**i ns.")
+
+    model_config = ConfigDict(extra='forbid')
+
+
+class _Counters:
+    """
+    Counters for one function: either one thread's shard (written only by that thread)
+    or the merged aggregate (touched only under the backend lock). ``merged`` holds
+    the shard totals already folded into the aggregate.
+    """
+
+    __slots__ = ("calls", "errors", "total_ns", "max_ns", "cpu_ns", "rss_bytes", "buckets", "merged")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.cpu_ns = 0
+        self.rss_bytes = 0
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+        self.merged: Optional[tuple] = None
+
+
+class FunctionTelemetryV2_5:
+    """Per-function recording handle returned by ``DecoratorTelemetryV2_5.register``."""
+
+    __slots__ = ("name", "sample_rate", "capture_cpu", "capture_memory", "metrics_file", "_backend", "_local",
+                 "_shards", "_aggregate")
+
+    def __init__(self, backend: "DecoratorTelemetryV2_5", name: str, sample_rate: float,
+                 capture_cpu: bool, capture_memory: bool, metrics_file: Optional[str] = None):
+        self.name = name
+        self.metrics_file = metrics_file
+        self.sample_rate = sample_rate
+        self.capture_cpu = capture_cpu
+        self.capture_memory = capture_memory and PSUTIL_AVAILABLE
+        self._backend = backend
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, _Counters]] = []  # (owning thread, its shard)
+        self._aggregate = _Counters()
+
+    def shard(self) -> _Counters:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = _Counters()
+            with self._backend._lock:
+                self._shards.append((threading.current_thread(), shard))
+            return shard
+
+    def record(self, duration_ns: int, failed: bool, cpu_ns: int = 0, rss_bytes: int = 0) -> None:
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self.shard()
+        shard.calls += 1
+        shard.total_ns += duration_ns
+        if duration_ns > shard.max_ns:
+            shard.max_ns = duration_ns
+        bucket = duration_ns.bit_length()
+        shard.buckets[bucket if bucket < HISTOGRAM_BUCKETS else HISTOGRAM_BUCKETS - 1] += 1
+        if failed:
+            shard.errors += 1
+        if cpu_ns:
+            shard.cpu_ns += cpu_ns
+        if rss_bytes:
+            shard.rss_bytes += rss_bytes
+
+    def _merge_locked(self) -> bool:
+        """
+        Fold new shard activity into the aggregate and drop the shards of exited
+        threads; returns True if anything changed.
+        """
+        changed = False
+        live = []
+        for thread, shard in self._shards:
+            # Checked before folding: a thread seen dead cannot write after the fold
+            alive = thread.is_alive()
+            changed = self._fold_locked(shard) or changed
+            if alive:
+                live.append((thread, shard))
+        if len(live) != len(self._shards):
+            self._shards = live
+        return changed
+
+    def _fold_locked(self, shard: _Counters) -> bool:
+        buckets = list(shard.buckets)
+        current = (shard.calls, shard.errors, shard.total_ns, shard.cpu_ns, shard.rss_bytes, buckets)
+        previous = shard.merged or (0, 0, 0, 0, 0, [0] * HISTOGRAM_BUCKETS)
+        if current[0] == previous[0]:
+            return False
+        agg = self._aggregate
+        agg.calls += current[0] - previous[0]
+        agg.errors += current[1] - previous[1]
+        agg.total_ns += current[2] - previous[2]
+        agg.cpu_ns += current[3] - previous[3]
+        agg.rss_bytes += current[4] - previous[4]
+        for i, (now, before) in enumerate(zip(buckets, previous[5])):
+            agg.buckets[i] += now - before
+        agg.max_ns = max(agg.max_ns, shard.max_ns)
+        shard.merged = current
+        return True
+
+    @property
+    def shard_count(self) -> int:
+        """Shards not yet dropped (one per live recording thread, plus exited ones awaiting a merge)."""
+        return len(self._shards)
+
+    def _snapshot_locked(self) -> FunctionTelemetrySnapshotV2_5:
+        agg = self._aggregate
+        return FunctionTelemetrySnapshotV2_5(
+            function_name=self.name,
+            sample_rate=self.sample_rate,
+            sampled_calls=agg.calls,
+            estimated_calls=agg.calls / self.sample_rate if self.sample_rate > 0 else 0.0,
+            errors=agg.errors,
+            total_ns=agg.total_ns,
+            max_ns=agg.max_ns,
+            mean_ms=(agg.total_ns / agg.calls) / 1e6 if agg.calls else 0.0,
+            p50_ms=_bucket_quantile_ms(agg.buckets, agg.calls, 0.50),
+            p95_ms=_bucket_quantile_ms(agg.buckets, agg.calls, 0.95),
+            p99_ms=_bucket_quantile_ms(agg.buckets, agg.calls, 0.99),
+            cpu_ms_total=agg.cpu_ns / 1e6 if self.capture_cpu else None,
+            rss_delta_mb_total=agg.rss_bytes / (1024 * 1024) if self.capture_memory else None,
+            histogram=list(agg.buckets),
+        )
+
+
+def _bucket_quantile_ms(buckets: List[int], total: int, q: float) -> float:
+    if total <= 0:
+        return 0.0
+    threshold = q * total
+    running = 0
+    for i, count in enumerate(buckets):
+        running += count
+        if running >= threshold:
+            return (1 << i) / 1e6
+    return (1 << (len(buckets) - 1)) / 1e6
+
+
+class DecoratorTelemetryV2_5:
+    """
+    Registry of per-function telemetry plus the background flusher.
+
+    Args:
+        default_sample_rate: Sampling probability used when a decorator does not set one.
+        flush_interval_seconds: Period of the background merge/flush thread.
+        metrics_file: Default JSON-lines file receiving one summary per active function per flush
+            (a function registered with its own ``metrics_file`` writes there instead).
+    """
+
+    def __init__(self, default_sample_rate: float = 1.0, flush_interval_seconds: float = 10.0,
+                 metrics_file: Optional[str] = None):
+        self.default_sample_rate = default_sample_rate
+        self.flush_interval_seconds = flush_interval_seconds
+        self.metrics_file = metrics_file
+        self._lock = threading.Lock()
+        self._functions: Dict[str, FunctionTelemetryV2_5] = {}
+        self._flusher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Registration / decoration
+    # ------------------------------------------------------------------
+    def register(self, name: str, sample_rate: Optional[float] = None, capture_cpu: bool = False,
+                 capture_memory: bool = False, metrics_file: Optional[str] = None) -> FunctionTelemetryV2_5:
+        """Return the handle for ``name``, creating it on first use (later settings for the same name are ignored)."""
+        rate = self.default_sample_rate if sample_rate is None else sample_rate
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f"sample_rate must be within [0, 1], got {rate}")
+        with self._lock:
+            handle = self._functions.get(name)
+            if handle is None:
+                handle = self._functions[name] = FunctionTelemetryV2_5(self, name, rate, capture_cpu, capture_memory, metrics_file)
+        self._ensure_flusher()
+        return handle
+
+    def instrument(self, func: Callable, sample_rate: Optional[float] = None, capture_cpu: bool = False,
+                   capture_memory: bool = False, metrics_file: Optional[str] = None, name: Optional[str] = None,
+                   error_logger: Optional[logging.Logger] = None) -> Callable:
+        """
+        Wrap ``func`` (sync or async) so sampled calls are recorded under ``name``.
+        If ``error_logger`` is given, every call that raises (sampled or not) is logged
+        there before the exception propagates.
+        """
+        handle = self.register(name or f"{func.__module__}.{func.__qualname__}", sample_rate, capture_cpu,
+                               capture_memory, metrics_file)
+        rate = handle.sample_rate
+        always = rate >= 1.0
+        rand = random.random
+        perf_ns = time.perf_counter_ns
+        record = handle.record
+        func_name = func.__name__
+
+        def log_error(e: Exception) -> None:
+            if error_logger is not None:
+                error_logger.error(f"Error in {func_name}: {e}")
+
+        if handle.capture_cpu or handle.capture_memory:
+            measure = _FullMeasure(handle)
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_full_wrapper(*args, **kwargs):
+                    sampled = always or rand() < rate
+                    token = measure.start() if sampled else None
+                    failed = True
+                    try:
+                        result = await func(*args, **kwargs)
+                        failed = False
+                        return result
+                    except Exception as e:
+                        log_error(e)
+                        raise
+                    finally:
+                        if sampled:
+                            measure.stop(token, failed)
+                return async_full_wrapper
+
+            @functools.wraps(func)
+            def full_wrapper(*args, **kwargs):
+                sampled = always or rand() < rate
+                token = measure.start() if sampled else None
+                failed = True
+                try:
+                    result = func(*args, **kwargs)
+                    failed = False
+                    return result
+                except Exception as e:
+                    log_error(e)
+                    raise
+                finally:
+                    if sampled:
+                        measure.stop(token, failed)
+            return full_wrapper
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not always and rand() >= rate:
+                    try:
+                        return await func(*args, **kwargs)
+                    except Exception as e:
+                        log_error(e)
+                        raise
+                start = perf_ns()
+                failed = True
+                try:
+                    result = await func(*args, **kwargs)
+                    failed = False
+                    return result
+                except Exception as e:
+                    log_error(e)
+                    raise
+                finally:
+                    record(perf_ns() - start, failed)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not always and rand() >= rate:
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    log_error(e)
+                    raise
+            start = perf_ns()
+            failed = True
+            try:
+                result = func(*args, **kwargs)
+                failed = False
+                return result
+            except Exception as e:
+                log_error(e)
+                raise
+            finally:
+                record(perf_ns() - start, failed)
+        return wrapper
+
+    # ------------------------------------------------------------------
+    # Aggregation / flushing
+    # ------------------------------------------------------------------
+    def flush(self) -> List[FunctionTelemetrySnapshotV2_5]:
+        """Merge shard deltas now; returns snapshots of the functions that changed."""
+        by_file: Dict[str, List[FunctionTelemetrySnapshotV2_5]] = defaultdict(list)
+        changed = []
+        with self._lock:
+            for handle in self._functions.values():
+                if not handle._merge_locked():
+                    continue
+                snapshot = handle._snapshot_locked()
+                changed.append(snapshot)
+                target = handle.metrics_file or self.metrics_file
+                if target:
+                    by_file[target].append(snapshot)
+        for target, snapshots in by_file.items():
+            self._append_metrics(target, snapshots)
+        return changed
+
+    def report(self, name: Optional[str] = None) -> Dict[str, FunctionTelemetrySnapshotV2_5]:
+        """Merge pending activity and return aggregated telemetry keyed by function name."""
+        self.flush()
+        with self._lock:
+            return {n: h._snapshot_locked() for n, h in self._functions.items() if name is None or n == name}
+
+    def reset(self) -> None:
+        with self._lock:
+            for handle in self._functions.values():
+                handle._merge_locked()
+                handle._aggregate = _Counters()
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join(timeout=self.flush_interval_seconds + 1.0)
+            self._flusher = None
+        self.flush()
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is not None or self.flush_interval_seconds <= 0:
+            return
+        with self._lock:
+            if self._flusher is None:
+                self._stop.clear()
+                self._flusher = threading.Thread(target=self._flush_loop, name="eots-decorator-telemetry", daemon=True)
+                self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval_seconds):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Decorator telemetry flush failed: {e}")
+
+    def _append_metrics(self, metrics_file: str, snapshots: List[FunctionTelemetrySnapshotV2_5]) -> None:
+        try:
+            path = Path(metrics_file)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            stamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+            lines = "".join(
+                json.dumps({"timestamp": stamp, **s.model_dump(exclude={"histogram"})}) + "\n" for s in snapshots
+            )
+            if FILELOCK_AVAILABLE:
+                with FileLock(f"{metrics_file}.lock"):
+                    with open(path, "a") as f:
+                        f.write(lines)
+            else:
+                with open(path, "a") as f:
+                    f.write(lines)
+        except Exception as e:
+            logger.error(f"Failed to save decorator telemetry to file: {e}")
+
+
+class _FullMeasure:
+    """Opt-in CPU / RSS capture around a sampled call."""
+
+    __slots__ = ("handle", "process")
+
+    def __init__(self, handle: FunctionTelemetryV2_5):
+        self.handle = handle
+        self.process = _get_process() if handle.capture_memory else None
+
+    def start(self) -> tuple:
+        rss = self.process.memory_info().rss if self.process is not None else 0
+        cpu = time.thread_time_ns() if self.handle.capture_cpu else 0
+        return time.perf_counter_ns(), cpu, rss
+
+    def stop(self, token: tuple, failed: bool) -> None:
+        duration = time.perf_counter_ns() - token[0]
+        cpu = time.thread_time_ns() - token[1] if self.handle.capture_cpu else 0
+        rss = self.process.memory_info().rss - token[2] if self.process is not None else 0
+        self.handle.record(duration, failed, cpu, rss)
+
+
+_process = None
+
+
+def _get_process():
+    global _process
+    if _process is None:
+        _process = psutil.Process()
+    return _process
+
+
+_default_backend: Optional[DecoratorTelemetryV2_5] = None
+_default_backend_lock = threading.Lock()
+
+
+def get_decorator_telemetry() -> DecoratorTelemetryV2_5:
+    """Process-wide telemetry backend shared by the compliance decorators."""
+    global _default_backend
+    if _default_backend is None:
+        with _default_backend_lock:
+            if _default_backend is None:
+                _default_backend = DecoratorTelemetryV2_5()
+    return _default_backend
+
+
+def configure_decorator_telemetry(default_sample_rate: Optional[float] = None,
+                                  flush_interval_seconds: Optional[float] = None,
+                                  metrics_file: Optional[str] = None) -> DecoratorTelemetryV2_5:
+    """
+    Adjust the process-wide backend. ``default_sample_rate`` applies to functions
+    decorated after the call.
+    """
+    backend = get_decorator_telemetry()
+    if default_sample_rate is not None:
+        if not 0.0 <= default_sample_rate <= 1.0:
+            raise ValueError(f"default_sample_rate must be within [0, 1], got {default_sample_rate}")
+        backend.default_sample_rate = default_sample_rate
+    if flush_interval_seconds is not None:
+        backend.flush_interval_seconds = flush_interval_seconds
+    if metrics_file is not None:
+        backend.metrics_file = metrics_file
+    return backend
@@ -0,0 +1,293 @@
+# utils/stage_tracer_v2_5.py
+# EOTS v2.5 - Lightweight per-stage tracing for the analysis cycle
+
+"""
+Per-stage tracing for EOTS v2.5.
+
+Provides a tiny span API (``tracer.span(...)`` context manager and ``@traced(...)``
+decorator) used to instrument ``ITSOrchestratorV2_5.run_full_analysis_cycle`` and
+``MetricsCalculatorV2_5.calculate_all_metrics`` down to the sub-calculator calls.
+
+- Every closed span is observed into the ``eots_stage_duration_seconds`` Prometheus
+  histogram, labeled by ``symbol`` and ``stage``.
+- Each root span (one analysis cycle) is offered to a bounded ring of the N slowest
+  cycles, which keeps the complete span tree for inspection from the dashboard.
+- When tracing is disabled, ``span()`` returns a shared no-op context manager, so the
+  instrumented code pays one attribute check per stage.
+
+The current span stack lives in a ``contextvars.ContextVar`` so nesting is tracked
+correctly across ``await`` points and concurrently running cycles.
+"""
+
+import functools
+import heapq
+import inspect
+import itertools
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    from prometheus_client import Histogram, REGISTRY
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("eots_current_span", default=None)
+
+
+class Span:
+    """A single timed stage. Children are attached when they close."""
+
+    __slots__ = ("stage", "symbol", "attributes", "parent", "children", "start_wall", "_start", "duration_s", "error")
+
+    def __init__(self, stage: str, symbol: Optional[str], parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.stage = stage
+        self.symbol = symbol
+        self.attributes = attributes
+        self.parent = parent
+        self.children: List["Span"] = []
+        self.start_wall = datetime.now()
+        self._start = time.perf_counter()
+        self.duration_s: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the span and its subtree (durations in milliseconds)."""
+        return {
+            "stage": self.stage,
+            "symbol": self.symbol,
+            "start": self.start_wall.isoformat(),
+            "duration_ms": round((self.duration_s or 0.0) * 1000.0, 3),
+            "error": self.error,
+            "attributes": dict(self.attributes),
+            "children": [child.to_dict() for child in self.children],
+        }
+
+
+class _NoOpSpan:
+    """Returned by ``StageTracerV2_5.span`` when tracing is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoOpSpan()
+
+
+class _SpanContext:
+    __slots__ = ("_tracer", "_stage", "_symbol", "_attributes", "_span", "_token")
+
+    def __init__(self, tracer: "StageTracerV2_5", stage: str, symbol: Optional[str], attributes: Dict[str, Any]):
+        self._tracer = tracer
+        self._stage = stage
+        self._symbol = symbol
+        self._attributes = attributes
+        self._span: Optional[Span] = None
+        self._token = None
+
+    def __enter__(self) -> Span:
+        parent = _current_span.get()
+        symbol = self._symbol if self._symbol is not None else (parent.symbol if parent is not None else None)
+        self._span = Span(self._stage, symbol, parent, self._attributes)
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb):
+        span = self._span
+        span.duration_s = time.perf_counter() - span._start
+        if exc_type is not None:
+            span.error = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self._token)
+        self._tracer._on_span_closed(span)
+        return False
+
+
+class StageTracerV2_5:
+    """
+    Span collector feeding Prometheus stage histograms and a slowest-cycles ring buffer.
+    """
+
+    def __init__(self, enabled: bool = False, slowest_cycles_to_keep: int = 20,
+                 histogram_buckets: Optional[List[float]] = None, namespace: str = "eots"):
+        self.enabled = enabled
+        self.slowest_cycles_to_keep = max(1, slowest_cycles_to_keep)
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._slowest: List[tuple] = []  # min-heap of (duration_s, seq, span)
+        self._seq = itertools.count()
+        self._histogram = self._create_histogram(tuple(histogram_buckets or DEFAULT_STAGE_BUCKETS))
+
+    def _create_histogram(self, buckets: tuple):
+        if not PROMETHEUS_AVAILABLE:
+            return None
+        metric_name = f"{self.namespace}_stage_duration_seconds"
+        # Unregister metric if it already exists to prevent errors on re-initialization
+        if metric_name in REGISTRY._names_to_collectors:
+            REGISTRY.unregister(REGISTRY._names_to_collectors[metric_name])
+        return Histogram(metric_name, "Duration of EOTS analysis-cycle stages in seconds",
+                         labelnames=["symbol", "stage"], buckets=buckets)
+
+    # ------------------------------------------------------------------
+    # Span API
+    # ------------------------------------------------------------------
+    def span(self, stage: str, symbol: Optional[str] = None, **attributes):
+        """Context manager timing ``stage``; nested spans become children of the current span."""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _SpanContext(self, stage, symbol, attributes)
+
+    def traced(self, stage: Optional[str] = None, symbol_arg: Optional[str] = None):
+        """
+        Decorator form of ``span`` for sync and async callables.
+
+        Args:
+            stage: Stage name; defaults to the function's qualified name.
+            symbol_arg: Optional argument carrying the ticker symbol; a dotted path such as
+                ``"underlying_data.symbol"`` reads an attribute of that argument.
+        """
+        return _make_traced(lambda: self, stage, symbol_arg)
+
+    @staticmethod
+    def current_span() -> Optional[Span]:
+        return _current_span.get()
+
+    # ------------------------------------------------------------------
+    # Collection
+    # ------------------------------------------------------------------
+    def _on_span_closed(self, span: Span) -> None:
+        if self._histogram is not None:
+            self._histogram.labels(symbol=span.symbol or "unknown", stage=span.stage).observe(span.duration_s)
+        if span.parent is not None:
+            span.parent.children.append(span)
+            return
+        # Root span: one complete cycle
+        with self._lock:
+            entry = (span.duration_s, next(self._seq), span)
+            if len(self._slowest) < self.slowest_cycles_to_keep:
+                heapq.heappush(self._slowest, entry)
+            elif span.duration_s > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def get_slowest_cycles(self, limit: Optional[int] = None, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return the slowest recorded cycles (slowest first) with their full span trees."""
+        with self._lock:
+            spans = [entry[2] for entry in sorted(self._slowest, key=lambda e: e[0], reverse=True)]
+        if symbol is not None:
+            spans = [s for s in spans if s.symbol == symbol]
+        if limit is not None:
+            spans = spans[:limit]
+        return [s.to_dict() for s in spans]
+
+    def get_stage_summary(self, symbol: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """Aggregate per-stage count/mean/max (ms) across the retained slow cycles."""
+        summary: Dict[str, Dict[str, float]] = {}
+        with self._lock:
+            roots = [entry[2] for entry in self._slowest]
+        stack = [s for s in roots if symbol is None or s.symbol == symbol]
+        while stack:
+            span = stack.pop()
+            stats = summary.setdefault(span.stage, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            duration_ms = (span.duration_s or 0.0) * 1000.0
+            stats["count"] += 1
+            stats["total_ms"] += duration_ms
+            stats["max_ms"] = max(stats["max_ms"], duration_ms)
+            stack.extend(span.children)
+        for stats in summary.values():
+            stats["mean_ms"] = stats["total_ms"] / stats["count"]
+        return summary
+
+    def reset(self) -> None:
+        with self._lock:
+            self._slowest.clear()
+
+
+_default_tracer: Optional[StageTracerV2_5] = None
+_default_tracer_lock = threading.Lock()
+
+
+def get_stage_tracer() -> StageTracerV2_5:
+    """Process-wide tracer (disabled until ``configure_stage_tracer`` enables it)."""
+    global _default_tracer
+    if _default_tracer is None:
+        with _default_tracer_lock:
+            if _default_tracer is None:
+                _default_tracer = StageTracerV2_5(enabled=False)
+    return _default_tracer
+
+
+def configure_stage_tracer(settings: Any = None) -> StageTracerV2_5:
+    """
+    Apply ``StageTracingSettings`` (or any object with the same attributes) to the
+    process-wide tracer and return it.
+    """
+    tracer = get_stage_tracer()
+    if settings is not None:
+        tracer.enabled = bool(getattr(settings, "enabled", tracer.enabled))
+        tracer.slowest_cycles_to_keep = max(1, int(getattr(settings, "slowest_cycles_to_keep", tracer.slowest_cycles_to_keep)))
+        if tracer.enabled:
+            logger.info(f"Stage tracing enabled (keeping {tracer.slowest_cycles_to_keep} slowest cycles)")
+    return tracer
+
+
+def trace_span(stage: str, symbol: Optional[str] = None, **attributes):
+    """Shortcut for ``get_stage_tracer().span(...)``."""
+    return get_stage_tracer().span(stage, symbol, **attributes)
+
+
+def traced(stage: Optional[str] = None, symbol_arg: Optional[str] = None):
+    """
+    Decorator bound to the process-wide tracer. The enabled flag is checked at call time,
+    so decorating at import time is safe even if tracing is configured later.
+    """
+    return _make_traced(get_stage_tracer, stage, symbol_arg)
+
+
+def _make_traced(get_tracer: Callable[[], StageTracerV2_5], stage: Optional[str], symbol_arg: Optional[str]):
+    def decorator(func: Callable) -> Callable:
+        stage_name = stage or func.__qualname__
+        signature = inspect.signature(func) if symbol_arg else None
+        arg_name, _, attr_path = (symbol_arg or "").partition(".")
+
+        def _symbol(args, kwargs) -> Optional[str]:
+            if signature is None:
+                return None
+            try:
+                value = signature.bind_partial(*args, **kwargs).arguments.get(arg_name)
+            except TypeError:
+                return None
+            for attr in filter(None, attr_path.split(".")):
+                value = getattr(value, attr, None)
+            return value if isinstance(value, str) else None
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                tracer = get_tracer()
+                if not tracer.enabled:
+                    return await func(*args, **kwargs)
+                with _SpanContext(tracer, stage_name, _symbol(args, kwargs), {}):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = get_tracer()
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with _SpanContext(tracer, stage_name, _symbol(args, kwargs), {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -6,13 +6,27 @@ Focus: SPY options for the past 5 days
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
 import os
 
+# Columns read from ConvexValue strike rows; everything else is derived
+INPUT_COLUMNS = ['date', 'strike', 'gxoi', 'dxoi', 'volmbs_15m', 'volmbs_60m', 'charmxoi',
+                 'vannaxoi', 'vommaxoi', 'gxvolm', 'value_bs']
+ZSCORE_METRICS = ['gxoi', 'dxoi', 'volmbs_15m', 'volmbs_60m', 'charmxoi', 'vannaxoi', 'vommaxoi', 'gxvolm', 'value_bs']
+LEVEL_METRICS = ['gxoi', 'dxoi', 'volmbs_15m', 'charmxoi', 'vannaxoi', 'vommaxoi', 'gxvolm', 'value_bs']
+METHODS = [
+    'High Gamma Imbalance', 'Delta-Gamma Divergence', 'Flow Anomaly', 'Volatility Sensitivity',
+    'Charm-Adjusted Gamma', 'Active Hedging Detection', 'Value-Volume Divergence'
+]
+METHOD_QUANTILE = 0.9
+
 class DarkpoolAnalyzer:
     """
     A framework for analyzing darkpool activity using ConvexValue metrics
+
+    The analysis is columnar: method scores, thresholds and selections are NumPy array
+    operations over whole columns, and per-strike aggregation uses grouped reductions.
+    Large files can be loaded in chunks with load_csv / load_chunks.
     """
     
     def __init__(self, symbol="SPY", days_back=5):
@@ -102,7 +116,41 @@ class DarkpoolAnalyzer:
         self.data = pd.DataFrame(data_rows)
         print(f"Loaded sample data with {len(self.data)} rows")
         return self.data
-    
+
+    def load_chunks(self, chunks):
+        """
+        Load data from an iterable of DataFrame chunks
+
+        Only INPUT_COLUMNS are kept from each chunk, so a very large source never has to
+        be materialized with all of its columns. Z-scores and method thresholds are taken
+        over the whole dataset, so the reduced chunks are concatenated before analysis.
+
+        Parameters:
+        -----------
+        chunks : iterable of DataFrame
+            Row chunks with at least INPUT_COLUMNS
+        """
+        kept = [chunk[INPUT_COLUMNS] for chunk in chunks]
+        if kept:
+            self.data = pd.concat(kept, ignore_index=True)
+        else:
+            self.data = pd.DataFrame(columns=INPUT_COLUMNS)
+        print(f"Loaded {len(self.data)} rows from {len(kept)} chunks")
+        return self.data
+
+    def load_csv(self, path, chunksize=250_000):
+        """
+        Stream a CSV export of ConvexValue strike rows in chunks
+
+        Parameters:
+        -----------
+        path : str
+            CSV file with at least INPUT_COLUMNS
+        chunksize : int
+            Rows read per chunk (default: 250000)
+        """
+        return self.load_chunks(pd.read_csv(path, usecols=INPUT_COLUMNS, chunksize=chunksize))
+
     def preprocess_data(self):
         """
         Preprocess the data for analysis
@@ -118,7 +166,7 @@ class DarkpoolAnalyzer:
         self.data['volmbs_ratio'] = self.data['volmbs_15m'] / self.data['volmbs_60m'].replace(0, 1)
         
         # Normalize key metrics for comparison
-        for metric in ['gxoi', 'dxoi', 'volmbs_15m', 'volmbs_60m', 'charmxoi', 'vannaxoi', 'vommaxoi', 'gxvolm', 'value_bs']:
+        for metric in ZSCORE_METRICS:
             mean = self.data[metric].mean()
             std = self.data[metric].std()
             self.data[f'{metric}_zscore'] = (self.data[metric] - mean) / std
@@ -126,88 +174,92 @@ class DarkpoolAnalyzer:
         print("Data preprocessing complete")
         return self.data
     
+    def _method_scores(self):
+        """
+        Score every row under each of the seven methodologies
+
+        Returns the score arrays in METHODS order and the derived columns that are
+        also stored on self.data.
+        """
+        z = {metric: self.data[f'{metric}_zscore'].to_numpy() for metric in ZSCORE_METRICS}
+        derived = {
+            # Method 2: Delta and gamma imbalances diverge significantly
+            'delta_gamma_divergence': np.abs(z['gxoi'] - z['dxoi']),
+            # Method 3: Unusual flow patterns across timeframes
+            'flow_anomaly': np.abs(z['volmbs_15m']) + np.abs(z['volmbs_15m'] - z['volmbs_60m']),
+            # Method 4: High vanna and vomma exposure
+            'vol_sensitivity': np.abs(z['vannaxoi']) + np.abs(z['vommaxoi']),
+            # Method 5: High gamma that is also sensitive to time decay
+            'charm_adjusted_gamma': z['gxoi'] * (1 + np.abs(z['charmxoi'])),
+            # Method 6: High gamma and high gamma-weighted volume
+            'active_hedging': z['gxoi'] * z['gxvolm'],
+            # Method 7: Value and volume flows diverge significantly
+            'value_volume_divergence': np.abs(z['value_bs'] - z['volmbs_15m']),
+        }
+        # Method 1: Unusually high gamma concentration
+        scores = [z['gxoi'], *derived.values()]
+        return scores, derived
+
     def identify_darkpool_levels(self):
         """
         Identify potential darkpool levels using multiple methodologies
+
+        A row is selected by a method when its score is above that method's 90th
+        percentile; each selection becomes one level row.
         """
         if self.data is None:
             print("No data loaded. Please load data first.")
             return []
-        
-        # Method 1: High Gamma Imbalance Method
-        # Identifies strikes with unusually high gamma concentration
-        gamma_threshold = self.data['gxoi_zscore'].quantile(0.9)
-        gamma_levels = self.data[self.data['gxoi_zscore'] > gamma_threshold].copy()
-        gamma_levels['method'] = 'High Gamma Imbalance'
-        gamma_levels['score'] = gamma_levels['gxoi_zscore']
-        
-        # Method 2: Delta-Gamma Divergence Method
-        # Identifies strikes where delta and gamma imbalances diverge significantly
-        self.data['delta_gamma_divergence'] = (self.data['gxoi_zscore'] - self.data['dxoi_zscore']).abs()
-        divergence_threshold = self.data['delta_gamma_divergence'].quantile(0.9)
-        divergence_levels = self.data[self.data['delta_gamma_divergence'] > divergence_threshold].copy()
-        divergence_levels['method'] = 'Delta-Gamma Divergence'
-        divergence_levels['score'] = divergence_levels['delta_gamma_divergence']
-        
-        # Method 3: Flow Anomaly Method
-        # Identifies strikes with unusual flow patterns across timeframes
-        self.data['flow_anomaly'] = (
-            self.data['volmbs_15m_zscore'].abs() + 
-            (self.data['volmbs_15m_zscore'] - self.data['volmbs_60m_zscore']).abs()
-        )
-        flow_threshold = self.data['flow_anomaly'].quantile(0.9)
-        flow_levels = self.data[self.data['flow_anomaly'] > flow_threshold].copy()
-        flow_levels['method'] = 'Flow Anomaly'
-        flow_levels['score'] = flow_levels['flow_anomaly']
-        
-        # Method 4: Volatility Sensitivity Method
-        # Identifies strikes with high vanna and vomma exposure
-        self.data['vol_sensitivity'] = self.data['vannaxoi_zscore'].abs() + self.data['vommaxoi_zscore'].abs()
-        vol_threshold = self.data['vol_sensitivity'].quantile(0.9)
-        vol_levels = self.data[self.data['vol_sensitivity'] > vol_threshold].copy()
-        vol_levels['method'] = 'Volatility Sensitivity'
-        vol_levels['score'] = vol_levels['vol_sensitivity']
-        
-        # Method 5: Charm-Adjusted Gamma Method
-        # Identifies strikes with high gamma that are also sensitive to time decay
-        self.data['charm_adjusted_gamma'] = self.data['gxoi_zscore'] * (1 + self.data['charmxoi_zscore'].abs())
-        charm_threshold = self.data['charm_adjusted_gamma'].quantile(0.9)
-        charm_levels = self.data[self.data['charm_adjusted_gamma'] > charm_threshold].copy()
-        charm_levels['method'] = 'Charm-Adjusted Gamma'
-        charm_levels['score'] = charm_levels['charm_adjusted_gamma']
-        
-        # Method 6: Active Hedging Detection Method
-        # Identifies strikes with high gamma and high gamma-weighted volume
-        self.data['active_hedging'] = self.data['gxoi_zscore'] * self.data['gxvolm_zscore']
-        hedging_threshold = self.data['active_hedging'].quantile(0.9)
-        hedging_levels = self.data[self.data['active_hedging'] > hedging_threshold].copy()
-        hedging_levels['method'] = 'Active Hedging Detection'
-        hedging_levels['score'] = hedging_levels['active_hedging']
-        
-        # Method 7: Value-Volume Divergence Method
-        # Identifies strikes where value and volume flows diverge significantly
-        self.data['value_volume_divergence'] = (
-            self.data['value_bs_zscore'] - self.data['volmbs_15m_zscore']
-        ).abs()
-        value_threshold = self.data['value_volume_divergence'].quantile(0.9)
-        value_levels = self.data[self.data['value_volume_divergence'] > value_threshold].copy()
-        value_levels['method'] = 'Value-Volume Divergence'
-        value_levels['score'] = value_levels['value_volume_divergence']
-        
-        # Combine all identified levels
-        all_levels = pd.concat([
-            gamma_levels, divergence_levels, flow_levels, vol_levels, 
-            charm_levels, hedging_levels, value_levels
-        ])
-        
-        # Keep only essential columns for the output
-        columns_to_keep = ['date', 'strike', 'method', 'score', 'gxoi', 'dxoi', 
-                          'volmbs_15m', 'charmxoi', 'vannaxoi', 'vommaxoi', 'gxvolm', 'value_bs']
-        self.darkpool_levels = all_levels[columns_to_keep].sort_values('score', ascending=False)
-        
+
+        scores, derived = self._method_scores()
+        for column, values in derived.items():
+            self.data[column] = values
+
+        selected = []
+        for score in scores:
+            threshold = np.nanquantile(score, METHOD_QUANTILE) if len(score) else np.nan
+            selected.append(np.flatnonzero(score > threshold))
+        rows = np.concatenate(selected)
+        counts = [len(positions) for positions in selected]
+
+        columns = {
+            'date': self.data['date'].to_numpy()[rows],
+            'strike': self.data['strike'].to_numpy()[rows],
+            'method': np.repeat(np.array(METHODS, dtype=object), counts),
+            'score': np.concatenate([score[positions] for score, positions in zip(scores, selected)]),
+        }
+        for metric in LEVEL_METRICS:
+            columns[metric] = self.data[metric].to_numpy()[rows]
+        all_levels = pd.DataFrame(columns, index=self.data.index[rows])
+
+        self.darkpool_levels = all_levels.sort_values('score', ascending=False)
+
         print(f"Identified {len(self.darkpool_levels)} potential darkpool levels using 7 methods")
         return self.darkpool_levels
-    
+
+    def _method_labels(self, levels, strikes):
+        """
+        Comma-joined method names for each strike in ``strikes``
+
+        Labels are ``', '.join(set(methods))`` over the strike's rows. A set's iteration
+        order depends only on the distinct values and the order they were first added, so
+        each label is built once per distinct first-appearance ordering.
+        """
+        strike_codes = pd.Index(strikes).get_indexer(levels['strike'])
+        method_codes = pd.Index(METHODS).get_indexer(levels['method'])
+        valid = (strike_codes >= 0) & (method_codes >= 0)
+        first_seen = np.full((len(strikes), len(METHODS)), len(levels), dtype=np.int64)
+        np.minimum.at(first_seen, (strike_codes[valid], method_codes[valid]), np.flatnonzero(valid))
+
+        labels = []
+        cache = {}
+        for row in first_seen:
+            order = tuple(code for code in np.argsort(row, kind='stable') if row[code] < len(levels))
+            if order not in cache:
+                cache[order] = ', '.join(set(METHODS[code] for code in order))
+            labels.append(cache[order])
+        return labels
+
     def rank_top_levels(self, n=7):
         """
         Rank and select the top n darkpool levels
@@ -222,18 +274,11 @@ class DarkpoolAnalyzer:
             return []
         
         # Group by strike and aggregate scores across methods
-        strike_scores = self.darkpool_levels.groupby('strike').agg({
-            'score': 'sum',
-            'method': lambda x: ', '.join(set(x)),
-            'gxoi': 'mean',
-            'dxoi': 'mean',
-            'volmbs_15m': 'mean',
-            'charmxoi': 'mean',
-            'vannaxoi': 'mean',
-            'vommaxoi': 'mean',
-            'gxvolm': 'mean',
-            'value_bs': 'mean'
-        }).reset_index()
+        aggregations = {'score': 'sum'}
+        aggregations.update({metric: 'mean' for metric in LEVEL_METRICS})
+        strike_scores = self.darkpool_levels.groupby('strike').agg(aggregations)
+        strike_scores.insert(1, 'method', self._method_labels(self.darkpool_levels, strike_scores.index))
+        strike_scores = strike_scores.reset_index()
         
         # Sort by aggregated score and select top n
         self.top_levels = strike_scores.sort_values('score', ascending=False).head(n)
@@ -266,7 +311,7 @@ class DarkpoolAnalyzer:
             # Factor 4: Normalized charm effect
             self.top_levels['charmxoi'].abs() / self.top_levels['charmxoi'].abs().max() +
             # Factor 5: Method diversity (more methods = higher plausibility)
-            self.top_levels['method'].apply(lambda x: len(x.split(', '))) / 7
+            (self.top_levels['method'].str.count(', ') + 1) / 7
         )
         
         # Select the ultra levels with highest plausibility
@@ -274,7 +319,45 @@ class DarkpoolAnalyzer:
         
         print(f"Refined to {n} ultra darkpool levels with highest plausibility")
         return ultra_levels
-    
+
+    def accumulation_profile(self, window=3, metrics=('gxvolm', 'value_bs')):
+        """
+        Per-strike, per-date totals with rolling accumulation across dates
+
+        Parameters:
+        -----------
+        window : int
+            Number of dates in the rolling accumulation (default: 3)
+        metrics : sequence of str
+            Columns to accumulate (default: gxvolm, value_bs)
+
+        Returns a DataFrame with one row per (date, strike), the summed metrics and a
+        ``<metric>_rolling`` column holding the sum over the last ``window`` dates.
+        """
+        if self.data is None:
+            print("No data loaded. Please load data first.")
+            return pd.DataFrame()
+
+        window = max(1, int(window))
+        date_codes, dates = pd.factorize(self.data['date'], sort=True)
+        strike_codes, strikes = pd.factorize(self.data['strike'], sort=True)
+        valid = (date_codes >= 0) & (strike_codes >= 0)
+        cells = (date_codes[valid], strike_codes[valid])
+
+        profile = {
+            'date': np.repeat(np.asarray(dates), len(strikes)),
+            'strike': np.tile(np.asarray(strikes), len(dates)),
+        }
+        for metric in metrics:
+            totals = np.zeros((len(dates), len(strikes)))
+            np.add.at(totals, cells, np.nan_to_num(self.data[metric].to_numpy(dtype=float)[valid]))
+            running = np.cumsum(totals, axis=0)
+            rolling = running.copy()
+            rolling[window:] -= running[:-window]
+            profile[metric] = totals.ravel()
+            profile[f'{metric}_rolling'] = rolling.ravel()
+        return pd.DataFrame(profile)
+
     def visualize_levels(self, levels=None, filename="darkpool_levels.png"):
         """
         Visualize the identified darkpool levels
@@ -295,6 +378,9 @@ class DarkpoolAnalyzer:
                 print("No levels to visualize")
                 return
         
+        # Plotting is the only use of matplotlib; keep the analysis importable without it
+        import matplotlib.pyplot as plt
+        
         plt.figure(figsize=(12, 8))
         
         # Plot strikes on x-axis and normalized metrics on y-axis
@@ -360,8 +446,8 @@ class DarkpoolAnalyzer:
             report.append("\n| Strike | Methods | Gamma Concentration | Delta Exposure | Flow (15m) | Charm Effect | Vanna Effect | Vomma Effect | Active Hedging | Value Flow |")
             report.append("|--------|---------|---------------------|---------------|------------|-------------|-------------|-------------|---------------|------------|")
             
-            for _, row in self.top_levels.iterrows():
-                report.append(f"| {row['strike']} | {row['method']} | {row['gxoi']:.2f} | {row['dxoi']:.2f} | {row['volmbs_15m']:.2f} | {row['charmxoi']:.2f} | {row['vannaxoi']:.2f} | {row['vommaxoi']:.2f} | {row['gxvolm']:.2f} | {row['value_bs']:.2f} |")
+            for row in self.top_levels.itertuples(index=False):
+                report.append(f"| {row.strike} | {row.method} | {row.gxoi:.2f} | {row.dxoi:.2f} | {row.volmbs_15m:.2f} | {row.charmxoi:.2f} | {row.vannaxoi:.2f} | {row.vommaxoi:.2f} | {row.gxvolm:.2f} | {row.value_bs:.2f} |")
         
         # Add ultra levels if available
         if 'plausibility' in self.top_levels.columns:
@@ -373,8 +459,8 @@ class DarkpoolAnalyzer:
             report.append("\n| Strike | Plausibility | Methods | Gamma Concentration | Delta Exposure | Flow (15m) | Charm Effect |")
             report.append("|--------|--------------|---------|---------------------|---------------|------------|-------------|")
             
-            for _, row in ultra_levels.iterrows():
-                report.append(f"| {row['strike']} | {row['plausibility']:.4f} | {row['method']} | {row['gxoi']:.2f} | {row['dxoi']:.2f} | {row['volmbs_15m']:.2f} | {row['charmxoi']:.2f} |")
+            for row in ultra_levels.itertuples(index=False):
+                report.append(f"| {row.strike} | {row.plausibility:.4f} | {row.method} | {row.gxoi:.2f} | {row.dxoi:.2f} | {row.volmbs_15m:.2f} | {row.charmxoi:.2f} |")
             
             report.append("\n## Methodology Relationships")
             report.append("\nThe three ultra darkpool levels were identified through a composite analysis that considers the relationships between different methodologies:")